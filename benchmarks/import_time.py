@@ -0,0 +1,72 @@
+"""
+import_time.py
+====================================
+Measures the time to ``import wearipedia`` and to get a single device, in fresh
+interpreters (i.e. cold starts, as paid by every CLI or serverless invocation).
+
+Usage: ``python benchmarks/import_time.py [--repeat N] [device_name ...]``
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+IMPORT = "import wearipedia"
+
+
+def time_code(code, repeat):
+    """Runs `code` in `repeat` fresh interpreters, and returns the time it took in each.
+
+    :param code: the Python code to time
+    :type code: str
+    :param repeat: the number of interpreters to run the code in
+    :type repeat: int
+    :return: the times in seconds
+    :rtype: List
+    """
+    timed = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{code}\n"
+        "print(time.perf_counter() - start)"
+    )
+
+    return [
+        float(
+            subprocess.run(
+                [sys.executable, "-c", timed],
+                capture_output=True,
+                text=True,
+                check=True,
+            ).stdout
+        )
+        for _ in range(repeat)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "device_names", nargs="*", default=["dexcom/pro_cgm", "garmin/fenix_7s"]
+    )
+    args = parser.parse_args()
+
+    benchmarks = {IMPORT: IMPORT}
+
+    for device_name in args.device_names:
+        benchmarks[
+            f"get_device({device_name!r})"
+        ] = f"{IMPORT}\nwearipedia.get_device({device_name!r})"
+
+    for name, code in benchmarks.items():
+        times = time_code(code, args.repeat)
+        print(
+            f"{name:<45} median {statistics.median(times) * 1000:8.1f} ms, "
+            f"min {min(times) * 1000:8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
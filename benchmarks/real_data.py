@@ -0,0 +1,161 @@
+"""
+real_data.py
+====================================
+Benchmarks the real data path of devices (authentication, fetching and parsing the
+responses into data) offline, by replaying cassettes of real runs, see
+`wearipedia.cassette`. Since replaying does not touch the network, the times are those
+of the post-processing of the responses by `_get_real` (DataFrame construction, CSV and
+JSON parsing, ...).
+
+Record a cassette of a device (with real credentials, once):
+``python benchmarks/real_data.py record whoop/whoop_4 --creds creds.json``
+
+Benchmark all the cassettes of a directory:
+``python benchmarks/real_data.py run [--repeat N] [--cassettes DIR] [--json OUT]``
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import wearipedia
+from wearipedia.cassette import FILTERED, SECRET_PATTERN, use_cassette
+
+CASSETTE_DIR = Path(__file__).parent / "cassettes"
+
+
+def cassette_path(cassette_dir, device_name):
+    return Path(cassette_dir) / (device_name.replace("/", "_") + ".json.gz")
+
+
+def record(device_name, auth_creds, data_types, cassette_dir):
+    """Records a cassette of getting every data type of a device with real credentials.
+
+    :param device_name: the name of the device
+    :type device_name: str
+    :param auth_creds: the credentials to authenticate the device with
+    :type auth_creds: Dict
+    :param data_types: the data types to get, defaults to all of them
+    :type data_types: List
+    :param cassette_dir: the directory to save the cassette in
+    :type cassette_dir: str or Path
+    :return: the path of the cassette
+    :rtype: Path
+    """
+    path = cassette_path(cassette_dir, device_name)
+    device = wearipedia.get_device(device_name)
+    data_types = data_types or device.valid_data_types
+    recorded = []
+
+    with use_cassette(path, mode="record") as cassette:
+        device.authenticate(auth_creds)
+
+        for data_type in data_types:
+            try:
+                device.get_data(data_type)
+                recorded.append(data_type)
+            except Exception as e:
+                print(
+                    f"{device_name} {data_type}: {e!r}, not recorded", file=sys.stderr
+                )
+
+        cassette.metadata = {
+            "device_name": device_name,
+            # the structure of the credentials, which are replayed with placeholders
+            "auth_creds": {
+                key: FILTERED if SECRET_PATTERN.search(key) else value
+                for key, value in auth_creds.items()
+            },
+            "data_types": recorded,
+        }
+
+    return path
+
+
+def replay(path, repeat):
+    """Replays a cassette, timing the authentication and each data type.
+
+    :param path: the path of the cassette
+    :type path: str or Path
+    :param repeat: the number of times to get each data type
+    :type repeat: int
+    :return: the times in seconds of each step
+    :rtype: Dict
+    """
+    times = dict()
+
+    with use_cassette(path) as cassette:
+        metadata = cassette.metadata
+        device = wearipedia.get_device(metadata["device_name"])
+
+        start = time.perf_counter()
+        device.authenticate(metadata["auth_creds"])
+        times["authenticate"] = [time.perf_counter() - start]
+
+        for data_type in metadata["data_types"]:
+            times[data_type] = []
+
+            for _ in range(repeat):
+                start = time.perf_counter()
+                device.get_data(data_type)
+                times[data_type].append(time.perf_counter() - start)
+
+    return times
+
+
+def run(cassette_dir, repeat):
+    results = dict()
+
+    for path in sorted(Path(cassette_dir).glob("*.json*")):
+        try:
+            times = replay(path, repeat)
+        except Exception as e:
+            print(f"{path.name}: {e!r}", file=sys.stderr)
+            continue
+
+        for step, step_times in times.items():
+            name = f"{path.name.split('.')[0]} {step}"
+            results[name] = statistics.median(step_times)
+            print(
+                f"{name:<50} median {statistics.median(step_times) * 1000:8.1f} ms, "
+                f"min {min(step_times) * 1000:8.1f} ms"
+            )
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = subparsers.add_parser("record")
+    record_parser.add_argument("device_name")
+    record_parser.add_argument("--creds", required=True, help="a JSON credentials file")
+    record_parser.add_argument("--data_types", nargs="+")
+    record_parser.add_argument("--cassettes", default=CASSETTE_DIR)
+
+    run_parser = subparsers.add_parser("run")
+    run_parser.add_argument("--repeat", type=int, default=5)
+    run_parser.add_argument("--cassettes", default=CASSETTE_DIR)
+    run_parser.add_argument("--json", help="a file to save the median times to")
+
+    args = parser.parse_args()
+
+    if args.command == "record":
+        with open(args.creds) as f:
+            auth_creds = json.load(f)
+
+        print(record(args.device_name, auth_creds, args.data_types, args.cassettes))
+    else:
+        results = run(args.cassettes, args.repeat)
+
+        if args.json:
+            with open(args.json, "w") as f:
+                json.dump(results, f, indent=4)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,296 @@
+"""
+synthetic.py
+====================================
+Benchmarks the generation of synthetic data by every device over date ranges of
+increasing length (7, 90, 365 and 1825 days by default), to make the scaling of the
+generators visible and to catch regressions.
+
+Each device and span is run in a fresh interpreter, which gets every data type twice:
+the first pass generates the synthetic data (``generate``), the second one only filters
+it (``get_data``). Both are timed, together with the time spent in the generators
+themselves (``gen_synthetic``, see `wearipedia.instrumentation`), the peak RSS of the
+interpreter, and the number of records and approximate size of the data.
+
+The results can be saved as a baseline, and later runs compared against it, in which
+case the script fails if any metric grew by more than the tolerance. Baselines are
+machine-specific, so compare runs on the same machine (e.g. the same CI runner): the
+machine and Python version a baseline was saved on are kept under its "_machine" key.
+The comparison is skipped, with a message, if the baseline file does not exist.
+
+Usage:
+``python benchmarks/synthetic.py [--spans 7 90 ...] [--devices whoop/whoop_4 ...]
+[--save BASELINE] [--baseline BASELINE] [--tolerance 0.25] [--json OUT]``
+"""
+
+import argparse
+import inspect
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import wearipedia
+from wearipedia.instrumentation import (
+    approximate_size,
+    count_records,
+    disable_instrumentation,
+    enable_instrumentation,
+)
+
+SPANS = [7, 90, 365, 1825]
+
+# the last day of every range, so that results do not depend on the current date
+END_DATE = date(2023, 12, 31)
+
+BASELINE = Path(__file__).parent / "synthetic_baseline.json"
+
+# the metrics compared against the baseline
+METRICS = ["generate", "get_data", "peak_rss", "memory"]
+
+# the date params of the devices, in order of preference
+DATE_PARAMS = [
+    ("synthetic_start_date", "synthetic_end_date"),
+    ("start_date", "end_date"),
+]
+
+
+def date_kwargs(device_name, span):
+    """Returns the init params of a device generating `span` days of synthetic data.
+
+    :param device_name: the name of the device
+    :type device_name: str
+    :param span: the number of days, or None for the default range of the device
+    :type span: int
+    :return: the init params, or None if the range of the device cannot be set
+    :rtype: Dict
+    """
+    if span is None:
+        return dict()
+
+    params = inspect.signature(type(wearipedia.get_device(device_name))).parameters
+    start_date = END_DATE - timedelta(days=span - 1)
+
+    for start_param, end_param in DATE_PARAMS:
+        if start_param in params and end_param in params:
+            return {
+                start_param: start_date.isoformat(),
+                end_param: END_DATE.isoformat(),
+            }
+        elif start_param in params:
+            # e.g. Body+, whose synthetic data starts at a date and ends today
+            return {start_param: start_date.isoformat()}
+
+    return None
+
+
+def machine():
+    """Returns a description of the machine and Python version running the benchmark.
+
+    :return: the platform, processor, number of CPUs and Python version
+    :rtype: Dict
+    """
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpus": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+
+def peak_rss():
+    # in bytes, ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def measure(device_name, span):
+    """Generates and gets every data type of a device, in the current interpreter.
+
+    :param device_name: the name of the device
+    :type device_name: str
+    :param span: the number of days, or None for the default range of the device
+    :type span: int
+    :return: the metrics
+    :rtype: Dict
+    """
+    device = wearipedia.get_device(device_name, **date_kwargs(device_name, span))
+    metrics = enable_instrumentation()
+    records, memory = 0, 0
+
+    start = time.perf_counter()
+
+    for data_type in device.valid_data_types:
+        data = device.get_data(data_type)
+        records += count_records(data) or 0
+        memory += approximate_size(data)
+
+    generate = time.perf_counter() - start
+
+    start = time.perf_counter()
+
+    for data_type in device.valid_data_types:
+        device.get_data(data_type)
+
+    get_data = time.perf_counter() - start
+
+    gen_synthetic = sum(
+        row["total_duration"]
+        for row in metrics.summary()
+        if row["phase"] == "gen_synthetic"
+    )
+    disable_instrumentation()
+
+    return {
+        "generate": generate,
+        "gen_synthetic": gen_synthetic,
+        "get_data": get_data,
+        "peak_rss": peak_rss(),
+        "records": records,
+        "memory": memory,
+    }
+
+
+def run(device_name, span, timeout):
+    """Measures a device and span in a fresh interpreter (so that the peak RSS is that
+    of this device and span alone).
+
+    :param device_name: the name of the device
+    :type device_name: str
+    :param span: the number of days, or None for the default range of the device
+    :type span: int
+    :param timeout: the number of seconds after which the run is stopped
+    :type timeout: float
+    :return: the metrics, or a dictionary with the error
+    :rtype: Dict
+    """
+    # the on-disk synthetic data cache would turn the generation into a load
+    env = {
+        key: value for key, value in os.environ.items() if key != "WEARIPEDIA_CACHE_DIR"
+    }
+    args = [sys.executable, __file__, "--measure", device_name, str(span or "")]
+
+    try:
+        process = subprocess.run(
+            args, capture_output=True, text=True, timeout=timeout, env=env
+        )
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout} s"}
+
+    if process.returncode != 0:
+        # e.g. killed when out of memory, without any output
+        lines = process.stderr.strip().splitlines()
+
+        return {"error": lines[-1] if lines else f"exited with {process.returncode}"}
+
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """Returns the regressions of the results compared to a baseline.
+
+    :param results: the results, a dictionary of "device_name span" to metrics
+    :type results: Dict
+    :param baseline: the baseline, in the same format
+    :type baseline: Dict
+    :param tolerance: the relative increase of a metric above which it is a regression
+    :type tolerance: float
+    :return: the descriptions of the regressions
+    :rtype: List
+    """
+    regressions = []
+
+    for name, metrics in results.items():
+        baseline_metrics = baseline.get(name)
+
+        if baseline_metrics is None or "error" in baseline_metrics:
+            continue
+        elif "error" in metrics:
+            regressions.append(f"{name}: {metrics['error']}")
+            continue
+
+        for metric in METRICS:
+            old, new = baseline_metrics.get(metric), metrics[metric]
+
+            if old and new > old * (1 + tolerance):
+                regressions.append(f"{name} {metric}: {old:.4g} -> {new:.4g}")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--devices", nargs="+", help="defaults to all devices")
+    parser.add_argument("--spans", nargs="+", type=int, default=SPANS)
+    parser.add_argument("--timeout", type=float, default=600)
+    parser.add_argument("--save", help="a file to save the results to as a baseline")
+    parser.add_argument("--baseline", help=f"a baseline to compare to, e.g. {BASELINE}")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--json", help="a file to save the results to")
+    # run a single device and span, in the interpreter started by `run`
+    parser.add_argument("--measure", nargs=2, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.measure:
+        device_name, span = args.measure
+        print(json.dumps(measure(device_name, int(span) if span else None)))
+        return
+
+    results = dict()
+
+    for device_name in args.devices or wearipedia.get_all_device_names():
+        # devices whose range cannot be set are measured once, over their default range
+        spans = args.spans if date_kwargs(device_name, 1) else [None]
+
+        for span in spans:
+            name = f"{device_name} {span or 'default'}"
+            results[name] = metrics = run(device_name, span, args.timeout)
+
+            if "error" in metrics:
+                print(f"{name:<40} {metrics['error']}", file=sys.stderr)
+            else:
+                print(
+                    f"{name:<40} generate {metrics['generate'] * 1000:9.1f} ms, "
+                    f"get_data {metrics['get_data'] * 1000:8.1f} ms, "
+                    f"peak RSS {metrics['peak_rss'] / 2**20:7.1f} MiB, "
+                    f"{metrics['records']:8d} records, "
+                    f"{metrics['memory'] / 2**20:7.1f} MiB"
+                )
+
+    for path in [args.json, args.save]:
+        if path:
+            with open(path, "w") as f:
+                json.dump({"_machine": machine(), **results}, f, indent=4)
+
+    if args.baseline and not Path(args.baseline).exists():
+        print(
+            f"no baseline at {args.baseline}, not comparing (save one with --save)",
+            file=sys.stderr,
+        )
+    elif args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+        if baseline.get("_machine") != machine():
+            print(
+                f"the baseline was saved on another machine: {baseline.get('_machine')}",
+                file=sys.stderr,
+            )
+
+        regressions = compare(results, baseline, args.tolerance)
+
+        for regression in regressions:
+            print(f"regression: {regression}", file=sys.stderr)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
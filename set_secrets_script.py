@@ -1,8 +1,23 @@
 import json
 import os
+import re
 
-d = json.load(open("/tmp/refresh_tokens.json"))
+# the tokens of the CI, see wearipedia/tokens.py
+TOKEN_STORE = "/tmp/refresh_tokens.json"
 
-for k, v in d.items():
-    cmd = f'gh secret set {k} --body "{v}"'
-    os.system(cmd)
+# only the tokens named like the secrets they come from, e.g. WITHINGS_REFRESH_TOKEN, are
+# pushed back, and not the tokens of each user kept under "_users" (or the other keys
+# starting with "_")
+SECRET_NAME = re.compile(r"[A-Z0-9]+_(REFRESH|ACCESS)_TOKEN")
+
+
+def get_secrets(tokens):
+    return {name: token for name, token in tokens.items() if SECRET_NAME.fullmatch(name)}
+
+
+if __name__ == "__main__":
+    d = json.load(open(TOKEN_STORE))
+
+    for k, v in get_secrets(d).items():
+        cmd = f'gh secret set {k} --body "{v}"'
+        os.system(cmd)
@@ -0,0 +1,132 @@
+import asyncio
+import threading
+import time
+import unittest.mock as mock
+
+import wearipedia
+from wearipedia.devices.fitbit import fitbit_sense_fetch
+from wearipedia.devices.fitbit.fitbit_sense_fetch import (
+    afetch_real_data,
+    fetch_real_data,
+)
+
+
+class FakeAPI:
+    # answers every request with the dates of its URL, from several threads at once
+    def __init__(self):
+        self.urls = []
+        self.active = 0
+        self.max_active = 0
+        self.lock = threading.Lock()
+
+    def response(self, url):
+        # e.g. ["2022-05-01", "2022-05-30"] for ".../date/2022-05-01/2022-05-30/all.json"
+        dates = [part for part in url.split("/") if part.count("-") == 2]
+
+        if "/spo2/" in url:
+            return [{"dateTime": date} for date in dates]
+
+        return {"hrv": [{"dateTime": date} for date in dates], "dates": dates}
+
+    def call_API(self, access_token, url, call="GET", session=None):
+        with self.lock:
+            self.urls.append(url)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+
+        time.sleep(0.01)
+
+        with self.lock:
+            self.active -= 1
+
+        return self.response(url)
+
+
+def test_fetch_days():
+    api = FakeAPI()
+
+    with mock.patch.object(fitbit_sense_fetch, "call_API", api.call_API):
+        days = fetch_real_data(
+            "intraday_heart_rate", "token", "2022-05-01", "2022-05-10", max_workers=4
+        )
+
+    # one request per day, concurrently, and the responses in time order
+    assert len(api.urls) == 10
+    assert api.max_active > 1
+    assert [day["dates"] for day in days] == [
+        [f"2022-05-{day:02d}"] for day in range(1, 11)
+    ]
+
+
+def test_fetch_windows():
+    api = FakeAPI()
+
+    with mock.patch.object(fitbit_sense_fetch, "call_API", api.call_API):
+        (hrv,) = fetch_real_data("intraday_hrv", "token", "2022-05-01", "2022-07-14")
+        (spo2,) = fetch_real_data("intraday_spo2", "token", "2022-05-01", "2022-07-14")
+
+    # windows of at most 30 days, merged into one response
+    assert sorted(api.urls)[:3] == [
+        "https://api.fitbit.com/1/user/-/hrv/date/2022-05-01/2022-05-30/all.json",
+        "https://api.fitbit.com/1/user/-/hrv/date/2022-05-31/2022-06-29/all.json",
+        "https://api.fitbit.com/1/user/-/hrv/date/2022-06-30/2022-07-14/all.json",
+    ]
+    assert [point["dateTime"] for point in hrv["hrv"]] == [
+        "2022-05-01",
+        "2022-05-30",
+        "2022-05-31",
+        "2022-06-29",
+        "2022-06-30",
+        "2022-07-14",
+    ]
+    assert [point["dateTime"] for point in spo2] == [
+        point["dateTime"] for point in hrv["hrv"]
+    ]
+
+
+def test_fetch_range():
+    api = FakeAPI()
+
+    with mock.patch.object(fitbit_sense_fetch, "call_API", api.call_API):
+        steps = fetch_real_data("steps", "token", "2022-01-01", "2022-12-31")
+
+    assert len(steps) == 1
+    assert api.urls == [
+        "https://api.fitbit.com/1/user/-/activities/steps/date/2022-01-01/2022-12-31.json"
+    ]
+
+
+def test_get_real_uses_params():
+    api = FakeAPI()
+    device = wearipedia.get_device("fitbit/fitbit_sense")
+    device.user = "token"
+
+    with mock.patch.object(fitbit_sense_fetch, "call_API", api.call_API):
+        days = device._get_real(
+            "distance_day", {"start_date": "2022-05-01", "end_date": "2022-05-03"}
+        )
+
+    assert [day["dates"] for day in days] == [
+        ["2022-05-01"],
+        ["2022-05-02"],
+        ["2022-05-03"],
+    ]
+
+
+def test_afetch_days():
+    api = FakeAPI()
+
+    class FakeClient:
+        async def get(self, url, headers):
+            await asyncio.sleep(0.01)
+            return mock.Mock(json=lambda: api.call_API(None, url))
+
+    days = asyncio.run(
+        afetch_real_data(
+            FakeClient(), "intraday_activity", "token", "2022-05-01", "2022-05-05"
+        )
+    )
+
+    assert [day["dates"] for day in days] == [
+        [f"2022-05-{day:02d}"] for day in range(1, 6)
+    ]
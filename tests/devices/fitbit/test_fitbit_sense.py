@@ -1,9 +1,13 @@
+import json
+import tracemalloc
 from datetime import datetime, timedelta
 
+import numpy as np
 import pytest
 from dateutil import parser
 
 import wearipedia
+from wearipedia.devices.fitbit import fitbit_device
 
 
 @pytest.mark.parametrize("real", [True, False])
@@ -136,3 +140,281 @@ def helper_test(device, start_synthetic, end_synthetic, real):
         sum(distance_arr) / len(distance_arr) < 30
     ), f"Average distance should be less than 30 but was {sum(distance_arr) / len(distance_arr)}"
     assert len(distance_arr) >= 1, "Number of distance data points should be at least 1"
+
+
+def test_fitbit_sense_lazy_synthetic():
+    device = wearipedia.get_device("fitbit/fitbit_sense")
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-03"}
+
+    steps = device.get_data("steps", params=params)
+
+    # only the activity data types are generated, not the heavy intraday ones
+    assert device.synthetic_has_been_generated
+    assert not hasattr(device, "intraday_heart_rate")
+    assert not hasattr(device, "sleep")
+
+    assert device.get_data("steps", params=params) == steps
+
+    azm = device.get_data("intraday_active_zone_minute", params=params)
+    assert len(azm) >= 1
+    assert hasattr(device, "intraday_heart_rate")
+
+    # the data does not depend on the order in which data types are requested
+    other_device = wearipedia.get_device("fitbit/fitbit_sense")
+    other_device.get_data("sleep", params=params)
+    assert other_device.get_data("steps", params=params) == steps
+
+
+def test_fitbit_sense_windowed_synthetic():
+    device = wearipedia.get_device(
+        "fitbit/fitbit_sense",
+        synthetic_start_date="2022-05-01",
+        synthetic_end_date="2022-05-10",
+    )
+
+    sleep = device.get_data(
+        "sleep", params={"start_date": "2022-05-04", "end_date": "2022-05-05"}
+    )
+
+    # only the requested days are generated
+    assert len(sleep) == 2
+    assert len(device._synthetic_days["sleep"]) == 2
+
+    # and they are the same as when generating the full span
+    full_device = wearipedia.get_device(
+        "fitbit/fitbit_sense",
+        synthetic_start_date="2022-05-01",
+        synthetic_end_date="2022-05-10",
+    )
+    full_sleep = full_device.get_data(
+        "sleep", params={"start_date": "2022-05-01", "end_date": "2022-05-10"}
+    )
+
+    assert len(full_sleep) == 10
+    assert full_sleep[3:5] == sleep
+
+
+def test_fitbit_sense_heart_rate_json():
+    device = wearipedia.get_device("fitbit/fitbit_sense")
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-01"}
+
+    for data_type in ["intraday_heart_rate", "heart_rate_day"]:
+        data = device.get_data(data_type, params=params)
+        dataset = data[0]["heart_rate_day"][0]["activities-heart-intraday"]["dataset"]
+
+        # by default, the datasets are lists of dictionaries, like those of the API
+        assert type(dataset) is list
+        assert json.loads(json.dumps(data)) == data
+
+
+def test_fitbit_sense_columnar_heart_rate():
+    device = wearipedia.get_device("fitbit/fitbit_sense", columnar=True)
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-01"}
+
+    day = device.get_data("intraday_heart_rate", params=params)[0]
+    dataset = day["heart_rate_day"][0]["activities-heart-intraday"]["dataset"]
+
+    # stored as arrays, one sample per second
+    assert dataset.times.dtype == "datetime64[s]"
+    assert dataset.values.dtype == "uint8"
+    assert len(dataset) == 86400
+
+    # and rendered in the format of the Fitbit API on access
+    assert dataset[3661] == {"time": "01:01:01", "value": int(dataset.values[3661])}
+    assert dataset[:2] == dataset.tolist()[:2]
+    assert list(dataset) == dataset.tolist()
+    assert dataset == dataset.tolist()
+
+
+def test_fitbit_sense_azm_json():
+    device = wearipedia.get_device("fitbit/fitbit_sense")
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-02"}
+
+    data = device.get_data("intraday_active_zone_minute", params=params)
+
+    for day in data:
+        minutes = day["activities-active-zone-minutes-intraday"][0]["minutes"]
+
+        assert type(minutes) is list
+        assert len(minutes) == 1440
+
+    assert json.loads(json.dumps(data)) == data
+
+
+def test_fitbit_sense_columnar_azm():
+    device = wearipedia.get_device("fitbit/fitbit_sense", columnar=True)
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-01"}
+
+    hr = device.get_data("intraday_heart_rate", params=params)[0]
+    azm = device.get_data("intraday_active_zone_minute", params=params)[0]
+    minutes = azm["activities-active-zone-minutes-intraday"][0]["minutes"]
+
+    assert len(minutes) == 1440
+    assert minutes.times[1] - minutes.times[0] == np.timedelta64(60, "s")
+
+    # the zone of each minute is that of its mean heart rate
+    hr_values = hr["heart_rate_day"][0]["activities-heart-intraday"]["dataset"].values
+    mean_hr = hr_values.reshape(1440, 60).mean(axis=1)
+
+    assert (minutes.active_zone_minutes == (mean_hr > 87)).all()
+    assert ((minutes.zones == 3) == (mean_hr > 111)).all()
+
+    for minute, zone in zip(minutes, minutes.zones):
+        assert minute["value"]["activeZoneMinutes"] == int(zone > 0)
+
+    assert minutes[-1]["minute"] == "23:59:00"
+
+
+def test_fitbit_shared_synthetic():
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-01"}
+
+    sense = wearipedia.get_device("fitbit/fitbit_sense", columnar=True)
+    charge = wearipedia.get_device(
+        "fitbit/fitbit_charge_4",
+        synthetic_start_date="2022-05-01",
+        synthetic_end_date="2022-05-03",
+        columnar=True,
+    )
+
+    # the models generate the same days once, and share them
+    hr = sense.get_data("intraday_heart_rate", params=params)[0]
+    charge_hr = charge.get_data("intraday_heart_rate", params=params)[0]
+    dataset = hr["heart_rate_day"][0]["activities-heart-intraday"]["dataset"]
+
+    assert charge_hr == hr
+    assert (
+        charge_hr["heart_rate_day"][0]["activities-heart-intraday"]["dataset"]
+        is dataset
+    )
+    assert sense.get_data("steps", params=params) == charge.get_data(
+        "steps", params=params
+    )
+
+    # which are consistent with each other: the per minute heart rate is the mean of the
+    # per second one, and SpO2 is measured during the sleep of the night
+    hr_values = hr["heart_rate_day"][0]["activities-heart-intraday"]["dataset"].values
+    hr_day = sense.get_data("heart_rate_day", params=params)[0]
+    minute_values = hr_day["heart_rate_day"][0]["activities-heart-intraday"]["dataset"]
+
+    assert (
+        minute_values.values == np.rint(hr_values.reshape(1440, 60).mean(axis=1))
+    ).all()
+
+    sleep = sense.get_data("sleep", params=params)[0]
+    spo2 = sense.get_data("intraday_spo2", params=params)[0]
+
+    assert spo2["minutes"][0]["minute"] == sleep["startTime"]
+
+
+def test_fitbit_shared_synthetic_copies():
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-01"}
+
+    sense = wearipedia.get_device("fitbit/fitbit_sense")
+    charge = wearipedia.get_device(
+        "fitbit/fitbit_charge_4",
+        synthetic_start_date="2022-05-01",
+        synthetic_end_date="2022-05-03",
+    )
+
+    sleep = charge.get_data("sleep", params=params)
+    hr = charge.get_data("intraday_heart_rate", params=params)
+
+    # modifying the data returned by a device does not affect the other devices
+    modified = sense.get_data("sleep", params=params)
+    modified[0]["levels"]["data"].clear()
+    modified[0]["dateOfSleep"] = None
+    sense.get_data("intraday_heart_rate", params=params)[0]["heart_rate_day"].clear()
+
+    assert sense.get_data("sleep", params=params) == sleep
+    assert charge.get_data("sleep", params=params) == sleep
+    assert charge.get_data("intraday_heart_rate", params=params) == hr
+
+    # and the shared columnar datasets are read-only
+    columnar = wearipedia.get_device("fitbit/fitbit_sense", columnar=True)
+    day = columnar.get_data("intraday_heart_rate", params=params)[0]
+    dataset = day["heart_rate_day"][0]["activities-heart-intraday"]["dataset"]
+
+    with pytest.raises(ValueError):
+        dataset.values[0] = 0
+
+
+def test_fitbit_shared_synthetic_size(monkeypatch):
+    fitbit_device.clear_shared_cache()
+    monkeypatch.setattr(fitbit_device, "SHARED_CACHE_BYTES", 4 * 1024 * 1024)
+
+    device = wearipedia.get_device(
+        "fitbit/fitbit_sense",
+        synthetic_start_date="2022-01-01",
+        synthetic_end_date="2022-01-31",
+    )
+    params = {"start_date": "2022-01-01", "end_date": "2022-01-31"}
+
+    # the cheap days of a long date range all fit in the shared cache
+    assert len(device.get_data("steps", params=params)) == 31
+    assert len(fitbit_device._shared_days) == 2 * 31
+
+    # but the days of per second heart rate are evicted to stay within its size
+    device.get_data("intraday_heart_rate", params=params)
+
+    assert fitbit_device._shared_days_bytes <= fitbit_device.SHARED_CACHE_BYTES
+    assert len(fitbit_device._shared_days) < 4 * 31
+
+    fitbit_device.clear_shared_cache()
+
+
+def test_fitbit_iter_data_memory():
+    fitbit_device.clear_shared_cache()
+
+    device = wearipedia.get_device(
+        "fitbit/fitbit_sense",
+        synthetic_start_date="2022-01-01",
+        synthetic_end_date="2022-01-20",
+    )
+    params = {"start_date": "2022-01-01", "end_date": "2022-01-20"}
+
+    tracemalloc.start()
+
+    try:
+        memory = []
+
+        for chunk in device.iter_data("intraday_heart_rate", params=params):
+            del chunk
+            memory.append(tracemalloc.get_traced_memory()[0])
+    finally:
+        tracemalloc.stop()
+
+    # the memory held between chunks does not grow with the days iterated over (each
+    # day of per second heart rate takes about 780 KB)
+    assert len(memory) == 20
+    assert max(memory[2:]) - memory[1] < 2 * 1024 * 1024
+    assert not fitbit_device._shared_days
+
+
+def test_fitbit_sense_sleep_stages():
+    device = wearipedia.get_device("fitbit/fitbit_sense")
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-03"}
+
+    for sleep in device.get_data("sleep", params=params):
+        levels = sleep["levels"]
+        stages = levels["data"][1:-1]
+
+        # the stages cover the time asleep, one after the other
+        assert sum(stage["seconds"] for stage in stages) / 60 == pytest.approx(
+            sleep["minutesAsleep"], abs=1
+        )
+
+        for stage, next_stage in zip(stages, stages[1:]):
+            assert parser.parse(next_stage["dateTime"]) - parser.parse(
+                stage["dateTime"]
+            ) == timedelta(seconds=stage["seconds"])
+
+        # and the summary counts them
+        for name in ["deep", "light", "rem"]:
+            of_stage = [stage for stage in stages if stage["level"] == name]
+
+            assert levels["summary"][name]["count"] == len(of_stage)
+            assert levels["summary"][name]["minutes"] == sum(
+                round(stage["seconds"] / 60) for stage in of_stage
+            )
+
+        assert levels["summary"]["wake"]["count"] == 2 + len(levels["shortData"])
@@ -112,3 +112,26 @@ def session_tests(data, start_synthetic, end_synthetic, real):
             assert (
                 40 <= hr <= 200
             ), f"Heart rate should be between 40 and 200, but received {hr}"
+
+
+def test_h10_windowed_synthetic():
+    device = wearipedia.get_device(
+        "polar/h10", start_date="2022-03-01", end_date="2022-06-17"
+    )
+    full_device = wearipedia.get_device(
+        "polar/h10", start_date="2022-03-01", end_date="2022-06-17"
+    )
+
+    params = {"start_date": "2022-04-01", "end_date": "2022-04-10"}
+    sessions = device.get_data("sessions", params=params)
+
+    # only the requested days are generated
+    assert len(device._synthetic_days["rr"]) == 10
+
+    # and they are the same as when generating the full span
+    full_sessions = full_device.get_data("sessions")
+    assert sessions == {
+        key: session
+        for key, session in full_sessions.items()
+        if params["start_date"] <= key <= params["end_date"]
+    }
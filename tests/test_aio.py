@@ -0,0 +1,136 @@
+from types import SimpleNamespace
+
+import asyncio
+import json
+import threading
+import time
+
+import wearipedia
+from wearipedia.aio import AsyncClient
+from wearipedia.devices.garmin.fenix_fetch import afetch_real_data as fenix_afetch
+from wearipedia.devices.oura.oura_ring3_fetch import afetch_real_data as oura_afetch
+from wearipedia.devices.withings.withings_extract import afetch_all_heart_rate
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.text = json.dumps(payload)
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class FakeClient(AsyncClient):
+    # answers requests with handler(method, url, **kwargs) instead of the network
+
+    def __init__(self, handler):
+        super().__init__(max_concurrency=4)
+        self.handler = handler
+        self.requests = []
+
+    async def request(self, method, url, **kwargs):
+        self.requests.append((method, url, kwargs))
+        return FakeResponse(self.handler(method, url, **kwargs))
+
+
+def test_aget_data_synthetic():
+    device = wearipedia.get_device("whoop/whoop_4")
+
+    async def get_all():
+        return await asyncio.gather(
+            *[device.aget_data(data_type) for data_type in device.valid_data_types]
+        )
+
+    results = asyncio.run(get_all())
+
+    for data_type, data in zip(device.valid_data_types, results):
+        assert data.equals(device.get_data(data_type))
+
+
+def test_async_client_max_concurrency():
+    client = AsyncClient(max_concurrency=3)
+    lock = threading.Lock()
+    running = []
+    max_running = []
+
+    def blocking_call(i):
+        with lock:
+            running.append(i)
+            max_running.append(len(running))
+        time.sleep(0.05)
+        with lock:
+            running.remove(i)
+        return i
+
+    async def run_all():
+        return await asyncio.gather(*[client.run(blocking_call, i) for i in range(12)])
+
+    assert asyncio.run(run_all()) == list(range(12))
+    assert max(max_running) == 3
+
+    client.close()
+
+
+def test_afetch_all_heart_rate():
+    def handler(method, url, data, headers):
+        if data["action"] == "getactivity":
+            return {
+                "status": 0,
+                "body": {
+                    "activities": [{"date": "2022-01-01"}, {"date": "2022-01-02"}],
+                    "more": 0,
+                },
+            }
+
+        # two pages of intraday data for each date
+        start = data["startdate"] + data["offset"] * 60
+        return {
+            "status": 0,
+            "body": {
+                "series": {str(start): {"heart_rate": 60 + data["offset"]}},
+                "more": int(data["offset"] == 0),
+                "offset": 1,
+            },
+        }
+
+    client = FakeClient(handler)
+    df = asyncio.run(
+        afetch_all_heart_rate(client, "token", start="2022-01-01", end="2022-01-03")
+    )
+
+    assert len(client.requests) == 5
+    assert len(df) == 4
+    assert df["datetime"].is_monotonic_increasing
+    assert list(df["heart_rate"]) == [60, 61, 60, 61]
+
+
+def test_afetch_oura():
+    def handler(method, url, params, headers=None):
+        return {"sleep": [{"day": params["start"]}]}
+
+    client = FakeClient(handler)
+    sleep = asyncio.run(
+        oura_afetch("sleep", "token", "2022-01-01", "2022-01-02", client)
+    )
+
+    assert sleep == [{"day": "2022-01-01"}]
+    # only the endpoint of the requested data type is called
+    assert len(client.requests) == 1
+
+
+def test_afetch_fenix():
+    calls = []
+
+    def connectapi(url, params=None):
+        calls.append(params["date"])
+        return {"date": params["date"]}
+
+    api = SimpleNamespace(profile={"displayName": "user"}, connectapi=connectapi)
+    client = AsyncClient(max_concurrency=4)
+
+    steps = asyncio.run(fenix_afetch("2022-01-01", "2022-01-04", "steps", api, client))
+
+    assert steps == [{"date": f"2022-01-0{i}"} for i in range(1, 4)]
+    assert sorted(calls) == ["2022-01-01", "2022-01-02", "2022-01-03"]
+
+    client.close()
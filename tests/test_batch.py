@@ -0,0 +1,108 @@
+import time
+
+import wearipedia
+from wearipedia import batch
+from wearipedia.batch import BatchJob
+
+JOBS = [
+    ("whoop/whoop_4", "cycles"),
+    ("whoop/whoop_4", "sleeps"),
+    ("withings/scanwatch", "sleeps"),
+    ("withings/scanwatch", "heart_rates", {"start": "2022-03-05", "end": "2022-03-08"}),
+    ("nutrisense/cgm", "continuous"),
+]
+
+
+def expected_data(job):
+    job = BatchJob(*job)
+    return wearipedia.get_device(job.device_name).get_data(job.data_type, job.params)
+
+
+def test_run_batch_processes():
+    results = wearipedia.run_batch(JOBS, max_processes=2)
+
+    assert [result.index for result in results] == list(range(len(JOBS)))
+
+    for job, result in zip(JOBS, results):
+        assert result.error is None
+        assert repr(result.data) == repr(expected_data(job))
+
+
+def test_iter_batch_threads_with_vendor_cap():
+    results = list(
+        wearipedia.iter_batch(JOBS, use_processes=False, max_per_vendor={"whoop": 1})
+    )
+
+    assert sorted(result.index for result in results) == list(range(len(JOBS)))
+
+    for result in results:
+        assert repr(result.data) == repr(expected_data(JOBS[result.index]))
+
+
+def test_run_batch_errors():
+    jobs = [("whoop/whoop_4", "cycles"), ("whoop/whoop_4", "not_a_data_type")]
+
+    results = wearipedia.run_batch(jobs, raise_errors=False, use_processes=False)
+
+    assert results[0].error is None
+    assert isinstance(results[1].error, ValueError)
+
+
+def test_iter_batch_bounds_in_flight_jobs(monkeypatch):
+    submitted = []
+
+    class ThreadPoolExecutor(batch.ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args)
+            return super().submit(fn, *args, **kwargs)
+
+    monkeypatch.setattr(batch, "ThreadPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(
+        batch, "_get_synthetic_data", lambda device_name, *args: args[1]
+    )
+    jobs = [("whoop/whoop_4", str(i)) for i in range(100)]
+
+    results = wearipedia.iter_batch(jobs, use_processes=False, max_threads=2)
+    first = next(results)
+
+    # jobs are only submitted as workers become free (a single synthetic worker, and
+    # two threads)
+    assert len(submitted) <= 3
+
+    data = [first.data] + [result.data for result in results]
+    assert sorted(data) == sorted(str(i) for i in range(100))
+
+
+def test_iter_batch_ordered(monkeypatch):
+    submitted = []
+
+    class ThreadPoolExecutor(batch.ThreadPoolExecutor):
+        def submit(self, fn, *args, **kwargs):
+            submitted.append(args)
+            return super().submit(fn, *args, **kwargs)
+
+    def get_data(self, device_name, data_type, params):
+        # the first job finishes last
+        time.sleep(0.2 if data_type == "0" else 0)
+
+        return data_type
+
+    monkeypatch.setattr(batch, "ThreadPoolExecutor", ThreadPoolExecutor)
+    monkeypatch.setattr(batch._RealDevices, "get_data", get_data)
+    jobs = [("whoop/whoop_4", str(i)) for i in range(50)]
+
+    results = wearipedia.iter_batch(
+        jobs,
+        auth_creds={"whoop/whoop_4": {}},
+        max_threads=4,
+        use_processes=False,
+        ordered=True,
+    )
+    first = next(results)
+
+    # the results of the jobs after the first one wait for it, but only a few jobs are
+    # run ahead of it
+    assert first.index == 0
+    assert len(submitted) <= 5
+
+    assert [result.data for result in results] == [str(i) for i in range(1, 50)]
@@ -0,0 +1,113 @@
+import os
+import unittest.mock as mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import wearipedia
+
+
+@pytest.fixture
+def cache(tmp_path):
+    yield wearipedia.enable_synthetic_cache(tmp_path / "cache")
+    wearipedia.disable_synthetic_cache()
+
+
+def test_cache_loads_instead_of_generating(cache):
+    device = wearipedia.get_device("whoop/whoop_4", seed=3)
+    cycles = device.get_data("cycles")
+
+    assert len(cycles) > 0
+    assert cache.size() > 0
+
+    other_device = wearipedia.get_device("whoop/whoop_4", seed=3)
+    with mock.patch.object(cache, "store", wraps=cache.store) as mock_store:
+        assert other_device.get_data("cycles").equals(cycles)
+        mock_store.assert_not_called()
+
+    # a different seed is a different cache entry
+    seed_device = wearipedia.get_device("whoop/whoop_4", seed=4)
+    assert not seed_device.get_data("cycles").equals(cycles)
+
+
+def test_cache_per_day_and_legacy_devices(cache):
+    for device_name, data_type in [
+        ("fitbit/fitbit_sense", "steps"),
+        ("nutrisense/cgm", "continuous"),
+    ]:
+        data = wearipedia.get_device(device_name).get_data(data_type)
+        cached = wearipedia.get_device(device_name).get_data(data_type)
+
+        assert repr(cached) == repr(data)
+
+
+def test_cache_formats(cache):
+    data = {
+        "array": np.arange(10),
+        "arrays": {"start": np.arange(3), "value": np.ones(3, dtype=np.int16)},
+        "frame": pd.DataFrame({"a": [1, 2]}),
+        "records": [{"a": 1}],
+    }
+
+    cache.store("key", data)
+    loaded = cache.load("key", list(data))
+
+    assert np.array_equal(loaded["array"], data["array"])
+    assert loaded["arrays"]["value"].dtype == np.int16
+    assert loaded["frame"].equals(data["frame"])
+    assert loaded["records"] == data["records"]
+    assert cache.load("missing", list(data)) is None
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = wearipedia.SyntheticCache(tmp_path, max_size=3000)
+
+    for i, key in enumerate(["a", "b", "c"]):
+        cache.store(key, {"data": np.zeros(100 + i)})
+        os.utime(tmp_path / key, (i, i))
+
+    # using "a" makes "b" the least recently used entry
+    cache.load("a", ["data"])
+    cache.store("d", {"data": np.random.rand(300)})
+
+    assert cache.load("b", ["data"]) is None
+    assert cache.load("a", ["data"]) is not None
+    assert cache.size() <= 3000
+
+
+def test_cache_stores_window_of_days(cache):
+    params = {"start_date": "2022-05-01", "end_date": "2022-05-20"}
+
+    device = wearipedia.get_device(
+        "fitbit/fitbit_sense",
+        synthetic_start_date="2022-05-01",
+        synthetic_end_date="2022-05-31",
+    )
+    steps = device.get_data("steps", params=params)
+
+    # the requested window of days is a single entry
+    assert len(list(cache.cache_dir.iterdir())) == 1
+
+    # which does not depend on the synthetic date range of the device
+    other_device = wearipedia.get_device(
+        "fitbit/fitbit_sense",
+        synthetic_start_date="2022-04-01",
+        synthetic_end_date="2022-06-30",
+    )
+    with mock.patch.object(cache, "store", wraps=cache.store) as mock_store:
+        assert other_device.get_data("steps", params=params) == steps
+        mock_store.assert_not_called()
+
+
+def test_cache_store_does_not_scan(tmp_path):
+    cache = wearipedia.SyntheticCache(tmp_path, max_size=10**6)
+
+    with mock.patch.object(cache, "_entries", wraps=cache._entries) as mock_entries:
+        for i in range(20):
+            cache.store(str(i), {"data": np.zeros(10)})
+
+        # the size of the cache is only measured once, as long as it is small enough
+        assert mock_entries.call_count == 1
+
+    assert cache.size() == cache._size
@@ -0,0 +1,115 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+import wearipedia
+from wearipedia.cassette import CassetteError
+from wearipedia.devices.whoop.whoop_extract import fetch_collection
+from wearipedia.sessions import create_session
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    # answers with the path of the request and a (secret) token
+    def respond(self):
+        body = json.dumps({"path": self.path, "access_token": "s3cr3t"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.respond()
+
+    def log_message(self, *args):
+        pass
+
+
+def test_record_and_replay(tmp_path):
+    server = HTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    path = tmp_path / "cassette.json.gz"
+
+    try:
+        with wearipedia.use_cassette(path, mode="record") as cassette:
+            recorded = [
+                create_session().get(f"{url}/a?date=2022-01-01&b=1").json(),
+                requests.post(f"{url}/token", data={"password": "hunter2"}).json(),
+            ]
+            cassette.metadata["device_name"] = "test"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # credentials are not saved
+    with gzip.open(path, "rt") as f:
+        saved = f.read()
+
+    assert "s3cr3t" not in saved and "hunter2" not in saved
+
+    # the server is down, so these are replayed, with any credentials
+    with wearipedia.use_cassette(path) as cassette:
+        assert cassette.metadata == {"device_name": "test"}
+        assert create_session().get(f"{url}/a?b=1&date=2022-01-01").json() == {
+            **recorded[0],
+            "access_token": "FILTERED",
+        }
+        assert requests.post(f"{url}/token", data={"password": "1234"}).json()[
+            "path"
+        ] == ("/token")
+
+        with pytest.raises(CassetteError):
+            requests.get(f"{url}/b")
+
+    assert wearipedia.get_cassette() is None
+
+
+def page(records, next_token):
+    return {
+        "status": 200,
+        "reason": "OK",
+        "headers": {"Content-Type": "application/json"},
+        "encoding": "utf-8",
+        "body": json.dumps({"records": records, "next_token": next_token}),
+    }
+
+
+def test_replay_fetch_collection(tmp_path):
+    # the pages of a collection, whose (pagination) tokens are filtered
+    url = "https://api.prod.whoop.com/developer/v1/cycle?limit=20"
+    cassette = {
+        "version": 1,
+        "metadata": {},
+        "interactions": [
+            {
+                "request": {"method": "GET", "url": url, "body": None},
+                "response": page([{"id": 1}, {"id": 2}], "FILTERED"),
+            },
+            {
+                "request": {
+                    "method": "GET",
+                    "url": url + "&nextToken=FILTERED",
+                    "body": None,
+                },
+                "response": page([{"id": 3}], None),
+            },
+        ],
+    }
+
+    path = tmp_path / "whoop.json"
+    path.write_text(json.dumps(cassette))
+
+    with wearipedia.use_cassette(path):
+        df = fetch_collection("Cycle", "token")
+
+    assert df["id"].tolist() == [1, 2, 3]
@@ -0,0 +1,135 @@
+import csv
+import json
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import wearipedia
+from wearipedia.cl_parser import parse_CLI
+from wearipedia.export import to_records
+
+
+def test_to_records():
+    df = pd.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+
+    assert list(to_records(df)) == [{"a": 1, "b": "x"}, {"a": 2, "b": "y"}]
+    assert list(to_records([{"a": 1}, 2])) == [{"a": 1}, {"value": 2}]
+    assert list(to_records({"2022-03-01": {"a": 1}, "n": 2})) == [
+        {"key": "2022-03-01", "a": 1},
+        {"key": "n", "value": 2},
+    ]
+    assert len(list(to_records(np.zeros((3, 2))))) == 3
+
+
+def test_export_batch_ndjson(tmp_path):
+    jobs = [("whoop/whoop_4", "cycles"), ("withings/scanwatch", "sleeps")]
+    results = wearipedia.iter_batch(jobs, use_processes=False)
+
+    counts = wearipedia.export_batch(results, tmp_path / "out.ndjson")
+
+    records = [json.loads(line) for line in open(tmp_path / "out.ndjson")]
+
+    for device_name, data_type in jobs:
+        data = wearipedia.get_device(device_name).get_data(data_type)
+        assert counts[(device_name, data_type)] == len(data)
+        assert len(
+            [record for record in records if record["data_type"] == data_type]
+        ) == len(data)
+
+
+def test_export_batch_directory(tmp_path):
+    jobs = [("withings/scanwatch", "sleeps"), ("withings/scanwatch", "heart_rates")]
+    results = wearipedia.iter_batch(jobs, use_processes=False)
+
+    wearipedia.export_batch(results, tmp_path, format="csv")
+
+    with open(tmp_path / "withings_scanwatch_heart_rates.csv") as f:
+        rows = list(csv.DictReader(f))
+
+    heart_rates = wearipedia.get_device("withings/scanwatch").get_data("heart_rates")
+
+    assert len(rows) == len(heart_rates)
+    assert rows[0]["heart_rate"] == str(heart_rates["heart_rate"].iloc[0])
+    assert (tmp_path / "withings_scanwatch_sleeps.csv").exists()
+
+
+def test_cli_batch_chunks(tmp_path, monkeypatch):
+    output = tmp_path / "out.ndjson"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        [
+            "wearipedia",
+            "-e",
+            "withings/scanwatch",
+            "whoop/whoop_4",
+            "-t",
+            "heart_rates",
+            "cycles",
+            "-s",
+            "-c",
+            "7D",
+            "-p",
+            "2",
+            "-o",
+            str(output),
+        ],
+    )
+
+    parse_CLI()
+
+    records = [json.loads(line) for line in open(output)]
+    device = wearipedia.get_device("withings/scanwatch")
+
+    # only the data types of each device are extracted
+    assert {(r["device"], r["data_type"]) for r in records} == {
+        ("withings/scanwatch", "heart_rates"),
+        ("whoop/whoop_4", "cycles"),
+    }
+    assert len([r for r in records if r["data_type"] == "heart_rates"]) == len(
+        device.get_data("heart_rates")
+    )
+
+    # in the order of the jobs, whatever the order in which they finish
+    devices = [r["device"] for r in records]
+    assert devices == sorted(devices, key=lambda device: device != "withings/scanwatch")
+
+
+@pytest.mark.parametrize(
+    "device_name, data_type",
+    [
+        ("whoop/whoop_4", "cycles"),
+        ("fitbit/fitbit_sense", "intraday_heart_rate"),
+        ("fitbit/fitbit_sense", "intraday_active_zone_minute"),
+    ],
+)
+def test_cli_json(tmp_path, monkeypatch, device_name, data_type):
+    output = tmp_path / "out.json"
+    monkeypatch.setattr(
+        sys,
+        "argv",
+        ["wearipedia", "-e", device_name, "-t", data_type, "-s", "-o", str(output)],
+    )
+
+    parse_CLI()
+
+    # DataFrames, timestamps and NumPy values are serialized
+    data = json.load(open(output))
+
+    assert len(data) == len(wearipedia.get_device(device_name).get_data(data_type))
+
+
+def test_export_batch_parquet(tmp_path):
+    pytest.importorskip("pyarrow")
+
+    results = wearipedia.iter_batch(
+        [("withings/scanwatch", "sleeps")], use_processes=False
+    )
+    wearipedia.export_batch(results, tmp_path / "out.parquet")
+
+    df = pd.read_parquet(tmp_path / "out.parquet")
+    assert len(df) == len(
+        wearipedia.get_device("withings/scanwatch").get_data("sleeps")
+    )
@@ -0,0 +1,130 @@
+import threading
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+import wearipedia
+from wearipedia import ratelimit
+from wearipedia.http_cache import CACHE_USER_HEADER, ResponseCache, _last_day
+from wearipedia.sessions import create_session, set_cache_user
+
+
+class CountingHandler(BaseHTTPRequestHandler):
+    # answers every request with the number of requests received so far
+    requests = 0
+    headers_seen = []
+
+    def respond(self):
+        CountingHandler.requests += 1
+        CountingHandler.headers_seen.append(dict(self.headers))
+
+        body = str(CountingHandler.requests).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self.respond()
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.respond()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    # requests to the server are requests to the API of a vendor
+    monkeypatch.setitem(ratelimit.VENDOR_HOSTS, "127.0.0.1", "test")
+    CountingHandler.requests = 0
+    CountingHandler.headers_seen = []
+
+    server = HTTPServer(("127.0.0.1", 0), CountingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    wearipedia.enable_response_cache(tmp_path / "responses.sqlite")
+
+    yield f"http://127.0.0.1:{server.server_port}"
+
+    wearipedia.disable_response_cache()
+    server.shutdown()
+    server.server_close()
+
+
+def test_old_days_are_cached(server):
+    session = create_session()
+    url = f"{server}/activity?date=2020-01-01"
+
+    first = session.get(url)
+    second = session.get(url)
+
+    assert first.text == second.text == "1"
+    assert getattr(second, "from_cache", False)
+    assert CountingHandler.requests == 1
+
+    # the params are normalized, so their order does not matter
+    session.post(f"{server}/sleep", data={"startdate": 1577836800, "enddate": 1})
+    session.post(f"{server}/sleep", data={"enddate": 1, "startdate": 1577836800})
+    assert CountingHandler.requests == 2
+
+
+def test_recent_days_are_refetched(server):
+    session = create_session()
+    url = f"{server}/activity?date={date.today() - timedelta(days=1)}"
+
+    assert session.get(url).text == "1"
+    assert session.get(url).text == "2"
+
+
+def test_cache_is_per_user(server):
+    first, second = create_session(), create_session()
+    set_cache_user(first, {"email": "a@example.com"})
+    set_cache_user(second, {"email": "b@example.com"})
+    url = f"{server}/activity?date=2020-01-01"
+
+    assert first.get(url).text == "1"
+    assert second.get(url).text == "2"
+    assert first.get(url).text == "1"
+
+    # the cache user is never sent to the API
+    assert all(
+        CACHE_USER_HEADER not in headers for headers in CountingHandler.headers_seen
+    )
+
+
+def test_authentication_is_not_cached(server):
+    session = create_session()
+
+    session.post(f"{server}/oauth2/token?date=2020-01-01")
+    session.post(f"{server}/oauth2/token?date=2020-01-01")
+
+    assert CountingHandler.requests == 2
+
+
+def test_eviction(tmp_path):
+    cache = ResponseCache(tmp_path / "responses.sqlite", max_size=3000)
+
+    for i in range(10):
+        cache.store(str(i), "test", "url", 200, {}, bytes(range(256)) * 4 * (i + 1))
+
+    # the least recently used entries are evicted first
+    assert cache.size() <= 3000
+    assert cache.load("0") is None
+    assert cache.load("9")[2] == bytes(range(256)) * 40
+
+    cache.store("expired", "test", "url", 200, {}, b"{}", ttl=-1)
+    assert cache.load("expired") is None
+
+
+def test_last_day():
+    assert _last_day(
+        "https://api/1/user/-/hrv/date/2023-01-01/2023-01-31.json"
+    ) == date(2023, 1, 31)
+    assert _last_day("https://api/v2/sleep", "startdate=1577836800") == date(2020, 1, 1)
+    assert _last_day("https://api/profile") is None
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+
+import wearipedia
+
+
+def run_python(code):
+    # a fresh interpreter, since this one has already imported the devices under test
+    return subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout.split()
+
+
+def test_import_is_lazy():
+    loaded = run_python(
+        "import sys, wearipedia\n"
+        "for name in ['wearipedia.devices.whoop', 'pandas', 'garth', 'myfitnesspal']:\n"
+        "    print(name in sys.modules)"
+    )
+
+    assert loaded == ["False"] * 4
+
+
+def test_device_import_is_lazy():
+    # using one device only imports its own dependencies
+    loaded = run_python(
+        "import sys, wearipedia\n"
+        "wearipedia.get_device('whoop/whoop_4')\n"
+        "for name in ['wearipedia.devices.garmin', 'garth', 'myfitnesspal', 'bs4']:\n"
+        "    print(name in sys.modules)"
+    )
+
+    assert loaded == ["False"] * 4
+
+
+def test_utils_import_is_lazy():
+    # devices whose data are not DataFrames do not import pandas through the utils
+    loaded = run_python(
+        "import sys, wearipedia\n"
+        "wearipedia.get_device('fitbit/fitbit_sense')\n"
+        "print('pandas' in sys.modules)"
+    )
+
+    assert loaded == ["False"]
+
+
+def test_lazy_attributes():
+    from wearipedia.devices.polar import H10
+    from wearipedia.devices.withings.scanwatch import ScanWatch
+
+    assert wearipedia.devices.withings.ScanWatch is ScanWatch
+    assert wearipedia.devices.H10 is H10
+    assert wearipedia.H10 is H10
+    assert wearipedia.get_device_class("polar/h10") is H10
@@ -0,0 +1,81 @@
+import asyncio
+
+import pytest
+
+import wearipedia
+from wearipedia.mockserver import MockServer
+
+
+@pytest.fixture
+def events():
+    events = []
+    wearipedia.add_hook(events.append)
+
+    try:
+        yield events
+    finally:
+        wearipedia.disable_instrumentation()
+
+
+def test_synthetic_phases(events):
+    metrics = wearipedia.enable_instrumentation()
+    device = wearipedia.get_device("whoop/whoop_4")
+
+    cycles = device.get_data("cycles")
+    device.get_data("cycles")
+
+    phases = [event["phase"] for event in events]
+    assert phases == ["gen_synthetic", "filter_synthetic", "get_data"] * 2
+
+    get_data = events[2]
+    assert get_data["device"] == "Whoop4" and get_data["data_type"] == "cycles"
+    assert get_data["records"] == len(cycles)
+    assert get_data["memory"] > 0
+    assert get_data["http_requests"] == 0 and get_data["error"] is None
+
+    summary = {row["phase"]: row for row in metrics.summary()}
+    assert summary["get_data"]["count"] == 2
+    assert summary["gen_synthetic"]["records"] == 0
+    assert summary["filter_synthetic"]["records"] == 2 * len(cycles)
+
+
+def test_real_phases(events):
+    with MockServer(
+        page_size=5, start_date="2022-03-01", end_date="2022-03-15"
+    ) as server:
+        wearipedia.set_api_base_url(server.base_url)
+
+        try:
+            device = wearipedia.get_device(
+                "whoop/whoop_4",
+                synthetic_start_date="2022-03-01",
+                synthetic_end_date="2022-03-15",
+            )
+            device.authenticate({"access_token": "token"})
+
+            device.get_data("cycles")
+            # requests sent from the worker threads of the async client are counted
+            asyncio.run(device.aget_data("sleeps"))
+        finally:
+            wearipedia.set_api_base_url(None)
+
+    get_real = [event for event in events if event["phase"] == "get_real"]
+
+    for event, path in zip(
+        get_real, ["/developer/v1/cycle", "/developer/v1/activity/sleep"]
+    ):
+        assert event["http_requests"] == server.requests[("api.prod.whoop.com", path)]
+        assert event["http_bytes"] > 0
+        assert 0 < event["http_time"] <= event["duration"]
+
+
+def test_errors(events):
+    device = wearipedia.get_device("whoop/whoop_4")
+    device.authenticate({"access_token": "token"})
+    device._get_real = lambda data_type, params: 1 / 0
+
+    with pytest.raises(ZeroDivisionError):
+        device.get_data("cycles")
+
+    assert [event["error"] for event in events] == ["ZeroDivisionError"] * 2
+    assert events[0]["records"] is None
@@ -0,0 +1,92 @@
+import pandas as pd
+import pytest
+
+import wearipedia
+
+
+def test_iter_data_inclusive_end_date():
+    device = wearipedia.get_device(
+        "fitbit/fitbit_sense",
+        synthetic_start_date="2022-05-01",
+        synthetic_end_date="2022-05-10",
+    )
+    params = {"start_date": "2022-05-02", "end_date": "2022-05-08"}
+
+    chunks = list(device.iter_data("sleep", params=params, chunk="3D"))
+
+    assert [len(chunk) for chunk in chunks] == [3, 3, 1]
+    # the generated days are dropped after each chunk
+    assert len(device._synthetic_days["sleep"]) == 0
+
+    full_device = wearipedia.get_device(
+        "fitbit/fitbit_sense",
+        synthetic_start_date="2022-05-01",
+        synthetic_end_date="2022-05-10",
+    )
+    assert sum(chunks, []) == full_device.get_data("sleep", params=params)
+
+
+def test_iter_data_exclusive_end_date():
+    device = wearipedia.get_device("withings/scanwatch")
+    params = {"start": "2022-03-05", "end": "2022-03-19"}
+
+    chunks = list(device.iter_data("heart_rates", params=params, chunk=7))
+
+    assert len(chunks) == 2
+    assert sum(len(chunk) for chunk in chunks) > 0
+    assert pd.concat(chunks).equals(device.get_data("heart_rates", params=params))
+
+
+def test_iter_data_without_date_range():
+    device = wearipedia.get_device("withings/sleepmat")
+
+    chunks = list(device.iter_data("measurements"))
+
+    assert len(chunks) == 1
+
+
+def concat(chunks):
+    # the chunks of iter_data() as a single result of get_data()
+    if isinstance(chunks[0], pd.DataFrame):
+        return pd.concat(chunks)
+    elif isinstance(chunks[0], dict):
+        merged = dict()
+
+        for chunk in chunks:
+            for key, value in chunk.items():
+                if isinstance(value, list) and key in merged:
+                    merged[key] = merged[key] + value
+                else:
+                    assert key not in merged or merged[key] == value
+                    merged[key] = value
+
+        return merged
+
+    return sum(chunks, [])
+
+
+@pytest.mark.parametrize("device_name", wearipedia.get_all_device_names())
+def test_iter_data_equals_get_data(device_name):
+    device = wearipedia.get_device(device_name)
+
+    for data_type in device.valid_data_types:
+        full = device.get_data(data_type)
+        chunks = list(device.iter_data(data_type, chunk="2D"))
+
+        # no record is missing or repeated. Chunks are in time order, which is the
+        # reverse of the order of the records for data sorted by descending time
+        equal = [
+            concat(ordered).equals(full)
+            if isinstance(full, pd.DataFrame)
+            else concat(ordered) == full
+            for ordered in (chunks, chunks[::-1])
+        ]
+
+        assert any(equal), data_type
+
+
+def test_iter_data_invalid_chunk():
+    device = wearipedia.get_device("whoop/whoop_4")
+
+    with pytest.raises(ValueError):
+        next(device.iter_data("cycles", chunk="12h"))
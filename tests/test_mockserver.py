@@ -0,0 +1,102 @@
+import pytest
+
+import wearipedia
+from wearipedia.mockserver import MockServer
+from wearipedia.sessions import get_api_base_url
+
+START_DATE, END_DATE = "2022-03-01", "2022-03-15"
+
+
+@pytest.fixture
+def server():
+    # small pages, so that every collection takes several requests
+    with MockServer(page_size=5, start_date=START_DATE, end_date=END_DATE) as server:
+        wearipedia.set_api_base_url(server.base_url)
+
+        try:
+            yield server
+        finally:
+            wearipedia.set_api_base_url(None)
+
+
+def get_devices(device_name, **kwargs):
+    # a device fetching from the server, and the same device generating synthetic data
+    real = wearipedia.get_device(device_name, synthetic_start_date=START_DATE, **kwargs)
+    real.authenticate({"access_token": "token"})
+    synthetic = wearipedia.get_device(
+        device_name, synthetic_start_date=START_DATE, **kwargs
+    )
+
+    return real, synthetic
+
+
+def test_set_api_base_url(monkeypatch):
+    monkeypatch.setenv("WEARIPEDIA_API_BASE_URL", "http://localhost:1234/")
+    assert get_api_base_url() == "http://localhost:1234"
+
+    wearipedia.set_api_base_url("http://localhost:5678")
+    assert get_api_base_url() == "http://localhost:5678"
+
+    wearipedia.set_api_base_url(None)
+    monkeypatch.delenv("WEARIPEDIA_API_BASE_URL")
+    assert get_api_base_url() is None
+
+
+def test_whoop(server):
+    real, synthetic = get_devices("whoop/whoop_4", synthetic_end_date=END_DATE)
+
+    for data_type in ["cycles", "sleeps", "workouts"]:
+        df = real._get_real(data_type, real._default_params())
+        assert df["id"].tolist() == synthetic.get_data(data_type)["id"].tolist()
+
+    assert server.requests[("api.prod.whoop.com", "/developer/v1/cycle")] > 1
+
+
+def test_withings(server):
+    real, synthetic = get_devices("withings/scanwatch", synthetic_end_date=END_DATE)
+
+    sleeps = real._get_real("sleeps", real._default_params())
+    assert sleeps["id"].tolist() == synthetic.get_data("sleeps")["id"].tolist()
+
+    # every page of the measurements
+    real, synthetic = get_devices("withings/bodyplus")
+    params = {"start": START_DATE, "end": END_DATE}
+
+    measurements = real._get_real("measurements", params)
+    assert len(measurements) == len(synthetic.get_data("measurements", params))
+    assert len(measurements) > server.page_size
+
+
+def test_dexcom(server):
+    real, synthetic = get_devices("dexcom/pro_cgm", synthetic_end_date=END_DATE)
+
+    data = real._get_real("data", real._default_params())
+    egvs = synthetic.get_data("data")["egvs"]
+
+    # the API gets the values from 15:30 on the start date to 15:45 on the end date
+    assert data["unit"] == "mg/dL"
+    assert [egv["systemTime"] for egv in data["egvs"]] == [
+        egv["systemTime"]
+        for egv in egvs
+        if f"{START_DATE}T15:30:00" <= egv["systemTime"] <= f"{END_DATE}T15:45:00"
+    ]
+
+
+def test_throttled_requests_are_retried():
+    with MockServer(
+        page_size=5,
+        error_rate=0.5,
+        retry_after=0,
+        start_date=START_DATE,
+        end_date=END_DATE,
+    ) as server:
+        wearipedia.set_api_base_url(server.base_url)
+
+        try:
+            real, synthetic = get_devices("whoop/whoop_4", synthetic_end_date=END_DATE)
+            df = real._get_real("cycles", real._default_params())
+        finally:
+            wearipedia.set_api_base_url(None)
+
+    assert server.throttled > 0
+    assert df["id"].tolist() == synthetic.get_data("cycles")["id"].tolist()
@@ -0,0 +1,43 @@
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+import wearipedia
+from wearipedia.profiling import deep_size
+
+
+def test_deep_size():
+    start = datetime(2022, 3, 1)
+    records = [
+        {"time": start + timedelta(seconds=i), "value": float(i)} for i in range(1000)
+    ]
+
+    sizes = deep_size(records)
+
+    # each record holds two 8 byte values, in a dictionary, a float and a datetime
+    assert sizes["values"] == 2000
+    assert sizes["payload"] == 16000
+    assert sizes["size"] > 10 * sizes["payload"]
+
+    # columns only hold the values
+    columns = deep_size(pd.DataFrame(records))
+
+    assert columns["payload"] == 16000
+    assert columns["size"] < 1.1 * columns["payload"]
+
+    # shared objects are counted once
+    assert deep_size([records, records])["values"] == 2000
+
+
+def test_profile_memory():
+    report = wearipedia.profile_memory(
+        "withings/scanwatch",
+        synthetic_start_date="2022-03-01",
+        synthetic_end_date="2022-03-07",
+    )
+
+    assert report.index.tolist() == ["heart_rates", "sleeps"]
+    assert report.loc["heart_rates", "container"] == "DataFrame"
+    assert (report["size"] > 0).all() and (report["values"] > 0).all()
+    assert report.loc["heart_rates", "allocated"] > 0
+    assert report["overhead_dominated"].dtype == bool
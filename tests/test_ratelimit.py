@@ -0,0 +1,168 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+import wearipedia
+from wearipedia import ratelimit
+from wearipedia.ratelimit import (
+    RateLimiter,
+    backoff_delay,
+    call_with_retries,
+    get_rate_limiter,
+    get_vendor,
+)
+from wearipedia.sessions import create_session
+
+
+def test_token_bucket():
+    limiter = RateLimiter(20, per=1, capacity=2)
+
+    # a burst of capacity requests does not wait
+    assert limiter.acquire() == 0
+    assert limiter.acquire() == 0
+
+    start = time.monotonic()
+    for _ in range(4):
+        limiter.acquire()
+
+    # then requests are paced at rate per second
+    assert time.monotonic() - start == pytest.approx(0.2, abs=0.1)
+    assert limiter.try_acquire() > 0
+
+
+def test_shared_token_bucket(tmp_path):
+    # two limiters backed by the same file (e.g. in two processes) share their tokens
+    first = RateLimiter(1, per=60, capacity=2, lock_path=tmp_path / "fitbit.lock")
+    second = RateLimiter(1, per=60, capacity=2, lock_path=tmp_path / "fitbit.lock")
+
+    assert first.try_acquire() == 0
+    assert second.try_acquire() == 0
+    assert first.try_acquire() > 0
+    assert second.try_acquire() > 0
+
+
+def test_set_rate_limit():
+    assert get_rate_limiter("fitbit").rate == 150
+    assert get_rate_limiter("nutrisense") is None
+
+    limiter = wearipedia.set_rate_limit("nutrisense", 5, per=1)
+    assert get_rate_limiter("nutrisense") is limiter
+
+    wearipedia.set_rate_limit("nutrisense", None)
+    assert get_rate_limiter("nutrisense") is None
+
+
+def test_get_vendor():
+    assert get_vendor("https://api.fitbit.com/1/user/-/profile.json") == "fitbit"
+    assert get_vendor("https://wbsapi.withings.net/v2/sleep") == "withings"
+    assert get_vendor("http://127.0.0.1:8000/") is None
+
+
+def test_backoff_delay():
+    assert backoff_delay(0, "3") == 3
+    assert backoff_delay(5, "Wed, 21 Oct 2015 07:28:00 GMT") == 0
+
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt) <= ratelimit.MAX_BACKOFF
+
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    # throttles the first two requests, then answers
+    requests = 0
+
+    def do_GET(self):
+        ThrottlingHandler.requests += 1
+
+        if ThrottlingHandler.requests <= 2:
+            self.send_response(429)
+            self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+def test_session_retries_throttled_requests():
+    server = HTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    try:
+        response = create_session().get(f"http://127.0.0.1:{server.server_port}/")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == 200
+    assert response.text == "ok"
+    assert ThrottlingHandler.requests == 3
+
+
+def test_call_with_retries():
+    calls = []
+
+    def throttled():
+        calls.append(1)
+
+        if len(calls) < 3:
+            response = requests.Response()
+            response.status_code = 429
+            response.headers["Retry-After"] = "0"
+            raise requests.HTTPError(response=response)
+
+        return "ok"
+
+    assert call_with_retries("garmin", throttled) == "ok"
+    assert len(calls) == 3
+
+    # other errors are raised right away
+    def failing():
+        calls.append(1)
+        raise ValueError()
+
+    with pytest.raises(ValueError):
+        call_with_retries("garmin", failing)
+    assert len(calls) == 4
+
+
+def test_withings_throttled_pages(monkeypatch):
+    from wearipedia.devices.withings import withings_extract
+
+    class ThrottledSession:
+        # answers the first page, then throttles every request
+        def __init__(self):
+            self.requests = 0
+
+        def post(self, url, data, headers):
+            self.requests += 1
+
+            if data["offset"] == 0:
+                body = {"series": [1, 2], "more": 1, "offset": 2}
+
+                return mock_response({"status": 0, "body": body})
+
+            return mock_response({"status": 601, "error": "Too Many Requests"})
+
+    def mock_response(out):
+        return type("Response", (), {"text": json.dumps(out)})()
+
+    monkeypatch.setattr(withings_extract, "backoff_delay", lambda attempt: 0)
+    session = ThrottledSession()
+
+    # the retries run out instead of returning the first page only
+    with pytest.raises(Exception, match="throttled"):
+        withings_extract.fetch_all_wrapper(
+            "https://wbsapi.withings.net/v2/measure", {}, {}, "series", session=session
+        )
+
+    assert session.requests == 1 + withings_extract.NUM_RETRIES
@@ -0,0 +1,39 @@
+import pytest
+
+import wearipedia
+from wearipedia.devices.device import BaseDevice
+from wearipedia.devices.whoop import Whoop4
+
+
+def test_get_device_uses_imported_class():
+    device = wearipedia.get_device("whoop/whoop_4")
+
+    assert type(device) is Whoop4
+    assert type(wearipedia.get_device("whoop/whoop_4")) is type(device)
+
+
+def test_all_device_names_resolve():
+    device_names = wearipedia.get_all_device_names()
+
+    assert len(device_names) == len(set(device_names))
+
+    for device_name in device_names:
+        assert issubclass(wearipedia.get_device_class(device_name), BaseDevice)
+
+
+def test_unknown_device():
+    with pytest.raises(ValueError):
+        wearipedia.get_device("whoop/whoop_0")
+
+
+def test_register_device():
+    wearipedia.register_device("test/whoop", "wearipedia.devices.whoop.whoop_4")
+
+    try:
+        assert "test/whoop" in wearipedia.get_all_device_names()
+        assert wearipedia.get_device_class("test/whoop") is Whoop4
+    finally:
+        from wearipedia import registry
+
+        registry._DEVICE_MODULES.pop("test/whoop")
+        registry._device_classes.pop("test/whoop")
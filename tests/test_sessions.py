@@ -0,0 +1,63 @@
+import requests
+
+import wearipedia
+from wearipedia.devices.whoop.whoop_extract import fetch_profile
+from wearipedia.sessions import create_session, get_session
+
+
+class FakeResponse:
+    status_code = 200
+
+    def json(self):
+        return {"user_id": 1, "first_name": "Ada"}
+
+
+class FakeSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, **kwargs):
+        self.urls.append(url)
+        return FakeResponse()
+
+
+def test_create_session():
+    session = create_session(pool_size=4)
+
+    assert isinstance(session, requests.Session)
+    assert "gzip" in session.headers["Accept-Encoding"]
+    assert session.get_adapter("https://example.com")._pool_maxsize == 4
+
+
+def test_get_session():
+    session = create_session()
+
+    assert get_session(session) is session
+    # without a session, the same shared session is always returned
+    assert get_session() is get_session()
+    assert isinstance(get_session(), requests.Session)
+
+
+def test_authenticate_attaches_session(monkeypatch):
+    device = wearipedia.get_device("whoop/whoop_4")
+    monkeypatch.setattr(device, "_authenticate", lambda auth_creds: None)
+
+    device.authenticate({})
+    session = device.http_session
+
+    assert isinstance(session, requests.Session)
+
+    # authenticating again keeps the session, and with it its connections
+    device.authenticate({})
+    assert device.http_session is session
+
+
+def test_fetch_uses_session():
+    session = FakeSession()
+
+    df = fetch_profile("token", session=session)
+
+    assert session.urls == [
+        "https://api.prod.whoop.com/developer/v1/user/profile/basic"
+    ]
+    assert df["first_name"].tolist() == ["Ada"]
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+import wearipedia
+from wearipedia.mockserver import MockServer
+from wearipedia.sync import SyncStore, device_key, merge
+
+
+def test_merge():
+    old = pd.DataFrame({"id": [1, 2, 3], "score": [{"a": 1}, {"a": 2}, {"a": 3}]})
+    new = pd.DataFrame({"id": [3, 4], "score": [{"a": 30}, {"a": 4}]})
+
+    merged = merge(old, new, ["id"])
+
+    # records fetched again replace the stored ones
+    assert merged["id"].tolist() == [1, 2, 3, 4]
+    assert merged["score"].tolist()[2] == {"a": 30}
+
+    # without keys, records are identified by all their fields
+    assert len(merge(old, new)) == 5
+    assert merge([{"a": 1}, {"a": 2}], [{"a": 2}, {"a": 3}]) == [
+        {"a": 1},
+        {"a": 2},
+        {"a": 3},
+    ]
+
+
+def test_sync(tmp_path):
+    store = SyncStore(tmp_path)
+
+    with MockServer(start_date="2022-03-01", end_date="2022-03-20") as server:
+        wearipedia.set_api_base_url(server.base_url)
+
+        try:
+            device = wearipedia.get_device("whoop/whoop_4")
+            device.authenticate({"access_token": "token"})
+
+            # the params of every fetch
+            windows = []
+            get_real = device._get_real
+            device._get_real = lambda data_type, params: (
+                windows.append((params["start"], params["end"]))
+                or get_real(data_type, params)
+            )
+
+            first = device.sync(
+                "cycles", store, start="2022-03-01", end="2022-03-10", user="p01"
+            )
+            cycles = device.sync("cycles", store, end="2022-03-20", user="p01")
+        finally:
+            wearipedia.set_api_base_url(None)
+
+    synthetic = wearipedia.get_device(
+        "whoop/whoop_4",
+        synthetic_start_date="2022-03-01",
+        synthetic_end_date="2022-03-20",
+    ).get_data("cycles")
+
+    assert len(first) < len(cycles)
+    assert sorted(cycles["id"]) == sorted(synthetic["id"])
+
+    # the second sync only fetched the days from the high-water mark (less a day)
+    assert windows == [("2022-03-01", "2022-03-10"), ("2022-03-09", "2022-03-20")]
+
+    data, state = store.load(device_key(device), "p01", "cycles")
+    assert data["id"].tolist() == cycles["id"].tolist()
+    assert state["high_water_mark"] == "2022-03-20"
+
+
+def test_sync_requires_authentication(tmp_path):
+    device = wearipedia.get_device("whoop/whoop_4")
+
+    with pytest.raises(ValueError):
+        device.sync("cycles", tmp_path)
@@ -0,0 +1,51 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+import wearipedia
+from wearipedia.utils import TimeIndex
+
+
+def test_time_index_sorted():
+    df = pd.DataFrame(
+        {"datetime": pd.date_range("2022-03-01", periods=48, freq="h"), "x": range(48)}
+    )
+    index = TimeIndex(df["datetime"])
+
+    assert index.positions("2022-03-01 12:00", "2022-03-02") == slice(12, 24)
+    assert list(index.select(df, datetime(2022, 3, 2), "2022-03-05")["x"]) == list(
+        range(24, 48)
+    )
+    assert len(index.select(df, "2022-03-05", "2022-03-01")) == 0
+
+
+def test_time_index_unsorted():
+    timestamps = [
+        "2022-03-03T10:00:00Z",
+        "2022-03-01T10:00:00Z",
+        "2022-03-02T10:00:00Z",
+    ]
+    index = TimeIndex(timestamps)
+
+    assert np.all(index.times[1:] >= index.times[:-1])
+    # selections keep the order of the data
+    assert index.select(["c", "a", "b"], "2022-03-02", "2022-03-04") == ["c", "b"]
+
+
+def test_whoop_filter_descending():
+    device = wearipedia.get_device("whoop/whoop_4")
+    params = {"start": "2022-04-01", "end": "2022-05-01"}
+
+    cycles = device.get_data("cycles", params)
+    starts = pd.to_datetime(cycles["start"]).dt.tz_localize(None)
+
+    assert len(cycles) > 0
+    assert starts.min() >= pd.Timestamp(params["start"])
+    assert starts.max() < pd.Timestamp(params["end"])
+    assert starts.is_monotonic_decreasing
+
+    # the index is built once, and reused by later calls
+    index = device._time_indexes["cycles"][1]
+    device.get_data("cycles", params)
+    assert device._time_indexes["cycles"][1] is index
@@ -0,0 +1,164 @@
+import importlib.util
+import json
+import os
+import stat
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import wearipedia
+from wearipedia.tokens import TokenStore, get_token_store, set_token_store
+
+
+class TokenServer:
+    # hands out rotated tokens, like the OAuth servers of the vendors
+    def __init__(self, expires_in=3600, user=""):
+        self.expires_in = expires_in
+        self.user = user
+        self.refresh_tokens = [f"{user}r0"]
+        self.lock = threading.Lock()
+
+    def request_tokens(self, refresh_token):
+        with self.lock:
+            # a refresh token can only be used once
+            assert refresh_token == self.refresh_tokens[-1]
+            time.sleep(0.01)
+
+            n = len(self.refresh_tokens)
+            self.refresh_tokens.append(f"{self.user}r{n}")
+
+            return f"{self.user}r{n}", f"{self.user}a{n}", self.expires_in
+
+
+def test_refresh(tmp_path):
+    store = TokenStore(tmp_path / "tokens.json")
+    server = TokenServer()
+
+    assert store.refresh("WITHINGS", "r0", server.request_tokens) == ("r1", "a1")
+
+    # a fresh access token is reused, by the worker that refreshed it and by those
+    # started with the token it was refreshed from
+    assert store.refresh("WITHINGS", "r1", server.request_tokens) == ("r1", "a1")
+    assert store.refresh("WITHINGS", "r0", server.request_tokens) == ("r1", "a1")
+    assert len(server.refresh_tokens) == 2
+
+    # the tokens of each user are kept under "_users", and the file is only readable by
+    # its owner
+    tokens = json.loads((tmp_path / "tokens.json").read_text())
+    ((name, user),) = tokens["_users"].items()
+
+    assert list(tokens) == ["_users"]
+    assert name.startswith("WITHINGS_")
+    assert user["refresh_token"] == "r1"
+    assert user["access_token"] == "a1"
+
+    if os.name == "posix":
+        assert stat.S_IMODE((tmp_path / "tokens.json").stat().st_mode) == 0o600
+
+
+def test_refresh_users(tmp_path):
+    store = TokenStore(tmp_path / "tokens.json")
+    alice, bob = TokenServer(), TokenServer(user="b")
+
+    assert store.refresh("WHOOP", "r0", alice.request_tokens, "app") == ("r1", "a1")
+    assert store.refresh("WHOOP", "br0", bob.request_tokens, "app") == ("br1", "ba1")
+
+    # the tokens of each user (and client) are kept apart
+    assert store.refresh("WHOOP", "r1", alice.request_tokens, "app") == ("r1", "a1")
+    assert store.refresh("WHOOP", "br0", bob.request_tokens, "app") == ("br1", "ba1")
+    assert len(alice.refresh_tokens) == len(bob.refresh_tokens) == 2
+
+    other_client = TokenServer()
+    store.refresh("WHOOP", "r0", other_client.request_tokens, "other app")
+    assert len(other_client.refresh_tokens) == 2
+    assert len(store.read()["_users"]) == 3
+
+
+def test_token_store_is_opt_in(tmp_path):
+    code = "import wearipedia\nprint(wearipedia.get_token_store() is None)"
+    env = {**os.environ, "WEARIPEDIA_TOKEN_STORE": ""}
+
+    def run(env):
+        return subprocess.run(
+            [sys.executable, "-c", code], env=env, capture_output=True, text=True
+        ).stdout.split()
+
+    assert run(env) == ["True"]
+
+    env["WEARIPEDIA_TOKEN_STORE"] = str(tmp_path / "tokens.json")
+    assert run(env) == ["False"]
+
+
+def test_refresh_before_expiry(tmp_path):
+    store = TokenStore(tmp_path / "tokens.json", refresh_margin=300)
+    server = TokenServer(expires_in=200)
+
+    store.refresh("DEXCOM", "r0", server.request_tokens)
+
+    # the access token expires within the margin, so it is refreshed with the latest
+    # refresh token, even by a worker started with an older one
+    assert store.refresh("DEXCOM", "r0", server.request_tokens) == ("r2", "a2")
+
+
+def test_concurrent_refresh(tmp_path):
+    server = TokenServer()
+    results = []
+
+    def worker():
+        # each worker has its own store, like separate processes sharing the file
+        store = TokenStore(tmp_path / "tokens.json")
+        results.append(store.refresh("WHOOP", "r0", server.request_tokens))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [("r1", "a1")] * 8
+    assert len(server.refresh_tokens) == 2
+
+
+def test_read_token_from_json(tmp_path):
+    path = tmp_path / "tokens.json"
+    path.write_text("")
+
+    try:
+        set_token_store(path)
+        assert wearipedia._read_token_from_json("withings/scanwatch") is None
+
+        wearipedia._dump_token_to_json("withings/scanwatch", "r1")
+        wearipedia._dump_token_to_json("dexcom/pro_cgm", "a1", is_access_token=True)
+
+        assert wearipedia._read_token_from_json("withings/bodyplus") == "r1"
+        assert get_token_store().read() == {
+            "WITHINGS_REFRESH_TOKEN": "r1",
+            "DEXCOM_ACCESS_TOKEN": "a1",
+        }
+
+        set_token_store(None)
+        assert wearipedia._read_token_from_json("withings/scanwatch") is None
+    finally:
+        set_token_store(None)
+
+
+def test_set_secrets_script(tmp_path):
+    spec = importlib.util.spec_from_file_location(
+        "set_secrets_script",
+        Path(__file__).parents[1] / "set_secrets_script.py",
+    )
+    script = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(script)
+
+    store = TokenStore(tmp_path / "tokens.json")
+    store.update({"WITHINGS_REFRESH_TOKEN": "r0", "WITHINGS_ACCESS_TOKEN": "a0"})
+    store.refresh("WITHINGS", "r0", TokenServer().request_tokens, "app")
+
+    # only the tokens named like secrets are pushed back
+    assert script.get_secrets(store.read()) == {
+        "WITHINGS_REFRESH_TOKEN": "r0",
+        "WITHINGS_ACCESS_TOKEN": "a0",
+    }
@@ -1,17 +1,39 @@
 # type: ignore[attr-defined]
 """wearables in development"""
 
-import importlib
-import importlib.util
-from importlib import import_module
+import os
 
 try:
     from importlib import metadata as importlib_metadata
 except ImportError:  # for Python<3.8
     import importlib_metadata as importlib_metadata
 
+from .batch import *
+from .cache import *
+from .cassette import *
 from .constants import *
-from .devices import *
+from .export import *
+from .http_cache import *
+from .instrumentation import *
+from .lazy import lazy_getattr
+from .profiling import *
+from .registry import get_device_class, get_device_names, register_device
+from .sync import *
+from .tokens import *
+
+# devices (e.g. wearipedia.Whoop4), submodules (e.g. wearipedia.devices), the rate
+# limits and the API base URL (which import requests) are only imported once they are
+# used, see lazy.py
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "set_rate_limit": ".ratelimit",
+        "get_rate_limiter": ".ratelimit",
+        "set_api_base_url": ".sessions",
+        "get_api_base_url": ".sessions",
+    },
+    [".devices"],
+)
 
 
 def get_last_updated():
@@ -26,6 +48,7 @@ def get_device(device_name, **kwargs):
 
     :param device_name: the name of the device to get, e.g. "garmin/fenix_7s"
     :type device_name: str
+    :raises ValueError: if there is no device with that name, see get_all_device_names()
     :return: a device object
     :rtype: BaseDevice
 
@@ -39,22 +62,7 @@ def get_device(device_name, **kwargs):
         device = wearipedia.get_device("whoop/whoop_4")
         ...
     """
-    company, model = device_name.split("/")
-
-    module_path = f"{PACKAGE_PATH}/devices/{device_name}.py"
-
-    spec = importlib.util.spec_from_file_location(
-        name=f"wearipedia.devices.{company}.{model}",
-        location=module_path,
-    )
-
-    module = importlib.util.module_from_spec(spec)
-
-    spec.loader.exec_module(module)
-
-    class_name = getattr(module, "class_name")
-
-    return getattr(module, class_name)(**kwargs)
+    return get_device_class(device_name)(**kwargs)
 
 
 def get_all_device_names():
@@ -64,30 +72,7 @@ def get_all_device_names():
     :rtype: List
     """
 
-    return [
-        "apple/healthkit",
-        "cronometer/cronometer",
-        "whoop/whoop_4",
-        "withings/scanwatch",
-        "withings/bodyplus",
-        "withings/sleepmat",
-        "dreem/headband_2",
-        "dexcom/pro_cgm",
-        "garmin/fenix_7s",
-        "google/googlefit",
-        "polar/h10",
-        "polar/verity_sense",
-        "nutrisense/cgm",
-        "fitbit/fitbit_charge_4",
-        "fitbit/fitbit_charge_6",
-        "fitbit/fitbit_sense",
-        "fitbit/google_pixel_watch",
-        "oura/oura_ring3",
-        "coros/coros_pace_2",
-        "polar/vantage",
-        "strava/strava",
-        "myfitnesspal/myfitnesspal",
-    ]
+    return get_device_names()
 
 
 def get_version() -> str:
@@ -174,44 +159,35 @@ _DEVICE_TO_AUTH_DICT = {
     },
 }
 
-_REFRESH_TOKEN_STORE = "/tmp/refresh_tokens.json"
 
+def _token_name(device_name, is_access_token=False):
+    token_name = _DEVICE_TO_AUTH_DICT[device_name]["refresh_token_env_var"]
 
-def _read_token_from_json(device_name, is_access_token=False):
-    try:
-        d = json.load(open(_REFRESH_TOKEN_STORE))
-        refresh_token_env_var = _DEVICE_TO_AUTH_DICT[device_name][
-            "refresh_token_env_var"
-        ]
+    if is_access_token:
+        token_name = token_name.replace("REFRESH", "ACCESS")
+
+    return token_name
 
-        if is_access_token:
-            refresh_token_env_var = refresh_token_env_var.replace("REFRESH", "ACCESS")
 
-        return d[refresh_token_env_var]
-    except:
+def _read_token_from_json(device_name, is_access_token=False):
+    store = get_token_store()
+
+    if store is None or "refresh_token_env_var" not in _DEVICE_TO_AUTH_DICT.get(
+        device_name, dict()
+    ):
         return None
 
+    return store.get(_token_name(device_name, is_access_token))
 
-def _dump_token_to_json(device_name, new_refresh_token, is_access_token=False):
-    # pre-emptively fill it with nothing
-    if not Path(_REFRESH_TOKEN_STORE).exists():
-        json.dump({}, open(_REFRESH_TOKEN_STORE, "w"))
-    else:
-        with open(_REFRESH_TOKEN_STORE) as f:
-            if len(f.read()) == 0:
-                json.dump({}, open(_REFRESH_TOKEN_STORE, "w"))
 
-    # we're running in GitHub Actions, so we can
-    # update the refresh token
-    refresh_token_env_var = _DEVICE_TO_AUTH_DICT[device_name]["refresh_token_env_var"]
-    if is_access_token:
-        refresh_token_env_var = refresh_token_env_var.replace("REFRESH", "ACCESS")
+def _dump_token_to_json(device_name, new_refresh_token, is_access_token=False):
+    # we're running in GitHub Actions, and since we can't propagate environment
+    # variables up, we keep the tokens in the token store (/tmp/refresh_tokens.json, set
+    # by the workflow), from which set_secrets_script.py updates the secrets
+    store = get_token_store()
 
-    # since we can't propagate environment variables up in Github
-    # Actions, we just keep around a file /tmp/refresh_tokens.json
-    refresh_tokens = json.load(open(_REFRESH_TOKEN_STORE))
-    refresh_tokens[refresh_token_env_var] = new_refresh_token
-    json.dump(refresh_tokens, open(_REFRESH_TOKEN_STORE, "w"))
+    if store is not None:
+        store.update({_token_name(device_name, is_access_token): new_refresh_token})
 
 
 def _authenticate_device(device_name, device):
@@ -226,15 +202,17 @@ def _authenticate_device(device_name, device):
     if disk_refresh_token is not None:
         auth_dict["refresh_token"] = disk_refresh_token
 
-    disk_access_token = _read_token_from_json(device_name, is_access_token=True)
-    if disk_access_token is not None:
-        auth_dict["access_token"] = disk_access_token
+    # access tokens are not passed on, since they may have expired: refreshing with the
+    # refresh token reuses the access token of the token store while it is fresh
 
     print("AUTHENTICATING DEVICE", device_name)
     print("AUTHENTICATION DICTIONARY IS", auth_dict.keys())
 
     device.authenticate(auth_dict)
 
+    if "refresh_token_env_var" not in auth_dict:
+        return
+
     if "refresh_token" in dir(device):
         _dump_token_to_json(device_name, device.refresh_token)
 
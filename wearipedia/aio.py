@@ -0,0 +1,132 @@
+"""
+aio.py
+====================================
+Asynchronous access to the device APIs, so that a single event loop can drive many
+concurrent requests, e.g. with `BaseDevice.aget_data`.
+"""
+
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .sessions import create_session
+
+__all__ = ["AsyncClient", "get_async_client"]
+
+DEFAULT_MAX_CONCURRENCY = 32
+
+_async_client = None
+
+
+class AsyncClient:
+    """An asyncio HTTP client for the fetch modules. Requests are coroutines, and at most
+    `max_concurrency` of them are in flight at once, no matter how many are awaited
+    together (e.g. with ``asyncio.gather``).
+
+    Requests are sent with `requests` from a pool of worker threads, which is also used
+    to run the blocking calls of third party API clients (such as the Garmin and
+    MyFitnessPal clients) with `run`. Subclasses can override `request` to use a
+    different transport.
+
+    :param max_concurrency: the maximum number of concurrent requests, defaults to 32
+    :type max_concurrency: int, optional
+    :param session: the session to send requests with, defaults to a new session with a
+        connection pool of `max_concurrency` connections per host
+    :type session: requests.Session, optional
+
+    **Example**
+
+    .. code-block:: python
+
+        import asyncio
+
+        from wearipedia.aio import AsyncClient
+
+        async def main():
+            client = AsyncClient(max_concurrency=8)
+            responses = await asyncio.gather(
+                *[client.get("https://example.com", params={"page": i}) for i in range(100)]
+            )
+            client.close()
+
+        asyncio.run(main())
+    """
+
+    def __init__(self, max_concurrency=DEFAULT_MAX_CONCURRENCY, session=None):
+        self.max_concurrency = max_concurrency
+
+        if session is None:
+            session = create_session(pool_size=max_concurrency)
+
+        self.session = session
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="wearipedia-aio"
+        )
+
+    async def run(self, func, *args, **kwargs):
+        """Runs a blocking function without blocking the event loop.
+
+        :param func: the function to run
+        :type func: Callable
+        :return: the return value of func(*args, **kwargs)
+        """
+        loop = asyncio.get_running_loop()
+        # in the context of the caller, e.g. the phase measured by instrumentation
+        context = contextvars.copy_context()
+
+        return await loop.run_in_executor(
+            self._executor, partial(context.run, func, *args, **kwargs)
+        )
+
+    async def request(self, method, url, **kwargs):
+        """Sends a request, with the same arguments as `requests.request`.
+
+        :param method: the HTTP method, e.g. "GET"
+        :type method: str
+        :param url: the URL to send the request to
+        :type url: str
+        :return: the response
+        :rtype: requests.Response
+        """
+        return await self.run(self.session.request, method, url, **kwargs)
+
+    async def get(self, url, **kwargs):
+        """Sends a GET request, see `request`.
+
+        :param url: the URL to send the request to
+        :type url: str
+        :return: the response
+        :rtype: requests.Response
+        """
+        return await self.request("GET", url, **kwargs)
+
+    async def post(self, url, **kwargs):
+        """Sends a POST request, see `request`.
+
+        :param url: the URL to send the request to
+        :type url: str
+        :return: the response
+        :rtype: requests.Response
+        """
+        return await self.request("POST", url, **kwargs)
+
+    def close(self):
+        """Closes the session and stops the worker threads once they are done."""
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+def get_async_client():
+    """Returns the async client shared by all devices, creating it on first use.
+
+    :return: the shared async client
+    :rtype: AsyncClient
+    """
+    global _async_client
+
+    if _async_client is None:
+        _async_client = AsyncClient()
+
+    return _async_client
@@ -0,0 +1,280 @@
+"""
+batch.py
+====================================
+Extraction of many (device, data type, params) jobs at once, on bounded worker pools.
+
+Synthetic data generation is CPU-bound, so synthetic jobs run on a pool of processes,
+while fetching real data is I/O-bound, so real jobs (those of devices with credentials)
+run on a pool of threads. Results are streamed as jobs finish.
+"""
+
+import json
+import os
+import threading
+from collections import Counter, deque, namedtuple
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import ExitStack
+
+__all__ = ["BatchJob", "BatchResult", "iter_batch", "run_batch"]
+
+
+class BatchJob(namedtuple("BatchJob", ["device_name", "data_type", "params"])):
+    """A job of a batch: get the data of `data_type` from the device `device_name`, with
+    `params` (or the default params of the device if None).
+    """
+
+    def __new__(cls, device_name, data_type, params=None):
+        return super().__new__(cls, device_name, data_type, params)
+
+
+class BatchResult(namedtuple("BatchResult", ["index", "job", "data", "error"])):
+    """The result of a job of a batch: `index` is the position of the job in the batch,
+    and either `data` is the data returned by get_data(), or `error` is the exception it
+    raised.
+    """
+
+
+# devices created by the current (worker) process for synthetic jobs
+_synthetic_devices = dict()
+
+
+def _get_synthetic_data(device_name, init_params, data_type, params):
+    from . import get_device
+
+    # reuse the device across jobs, so that its synthetic data is only generated once
+    key = (device_name, json.dumps(init_params, sort_keys=True, default=str))
+
+    if key not in _synthetic_devices:
+        _synthetic_devices[key] = get_device(device_name, **init_params)
+
+    return _synthetic_devices[key].get_data(data_type, params)
+
+
+class _RealDevices:
+    # authenticated devices shared by the threads running real jobs, each created
+    # (and authenticated) by the first job that needs it
+
+    def __init__(self, init_params, auth_creds):
+        self.init_params = init_params
+        self.auth_creds = auth_creds
+        self.devices = dict()
+        self.locks = dict()
+        self.lock = threading.Lock()
+
+    def get_data(self, device_name, data_type, params):
+        from . import get_device
+
+        with self.lock:
+            device_lock = self.locks.setdefault(device_name, threading.Lock())
+
+        with device_lock:
+            if device_name not in self.devices:
+                device = get_device(
+                    device_name, **self.init_params.get(device_name, {})
+                )
+                device.authenticate(self.auth_creds[device_name])
+                self.devices[device_name] = device
+
+        return self.devices[device_name].get_data(data_type, params)
+
+
+def _vendor_cap(max_per_vendor, vendor):
+    if isinstance(max_per_vendor, dict):
+        cap = max_per_vendor.get(vendor)
+    else:
+        cap = max_per_vendor
+
+    if cap is not None and cap < 1:
+        raise ValueError(f"the maximum number of jobs of {vendor} must be at least 1")
+
+    return cap
+
+
+def iter_batch(
+    jobs,
+    init_params=None,
+    auth_creds=None,
+    max_threads=8,
+    max_processes=None,
+    max_per_vendor=None,
+    use_processes=True,
+    ordered=False,
+):
+    """Runs a batch of jobs, yielding their results as they finish (or in the order of
+    the jobs, if `ordered` is True).
+
+    Jobs of devices that have credentials in `auth_creds` fetch real data on a pool of
+    threads, sharing one authenticated device per device name. Other jobs generate
+    synthetic data on a pool of processes (or, if `use_processes` is False, one job at a
+    time on a single thread, since synthetic data is only reproducible when generated
+    by a single thread of a process).
+
+    Jobs are submitted as workers become free, at most as many at a time as there are
+    workers, so that the results waiting for the caller stay bounded however many jobs
+    the batch has. Results held back to be yielded in order count as jobs in flight,
+    except for the job whose result is yielded next, which is always submitted.
+
+    :param jobs: the jobs, as BatchJob or (device_name, data_type[, params]) tuples
+    :type jobs: Iterable
+    :param init_params: for each device name, the keyword arguments to pass to
+        get_device(), defaults to None
+    :type init_params: Dict, optional
+    :param auth_creds: for each device name, the credentials to authenticate the device
+        with, defaults to None
+    :type auth_creds: Dict, optional
+    :param max_threads: the maximum number of concurrent real jobs, defaults to 8
+    :type max_threads: int, optional
+    :param max_processes: the maximum number of concurrent synthetic jobs, defaults to
+        the number of CPUs
+    :type max_processes: int, optional
+    :param max_per_vendor: the maximum number of concurrent jobs per vendor (e.g.
+        "withings" for "withings/scanwatch"), either for all vendors or as a dictionary
+        of vendor to maximum, defaults to no maximum
+    :type max_per_vendor: int or Dict, optional
+    :param use_processes: whether to run synthetic jobs on processes, defaults to True
+    :type use_processes: bool, optional
+    :param ordered: whether to yield the results in the order of the jobs, rather than
+        in the order in which the jobs finish, defaults to False
+    :type ordered: bool, optional
+    :return: a generator of BatchResult
+    :rtype: Generator
+
+    **Example**
+
+    .. code-block:: python
+
+        import wearipedia
+
+        jobs = [
+            ("whoop/whoop_4", data_type)
+            for data_type in ["cycles", "sleeps", "workouts"]
+        ]
+
+        for result in wearipedia.iter_batch(jobs):
+            print(result.job.data_type, len(result.data))
+    """
+    jobs = [BatchJob(*job) for job in jobs]
+    init_params = init_params or dict()
+    auth_creds = auth_creds or dict()
+
+    real_devices = _RealDevices(init_params, auth_creds)
+
+    if use_processes:
+        synthetic_workers = max_processes or os.cpu_count() or 1
+    else:
+        synthetic_workers = 1
+
+    max_in_flight = synthetic_workers + max_threads
+
+    pending = deque(enumerate(jobs))
+    in_flight = dict()
+    vendor_counts = Counter()
+
+    # the results of an ordered batch waiting for those of earlier jobs, and the index of
+    # the next result to yield
+    finished = dict()
+    next_index = 0
+
+    with ExitStack() as stack:
+        pools = dict()
+
+        def get_pool(real):
+            # pools are only started once a job needs them
+            if real not in pools:
+                if real:
+                    pool = ThreadPoolExecutor(max_workers=max_threads)
+                elif use_processes:
+                    pool = ProcessPoolExecutor(max_workers=max_processes)
+                else:
+                    pool = ThreadPoolExecutor(max_workers=1)
+
+                pools[real] = stack.enter_context(pool)
+
+            return pools[real]
+
+        while pending or in_flight:
+            # submit the pending jobs whose vendor is below its cap, as long as workers
+            # are free
+            deferred = deque()
+
+            while pending and (
+                len(in_flight) + len(finished) < max_in_flight
+                or pending[0][0] == next_index
+            ):
+                index, job = pending.popleft()
+                vendor = job.device_name.split("/")[0]
+                cap = _vendor_cap(max_per_vendor, vendor)
+
+                if cap is not None and vendor_counts[vendor] >= cap:
+                    deferred.append((index, job))
+                    continue
+
+                if job.device_name in auth_creds:
+                    future = get_pool(True).submit(
+                        real_devices.get_data,
+                        job.device_name,
+                        job.data_type,
+                        job.params,
+                    )
+                else:
+                    future = get_pool(False).submit(
+                        _get_synthetic_data,
+                        job.device_name,
+                        init_params.get(job.device_name, {}),
+                        job.data_type,
+                        job.params,
+                    )
+
+                in_flight[future] = (index, job)
+                vendor_counts[vendor] += 1
+
+            deferred.extend(pending)
+            pending = deferred
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                index, job = in_flight.pop(future)
+                vendor_counts[job.device_name.split("/")[0]] -= 1
+
+                try:
+                    result = BatchResult(index, job, future.result(), None)
+                except Exception as e:
+                    result = BatchResult(index, job, None, e)
+
+                if not ordered:
+                    yield result
+                    continue
+
+                finished[index] = result
+
+                while next_index in finished:
+                    yield finished.pop(next_index)
+                    next_index += 1
+
+
+def run_batch(jobs, raise_errors=True, **kwargs):
+    """Runs a batch of jobs, see iter_batch(), and returns their results in the order of
+    the jobs.
+
+    :param jobs: the jobs, as BatchJob or (device_name, data_type[, params]) tuples
+    :type jobs: Iterable
+    :param raise_errors: whether to raise the error of the first failed job (otherwise,
+        the results of failed jobs have an error instead of data), defaults to True
+    :type raise_errors: bool, optional
+    :return: the BatchResult of each job
+    :rtype: List
+    """
+    results = list(iter_batch(jobs, ordered=True, **kwargs))
+
+    if raise_errors:
+        for result in results:
+            if result.error is not None:
+                raise result.error
+
+    return results
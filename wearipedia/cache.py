@@ -0,0 +1,369 @@
+"""
+cache.py
+====================================
+An opt-in, persistent on-disk cache for synthetic data, shared between processes.
+
+Synthetic data only depends on the device, its init params (which include the seed
+and the synthetic date range) and the code that generates it, so once it has been
+generated by one process, other processes can load it from disk instead of
+regenerating it. The days of devices that generate their data one day at a time do not
+depend on the synthetic date range, and are cached by window of days instead. The cache is disabled by default, and can be enabled with
+`enable_synthetic_cache` or by setting the ``WEARIPEDIA_CACHE_DIR`` environment
+variable.
+"""
+
+import hashlib
+import importlib.util
+import inspect
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+
+__all__ = [
+    "enable_synthetic_cache",
+    "disable_synthetic_cache",
+    "clear_synthetic_cache",
+    "SyntheticCache",
+]
+
+CACHE_DIR_ENV_VAR = "WEARIPEDIA_CACHE_DIR"
+CACHE_SIZE_ENV_VAR = "WEARIPEDIA_CACHE_MAX_SIZE"
+
+DEFAULT_MAX_SIZE = 2**30  # 1 GiB
+
+# the size of the cache is tracked in memory, and only measured on disk (to account for
+# the entries of other processes) every this many stores, or when it seems too large
+RESCAN_INTERVAL = 100
+
+_synthetic_cache = None
+_source_hashes = dict()
+
+
+class SyntheticCache:
+    """A directory of cached synthetic data, with one entry per generated group of data
+    types (and window of days, for per day generators). Entries are evicted least
+    recently used first once the total size of the cache exceeds `max_size`.
+
+    Each data type of an entry is written to its own file: arrays, and dictionaries of
+    arrays, to a NumPy ``.npz`` file, data frames to a Parquet file (if pyarrow is
+    installed), and anything else to a pickle file.
+
+    :param cache_dir: the directory to store the cache in
+    :type cache_dir: str
+    :param max_size: the maximum total size of the cache in bytes, defaults to 1 GiB
+    :type max_size: int, optional
+    """
+
+    def __init__(self, cache_dir, max_size=DEFAULT_MAX_SIZE):
+        self.cache_dir = Path(cache_dir)
+        self.max_size = max_size
+
+        # the size of the cache as last measured, plus that of the entries stored since
+        self._size = None
+        self._stores = 0
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def key(self, device, data_types, *keys):
+        """Returns the key of the cache entry holding `data_types` for `device`.
+
+        :param device: the device generating the data
+        :type device: BaseDevice
+        :param data_types: the data types generated together
+        :type data_types: List
+        :param keys: any further keys identifying the data, e.g. the dates of the days
+            for data that is generated one day at a time, which does not depend on the
+            synthetic date range of the device
+        :return: a hexadecimal key
+        :rtype: str
+        """
+        init_params = device.init_params
+
+        if keys:
+            init_params = {
+                name: value
+                for name, value in init_params.items()
+                if name not in device._synthetic_range_params
+            }
+
+        description = json.dumps(
+            [
+                type(device).__module__,
+                type(device).__name__,
+                init_params,
+                generator_version(device),
+                list(data_types),
+                [str(key) for key in keys],
+            ],
+            sort_keys=True,
+            default=str,
+        )
+
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def load(self, key, data_types):
+        """Loads a cache entry, marking it as recently used.
+
+        :param key: the key of the entry
+        :type key: str
+        :param data_types: the data types stored in the entry
+        :type data_types: List
+        :return: a dictionary of data type to data, or None if the entry is not cached
+        :rtype: Dict
+        """
+        entry = self.cache_dir / key
+
+        if not entry.is_dir():
+            return None
+
+        try:
+            data = {data_type: _load_file(entry, data_type) for data_type in data_types}
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            # an entry that was evicted while reading, or a corrupted one
+            return None
+
+        # the modification time of an entry is the time it was last used
+        try:
+            os.utime(entry)
+        except OSError:
+            pass
+
+        return data
+
+    def store(self, key, data):
+        """Stores a cache entry, then evicts the least recently used entries if the
+        cache is larger than its maximum size. The directory of the cache is only scanned
+        every `RESCAN_INTERVAL` stores, or to evict entries.
+
+        :param key: the key of the entry
+        :type key: str
+        :param data: a dictionary of data type to data
+        :type data: Dict
+        """
+        # write the entry to a temporary directory first, so that other processes
+        # never see a partially written entry
+        tmp_dir = Path(tempfile.mkdtemp(prefix=".tmp-", dir=self.cache_dir))
+
+        try:
+            for data_type, value in data.items():
+                _dump_file(tmp_dir, data_type, value)
+
+            size = sum(file.stat().st_size for file in tmp_dir.iterdir())
+            os.replace(tmp_dir, self.cache_dir / key)
+        except (OSError, pickle.PicklingError, TypeError, AttributeError):
+            # either another process stored the same entry in the meantime, or the
+            # data cannot be serialized, in which case it is simply not cached
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            size = 0
+
+        self._stores += 1
+
+        if self._size is None or self._stores >= RESCAN_INTERVAL:
+            self._size = self.size()
+            self._stores = 0
+        else:
+            self._size += size
+
+        if self._size > self.max_size:
+            self.evict()
+
+    def size(self):
+        """Returns the total size of the cache in bytes.
+
+        :return: the size of all cache entries
+        :rtype: int
+        """
+        return sum(size for _, _, size in self._entries())
+
+    def evict(self):
+        """Removes the least recently used entries until the cache is no larger than its
+        maximum size.
+        """
+        entries = sorted(self._entries(), key=lambda entry: entry[1])
+        total_size = sum(size for _, _, size in entries)
+
+        for entry, _, size in entries:
+            if total_size <= self.max_size:
+                break
+
+            shutil.rmtree(entry, ignore_errors=True)
+            total_size -= size
+
+        self._size = total_size
+        self._stores = 0
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        for entry, _, _ in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+
+        self._size = 0
+
+    def _entries(self):
+        entries = []
+
+        for entry in self.cache_dir.iterdir():
+            if entry.name.startswith(".") or not entry.is_dir():
+                continue
+
+            try:
+                last_used = entry.stat().st_mtime
+                size = sum(file.stat().st_size for file in entry.iterdir())
+            except OSError:
+                continue
+
+            entries.append((entry, last_used, size))
+
+        return entries
+
+
+def _is_array(value):
+    import numpy as np
+
+    return isinstance(value, np.ndarray) and value.dtype != object
+
+
+def _dump_file(directory, data_type, value):
+    # numpy and pandas are only imported once synthetic data is cached
+    import numpy as np
+    import pandas as pd
+
+    if _is_array(value):
+        np.savez_compressed(directory / f"{data_type}.npz", data=value)
+    elif (
+        isinstance(value, dict)
+        and len(value) > 0
+        and all(isinstance(key, str) and _is_array(v) for key, v in value.items())
+    ):
+        np.savez_compressed(directory / f"{data_type}.dict.npz", **value)
+    elif (
+        isinstance(value, pd.DataFrame)
+        and importlib.util.find_spec("pyarrow") is not None
+    ):
+        value.to_parquet(directory / f"{data_type}.parquet")
+    else:
+        with open(directory / f"{data_type}.pkl", "wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _load_file(directory, data_type):
+    import numpy as np
+    import pandas as pd
+
+    if (directory / f"{data_type}.npz").exists():
+        with np.load(directory / f"{data_type}.npz") as npz:
+            return npz["data"]
+    elif (directory / f"{data_type}.dict.npz").exists():
+        with np.load(directory / f"{data_type}.dict.npz") as npz:
+            return {key: npz[key] for key in npz.files}
+    elif (directory / f"{data_type}.parquet").exists():
+        return pd.read_parquet(directory / f"{data_type}.parquet")
+    else:
+        with open(directory / f"{data_type}.pkl", "rb") as f:
+            return pickle.load(f)
+
+
+def generator_version(device):
+    """Returns a hash of the code that generates the synthetic data of `device`, i.e. of
+    the sources of its subpackage and of the base device, so that cache entries are
+    invalidated whenever the generators change.
+
+    :param device: the device
+    :type device: BaseDevice
+    :return: a hexadecimal hash
+    :rtype: str
+    """
+    from .devices import device as base_device
+
+    # devices are not always registered in sys.modules (see get_device), so look up
+    # the file of the device through one of its methods rather than its module
+    directories = [
+        os.path.dirname(inspect.getfile(type(device).__init__)),
+        os.path.dirname(inspect.getfile(base_device)),
+    ]
+
+    return hashlib.sha256(
+        "".join(_source_hash(directory) for directory in directories).encode()
+    ).hexdigest()
+
+
+def _source_hash(directory):
+    if directory not in _source_hashes:
+        digest = hashlib.sha256()
+
+        for path in sorted(Path(directory).glob("*.py")):
+            digest.update(path.name.encode())
+            digest.update(path.read_bytes())
+
+        _source_hashes[directory] = digest.hexdigest()
+
+    return _source_hashes[directory]
+
+
+def get_synthetic_cache():
+    """Returns the synthetic data cache, or None if caching is disabled.
+
+    :return: the cache in use
+    :rtype: SyntheticCache
+    """
+    global _synthetic_cache
+
+    if _synthetic_cache is None and os.environ.get(CACHE_DIR_ENV_VAR):
+        _synthetic_cache = SyntheticCache(
+            os.environ[CACHE_DIR_ENV_VAR],
+            int(os.environ.get(CACHE_SIZE_ENV_VAR, DEFAULT_MAX_SIZE)),
+        )
+
+    # False when explicitly disabled, even if the environment variable is set
+    return _synthetic_cache or None
+
+
+def enable_synthetic_cache(cache_dir=None, max_size=DEFAULT_MAX_SIZE):
+    """Enable the on-disk cache of synthetic data, for all devices created from now on.
+
+    :param cache_dir: the directory to store the cache in, defaults to
+        "~/.cache/wearipedia/synthetic"
+    :type cache_dir: str, optional
+    :param max_size: the maximum total size of the cache in bytes, defaults to 1 GiB
+    :type max_size: int, optional
+    :return: the cache
+    :rtype: SyntheticCache
+
+    **Example**
+
+    .. code-block:: python
+
+        import wearipedia
+
+        wearipedia.enable_synthetic_cache()
+
+        # the first call generates the data, later calls (in any process) load it
+        device = wearipedia.get_device("whoop/whoop_4", seed=0)
+        cycles = device.get_data("cycles")
+    """
+    global _synthetic_cache
+
+    if cache_dir is None:
+        cache_dir = Path.home() / ".cache" / "wearipedia" / "synthetic"
+
+    _synthetic_cache = SyntheticCache(cache_dir, max_size)
+
+    return _synthetic_cache
+
+
+def disable_synthetic_cache():
+    """Disable the on-disk cache of synthetic data. The cached data is kept on disk."""
+    global _synthetic_cache
+
+    _synthetic_cache = False
+
+
+def clear_synthetic_cache():
+    """Remove all entries from the on-disk cache of synthetic data, if it is enabled."""
+    cache = get_synthetic_cache()
+
+    if cache is not None:
+        cache.clear()
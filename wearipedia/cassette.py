@@ -0,0 +1,342 @@
+"""
+cassette.py
+====================================
+Record and replay of the HTTP exchanges of real data extraction, so that the real data
+path (authentication, fetching and parsing) can be tested and benchmarked offline.
+
+Within `use_cassette` in "record" mode, every request sent with `requests` (by the
+sessions of `wearipedia.sessions`, plain `requests` calls, or third party API clients
+built on `requests`) is sent as usual and its response is saved to a cassette file. In
+"replay" mode, nothing is sent over the network: each request is answered with the
+recorded response of the same request, in the order in which they were recorded.
+
+Credentials (tokens, secrets, passwords, ...) are replaced by a placeholder in the
+requests and responses saved to cassettes, and requests are matched on their method,
+URL and body without them, so cassettes can be shared and replayed with any
+credentials.
+"""
+
+import base64
+import gzip
+import json
+import re
+import threading
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+__all__ = ["Cassette", "CassetteError", "use_cassette", "get_cassette"]
+
+CASSETTE_VERSION = 1
+
+# names of the params and JSON fields holding credentials
+SECRET_PATTERN = re.compile(
+    r"token|secret|passw|api_?key|^code$|email|username|session_?id|csrf",
+    re.IGNORECASE,
+)
+
+FILTERED = "FILTERED"
+
+_cassette = None
+_cassette_lock = threading.Lock()
+
+
+class CassetteError(Exception):
+    """Raised when a request that is not in the cassette is sent in replay mode."""
+
+
+def _filter_secrets(value):
+    # replaces the values of the fields of JSON data that hold credentials
+    if isinstance(value, dict):
+        return {
+            key: (
+                FILTERED
+                if SECRET_PATTERN.search(str(key)) and value[key] is not None
+                else _filter_secrets(value[key])
+            )
+            for key in value
+        }
+    elif isinstance(value, list):
+        return [_filter_secrets(element) for element in value]
+
+    return value
+
+
+def _filter_params(query):
+    params = parse_qsl(query, keep_blank_values=True)
+
+    return urlencode(
+        sorted(
+            (name, FILTERED if SECRET_PATTERN.search(name) else value)
+            for name, value in params
+        )
+    )
+
+
+def _filter_body(body):
+    # the body of a request (JSON, or form or otherwise encoded) without credentials
+    if body is None:
+        return None
+
+    if isinstance(body, bytes):
+        try:
+            body = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return base64.b64encode(body).decode()
+
+    try:
+        return json.dumps(_filter_secrets(json.loads(body)), sort_keys=True)
+    except ValueError:
+        pass
+
+    if "=" in body and not body.lstrip().startswith(("{", "[", "<")):
+        return _filter_params(body)
+
+    return body
+
+
+def request_key(method, url, body=None):
+    """Returns the key of a request in a cassette: its method, and its URL and body
+    without credentials.
+
+    :param method: the HTTP method of the request
+    :type method: str
+    :param url: the URL of the request
+    :type url: str
+    :param body: the body of the request, defaults to None
+    :type body: str or bytes, optional
+    :return: the key
+    :rtype: Tuple
+    """
+    parts = urlsplit(url)
+    url = urlunsplit(parts._replace(query=_filter_params(parts.query), fragment=""))
+
+    return method.upper(), url, _filter_body(body)
+
+
+def _encode_content(content):
+    try:
+        text = content.decode("utf-8")
+    except UnicodeDecodeError:
+        return {"encoding": "base64", "body": base64.b64encode(content).decode()}
+
+    # credentials in the responses of authentication requests
+    try:
+        text = json.dumps(_filter_secrets(json.loads(text)))
+    except ValueError:
+        pass
+
+    return {"encoding": "utf-8", "body": text}
+
+
+def _decode_content(response):
+    if response["encoding"] == "base64":
+        return base64.b64decode(response["body"])
+
+    return response["body"].encode("utf-8")
+
+
+class Cassette:
+    """The recorded HTTP exchanges of a run, saved as JSON (gzip compressed if the path
+    ends with ".gz").
+
+    :param path: the path of the cassette file
+    :type path: str or Path
+    :param mode: "record" to send requests and record their responses, or "replay" to
+        answer requests with the recorded responses, defaults to "replay"
+    :type mode: str, optional
+    """
+
+    def __init__(self, path, mode="replay"):
+        if mode not in ["record", "replay"]:
+            raise ValueError(f'mode must be "record" or "replay", got {mode}')
+
+        self.path = Path(path)
+        self.mode = mode
+        # anything to save with the exchanges, e.g. the device and data types recorded
+        self.metadata = dict()
+        self.interactions = []
+
+        self._lock = threading.Lock()
+        self._queues = defaultdict(deque)
+        self._last = dict()
+
+        if mode == "replay":
+            self.load()
+
+    def _open(self, mode):
+        if self.path.suffix == ".gz":
+            return gzip.open(self.path, mode + "t", encoding="utf-8")
+
+        return open(self.path, mode, encoding="utf-8")
+
+    def load(self):
+        """Loads the exchanges of the cassette file."""
+        with self._open("r") as f:
+            cassette = json.load(f)
+
+        self.metadata = cassette.get("metadata", dict())
+        self.interactions = cassette["interactions"]
+
+        for interaction in self.interactions:
+            request = interaction["request"]
+            key = request_key(request["method"], request["url"], request["body"])
+            self._queues[key].append(interaction["response"])
+
+    def save(self):
+        """Saves the recorded exchanges to the cassette file."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._open("w") as f:
+            json.dump(
+                {
+                    "version": CASSETTE_VERSION,
+                    "metadata": self.metadata,
+                    "interactions": self.interactions,
+                },
+                f,
+                indent=1,
+            )
+
+    def record(self, request, response):
+        """Records an exchange.
+
+        :param request: the request
+        :type request: requests.PreparedRequest
+        :param response: its response, whose content is read
+        :type response: requests.Response
+        """
+        method, url, body = request_key(request.method, request.url, request.body)
+
+        interaction = {
+            "request": {"method": method, "url": url, "body": body},
+            "response": {
+                "status": response.status_code,
+                "reason": response.reason,
+                "headers": {
+                    name: value
+                    for name, value in response.headers.items()
+                    if name.lower()
+                    not in ["content-encoding", "content-length", "transfer-encoding"]
+                    and name.lower() != "set-cookie"
+                },
+                **_encode_content(response.content),
+            },
+        }
+
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def play(self, request, adapter=None):
+        """Returns the recorded response of a request. Identical requests get the
+        responses recorded for them in order, and then the last of these responses.
+
+        :param request: the request
+        :type request: requests.PreparedRequest
+        :param adapter: the transport adapter answering the request, defaults to None
+        :type adapter: requests.adapters.BaseAdapter, optional
+        :raises CassetteError: if the request was not recorded
+        :return: the response
+        :rtype: requests.Response
+        """
+        import requests
+        from requests.structures import CaseInsensitiveDict
+        from requests.utils import get_encoding_from_headers
+
+        key = request_key(request.method, request.url, request.body)
+
+        with self._lock:
+            if self._queues[key]:
+                self._last[key] = self._queues[key].popleft()
+
+            recorded = self._last.get(key)
+
+        if recorded is None:
+            raise CassetteError(
+                f"{key[0]} {key[1]} was not recorded in the cassette {self.path}"
+            )
+
+        response = requests.Response()
+        response.status_code = recorded["status"]
+        response.reason = recorded["reason"]
+        response.headers = CaseInsensitiveDict(recorded["headers"])
+        response._content = _decode_content(recorded)
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = adapter
+
+        return response
+
+
+def get_cassette():
+    """Returns the cassette in use, if any.
+
+    :return: the cassette, or None
+    :rtype: Cassette
+    """
+    return _cassette
+
+
+@contextmanager
+def use_cassette(path, mode="replay"):
+    """Records the HTTP exchanges of the code in the context to a cassette file, or
+    replays them from it without any network access.
+
+    :param path: the path of the cassette file
+    :type path: str or Path
+    :param mode: "record" or "replay", defaults to "replay"
+    :type mode: str, optional
+    :return: the cassette (whose metadata is saved with it in record mode)
+    :rtype: Cassette
+
+    **Example**
+
+    .. code-block:: python
+
+        import wearipedia
+
+        device = wearipedia.get_device("whoop/whoop_4")
+
+        with wearipedia.use_cassette("whoop.json", mode="record"):
+            device.authenticate(creds)
+            cycles = device.get_data("cycles")
+
+        # later, and offline
+        with wearipedia.use_cassette("whoop.json"):
+            device.authenticate(creds)
+            cycles = device.get_data("cycles")
+    """
+    global _cassette
+
+    from requests.adapters import HTTPAdapter
+
+    cassette = Cassette(path, mode)
+    send = HTTPAdapter.send
+
+    def send_with_cassette(adapter, request, **kwargs):
+        if cassette.mode == "replay":
+            return cassette.play(request, adapter)
+
+        response = send(adapter, request, **kwargs)
+        cassette.record(request, response)
+
+        return response
+
+    with _cassette_lock:
+        if _cassette is not None:
+            raise RuntimeError("a cassette is already in use")
+
+        _cassette = cassette
+        HTTPAdapter.send = send_with_cassette
+
+    try:
+        yield cassette
+    finally:
+        with _cassette_lock:
+            HTTPAdapter.send = send
+            _cassette = None
+
+        if mode == "record":
+            cassette.save()
@@ -2,6 +2,8 @@ import argparse
 import json
 
 import wearipedia
+from wearipedia.batch import BatchJob, iter_batch
+from wearipedia.export import EXPORT_FORMATS, export_batch, write_json
 
 
 # The rudimentary command line interface for wearipedia
@@ -26,6 +28,12 @@ def parse_CLI():
     Example for synthetic data extraction: 
     wearipedia --extract garmin/fenix_7s --type steps --synthetic
 
+    Several devices and data types (or a job file) can be extracted at once, in
+    parallel, with the output streamed to an NDJSON, CSV or Parquet file (or to a
+    directory, with one file per device and data type):
+    wearipedia --extract whoop/whoop_4 withings/scanwatch --type cycles sleeps --synthetic -o out.ndjson
+    wearipedia --jobs jobs.json --synthetic --chunk 30D --format csv -o exports/
+
     """
     # Create parser for CL
     parser = argparse.ArgumentParser(
@@ -54,21 +62,46 @@ def parse_CLI():
         "-e",
         "--extract",
         type=str,
-        required=True,
-        help="the filepath to the notebook for the device and its model: -e /FILEPATH;",
+        nargs="+",
+        help="the device(s) to extract data from: -e whoop/whoop_4 [withings/scanwatch ...];",
     )
     parser.add_argument(
         "-t",
         "--type",
         type=str,
-        required=True,
-        help="the type of data to extracted: -t metric;",
+        nargs="+",
+        help="the type(s) of data to extract, from each device: -t metric [metric ...];",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=str,
+        help="a JSON file listing the jobs to extract, as objects with a 'device', a 'type' and optional 'params': -j /FILENAME;",
     )
     parser.add_argument(
         "-o",
         "--output_path",
         type=str,
-        help="the output file for the data to stored into (only .txt and.json files): -o /FILENAME;",
+        help="the output file for the data to stored into (.txt and .json files for a single job, .ndjson, .jsonl, .csv and .parquet files or a directory for a batch): -o /FILENAME;",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        choices=list(EXPORT_FORMATS),
+        help="the format to stream a batch in, instead of the one of the output file extension: -f ndjson;",
+    )
+    parser.add_argument(
+        "-c",
+        "--chunk",
+        type=str,
+        help="split the date range of each job into chunks of days, extracted and written one at a time: -c 7D;",
+    )
+    parser.add_argument(
+        "-p",
+        "--max_processes",
+        type=int,
+        help="the maximum number of processes generating synthetic data in parallel: -p 4;",
     )
 
     # Convert parsed CL into dictionary
@@ -127,7 +160,7 @@ def create_device_object(arg_dict: dict, remaining_args: list, synthetic: bool):
         print(raw_data)
 
     if output_file.lower().endswith(".json"):
-        json.dump(raw_data, open(output_file, "w"))
+        write_json(raw_data, output_file)
     elif output_file.lower().endswith(".txt"):
         with open(output_file, "w") as f:
             f.write(str(raw_data))
@@ -135,10 +168,122 @@ def create_device_object(arg_dict: dict, remaining_args: list, synthetic: bool):
         raise Exception("Invalid file extension.")
 
 
+# Lists the jobs of a batch: every data type of every device, or those of the job file,
+# each split into chunks of days if requested
+def get_batch_jobs(arg_dict: dict, remaining_args: list):
+    new_params = get_params_dict(remaining_args)
+
+    if arg_dict["jobs"]:
+        with open(arg_dict["jobs"]) as json_file:
+            jobs = [
+                (job["device"], job["type"], job.get("params", dict()))
+                for job in json.load(json_file)
+            ]
+    else:
+        jobs = [
+            (device_name, data_type, dict())
+            for device_name in arg_dict["extract"]
+            for data_type in arg_dict["type"]
+        ]
+
+    # the devices are only used for their params (and data types), in this process
+    devices = {
+        device_name: wearipedia.get_device(device_name)
+        for device_name in {device_name for device_name, _, _ in jobs}
+    }
+
+    if not arg_dict["jobs"]:
+        # the data types of each device, out of those requested
+        jobs = [job for job in jobs if job[1] in devices[job[0]].valid_data_types]
+
+        if len(jobs) == 0:
+            raise Exception(
+                f"None of the devices {arg_dict['extract']} has the data types {arg_dict['type']}."
+            )
+
+    for device_name, data_type, job_params in jobs:
+        params = devices[device_name]._default_params()
+        params.update(job_params)
+        params.update(new_params)
+
+        if arg_dict["chunk"]:
+            for chunk_params in devices[device_name]._chunk_params(
+                params, arg_dict["chunk"]
+            ):
+                yield BatchJob(device_name, data_type, chunk_params)
+        else:
+            yield BatchJob(device_name, data_type, params)
+
+
+# Runs a batch of jobs in parallel, streaming their data to the output in the order of
+# the jobs (so that running the same command twice writes the same file)
+def run_batch_jobs(arg_dict: dict, remaining_args: list, synthetic: bool):
+    jobs = list(get_batch_jobs(arg_dict, remaining_args))
+
+    auth_creds = dict()
+
+    if not synthetic:
+        with open(arg_dict["auth_creds"]) as json_file:
+            creds = json.load(json_file)
+
+        device_names = {job.device_name for job in jobs}
+
+        # either the credentials of each device, or those of the only device
+        if device_names <= set(creds):
+            auth_creds = {name: creds[name] for name in device_names}
+        elif len(device_names) == 1:
+            auth_creds = {device_names.pop(): creds}
+        else:
+            raise Exception(
+                "The credentials of a batch of several devices must map each device name to its credentials."
+            )
+
+    results = iter_batch(
+        jobs,
+        auth_creds=auth_creds,
+        max_processes=arg_dict["max_processes"],
+        ordered=True,
+    )
+
+    export_batch(results, arg_dict["output_path"], arg_dict["format"])
+
+
+# Whether the command line asks for a batch, rather than a single device and data type
+def is_batch(case: dict):
+    if case["jobs"] or case["format"] or case["chunk"]:
+        return True
+
+    if len(case["extract"] or []) > 1 or len(case["type"] or []) > 1:
+        return True
+
+    output_file = (case["output_path"] or "").lower()
+
+    return any(
+        output_file.endswith(suffix)
+        for suffixes in EXPORT_FORMATS.values()
+        for suffix in suffixes
+    )
+
+
 # Switch case implementation for Python version compatibility
 def switch(case: dict, remaining: list):
-    # go through each possible use case currently laid out
-    arg_keys = sorted(case.keys())
+    # wearipedia --extract whoop/whoop_4 withings/scanwatch --type cycles --synthetic -o out.ndjson
+    # wearipedia --jobs jobs.json --auth_creds path/to/creds.json -o out.csv
+    if (case["jobs"] or (case["extract"] and case["type"])) and is_batch(case):
+        if case["auth_creds"]:
+            run_batch_jobs(case, remaining, False)
+        elif case["synthetic"]:
+            run_batch_jobs(case, remaining, True)
+        else:
+            raise Exception(
+                "The following arguments ", case, " are not valid use cases currently."
+            )
+        return
+
+    if case["extract"] and case["type"]:
+        # a single device and data type
+        case = dict(case, extract=case["extract"][0], type=case["type"][0])
+
     # wearipedia --extract whoop/whoop_4 --type metrics --auth_creds path/to/creds.json
     if case["auth_creds"] and case["extract"] and case["type"]:
         create_device_object(case, remaining, False)
@@ -1,13 +1,47 @@
-from .apple import *
-from .cronometer import *
-from .dexcom import *
-from .dreem import *
-from .fitbit import *
-from .garmin import *
-from .google import *
-from .myfitnesspal import *
-from .oura import *
-from .polar import *
-from .strava import *
-from .whoop import *
-from .withings import *
+# vendor subpackages are only imported once one of their devices is used
+from ..lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "HealthKit": ".apple",
+        "Coros_pace_2": ".coros",
+        "Cronometer": ".cronometer",
+        "DexcomProCGM": ".dexcom",
+        "DreemHeadband2": ".dreem",
+        "Fitbit_charge_4": ".fitbit",
+        "Fitbit_charge_6": ".fitbit",
+        "Fitbit_sense": ".fitbit",
+        "Google_Pixel_Watch": ".fitbit",
+        "Fenix7S": ".garmin",
+        "GoogleFitness": ".google",
+        "MyFitnessPal": ".myfitnesspal",
+        "cgm": ".nutrisense",
+        "Oura_Ring_3": ".oura",
+        "H10": ".polar",
+        "PolarVantage": ".polar",
+        "VeritySense": ".polar",
+        "Strava": ".strava",
+        "Whoop4": ".whoop",
+        "BodyPlus": ".withings",
+        "ScanWatch": ".withings",
+        "SleepMat": ".withings",
+    },
+    [
+        ".apple",
+        ".coros",
+        ".cronometer",
+        ".dexcom",
+        ".dreem",
+        ".fitbit",
+        ".garmin",
+        ".google",
+        ".myfitnesspal",
+        ".nutrisense",
+        ".oura",
+        ".polar",
+        ".strava",
+        ".whoop",
+        ".withings",
+    ],
+)
@@ -4,7 +4,7 @@ import numpy as np
 import pandas as pd
 
 from ...devices.device import BaseDevice
-from ...utils import bin_search, seed_everything
+from ...utils import seed_everything
 from .apple_gen import *
 
 class_name = "HealthKit"
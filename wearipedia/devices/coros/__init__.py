@@ -1 +1,12 @@
-from .coros_pace_2 import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "Coros_pace_2": ".coros_pace_2",
+    },
+    [
+        ".coros_pace_2",
+    ],
+)
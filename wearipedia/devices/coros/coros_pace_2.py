@@ -1,7 +1,7 @@
 import collections
 from datetime import datetime, time, timedelta
 
-from ...utils import bin_search, seed_everything
+from ...utils import seed_everything
 from ..device import BaseDevice
 from .coros_pace_2_fetch import *
 from .coros_pace_2_gen import *
@@ -28,6 +28,8 @@ class Coros_pace_2(BaseDevice):
     :type synthetic_end_date: str, optional
     """
 
+    _end_date_inclusive = True
+
     def __init__(
         self,
         seed=0,
@@ -90,6 +92,7 @@ class Coros_pace_2(BaseDevice):
             self.user,
             start_date=self.init_params["start_date"],
             end_date=self.init_params["end_date"],
+            session=self.http_session,
         )
         return data
 
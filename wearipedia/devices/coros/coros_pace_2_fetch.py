@@ -1,11 +1,11 @@
 from typing import List
 
-import requests as rq
+from ...sessions import get_session
 
 __all__ = ["fetch_real_data"]
 
 
-def fetch_real_data(data_type, access_token, start_date, end_date):
+def fetch_real_data(data_type, access_token, start_date, end_date, session=None):
     """Main function for fetching real data from the Fitbit API.
     :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
     :type start_date: str
@@ -15,16 +15,21 @@ def fetch_real_data(data_type, access_token, start_date, end_date):
     :type data_type: str
     :param access_token: access token for the API
     :type access_token: str
+    :param session: the session to send the requests with, defaults to the shared session
+    :type session: requests.Session, optional
     :return: the data fetched from the API according to the inputs
     :rtype: List
     """
     # From intercepting the API requests, we were able to retrieve the following requests
 
+    # all the requests reuse the connections of the session
+    session = get_session(session)
+
     # dictionary to aggregate the data in
     data = dict()
 
     ## Getting user data
-    response = rq.post(
+    response = session.post(
         url=f"https://api.coros.com/coros/data/userExtend/query?accessToken={access_token}"
     )
     data["user_data"] = response.text
@@ -39,7 +44,7 @@ def fetch_real_data(data_type, access_token, start_date, end_date):
         "statisticType": 1,
     }
 
-    response = rq.post(
+    response = session.post(
         url=f"https://api.coros.com/coros/data/statistic/daily?accessToken={access_token}",
         json=j,
     )
@@ -55,7 +60,7 @@ def fetch_real_data(data_type, access_token, start_date, end_date):
         "statisticType": 1,
     }
 
-    response = rq.post(
+    response = session.post(
         url=f"https://api.coros.com/coros/data/statistic/daily?accessToken={access_token}",
         json=j,
     )
@@ -71,7 +76,7 @@ def fetch_real_data(data_type, access_token, start_date, end_date):
         "statisticType": 1,
     }
 
-    response = rq.post(
+    response = session.post(
         url=f"https://api.coros.com/coros/data/statistic/daily?accessToken={access_token}",
         json=j,
     )
@@ -84,7 +89,7 @@ def fetch_real_data(data_type, access_token, start_date, end_date):
         "size": 20,
     }
 
-    response = rq.post(
+    response = session.post(
         url=f"https://api.coros.com/coros/data/sport/query?accessToken={access_token}",
         json=j,
     )
@@ -101,7 +106,7 @@ def fetch_real_data(data_type, access_token, start_date, end_date):
         "statisticType": 1,
     }
 
-    response = rq.post(
+    response = session.post(
         url=f"https://api.coros.com/coros/data/statistic/daily?accessToken={access_token}",
         json=j,
     )
@@ -115,7 +120,7 @@ def fetch_real_data(data_type, access_token, start_date, end_date):
         "dataVersion": 1,
         "statisticType": 1,
     }
-    response = rq.post(
+    response = session.post(
         url=f"https://api.coros.com/coros/data/statistic/daily?accessToken={access_token}",
         json=j,
     )
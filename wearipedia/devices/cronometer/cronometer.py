@@ -1,8 +1,6 @@
 from datetime import datetime
 
 import pandas as pd
-import requests
-from bs4 import BeautifulSoup
 
 from ...devices.device import BaseDevice
 from ...utils import seed_everything
@@ -101,9 +99,11 @@ class Cronometer(BaseDevice):
         )
 
     def _authenticate(self, auth_creds):
+        # the HTML parser is only needed (and imported) for real data
+        from bs4 import BeautifulSoup
 
-        # creating a requests session to store cookies
-        s = requests.Session()
+        # the session of the device stores the cookies
+        s = self.http_session
 
         # saving the session to the class
         self.session = s
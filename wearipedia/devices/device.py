@@ -4,9 +4,57 @@ device.py
 The core module for the wearipedia library.
 """
 
+import re
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from functools import partial
+
+from ..aio import get_async_client
+from ..cache import get_synthetic_cache
+from ..instrumentation import ameasure, measure
+from ..sessions import create_session, set_cache_user
+from ..sync import DEFAULT_OVERLAP, sync_data
+from ..utils import TimeIndex, derive_seed, seed_everything
+
 __all__ = ["BaseDevice"]
 
 
+class SyntheticDays(Sequence):
+    """A sequence of synthetic data with one element per day, where each day is only
+    generated (by the device that owns the sequence) the first time it is accessed.
+    Slicing returns a list, so filtering a window of days only generates those days.
+
+    :param gen_days: a callable taking the indices of some days and returning the data
+        generated for each of them, as a dictionary of data type to data
+    :type gen_days: Callable
+    :param data_type: the data type of the elements of the sequence
+    :type data_type: str
+    :param dates: the dates covered by the sequence, as strings in the format "YYYY-MM-DD"
+    :type dates: List
+    """
+
+    def __init__(self, gen_days, data_type, dates):
+        self._gen_days = gen_days
+        self.data_type = data_type
+        self.dates = dates
+
+    def __len__(self):
+        return len(self.dates)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = list(range(*index.indices(len(self))))
+
+            return [day[self.data_type] for day in self._gen_days(indices)]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("day index out of range")
+
+        return self._gen_days([index])[0][self.data_type]
+
+
 class BaseDevice:
     """This class is a base class for all devices. It should not be instantiated directly.
     Instead, you should instantiate a child class of this class, which should be specific to
@@ -27,8 +75,32 @@ class BaseDevice:
 
     * _authenticate
 
+    Instead of implementing _gen_synthetic, a child class may register one generator
+    per data type (or group of data types) with _register_synthetic_generator(), in which
+    case only the requested data type and the data types it depends on are generated.
+    Generators registered with a list of dates are called once per day, so that only the
+    days that are requested are generated.
+
     """
 
+    # whether the end date of the params (see _default_params) is part of the requested
+    # window, used by iter_data() to split the window into chunks without gaps or overlap
+    _end_date_inclusive = False
+
+    # data types whose synthetic data is not filtered by the date range of the params
+    # (e.g. summaries of the whole synthetic range), which iter_data() yields in a single
+    # chunk rather than once per chunk
+    _undated_data_types = set()
+
+    # the init params setting the synthetic date range, which the data of a day generated
+    # by a per day generator does not depend on (so the on-disk cache shares such days
+    # between devices with different ranges)
+    _synthetic_range_params = ["synthetic_start_date", "synthetic_end_date"]
+
+    # data type -> the fields identifying a record, used by sync() to de-duplicate the
+    # records fetched again (by default, records are identified by all their fields)
+    _sync_keys = dict()
+
     def __init__(self, **kwargs):
         """Initializes the device. If you are implementing a child device, the overrided
         __init__() should call _initialize_device_params().
@@ -64,6 +136,11 @@ class BaseDevice:
         self._authenticated = False
         self.valid_data_types = valid_data_types
         self._synthetic_has_been_generated = False
+        self._synthetic_generators = dict()
+        self._synthetic_generated = set()
+        self._synthetic_days = dict()
+        self._time_indexes = dict()
+        self.http_session = None
         self.init_params = default_init_params
 
         if params is None:
@@ -104,10 +181,286 @@ class BaseDevice:
         """Generates synthetic data for the device. This is automatically called by get_data()
         exactly once, when the user calls get_data() without first calling authenticate().
 
-        :raises NotImplementedError: for now, raises NotImplementedError, but should be implemented
-            by child classes.
+        Child classes that register per data type generators with
+        _register_synthetic_generator() do not need to implement this method, as get_data()
+        then generates each data type on demand. In that case, calling this method generates
+        all valid data types at once.
+
+        :raises NotImplementedError: if the child class neither implements this method nor
+            registers any synthetic data generators.
         """
-        raise NotImplementedError
+        if not self._synthetic_generators:
+            raise NotImplementedError
+
+        for data_type in self.valid_data_types:
+            self._gen_synthetic_data_type(data_type)
+
+    def _register_synthetic_generator(
+        self, data_types, generator, depends_on=None, dates=None
+    ):
+        """Registers a generator of synthetic data for one or more data types. This should
+        be called in __init__, after _initialize_device_params().
+
+        The generator is called with the data types it depends on as keyword arguments,
+        and must return a dictionary mapping each of `data_types` to its data. Data types
+        that are generated together (e.g. because they are derived from the same random
+        draws) should be registered with a single generator.
+
+        If `dates` is given, the generator is instead called once per date, with the date
+        as its first argument and the data that its dependencies (which must also be
+        registered with the same dates) generated for that date, and must return the data
+        for that date only. Each data type is then a `SyntheticDays` sequence, and only
+        the days that are accessed (e.g. by _filter_synthetic) are generated.
+
+        Each generator is seeded independently from the device seed (and, for per day
+        generators, the date), so that the synthetic data does not depend on the order
+        in which data types or days are requested.
+
+        :param data_types: the data types produced by the generator
+        :type data_types: List
+        :param generator: a callable returning a dictionary of data type to data
+        :type generator: Callable
+        :param depends_on: data types that must be generated before, and passed to, the
+            generator, defaults to None
+        :type depends_on: List, optional
+        :param dates: the dates to generate data for one day at a time, as strings in the
+            format "YYYY-MM-DD", defaults to None
+        :type dates: List, optional
+        """
+        entry = (list(data_types), generator, list(depends_on or []), dates)
+
+        for data_type in data_types:
+            self._synthetic_generators[data_type] = entry
+
+    def _synthetic_seed(self, *keys):
+        """Returns the seed to use for generating the synthetic data identified by keys.
+
+        :return: a seed derived from the device seed, the device and the keys
+        :rtype: int
+        """
+        return derive_seed(
+            self.init_params.get("seed", 0), self.__class__.__name__, *keys
+        )
+
+    def _gen_synthetic_data_type(self, data_type):
+        """Generates synthetic data for a single data type (and the data types it depends
+        on) using the registered generator, unless it has already been generated. The data
+        is set as a member attribute named after the data type.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+
+        :param data_type: a string describing the type of data to generate.
+        :type data_type: str
+        """
+        if data_type in self._synthetic_generated:
+            return
+
+        data_types, generator, depends_on, dates = self._synthetic_generators[data_type]
+
+        for dependency in depends_on:
+            self._gen_synthetic_data_type(dependency)
+
+        if dates is None:
+
+            def generate():
+                seed_everything(self._synthetic_seed(*data_types))
+
+                return generator(
+                    **{
+                        dependency: getattr(self, dependency)
+                        for dependency in depends_on
+                    }
+                )
+
+            syn_data = self._cached_synthetic(data_types, generate)
+        else:
+            # days are only generated once they are accessed
+            self._synthetic_days[data_types[0]] = dict()
+            gen_days = partial(self._gen_synthetic_days, data_types[0])
+
+            syn_data = {key: SyntheticDays(gen_days, key, dates) for key in data_types}
+
+        for key in data_types:
+            setattr(self, key, syn_data[key])
+            self._synthetic_generated.add(key)
+
+    def _gen_synthetic_days(self, data_type, indices):
+        """Returns the synthetic data of some days for the per day generator that produces
+        data_type, generating the days that have not been generated yet. These are loaded
+        from the on-disk synthetic data cache instead if it is enabled and holds them, as a
+        single entry, so that a window of days is stored and loaded at once.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+
+        :param data_type: the first data type produced by the generator
+        :type data_type: str
+        :param indices: the indices of the days in the dates of the generator
+        :type indices: List
+        :return: the data of each day, as a dictionary of data type to data
+        :rtype: List
+        """
+        days = self._synthetic_days[data_type]
+        missing = [index for index in indices if index not in days]
+
+        if missing:
+            data_types, _, _, dates = self._synthetic_generators[data_type]
+
+            def generate():
+                generated = [
+                    self._gen_synthetic_day(data_type, index) for index in missing
+                ]
+
+                return {key: [day[key] for day in generated] for key in data_types}
+
+            syn_data = self._cached_synthetic(
+                data_types, generate, *[dates[index] for index in missing]
+            )
+
+            for i, index in enumerate(missing):
+                days[index] = {key: syn_data[key][i] for key in data_types}
+
+        return [days[index] for index in indices]
+
+    def _gen_synthetic_day(self, data_type, index):
+        """Generates the synthetic data of a single day for the per day generator that
+        produces data_type, unless it has already been generated.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+
+        :param data_type: the first data type produced by the generator
+        :type data_type: str
+        :param index: the index of the day in the dates of the generator
+        :type index: int
+        :return: the data generated for that day, as a dictionary of data type to data
+        :rtype: Dict
+        """
+        days = self._synthetic_days[data_type]
+
+        if index not in days:
+            data_types, generator, depends_on, dates = self._synthetic_generators[
+                data_type
+            ]
+
+            def generate():
+                # generate the dependencies first, since they are seeded separately (and
+                # in memory, since only the requested data types are cached on disk)
+                dependencies = {
+                    dependency: self._gen_synthetic_day(
+                        self._synthetic_generators[dependency][0][0], index
+                    )[dependency]
+                    for dependency in depends_on
+                }
+
+                seed_everything(self._synthetic_seed(*data_types, dates[index]))
+
+                return generator(dates[index], **dependencies)
+
+            days[index] = self._shared_synthetic_day(data_types, generate, dates[index])
+
+        return days[index]
+
+    def _shared_synthetic_day(self, data_types, generate, date):
+        """Returns the synthetic data of a single day produced by generate(), a dictionary
+        of data type to data. Devices whose days can be shared with other devices (e.g.
+        the models of a family, seeded alike) may override this method to look them up
+        in a shared cache before generating them.
+
+        :param data_types: the data types produced by generate()
+        :type data_types: List
+        :param generate: a callable generating the data
+        :type generate: Callable
+        :param date: the date of the day, as a string in the format "YYYY-MM-DD"
+        :type date: str
+        :return: a dictionary of data type to data
+        :rtype: Dict
+        """
+        return generate()
+
+    def _gen_synthetic_cached(self):
+        """Calls _gen_synthetic(), unless the on-disk synthetic data cache is enabled and
+        already holds the data of every valid data type, in which case it is loaded instead.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+        """
+
+        def generate():
+            self._gen_synthetic()
+
+            return {
+                data_type: getattr(self, data_type)
+                for data_type in self.valid_data_types
+            }
+
+        syn_data = self._cached_synthetic(self.valid_data_types, generate)
+
+        for data_type in self.valid_data_types:
+            setattr(self, data_type, syn_data[data_type])
+
+    def _drop_synthetic_days(self):
+        """Drops the days generated so far by the per day generators, which are generated
+        again (identically) if they are accessed later. Devices that also keep these days
+        elsewhere, e.g. in a cache shared by several devices, should override this method
+        to drop them there as well.
+        """
+        for days in self._synthetic_days.values():
+            days.clear()
+
+    def _cached_synthetic(self, data_types, generate, *keys):
+        """Returns the synthetic data produced by generate(), a dictionary of data type to
+        data, loading it from the on-disk synthetic data cache instead if it is enabled
+        and holds the data (see `wearipedia.enable_synthetic_cache`).
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+
+        :param data_types: the data types produced by generate()
+        :type data_types: List
+        :param generate: a callable generating the data
+        :type generate: Callable
+        :param keys: any further keys identifying the data, e.g. the dates of the days it
+            holds
+        :return: a dictionary of data type to data
+        :rtype: Dict
+        """
+        cache = get_synthetic_cache()
+
+        if cache is None:
+            return generate()
+
+        key = cache.key(self, data_types, *keys)
+        syn_data = cache.load(key, data_types)
+
+        if syn_data is None:
+            syn_data = generate()
+            cache.store(
+                key, {data_type: syn_data[data_type] for data_type in data_types}
+            )
+
+        return syn_data
+
+    def _time_index(self, data_type, data, get_timestamps):
+        """Returns the TimeIndex of the synthetic data of data_type, for _filter_synthetic()
+        to select a time range of the data with a binary search. The index is built with
+        get_timestamps(data) once, the first time the data is filtered, and rebuilt only if
+        the data is regenerated.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+
+        :param data_type: the data type of the data
+        :type data_type: str
+        :param data: the synthetic data of data_type
+        :type data: DataFrame or List or Dict
+        :param get_timestamps: a callable returning the timestamp of each element of data
+        :type get_timestamps: Callable
+        :return: the index of the data
+        :rtype: TimeIndex
+        """
+        indexed_data, index = self._time_indexes.get(data_type, (None, None))
+
+        if indexed_data is not data:
+            index = TimeIndex(get_timestamps(data))
+            self._time_indexes[data_type] = (data, index)
+
+        return index
 
     def _default_params(self):
         """Returns default parameters for API extraction.
@@ -131,7 +484,9 @@ class BaseDevice:
         get_data(), but instead are generating data once and storing it in a member attribute.
 
         Generating data all at once for the entire time period is not very slow, and is
-        necessary for the synthetic data to be consistent across calls to get_data().
+        necessary for the synthetic data to be consistent across calls to get_data(). Devices
+        that register per data type generators only generate the requested data type (and
+        its dependencies) on the first call for that data type.
 
         IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
 
@@ -150,20 +505,231 @@ class BaseDevice:
         if params is None:
             params = self._default_params()
 
+        # the phases are measured if instrumentation is enabled, see instrumentation.py
+        return measure(self, data_type, "get_data", self._get_data, data_type, params)
+
+    def _get_data(self, data_type, params):
         if self.authenticated:
-            return self._get_real(data_type, params)
-        else:
-            if self.synthetic_has_been_generated:
-                return self._filter_synthetic(
-                    getattr(self, data_type), data_type, params
-                )
-            else:
-                self._gen_synthetic()
-                self._synthetic_has_been_generated = True
-                return self._filter_synthetic(
-                    getattr(self, data_type), data_type, params
+            return measure(
+                self, data_type, "get_real", self._get_real, data_type, params
+            )
+
+        if data_type in self._synthetic_generators:
+            measure(
+                self,
+                data_type,
+                "gen_synthetic",
+                self._gen_synthetic_data_type,
+                data_type,
+            )
+        elif not self.synthetic_has_been_generated:
+            measure(self, data_type, "gen_synthetic", self._gen_synthetic_cached)
+
+        self._synthetic_has_been_generated = True
+
+        return measure(
+            self,
+            data_type,
+            "filter_synthetic",
+            self._filter_synthetic,
+            getattr(self, data_type),
+            data_type,
+            params,
+        )
+
+    async def aget_data(self, data_type, params=None):
+        """Coroutine version of get_data(), so that the data of many devices and data types
+        can be fetched concurrently from a single event loop, e.g. with asyncio.gather().
+
+        Synthetic data is generated in the event loop itself, since generating it
+        concurrently from several threads would break its reproducibility.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+        Override _aget_real() instead.
+
+        :param data_type: a string describing the type of data to get.
+        :type data_type: str
+        :param params: dictionary containing parameters for API extraction, defaults to None
+        :type params: Dict, optional
+        :raises ValueError: if data_type is not in valid_data_types
+        :return: returns the data from the API (or synthetic data if not authenticated)
+        :rtype: List or DataFrame or Series or Dict
+
+        **Example**
+
+        .. code-block:: python
+
+            import asyncio
+
+            import wearipedia
+
+            device = wearipedia.get_device("oura/oura_ring3")
+            device.authenticate(token)
+
+            async def main():
+                return await asyncio.gather(
+                    *[device.aget_data(data_type) for data_type in ["sleep", "activity"]]
                 )
 
+            sleep, activity = asyncio.run(main())
+        """
+        if not data_type in self.valid_data_types:
+            raise ValueError(f"data_type must be in {list(self.valid_data_types)}")
+
+        if params is None:
+            params = self._default_params()
+
+        if self.authenticated:
+            return await ameasure(
+                self, data_type, "get_real", self._aget_real, data_type, params
+            )
+        else:
+            return self.get_data(data_type, params)
+
+    async def _aget_real(self, data_type, params):
+        """Coroutine version of _get_real(). By default, this runs _get_real() in the
+        worker threads of the shared async client (see `wearipedia.aio`), but child classes
+        whose API calls are independent of each other can override this to issue them
+        concurrently.
+
+        :param data_type: a string describing the type of data to get.
+        :type data_type: str
+        :param params: dictionary containing parameters for API extraction
+        :type params: Dict
+        :return: returns the data from the API
+        :rtype: List or DataFrame or Series or Dict
+        """
+        return await get_async_client().run(self._get_real, data_type, params)
+
+    def iter_data(self, data_type, params=None, chunk="1D"):
+        """Gets data like get_data(), but lazily, one chunk of days at a time. Each chunk
+        is what get_data() returns for that part of the date range of params, so
+        downstream code can process each chunk and drop it before the next one is
+        fetched (or generated, for devices that generate synthetic data one day at a
+        time).
+
+        Chunks do not overlap: the date range is split into consecutive, half-open ranges
+        of days. Devices whose params have no date range, and synthetic data types that are
+        not filtered by date (see _undated_data_types), yield a single chunk with all the
+        data.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+
+        :param data_type: a string describing the type of data to get.
+        :type data_type: str
+        :param params: dictionary containing parameters for API extraction, defaults to None
+        :type params: Dict, optional
+        :param chunk: the number of days per chunk, as an int, a timedelta or a string
+            such as "1D" or "7D", defaults to "1D"
+        :type chunk: str, optional
+        :raises ValueError: if data_type is not in valid_data_types, or chunk is not a
+            positive number of days
+        :return: a generator of chunks of data, each of the same type as get_data() returns
+        :rtype: Generator
+        """
+        if not data_type in self.valid_data_types:
+            raise ValueError(f"data_type must be in {list(self.valid_data_types)}")
+
+        if not self.authenticated and data_type in self._undated_data_types:
+            yield self.get_data(data_type, params)
+            return
+
+        for chunk_params in self._chunk_params(params, chunk):
+            yield self.get_data(data_type, chunk_params)
+
+            # drop the synthetic days of this chunk, so that memory stays flat (they
+            # are generated again, identically, if they are requested later)
+            self._drop_synthetic_days()
+
+    def sync(
+        self,
+        data_type,
+        store=None,
+        start=None,
+        end=None,
+        user=None,
+        overlap=DEFAULT_OVERLAP,
+    ):
+        """Gets real data like get_data(), but incrementally: the data is kept in a local
+        store along with the date up to which it was fully fetched (its high-water mark),
+        and later calls only fetch the data from that date on, less `overlap` days, and
+        append it to the stored data without duplicates. See `wearipedia.sync`.
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+        Set _sync_keys instead, if records can be identified by some of their fields.
+
+        :param data_type: a string describing the type of data to get.
+        :type data_type: str
+        :param store: the store (or the directory of the store), defaults to the directory
+            in the ``WEARIPEDIA_SYNC_DIR`` environment variable
+        :type store: SyncStore or str, optional
+        :param start: the date to fetch data from on the first sync, defaults to the
+            start date of the default params
+        :type start: str, optional
+        :param end: the date to fetch data up to (excluded), defaults to tomorrow
+        :type end: str, optional
+        :param user: the user of the data, defaults to a hash of the credentials (pass a
+            stable ID if the credentials change between runs, e.g. refresh tokens)
+        :type user: str, optional
+        :param overlap: the number of days before the high-water mark to fetch again,
+            defaults to 1
+        :type overlap: int, optional
+        :raises ValueError: if the device is not authenticated, data_type is not in
+            valid_data_types, or the params of the device have no date range
+        :return: all the synced data
+        :rtype: DataFrame or List
+        """
+        return sync_data(self, data_type, store, start, end, user, overlap)
+
+    def _chunk_params(self, params=None, chunk="1D"):
+        """Splits the date range of params into chunks of days, see iter_data().
+
+        IF YOU ARE IMPLEMENTING A NEW DEVICE, YOU SHOULD NOT NEED TO OVERRIDE THIS METHOD.
+
+        :param params: dictionary containing parameters for API extraction, defaults to
+            the default params of the device
+        :type params: Dict, optional
+        :param chunk: the number of days per chunk, see iter_data(), defaults to "1D"
+        :type chunk: str, optional
+        :raises ValueError: if chunk is not a positive number of days
+        :return: a generator of the params of each chunk, or of params itself if it has no
+            date range
+        :rtype: Generator
+        """
+        step = _parse_chunk(chunk)
+
+        if params is None:
+            params = self._default_params()
+
+        if "start_date" in params and "end_date" in params:
+            start_key, end_key = "start_date", "end_date"
+        elif "start" in params and "end" in params:
+            start_key, end_key = "start", "end"
+        else:
+            yield params
+            return
+
+        date_format = "%Y-%m-%d"
+        start = datetime.strptime(str(params[start_key])[:10], date_format)
+        end = datetime.strptime(str(params[end_key])[:10], date_format)
+
+        if self._end_date_inclusive:
+            # work with an exclusive end date, and convert back for each chunk
+            end += timedelta(days=1)
+
+        while start < end:
+            chunk_end = min(start + step, end)
+
+            chunk_params = dict(params)
+            chunk_params[start_key] = start.strftime(date_format)
+            chunk_params[end_key] = (
+                chunk_end - timedelta(days=1) if self._end_date_inclusive else chunk_end
+            ).strftime(date_format)
+
+            yield chunk_params
+
+            start = chunk_end
+
     def _authenticate(self, auth_creds):
         """Authenticates the device. This is called by the authenticate() method.
 
@@ -186,6 +752,13 @@ class BaseDevice:
         :type auth_creds: Dict
         """
 
+        # all the requests of the device reuse the connections of its own session
+        if self.http_session is None:
+            self.http_session = create_session()
+
+        # cached responses are kept apart per user, see wearipedia.http_cache
+        set_cache_user(self.http_session, auth_creds)
+
         self._authenticate(auth_creds)
         self._authenticated = True
 
@@ -196,3 +769,23 @@ class BaseDevice:
     @property
     def synthetic_has_been_generated(self):
         return self._synthetic_has_been_generated
+
+
+def _parse_chunk(chunk):
+    if isinstance(chunk, str):
+        match = re.fullmatch(r"(\d+)D", chunk.strip(), flags=re.IGNORECASE)
+
+        if match is None:
+            raise ValueError(
+                f'chunk must be a number of days such as "1D", got {chunk}'
+            )
+
+        chunk = int(match.group(1))
+
+    if isinstance(chunk, int):
+        chunk = timedelta(days=chunk)
+
+    if chunk < timedelta(days=1) or chunk % timedelta(days=1):
+        raise ValueError(f"chunk must be a positive number of days, got {chunk}")
+
+    return chunk
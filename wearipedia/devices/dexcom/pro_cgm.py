@@ -5,7 +5,7 @@ import numpy as np
 import pandas as pd
 
 from ...devices.device import BaseDevice
-from ...utils import bin_search, seed_everything
+from ...utils import seed_everything
 from .pro_cgm_fetch import *
 from .pro_cgm_gen import *
 
@@ -60,24 +60,22 @@ class DexcomProCGM(BaseDevice):
             self.access_token,
             start_date=params["start_date"],
             end_date=params["end_date"],
+            session=self.http_session,
         )
 
     def _filter_synthetic(self, data, data_type, params):
         # there is really only one data type for this device,
         # so we don't need to check the data_type
 
-        start_ts = pd.Timestamp(params["start_date"])
-        end_ts = pd.Timestamp(params["end_date"])
-
-        timestamps = [pd.Timestamp(x["systemTime"]) for x in self.data["egvs"]]
-
-        start_idx = bin_search(timestamps, start_ts)
-        end_idx = bin_search(timestamps, end_ts)
+        egvs = data["egvs"]
+        index = self._time_index(
+            data_type, egvs, lambda egvs: [egv["systemTime"] for egv in egvs]
+        )
 
         return {
             "unit": "mg/dL",
             "rateUnit": "mg/dL/min",
-            "egvs": self.data["egvs"][start_idx:end_idx],
+            "egvs": index.select(egvs, params["start_date"], params["end_date"]),
         }
 
     def _gen_synthetic(self):
@@ -93,6 +91,10 @@ class DexcomProCGM(BaseDevice):
         if use_cache and hasattr(self, "access_token"):
             return
 
+        if "access_token" in auth_creds:
+            self.access_token = auth_creds["access_token"]
+            return
+
         if "refresh_token" in auth_creds:
             self.refresh_token, self.access_token = refresh_access_token(
                 auth_creds["refresh_token"],
@@ -7,25 +7,32 @@ from datetime import datetime
 import pandas as pd
 import requests
 
+from ...sessions import get_session
+from ...tokens import refresh_tokens
+
 __all__ = ["refresh_access_token", "dexcom_authenticate", "fetch_data"]
 
 
 def refresh_access_token(refresh_token, client_id, client_secret):
-    # gives us access token given the refresh token
-
-    params = {
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "refresh_token": refresh_token,
-        "grant_type": "refresh_token",
-        "redirect_uri": "https://www.google.com",
-    }
+    # gives us access token given the refresh token, unless the token store already
+    # has a fresh one (e.g. refreshed by another worker)
+
+    def request_tokens(refresh_token):
+        params = {
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "refresh_token": refresh_token,
+            "grant_type": "refresh_token",
+            "redirect_uri": "https://www.google.com",
+        }
+
+        out = requests.post("https://api.dexcom.com/v2/oauth2/token", data=params)
 
-    out = requests.post("https://api.dexcom.com/v2/oauth2/token", data=params)
+        body = json.loads(out.text)
 
-    body = json.loads(out.text)
+        return body["refresh_token"], body["access_token"], body.get("expires_in")
 
-    return body["refresh_token"], body["access_token"]
+    return refresh_tokens("DEXCOM", refresh_token, request_tokens, client_id)
 
 
 def dexcom_authenticate(your_client_id, your_client_secret):
@@ -81,7 +88,9 @@ def dexcom_authenticate(your_client_id, your_client_secret):
     return refresh_token, access_token
 
 
-def fetch_data(access_token, start_date="2022-02-16", end_date="2022-05-15"):
+def fetch_data(
+    access_token, start_date="2022-02-16", end_date="2022-05-15", session=None
+):
     start_date = start_date + "T15:30:00"
     end_date = end_date + "T15:45:00"
 
@@ -89,7 +98,7 @@ def fetch_data(access_token, start_date="2022-02-16", end_date="2022-05-15"):
 
     endpoint = f"https://api.dexcom.com/v2/users/self/egvs?startDate={start_date}&endDate={end_date}"
 
-    out = json.loads(requests.get(endpoint, headers=headers).text)
+    out = json.loads(get_session(session).get(endpoint, headers=headers).text)
 
     if "errors" in out.keys():
         exception_str = (
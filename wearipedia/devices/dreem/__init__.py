@@ -0,0 +1,12 @@
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "DreemHeadband2": ".headband_2",
+    },
+    [
+        ".headband_2",
+    ],
+)
@@ -3,9 +3,10 @@ import os
 from pathlib import Path
 
 import pandas as pd
-import requests
 from tqdm import tqdm
 
+from ...sessions import get_session
+
 EEG_LOCAL_DIR = "/tmp/wearipedia-cache/dreem/headband_2"
 
 os.makedirs(EEG_LOCAL_DIR, exist_ok=True)
@@ -16,7 +17,7 @@ def get_aux_records(auth_dict):
 
     headers = {"Authorization": "Bearer " + auth_dict["token"]}
 
-    out = requests.get(url, headers=headers)
+    out = get_session().get(url, headers=headers)
 
     out_dict = json.loads(out.text)
 
@@ -32,11 +33,15 @@ def get_user2id_mapping(auth_dict, user_ids):
 
     payload = {"id": [user_id for user_id in user_ids]}
 
-    out = requests.post(
-        url,
-        headers=headers,
-        data='{"id":["ce73192e-874c-4576-a2e3-27b0dc0ebcee","1222a474-bc02-44ab-b4c5-d66dc34620b7","e1ec95b0-b71b-4499-b73c-cf9b1e3576c2"]}',
-    ).text
+    out = (
+        get_session()
+        .post(
+            url,
+            headers=headers,
+            data='{"id":["ce73192e-874c-4576-a2e3-27b0dc0ebcee","1222a474-bc02-44ab-b4c5-d66dc34620b7","e1ec95b0-b71b-4499-b73c-cf9b1e3576c2"]}',
+        )
+        .text
+    )
 
     return {x["pseudo"]: x["dreemer"] for x in json.loads(out)}
 
@@ -75,7 +80,7 @@ def get_table_records(auth_dict, record_ids):
     payload = {"id": record_ids}
 
     out_dict = json.loads(
-        requests.post(url, headers=headers, data=json.dumps(payload)).text
+        get_session().post(url, headers=headers, data=json.dumps(payload)).text
     )
 
     return out_dict
@@ -174,7 +179,7 @@ def get_download_info(auth_dict, record_ref):
 
     headers = {"Authorization": "Bearer " + auth_dict["token"]}
 
-    out_dict = json.loads(requests.get(url, headers=headers).text)
+    out_dict = json.loads(get_session().get(url, headers=headers).text)
 
     return out_dict
 
@@ -185,7 +190,7 @@ def fetch_hypnogram(auth_dict, record_ref):
 
     headers = {"Authorization": "Bearer " + auth_dict["token"]}
 
-    hypnogram_text = requests.get(url, headers=headers).text
+    hypnogram_text = get_session().get(url, headers=headers).text
 
     from io import StringIO
 
@@ -211,7 +216,7 @@ def fetch_eeg_file(auth_dict, record_ref):
     download_path = Path(EEG_LOCAL_DIR) / (str(record_ref) + ".h5")
 
     # Streaming, so we can iterate over the response.
-    response = requests.get(download_url, stream=True)
+    response = get_session().get(download_url, stream=True)
     total_size_in_bytes = int(response.headers.get("content-length", 0))
     block_size = 1024  # 1 Kibibyte
     progress_bar = tqdm(total=total_size_in_bytes, unit="iB", unit_scale=True)
@@ -1,3 +1,18 @@
-from .fitbit_charge_4 import *
-from .fitbit_charge_6 import *
-from .fitbit_sense import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "Fitbit_charge_4": ".fitbit_charge_4",
+        "Fitbit_charge_6": ".fitbit_charge_6",
+        "Fitbit_sense": ".fitbit_sense",
+        "Google_Pixel_Watch": ".google_pixel_watch",
+    },
+    [
+        ".fitbit_charge_4",
+        ".fitbit_charge_6",
+        ".fitbit_sense",
+        ".google_pixel_watch",
+    ],
+)
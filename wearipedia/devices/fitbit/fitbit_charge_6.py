@@ -1,17 +1,10 @@
-from datetime import datetime, time, timedelta
-
-import numpy as np
-
-from ...utils import bin_search, seed_everything
-from ..device import BaseDevice
 from .fitbit_authenticate import *
-from .fitbit_sense_fetch import *
-from .fitbit_sense_gen import *
+from .fitbit_device import FitbitDevice
 
 class_name = "Fitbit_charge_6"
 
 
-class Fitbit_charge_6(BaseDevice):
+class Fitbit_charge_6(FitbitDevice):
     """This device allows you to work with data from the `Fitbit charge  <(https://www.fitbit.com/global/au/products/trackers/charge6)>`_ device.
     Available datatypes for this device are:
 
@@ -30,99 +23,31 @@ class Fitbit_charge_6(BaseDevice):
 
     :param seed: random seed for synthetic data generation, defaults to 0
     :type seed: int, optional
-    :param synthetic_start_date: start date for synthetic data generation, defaults to "2024-04-01"
+    :param synthetic_start_date: start date for synthetic data generation, defaults to "2024-01-01"
     :type synthetic_start_date: str, optional
-    :param synthetic_end_date: end date for synthetic data generation, defaults to "2024-05-13"
+    :param synthetic_end_date: end date for synthetic data generation, defaults to "2024-01-31"
     :type synthetic_end_date: str, optional
+    :param columnar: whether the heart rate datasets and active zone minutes are returned as `HeartRateDataset` and `ActiveZoneMinutes` (holding NumPy arrays) rather than lists of dictionaries, defaults to False
+    :type columnar: bool, optional
     """
 
-    def __init__(
-        self,
-        seed=0,
-        synthetic_start_date="2024-01-01",
-        synthetic_end_date="2024-01-31",
-    ):
-
-        params = {
-            "seed": seed,
-            "synthetic_start_date": synthetic_start_date,
-            "synthetic_end_date": synthetic_end_date,
-        }
-
-        self._initialize_device_params(
-            [
-                "intraday_breath_rate",
-                "intraday_active_zone_minute",
-                "intraday_heart_rate",
-                "intraday_hrv",
-                "intraday_spo2",
-                "sleep",
-                "steps",
-                "minutesVeryActive",
-                "minutesLightlyActive",
-                "minutesFairlyActive",
-                "distance",
-                "minutesSedentary",
-            ],
-            params,
-            {
-                "seed": 0,
-                "synthetic_start_date": "2024-01-01",
-                "synthetic_end_date": "2024-01-31",
-            },
-        )
-
-    def _default_params(self):
-        return {
-            "start_date": "2022-04-24",
-            "end_date": "2022-04-28",
-        }
-
-    def _filter_synthetic(self, data, data_type, params):
-
-        date_format = "%Y-%m-%d"
-        date1 = datetime.strptime(self.init_params["synthetic_start_date"], date_format)
-        date2 = datetime.strptime(params["start_date"], date_format)
-
-        date3 = datetime.strptime(self.init_params["synthetic_end_date"], date_format)
-        date4 = datetime.strptime(params["end_date"], date_format)
-
-        delta1 = date2 - date1
-        delta2 = date3 - date4
-
-        num_days_start = delta1.days
-        num_days_end = delta2.days
-
-        return data[num_days_start : -num_days_end - 1]
-
-    def _get_real(self, data_type, params):
-        data = fetch_real_data(
-            data_type,
-            self.user,
-            start_date=self.init_params["start_date"],
-            end_date=self.init_params["end_date"],
-        )
-        return data
-
-    def _gen_synthetic(self):
-
-        syn_data = create_syn_data(
-            self.init_params["synthetic_start_date"],
-            self.init_params["synthetic_end_date"],
-        )
-
-        self.intraday_breath_rate = syn_data["intraday_breath_rate"]
-        self.intraday_active_zone_minute = syn_data["intraday_active_zone_minute"]
-        self.intraday_heart_rate = syn_data["intraday_heart_rate"]
-        self.intraday_hrv = syn_data["intraday_hrv"]
-        self.intraday_spo2 = syn_data["intraday_spo2"]
-        self.sleep = syn_data["sleep"]
-        self.steps = syn_data["steps"]
-        self.minutesVeryActive = syn_data["minutesVeryActive"]
-        self.minutesFairlyActive = syn_data["minutesFairlyActive"]
-        self.minutesLightlyActive = syn_data["minutesLightlyActive"]
-        self.distance = syn_data["distance"]
-        self.minutesSedentary = syn_data["minutesSedentary"]
+    _data_types = [
+        "intraday_breath_rate",
+        "intraday_active_zone_minute",
+        "intraday_heart_rate",
+        "intraday_hrv",
+        "intraday_spo2",
+        "sleep",
+        "steps",
+        "minutesVeryActive",
+        "minutesLightlyActive",
+        "minutesFairlyActive",
+        "distance",
+        "minutesSedentary",
+    ]
+
+    _synthetic_start_date = "2024-01-01"
+    _synthetic_end_date = "2024-01-31"
 
     def _authenticate(self, auth_creds):
         client_id = auth_creds["client_id"]
@@ -0,0 +1,225 @@
+"""
+fitbit_device.py
+====================================
+The base class of the Fitbit devices, which only differ by the data types they support
+(their capability table, `_data_types`), their default synthetic date range, and how
+they authenticate. They share the synthetic data engine of `fitbit_gen`, whose days are
+seeded by the Fitbit family rather than by the model, and are kept in a cache shared by
+every Fitbit device of the process: asking several models (or several devices) for the
+same days, with the same seed, generates them only once.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from ...aio import get_async_client
+from ...utils import derive_seed
+from ..device import BaseDevice
+from .fitbit_gen import *
+from .fitbit_sense_fetch import *
+
+# the synthetic data of a day is seeded by the family, so that all the models generate
+# the same days
+FAMILY = "Fitbit"
+
+# the shared cache of synthetic days keeps (seed, generator, day) entries up to this many
+# bytes (as estimated by _size_of), the least recently used ones being evicted first. A
+# day of per second heart rate takes about 780 KB, most of the other days a few KB
+SHARED_CACHE_BYTES = 32 * 1024 * 1024
+
+# maps each key to its data and its size
+_shared_days = OrderedDict()
+_shared_days_lock = threading.Lock()
+_shared_days_bytes = 0
+
+
+def _size_of(data):
+    # an estimate of the memory taken by the data of a day, counting the arrays of its
+    # columnar datasets rather than the objects holding them
+    if isinstance(data, ColumnarDataset):
+        return sum(getattr(data, column).nbytes for column in data._columns)
+    elif isinstance(data, dict):
+        return sys.getsizeof(data) + sum(
+            sys.getsizeof(key) + _size_of(value) for key, value in data.items()
+        )
+    elif isinstance(data, list):
+        return sys.getsizeof(data) + sum(_size_of(value) for value in data)
+
+    return sys.getsizeof(data)
+
+
+def _pop_shared_day(key):
+    # must be called with _shared_days_lock held
+    global _shared_days_bytes
+
+    if key in _shared_days:
+        _shared_days_bytes -= _shared_days.pop(key)[1]
+
+
+def clear_shared_cache():
+    """Empties the cache of synthetic days shared by the Fitbit devices."""
+    global _shared_days_bytes
+
+    with _shared_days_lock:
+        _shared_days.clear()
+        _shared_days_bytes = 0
+
+
+class FitbitDevice(BaseDevice):
+    """The base class of the Fitbit devices. Subclasses set the data types they support
+    in `_data_types`, their default synthetic date range in `_synthetic_start_date` and
+    `_synthetic_end_date`, and implement `_authenticate`.
+
+    The synthetic data of a day is shared with every other Fitbit device with the same
+    seed, and `get_data` returns copies of it, so that modifying them does not affect the
+    other devices.
+
+    :param seed: random seed for synthetic data generation, defaults to 0
+    :type seed: int, optional
+    :param synthetic_start_date: start date for synthetic data generation, defaults to
+        `_synthetic_start_date`
+    :type synthetic_start_date: str, optional
+    :param synthetic_end_date: end date (inclusive) for synthetic data generation,
+        defaults to `_synthetic_end_date`
+    :type synthetic_end_date: str, optional
+    :param columnar: whether the synthetic heart rate datasets and active zone minutes
+        are returned as `HeartRateDataset` and `ActiveZoneMinutes` (holding NumPy
+        arrays) rather than lists of dictionaries, defaults to False
+    :type columnar: bool, optional
+    """
+
+    _end_date_inclusive = True
+
+    _data_types = []
+
+    _synthetic_start_date = "2022-03-01"
+    _synthetic_end_date = "2022-06-17"
+
+    def __init__(
+        self,
+        seed=0,
+        synthetic_start_date=None,
+        synthetic_end_date=None,
+        columnar=False,
+    ):
+
+        params = {
+            "seed": seed,
+            "synthetic_start_date": synthetic_start_date,
+            "synthetic_end_date": synthetic_end_date,
+            "columnar": columnar,
+        }
+
+        self._initialize_device_params(
+            list(self._data_types),
+            {key: value for key, value in params.items() if value is not None},
+            {
+                "seed": 0,
+                "synthetic_start_date": self._synthetic_start_date,
+                "synthetic_end_date": self._synthetic_end_date,
+                "columnar": False,
+            },
+        )
+
+        # each day is generated independently, the first time it is requested
+        synthetic_dates = get_synth_dates(
+            self.init_params["synthetic_start_date"],
+            self.init_params["synthetic_end_date"],
+        )
+
+        for data_types, generator, depends_on in SYNTHETIC_GENERATORS:
+            self._register_synthetic_generator(
+                data_types, generator, depends_on, dates=synthetic_dates
+            )
+
+        self._register_synthetic_generator(
+            ["intraday_activity"], create_syn_intraday_activity
+        )
+
+    def _default_params(self):
+        return {
+            "start_date": self.init_params["synthetic_start_date"],
+            "end_date": self.init_params["synthetic_end_date"],
+        }
+
+    def _filter_synthetic(self, data, data_type, params):
+
+        date_format = "%Y-%m-%d"
+        synthetic_start = datetime.strptime(
+            self.init_params["synthetic_start_date"], date_format
+        )
+        start = datetime.strptime(params["start_date"], date_format)
+        end = datetime.strptime(params["end_date"], date_format)
+
+        # one entry per day, and both the start and the end date are inclusive
+        start_index = max((start - synthetic_start).days, 0)
+        end_index = max((end - synthetic_start).days + 1, 0)
+
+        # the days are shared, and their columnar datasets rendered only for the
+        # requested range unless columnar is set
+        return [
+            copy_day(day, self.init_params["columnar"])
+            for day in data[start_index:end_index]
+        ]
+
+    def _get_real(self, data_type, params):
+        return fetch_real_data(
+            data_type,
+            self.user,
+            start_date=params["start_date"],
+            end_date=params["end_date"],
+            session=self.http_session,
+        )
+
+    async def _aget_real(self, data_type, params):
+        return await afetch_real_data(
+            get_async_client(),
+            data_type,
+            self.user,
+            start_date=params["start_date"],
+            end_date=params["end_date"],
+        )
+
+    def _synthetic_seed(self, *keys):
+        return derive_seed(self.init_params.get("seed", 0), FAMILY, *keys)
+
+    def _shared_key(self, data_types, date):
+        return (self.init_params.get("seed", 0), tuple(data_types), date)
+
+    def _shared_synthetic_day(self, data_types, generate, date):
+        # days are shared by every Fitbit device of the process
+        global _shared_days_bytes
+
+        key = self._shared_key(data_types, date)
+
+        with _shared_days_lock:
+            if key in _shared_days:
+                _shared_days.move_to_end(key)
+
+                return _shared_days[key][0]
+
+        syn_data = generate()
+        size = _size_of(syn_data)
+
+        with _shared_days_lock:
+            _pop_shared_day(key)
+            _shared_days[key] = (syn_data, size)
+            _shared_days_bytes += size
+
+            while _shared_days_bytes > SHARED_CACHE_BYTES and len(_shared_days) > 1:
+                _pop_shared_day(next(iter(_shared_days)))
+
+        return syn_data
+
+    def _drop_synthetic_days(self):
+        # the days dropped by iter_data are not kept in the shared cache either
+        with _shared_days_lock:
+            for data_type, days in self._synthetic_days.items():
+                data_types, _, _, dates = self._synthetic_generators[data_type]
+
+                for index in days:
+                    _pop_shared_day(self._shared_key(data_types, dates[index]))
+
+        super()._drop_synthetic_days()
@@ -0,0 +1,1037 @@
+"""
+fitbit_gen.py
+====================================
+The synthetic data engine shared by the Fitbit devices. Each day is generated from a
+latent daily state (the sleep window of the night, the minutes spent at each activity
+level, and the heart rate at midnight), from which the sleep, activity, heart rate and
+sleep time series of that day are rendered, so that the data types of a day are
+consistent with each other. The per minute heart rate and the active zone minutes are
+derived from the per second heart rate of the same day rather than generated again.
+
+The generators are listed in SYNTHETIC_GENERATORS, and each device selects the data
+types it supports from them (see `FitbitDevice`).
+"""
+
+import collections
+import random
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+
+import numpy as np
+
+__all__ = [
+    "ActiveZoneMinutes",
+    "ColumnarDataset",
+    "HeartRateDataset",
+    "create_syn_data",
+    "create_syn_intraday_activity",
+    "copy_day",
+    "get_synth_dates",
+    "SYNTHETIC_GENERATORS",
+]
+
+sleep_stages = {
+    "deepSleepSummary": {"mean": 12, "std": 1.5},
+    "remSleepSummary": {"mean": 16, "std": 1.5},
+    "lightSleepSummary": {"mean": 18, "std": 2},
+}
+
+
+# the sleep of a night starts this many seconds after midnight of its day (9 PM), within
+# SLEEP_START_RANGE seconds (before 11:58 PM), and lasts between the bounds of
+# SLEEP_DURATION_RANGE seconds
+SLEEP_START = 21 * 3600
+SLEEP_START_RANGE = 3 * 3600 - 120
+SLEEP_DURATION_RANGE = (14400, 36000)
+
+# the stages of sleep segments, and the number of segment lengths drawn at a time (about
+# 24 segments are needed on average)
+SLEEP_STAGES = ["deep", "light", "rem"]
+SLEEP_SEGMENTS = 48
+
+
+def get_daily_state(date):
+    """Generate the latent state of a day, from which the data types of the day are
+    generated.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :return: a dictionary with the start of the sleep of the night in seconds after
+        midnight ("sleep_start"), its duration in seconds ("sleep_duration"), the minutes
+        spent at each activity level ("very_active", "fairly_active" and
+        "lightly_active"), and the heart rate at midnight in bpm ("hr_baseline")
+    :rtype: dictionary
+    """
+    HR_MEAN = 75
+    HR_STD = 15
+    HR_MIN = 50
+    HR_MAX = 195
+
+    return {
+        "sleep_start": SLEEP_START + int(np.random.randint(0, SLEEP_START_RANGE)),
+        "sleep_duration": int(np.random.randint(*SLEEP_DURATION_RANGE)),
+        "very_active": int(np.random.randint(0, 240)),
+        "fairly_active": int(np.random.randint(0, 240)),
+        "lightly_active": int(np.random.randint(0, 240)),
+        "hr_baseline": float(
+            np.clip(np.random.normal(HR_MEAN, HR_STD), HR_MIN, HR_MAX)
+        ),
+    }
+
+
+def get_sleep(date, daily_state=None):
+    """Generate sleep data for a given date.
+
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param daily_state: the latent state of the day, see `get_daily_state`, defaults to
+        a new one
+    :type daily_state: dictionary, optional
+    :return: sleep data dictionary
+    :rtype: dictionary
+    """
+    if daily_state is None:
+        daily_state = get_daily_state(date)
+
+    duration = daily_state["sleep_duration"]
+
+    awake = np.random.randint(2, 9)
+    afterwake = np.random.randint(0, 200) / 100
+    tofall = np.random.randint(0, 200) / 100
+
+    percents = (100 - awake - afterwake - tofall, awake, afterwake, tofall)
+
+    start_time = datetime.strptime(date, "%Y-%m-%d") + timedelta(
+        seconds=daily_state["sleep_start"]
+    )
+    end_time = start_time + timedelta(seconds=duration)
+
+    sleep_dict = {
+        "dateOfSleep": date,
+        "duration": duration * 1000,
+        "efficiency": np.random.randint(90, 99),
+        "endTime": str(end_time.isoformat()),
+        "infoCode": 0,
+        "isMainSleep": True,
+        "logId": np.random.randint(0, 1000000000),
+        "logType": "auto_detected",
+        "minutesAfterWakeup": round(duration / 60 * percents[2] / 100),
+        "minutesAsleep": round(duration / 60 * percents[0] / 100),
+        "minutesAwake": round(duration / 60 * percents[1] / 100),
+        "minutesToFallAsleep": round(duration / 60 * percents[3] / 100),
+        "startTime": str(start_time.isoformat()),
+        "timeInBed": round(duration / 60),
+        "levels": dict(),
+        "type": "stages",
+    }
+    # the time to fall asleep and after waking up, in seconds
+    to_fall_asleep = round(duration / 60 * percents[3] / 100) * 60
+    after_wakeup = round(duration / 60 * percents[2] / 100) * 60
+
+    # the night is split into segments of at most a 12th of the time asleep, each in
+    # one stage, drawn all at once: the lengths are drawn until their cumulative sum
+    # covers the time asleep, and the last segment is cut at its end
+    asleep = round(duration * percents[0] / 100)
+    max_length = round(asleep / 12)
+    lengths = np.random.randint(1, max_length, size=SLEEP_SEGMENTS)
+
+    while lengths.sum() < asleep:
+        lengths = np.concatenate(
+            [lengths, np.random.randint(1, max_length, size=SLEEP_SEGMENTS)]
+        )
+
+    ends = np.cumsum(lengths)
+    n_segments = int(np.searchsorted(ends, asleep)) + 1
+    ends = np.minimum(ends[:n_segments], asleep)
+    lengths = np.diff(ends, prepend=0)
+
+    stages = np.random.randint(0, len(SLEEP_STAGES), size=n_segments)
+
+    onset = np.datetime64(start_time, "s") + np.timedelta64(to_fall_asleep, "s")
+    segment_starts = onset + (ends - lengths).astype("timedelta64[s]")
+    wakeup = onset + np.timedelta64(int(asleep), "s")
+
+    # short wakes between the segments, at random times of the night
+    n_wakes = n_segments - 1
+    wake_times = np.datetime64(start_time, "s") + np.sort(
+        np.random.randint(0, duration, size=n_wakes)
+    ).astype("timedelta64[s]")
+    wake_lengths = np.random.randint(30, 180, size=n_wakes)
+
+    stage_counts = np.bincount(stages, minlength=len(SLEEP_STAGES))
+    stage_minutes = np.bincount(
+        stages, weights=np.rint(lengths / 60), minlength=len(SLEEP_STAGES)
+    )
+
+    sleep_dict["levels"]["summary"] = {
+        stage: {"count": int(count), "minutes": int(minutes)}
+        for stage, count, minutes in zip(SLEEP_STAGES, stage_counts, stage_minutes)
+    }
+    sleep_dict["levels"]["summary"]["wake"] = {
+        "count": 2 + n_wakes,
+        "minutes": round(duration / 60 * percents[1] / 100),
+    }
+
+    stage_names = np.array(SLEEP_STAGES)[stages].tolist()
+
+    sleep_dict["levels"]["data"] = (
+        [
+            {
+                "dateTime": str(start_time.isoformat()),
+                "level": "wake",
+                "seconds": to_fall_asleep,
+            }
+        ]
+        + [
+            {"dateTime": time, "level": stage, "seconds": length}
+            for time, stage, length in zip(
+                np.datetime_as_string(segment_starts, unit="s").tolist(),
+                stage_names,
+                lengths.tolist(),
+            )
+        ]
+        + [
+            {
+                "dateTime": str(np.datetime_as_string(wakeup, unit="s")),
+                "level": "wake",
+                "seconds": after_wakeup,
+            }
+        ]
+    )
+    sleep_dict["levels"]["shortData"] = [
+        {"dateTime": time, "level": "wake", "seconds": length}
+        for time, length in zip(
+            np.datetime_as_string(wake_times, unit="s").tolist(),
+            wake_lengths.tolist(),
+        )
+    ]
+
+    return sleep_dict
+
+
+def get_activity(date, daily_state=None):
+    """Generate activity data for a given date.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param daily_state: the latent state of the day, see `get_daily_state`, defaults to
+        a new one
+    :type daily_state: dictionary, optional
+    :return: dictionaries of "steps", "minutesVeryActive", "minutesFairlyActive", "minutesLightlyActive", "distance", "minutesSedentary"
+    :rtype: dictionary
+    """
+    if daily_state is None:
+        daily_state = get_daily_state(date)
+
+    very_active = daily_state["very_active"]
+    fairly_active = daily_state["fairly_active"]
+    lightly_active = daily_state["lightly_active"]
+
+    minutes_in_a_day = 1440
+
+    steps = {
+        "dateTime": date,
+        "value": very_active * 50 + fairly_active * 25 + lightly_active * 10,
+    }
+    minutesVeryActive = {"dateTime": date, "value": very_active}
+    minutesFairlyActive = {"dateTime": date, "value": fairly_active}
+    minutesLightlyActive = {"dateTime": date, "value": lightly_active}
+    distance = {
+        "dateTime": date,
+        "value": (very_active * 50 + fairly_active * 25 + lightly_active * 10) / 1326,
+    }
+    minutesSedentary = {
+        "dateTime": date,
+        "value": minutes_in_a_day - (very_active + fairly_active + lightly_active),
+    }
+
+    return (
+        steps,
+        minutesVeryActive,
+        minutesFairlyActive,
+        minutesLightlyActive,
+        distance,
+        minutesSedentary,
+    )
+
+
+def _read_only(array):
+    view = np.asarray(array).view()
+    view.flags.writeable = False
+
+    return view
+
+
+class ColumnarDataset(Sequence):
+    """A day of intraday data stored as NumPy arrays (columns), whose elements are
+    rendered as the dictionaries of the Fitbit API only when they are accessed. Slicing
+    returns a list, and `tolist` renders every element.
+
+    Subclasses list their columns in `_columns` and render them in `_render`. Columns
+    are read-only, since datasets are shared (see `FitbitDevice`).
+
+    :param times: the time of each element
+    :type times: np.ndarray
+    """
+
+    _columns = ["times"]
+
+    # rendered this many elements at a time when iterating
+    _chunk_size = 3600
+
+    def __init__(self, times):
+        self.times = _read_only(times)
+
+    def __len__(self):
+        return len(self.times)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._render(index)
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("dataset index out of range")
+
+        return self._render(slice(index, index + 1))[0]
+
+    def __iter__(self):
+        # much faster than rendering one element at a time
+        for start in range(0, len(self), self._chunk_size):
+            yield from self[start : start + self._chunk_size]
+
+    def _render(self, index):
+        raise NotImplementedError
+
+    def _time_strings(self, index):
+        # "YYYY-MM-DDTHH:MM:SS" without the date
+        return [
+            time[11:]
+            for time in np.datetime_as_string(self.times[index], unit="s").tolist()
+        ]
+
+    def tolist(self):
+        """Returns every element, in the format of the Fitbit API.
+
+        :return: a list of dictionaries
+        :rtype: List
+        """
+        return self._render(slice(None))
+
+    def __eq__(self, other):
+        if type(other) is type(self):
+            return all(
+                np.array_equal(getattr(self, column), getattr(other, column))
+                for column in self._columns
+            )
+        elif isinstance(other, Sequence):
+            return self.tolist() == list(other)
+
+        return NotImplemented
+
+    def __repr__(self):
+        return f"{type(self).__name__}({len(self)} elements)"
+
+
+class HeartRateDataset(ColumnarDataset):
+    """The "dataset" of a day of heart rate data, stored as `times`, a datetime64[s]
+    array, and `values`, a uint8 array of bpm, and rendered as {"time": "HH:MM:SS",
+    "value": bpm} dictionaries (see `ColumnarDataset`). A day of per second data takes
+    777 KB instead of about 30 MB of dictionaries.
+
+    :param times: the time of each sample
+    :type times: np.ndarray
+    :param values: the heart rate of each sample in bpm
+    :type values: np.ndarray
+    """
+
+    _columns = ["times", "values"]
+
+    def __init__(self, times, values):
+        super().__init__(times)
+        self.values = _read_only(values)
+
+    def _render(self, index):
+        return [
+            {"time": time, "value": value}
+            for time, value in zip(
+                self._time_strings(index), self.values[index].tolist()
+            )
+        ]
+
+
+# the zones of active zone minutes, by the mean heart rate of a minute, and the value of
+# the minutes of each zone in the Fitbit API
+AZM_ZONES = ["none", "fatBurn", "cardio", "peak"]
+AZM_ZONE_MIN_HR = [87, 98, 111]
+AZM_ZONE_VALUES = [
+    {"activeZoneMinutes": 0},
+    {"fatBurnActiveZoneMinutes": 1, "activeZoneMinutes": 1},
+    {"cardioActiveZoneMinutes": 1, "activeZoneMinutes": 1},
+    {"peakActiveZoneMinutes": 1, "activeZoneMinutes": 1},
+]
+
+
+class ActiveZoneMinutes(ColumnarDataset):
+    """The "minutes" of a day of active zone minutes, stored as `times`, a
+    datetime64[s] array of the start of each minute, and `zones`, a uint8 array of the
+    index of the zone of each minute in `AZM_ZONES` (0 when the minute is not active),
+    and rendered as {"minute": "HH:MM:SS", "value": {...}} dictionaries (see
+    `ColumnarDataset`).
+
+    :param times: the start of each minute
+    :type times: np.ndarray
+    :param zones: the zone of each minute
+    :type zones: np.ndarray
+    """
+
+    _columns = ["times", "zones"]
+
+    _chunk_size = 1440
+
+    def __init__(self, times, zones):
+        super().__init__(times)
+        self.zones = _read_only(zones)
+
+    @property
+    def active_zone_minutes(self):
+        """The active zone minutes of each minute (1 if it is in a zone, 0 otherwise).
+
+        :rtype: np.ndarray
+        """
+        return (self.zones > 0).astype(np.uint8)
+
+    def _render(self, index):
+        return [
+            {"minute": time, "value": dict(AZM_ZONE_VALUES[zone])}
+            for time, zone in zip(self._time_strings(index), self.zones[index].tolist())
+        ]
+
+
+def copy_day(data, columnar=False):
+    """Returns a copy of the data of a day, in which every `ColumnarDataset` is rendered
+    as a list of dictionaries in the format of the Fitbit API (and so can be serialized
+    as JSON), unless columnar is True. Columnar datasets are read-only, so they are not
+    copied.
+
+    :param data: the data of a day, made of dictionaries, lists and columnar datasets
+    :type data: Any
+    :param columnar: whether to keep the columnar datasets, defaults to False
+    :type columnar: bool, optional
+    :return: the copied data
+    :rtype: Any
+    """
+    if isinstance(data, ColumnarDataset):
+        return data if columnar else data.tolist()
+    elif isinstance(data, dict):
+        return {key: copy_day(value, columnar) for key, value in data.items()}
+    elif isinstance(data, list):
+        return [copy_day(value, columnar) for value in data]
+
+    return data
+
+
+def _mean_hr_per_minute(hr):
+    # the mean heart rate of each minute of a day of per second heart rate data (the
+    # last one possibly partial), and the last heart rate for the minutes without data
+    minutes_in_a_day = 1440
+    hr_dataset = hr["heart_rate_day"][0]["activities-heart-intraday"]["dataset"]
+
+    if isinstance(hr_dataset, HeartRateDataset):
+        hr_values = hr_dataset.values.astype(float)
+    else:
+        hr_values = np.array([point["value"] for point in hr_dataset], dtype=float)
+
+    full_minutes = min(len(hr_values) // 60, minutes_in_a_day)
+    mean_hr_per_minute = np.full(minutes_in_a_day, hr_values[-1])
+    mean_hr_per_minute[:full_minutes] = (
+        hr_values[: full_minutes * 60].reshape(full_minutes, 60).mean(axis=1)
+    )
+
+    if full_minutes < minutes_in_a_day and len(hr_values) > full_minutes * 60:
+        mean_hr_per_minute[full_minutes] = hr_values[full_minutes * 60 :].mean()
+
+    return mean_hr_per_minute
+
+
+def get_heart_rate(
+    date, intraday=False, columnar=True, daily_state=None, intraday_heart_rate=None
+):
+    """Generate heart rate data for a given date.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param intraday: whether the heart rate is reported per second
+    :type intraday: bool
+    :param columnar: whether the dataset is a `HeartRateDataset` (holding NumPy arrays)
+        rather than a list of dictionaries, defaults to True
+    :type columnar: bool, optional
+    :param daily_state: the latent state of the day, see `get_daily_state`, defaults to
+        a new one
+    :type daily_state: dictionary, optional
+    :param intraday_heart_rate: the per second heart rate data of the same day, from
+        which the per minute heart rate is derived (as the mean of each minute) rather
+        than generated, defaults to None
+    :type intraday_heart_rate: dictionary, optional
+    :return: dictionary of heart rate values and details
+    :rtype: dictionary
+    """
+
+    HR_MIN = 50
+    HR_MAX = 195
+    ZONE_CALORIES = [0, 1, 2, 3]
+
+    heart_rate_zones = [
+        {
+            "caloriesOut": 2877.06579,
+            "max": 110,
+            "min": 30,
+            "minutes": 0,
+            "name": "Out of Range",
+        },
+        {"caloriesOut": 1000, "max": 136, "min": 110, "minutes": 0, "name": "Fat Burn"},
+        {"caloriesOut": 1000, "max": 169, "min": 136, "minutes": 0, "name": "Cardio"},
+        {"caloriesOut": 1000, "max": 220, "min": 169, "minutes": 0, "name": "Peak"},
+    ]
+
+    the_time = datetime.strptime(date, "%Y-%m-%d").replace(hour=0, minute=0, second=0)
+    iterations_in_a_day = 1440 if not intraday else 1440 * 60
+
+    time_intervals = np.arange(iterations_in_a_day)
+
+    if intraday_heart_rate is not None and not intraday:
+        heart_rate_values = _mean_hr_per_minute(intraday_heart_rate)
+    else:
+        if daily_state is None:
+            daily_state = get_daily_state(date)
+
+        random_walk = np.random.randint(-1, 2, size=iterations_in_a_day)
+        heart_rate_values = np.clip(
+            np.cumsum(random_walk) + daily_state["hr_baseline"], HR_MIN, HR_MAX
+        )
+
+    hours = (time_intervals // 60) % 24
+
+    zone_indices = np.where(
+        hours < 6, 0, np.where(hours < 10, 1, np.where(hours < 18, 2, 3))
+    )
+
+    zone_minutes = np.bincount(zone_indices, minlength=4)
+    zone_calories = np.array([ZONE_CALORIES[i] * zone_minutes[i] for i in range(4)])
+
+    for i, zone in enumerate(heart_rate_zones):
+        zone["minutes"] += int(zone_minutes[i])
+        zone["caloriesOut"] += int(zone_calories[i])
+
+    # heart rates are reported as whole bpm, like those of the Fitbit API
+    dataset = HeartRateDataset(
+        np.datetime64(the_time, "s")
+        + time_intervals.astype("timedelta64[s]") * (1 if intraday else 60),
+        np.rint(heart_rate_values).astype(np.uint8),
+    )
+
+    if not columnar:
+        dataset = dataset.tolist()
+
+    heart_rate_data = {
+        "heart_rate_day": [
+            {
+                "activities-heart": [
+                    {
+                        "dateTime": date,
+                        "value": {
+                            "customHeartRateZones": [],
+                            "heartRateZones": heart_rate_zones,
+                            "restingHeartRate": 58,
+                        },
+                    }
+                ],
+                "activities-heart-intraday": {
+                    "dataset": dataset,
+                    "datasetInterval": 1,
+                    "datasetType": "minute" if not intraday else "second",
+                },
+            }
+        ]
+    }
+
+    return heart_rate_data
+
+
+def get_intraday_azm(date, hr, columnar=True):
+    """Generate active zone minutes for a given date.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param hr: heart rate data collected per second on the same day as date
+    :type hr: dict
+    :param columnar: whether the minutes are an `ActiveZoneMinutes` (holding NumPy
+        arrays) rather than a list of dictionaries, defaults to True
+    :type columnar: bool, optional
+    :return: dictionary of intraday active zone minute details
+    :rtype: dictionary
+    """
+    minutes_in_a_day = 1440
+    mean_hr_per_minute = _mean_hr_per_minute(hr)
+
+    zones = np.select(
+        [mean_hr_per_minute > min_hr for min_hr in AZM_ZONE_MIN_HR[::-1]],
+        [3, 2, 1],
+        default=0,
+    ).astype(np.uint8)
+
+    minutes = ActiveZoneMinutes(
+        np.datetime64(date, "s") + np.arange(minutes_in_a_day).astype("timedelta64[m]"),
+        zones,
+    )
+
+    return {
+        "activities-active-zone-minutes-intraday": [
+            {"dateTime": date, "minutes": minutes if columnar else minutes.tolist()}
+        ]
+    }
+
+
+def get_intraday_breath_rate(date):
+    """Generate breath rate during sleep for a given date.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :return: dictionary of breath rate during sleep details
+    :rtype: dictionary
+    """
+    breathing_rates = {
+        stage: np.random.normal(info["mean"], info["std"])
+        for stage, info in sleep_stages.items()
+    }
+    full_breathing_rate = np.mean(list(breathing_rates.values()))
+
+    br = {
+        "br": [
+            {
+                "value": {
+                    **{
+                        stage: {"breathingRate": rate}
+                        for stage, rate in breathing_rates.items()
+                    },
+                    "fullSleepSummary": {"breathingRate": full_breathing_rate},
+                },
+                "dateTime": date,
+            }
+        ]
+    }
+
+    return br
+
+
+def get_hrv(date):
+    """Generate hrv for a given date.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :return: dictionary of hrv details
+    :rtype: dictionary
+    """
+    hrv = {
+        "hrv": [
+            {
+                "hrv": [
+                    {
+                        "value": {
+                            "dailyRmssd": np.random.randint(13, 48),
+                            "deepRmssd": np.random.randint(13, 48),
+                        },
+                        "dateTime": date,
+                    }
+                ]
+            }
+        ]
+    }
+
+    return hrv
+
+
+def get_sleep_window(daily_state):
+    """Returns the start of the sleep of a night, as an hour, minute and second, and its
+    duration in minutes.
+
+    :param daily_state: the latent state of the day, see `get_daily_state`
+    :type daily_state: dictionary
+    :return: the hour, minute and second of the start of the sleep, and its duration
+    :rtype: tuple
+    """
+    hour, rest = divmod(daily_state["sleep_start"], 3600)
+    minute, second = divmod(rest, 60)
+
+    return hour, minute, second, daily_state["sleep_duration"] // 60
+
+
+def get_intraday_hrv(date, random_hour, random_min, random_sec, random_duration):
+    """Generate intraday HRV data for a given date.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param random_hour: the starting hour
+    :type random_hour: int
+    :param random_min: the starting minute
+    :type random_min: int
+    :param random_sec: the starting second
+    :type random_sec: int
+    :param random_duration: the number of minutes for which to generate data
+    :type random_duration: int
+    :return: dictionary of intraday HRV data details
+    :rtype: dictionary
+    """
+
+    hrv = {"hrv": [{"minutes": [], "dateTime": date}]}
+
+    the_time = datetime.strptime(date, "%Y-%m-%d").replace(
+        hour=random_hour, minute=random_min, second=random_sec
+    )
+
+    random_values = np.random.uniform(0, 1, (random_duration, 4))
+    hf_values = np.round(100 + 900 * random_values[:, 0], 3)
+    rmssd_values = np.round(20 + 60 * random_values[:, 1], 3)
+    coverage_values = np.round(0.9 + 0.09 * random_values[:, 2], 3)
+    lf_values = np.round(hf_values * (0.2 + 0.2 * random_values[:, 3]), 3)
+
+    times = [the_time + timedelta(minutes=i) for i in range(random_duration)]
+
+    hrv["hrv"][0]["minutes"] = [
+        {
+            "minute": f"{date}T{time.strftime('%H:%M:%S')}.000",
+            "value": {
+                "rmssd": rmssd,
+                "coverage": coverage,
+                "hf": hf,
+                "lf": lf,
+            },
+        }
+        for hf, rmssd, coverage, lf, time in zip(
+            hf_values, rmssd_values, coverage_values, lf_values, times
+        )
+    ]
+
+    return hrv
+
+
+def get_intraday_spo2(date, random_hour, random_min, random_sec, random_duration):
+    """Generate intraday SpO2 data for a given date.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param random_hour: the starting hour
+    :type random_hour: int
+    :param random_min: the starting minute
+    :type random_min: int
+    :param random_sec: the starting second
+    :type random_sec: int
+    :param random_duration: the number of minutes for which to generate data
+    :type random_duration: int
+    :return: dictionary of intraday SpO2 data details
+    :rtype: dictionary
+    """
+
+    spo2_data = {"dateTime": date, "minutes": []}
+
+    the_time = datetime.strptime(date, "%Y-%m-%d").replace(
+        hour=random_hour, minute=random_min, second=random_sec
+    )
+
+    mean = 97.5
+    std_dev = 3
+    spo2_value = round(np.random.normal(mean, std_dev), 1)
+    spo2_value = max(95, min(100, spo2_value))
+
+    random_changes = np.round(np.random.uniform(-0.5, 0.5, random_duration), 1)
+    times = [the_time + timedelta(minutes=i) for i in range(random_duration)]
+
+    spo2_data["minutes"] = [
+        {
+            "value": (spo2_value := max(95, min(100, spo2_value + change))),
+            "minute": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        for change, time in zip(random_changes, times)
+    ]
+
+    return spo2_data
+
+
+def get_distance_day(date):
+    """Generate distance data for a given date.
+
+    :return: dictionary of distance data details
+    :rtype: dictionary
+    """
+
+    distance_day = {
+        "distance_day": [
+            {
+                "activities-distance": [{"dateTime": date, "value": 0}],
+                "activities-distance-intraday": {
+                    "dataset": [],
+                    "datasetInterval": 1,
+                    "datasetType": "minute",
+                },
+            }
+        ]
+    }
+
+    the_time = datetime.strptime(date, "%Y-%m-%d").replace(hour=0, minute=0, second=0)
+    minutes_in_a_day = 1440
+    distance = [0, 0.1]
+    weights = [0.6, 0.3]
+
+    dataset = [
+        {
+            "time": (the_time + timedelta(minutes=i)).strftime("%H:%M:%S"),
+            "value": random.uniform(0, 0.1)
+            if random.choices(distance, weights)[0]
+            else 0,
+        }
+        for i in range(minutes_in_a_day)
+    ]
+
+    distance_day["distance_day"][0]["activities-distance-intraday"]["dataset"] = dataset
+
+    return distance_day
+
+
+def get_synth_dates(start_date, end_date):
+    """Returns the dates between start_date and end_date (both inclusive) as strings.
+
+    :param start_date: the start date (inclusive) as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date (inclusive) as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :return: list of dates as strings in the format "YYYY-MM-DD"
+    :rtype: list
+    """
+
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+    num_days = (end_dt - start_dt).days + 1
+
+    return [
+        (start_dt + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(num_days)
+    ]
+
+
+def create_syn_daily_state(date):
+    """Generate the latent "daily_state" of a single day, from which its other data
+    types are generated.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :return: dictionary mapping "daily_state" to the state of that day
+    :rtype: dictionary
+    """
+
+    return {"daily_state": get_daily_state(date)}
+
+
+def create_syn_sleep(date, daily_state):
+    """Generate "sleep" data for a single day.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param daily_state: the "daily_state" of the same day
+    :type daily_state: dictionary
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    return {"sleep": get_sleep(date, daily_state)}
+
+
+def create_syn_activity(date, daily_state):
+    """Generate "steps", "minutesVeryActive", "minutesFairlyActive", "minutesLightlyActive", "distance", "minutesSedentary" data for a single day.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param daily_state: the "daily_state" of the same day
+    :type daily_state: dictionary
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    return dict(zip(ACTIVITY_DATA_TYPES, get_activity(date, daily_state)))
+
+
+def create_syn_heart_rate(date, intraday_heart_rate):
+    """Generate per minute "heart_rate_day" data for a single day, the mean of each minute of the per second heart rate of the same day.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param intraday_heart_rate: the "intraday_heart_rate" data for the same day
+    :type intraday_heart_rate: dictionary
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    return {
+        "heart_rate_day": get_heart_rate(
+            date, intraday=False, intraday_heart_rate=intraday_heart_rate
+        )
+    }
+
+
+def create_syn_intraday_heart_rate(date, daily_state):
+    """Generate per second "intraday_heart_rate" data for a single day.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param daily_state: the "daily_state" of the same day
+    :type daily_state: dictionary
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    return {
+        "intraday_heart_rate": get_heart_rate(
+            date, intraday=True, daily_state=daily_state
+        )
+    }
+
+
+def create_syn_intraday_azm(date, intraday_heart_rate):
+    """Generate "intraday_active_zone_minute" data for a single day, derived from the per second heart rate of the same day.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param intraday_heart_rate: the "intraday_heart_rate" data for the same day
+    :type intraday_heart_rate: dictionary
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    return {"intraday_active_zone_minute": get_intraday_azm(date, intraday_heart_rate)}
+
+
+def create_syn_hrv(date):
+    """Generate "hrv" data for a single day.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    return {"hrv": get_hrv(date)}
+
+
+def create_syn_distance_day(date):
+    """Generate "distance_day" data for a single day.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    return {"distance_day": get_distance_day(date)}
+
+
+def create_syn_sleep_intraday(date, daily_state):
+    """Generate "intraday_spo2" and "intraday_hrv" data for a single day. Both are measured during the sleep of the night.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param daily_state: the "daily_state" of the same day
+    :type daily_state: dictionary
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    sleep_window = get_sleep_window(daily_state)
+
+    return {
+        "intraday_spo2": get_intraday_spo2(date, *sleep_window),
+        "intraday_hrv": get_intraday_hrv(date, *sleep_window),
+    }
+
+
+def create_syn_breath_rate(date):
+    """Generate "intraday_breath_rate" data for a single day.
+
+    :param date: the date as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :return: dictionary mapping each of the data types to its data for that day
+    :rtype: dictionary
+    """
+
+    return {"intraday_breath_rate": get_intraday_breath_rate(date)}
+
+
+def create_syn_intraday_activity():
+    """Generate "intraday_activity" data. Synthetic intraday activity is not supported
+    yet, so this is always empty.
+
+    :return: dictionary mapping "intraday_activity" to an empty list
+    :rtype: dictionary
+    """
+
+    return {"intraday_activity": []}
+
+
+ACTIVITY_DATA_TYPES = [
+    "steps",
+    "minutesVeryActive",
+    "minutesFairlyActive",
+    "minutesLightlyActive",
+    "distance",
+    "minutesSedentary",
+]
+
+# (data types, generator, data types the generator depends on), to be registered
+# with BaseDevice._register_synthetic_generator() by the Fitbit devices, with the
+# synthetic dates so that each generator is called for one day at a time. Generators
+# come after those they depend on
+SYNTHETIC_GENERATORS = [
+    (["daily_state"], create_syn_daily_state, []),
+    (["sleep"], create_syn_sleep, ["daily_state"]),
+    (ACTIVITY_DATA_TYPES, create_syn_activity, ["daily_state"]),
+    (["intraday_heart_rate"], create_syn_intraday_heart_rate, ["daily_state"]),
+    (["heart_rate_day"], create_syn_heart_rate, ["intraday_heart_rate"]),
+    (
+        ["intraday_active_zone_minute"],
+        create_syn_intraday_azm,
+        ["intraday_heart_rate"],
+    ),
+    (["hrv"], create_syn_hrv, []),
+    (["distance_day"], create_syn_distance_day, []),
+    (["intraday_spo2", "intraday_hrv"], create_syn_sleep_intraday, ["daily_state"]),
+    (["intraday_breath_rate"], create_syn_breath_rate, []),
+]
+
+
+def create_syn_data(start_date, end_date):
+    """Returns a defaultdict of heart_rate data, activity data, "sleep", "steps","minutesVeryActive", "minutesLightlyActive", "minutesFairlyActive", "distance", "minutesSedentary", "heart_rate_day", "hrv", "distance_day"
+
+    :param start_date: the start date (inclusive) as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date (inclusive) as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :return: a defaultdict of heart_rate data, activity data, "sleep", "steps","minutesVeryActive", "minutesLightlyActive", "minutesFairlyActive", "distance", "minutesSedentary", "heart_rate_day", "hrv", "distance_day"
+    :rtype: defaultdict
+    """
+
+    full_dict = collections.defaultdict(list)
+
+    for data_types, generator, depends_on in SYNTHETIC_GENERATORS:
+        for i, date in enumerate(get_synth_dates(start_date, end_date)):
+            day = generator(
+                date,
+                **{dependency: full_dict[dependency][i] for dependency in depends_on},
+            )
+
+            for data_type in data_types:
+                full_dict[data_type].append(day[data_type])
+
+    full_dict.update(create_syn_intraday_activity())
+    full_dict.pop("daily_state")
+    full_dict["heart_rate"] = full_dict.pop("heart_rate_day")
+
+    return full_dict
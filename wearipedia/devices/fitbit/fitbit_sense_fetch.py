@@ -1,82 +1,206 @@
-import requests
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
 
-__all__ = ["fetch_real_data"]
+from ...sessions import get_session
 
+__all__ = ["fetch_real_data", "afetch_real_data"]
 
-def call_API(access_token: str, url: str, call: str = "GET"):
+BASE_URL = "https://api.fitbit.com"
+
+# data types whose endpoint covers any date range in a single request
+RANGE_URLS = {
+    "sleep": "/1.2/user/-/sleep/date/{start_date}/{end_date}.json",
+    "steps": "/1/user/-/activities/steps/date/{start_date}/{end_date}.json",
+    "minutesVeryActive": "/1/user/-/activities/minutesVeryActive/date/{start_date}/{end_date}.json",
+    "minutesFairlyActive": "/1/user/-/activities/minutesFairlyActive/date/{start_date}/{end_date}.json",
+    "minutesLightlyActive": "/1/user/-/activities/minutesLightlyActive/date/{start_date}/{end_date}.json",
+    "distance": "/1/user/-/activities/distance/date/{start_date}/{end_date}.json",
+    "minutesSedentary": "/1/user/-/activities/minutesSedentary/date/{start_date}/{end_date}.json",
+}
+
+# data types whose endpoint accepts date ranges of at most MAX_WINDOW_DAYS days, whose
+# responses are merged
+WINDOW_URLS = {
+    "hrv": "/1/user/-/hrv/date/{start_date}/{end_date}.json",
+    "intraday_breath_rate": "/1/user/-/br/date/{start_date}/{end_date}/all.json",
+    "intraday_hrv": "/1/user/-/hrv/date/{start_date}/{end_date}/all.json",
+    "intraday_spo2": "/1/user/-/spo2/date/{start_date}/{end_date}/all.json",
+}
+
+MAX_WINDOW_DAYS = 30
+
+# data types whose endpoint only returns a single day, with one response per day
+DAY_URLS = {
+    "heart_rate_day": "/1/user/-/activities/heart/date/{date}/1d.json",
+    "distance_day": "/1/user/-/activities/distance/date/{date}/1d.json",
+    "intraday_active_zone_minute": "/1/user/-/activities/active-zone-minutes/date/{date}/1d/1min.json",
+    "intraday_activity": "/1/user/-/activities/steps/date/{date}/1d/1min.json",
+    "intraday_heart_rate": "/1/user/-/activities/heart/date/{date}/1d/1sec.json",
+}
+
+# the number of days fetched concurrently, the requests themselves being rate limited
+# by the session to the Fitbit quota, see wearipedia.ratelimit
+DEFAULT_MAX_WORKERS = 8
+
+
+def call_API(access_token: str, url: str, call: str = "GET", session=None):
     headers = {"Authorization": "Bearer " + access_token}
-    return requests.request(call, url=url, headers=headers).json()
+    return get_session(session).request(call, url=url, headers=headers).json()
+
+
+def _dates(start_date, end_date):
+    # the dates from start_date to end_date (both inclusive)
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+    end = datetime.strptime(end_date, "%Y-%m-%d")
+
+    return [
+        (start + timedelta(days=i)).strftime("%Y-%m-%d")
+        for i in range((end - start).days + 1)
+    ]
+
+
+def get_urls(data_type, start_date, end_date=None):
+    """Returns the URLs to request to get a data type over a date range, in time order.
+
+    :param data_type: the type of data to fetch
+    :type data_type: str
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date (inclusive) represented as a string in the format
+        "YYYY-MM-DD", defaults to start_date
+    :type end_date: str, optional
+    :return: the URLs
+    :rtype: List
+    """
+    end_date = end_date or start_date
+
+    if data_type in RANGE_URLS:
+        return [
+            BASE_URL
+            + RANGE_URLS[data_type].format(start_date=start_date, end_date=end_date)
+        ]
+
+    dates = _dates(start_date, end_date)
+
+    if data_type in WINDOW_URLS:
+        return [
+            BASE_URL
+            + WINDOW_URLS[data_type].format(start_date=window[0], end_date=window[-1])
+            for window in (
+                dates[i : i + MAX_WINDOW_DAYS]
+                for i in range(0, len(dates), MAX_WINDOW_DAYS)
+            )
+        ]
+    elif data_type in DAY_URLS:
+        return [BASE_URL + DAY_URLS[data_type].format(date=date) for date in dates]
+
+    raise ValueError(f"Unknown data type {data_type}")
+
+
+def _merge(responses):
+    # the responses of consecutive windows, as one response, by concatenating their
+    # lists (e.g. {"hrv": [...]} or the list of days of SpO2)
+    if all(isinstance(response, list) for response in responses):
+        return [element for response in responses for element in response]
 
+    merged = dict(responses[0])
 
-def fetch_real_data(data_type, access_token, start_date, end_date=None):
+    for response in responses[1:]:
+        for key, value in response.items():
+            if isinstance(value, list) and isinstance(merged.get(key), list):
+                merged[key] = merged[key] + value
+
+    return merged
+
+
+def _combine(data_type, responses):
+    # one response per day for single day endpoints, otherwise a single response
+    if data_type in DAY_URLS:
+        return responses
+
+    return [_merge(responses)]
+
+
+def fetch_real_data(
+    data_type,
+    access_token,
+    start_date,
+    end_date=None,
+    session=None,
+    max_workers=DEFAULT_MAX_WORKERS,
+):
     """Main function for fetching real data from the Fitbit API.
 
+    Data types whose endpoint covers a date range are fetched with a single request (or
+    one per window of 30 days, for "hrv", "intraday_breath_rate", "intraday_hrv" and
+    "intraday_spo2", whose responses are merged), while the other intraday data types
+    are fetched with one request per day, `max_workers` days at a time.
+
+    :param data_type: the type of data to fetch, one of "sleep", "steps","minutesVeryActive", "minutesLightlyActive", "minutesFairlyActive", "distance", "minutesSedentary", "heart_rate_day", "hrv", "distance_day", "intraday_breath_rate", "intraday_active_zone_minute", "intraday_activity", "intraday_heart_rate", "intraday_hrv", "intraday_spo2"
+    :type data_type: str
+    :param access_token: access token for the API
+    :type api: str
     :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
     :type start_date: str
-    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
-    :type end_date: str
-    :param single_date: the day data is being requested from represented as a string in the format "YYYY-MM-DD"
-    :type end_date: str
-    :param data_type: the type of data to fetch, one of "sleep", "steps","minutesVeryActive", "minutesLightlyActive", "minutesFairlyActive", "distance", "minutesSedentary", "heart_rate_day", "hrv", "distance_day", "breath_rate"
+    :param end_date: the end date (inclusive) represented as a string in the format "YYYY-MM-DD", defaults to start_date
+    :type end_date: str, optional
+    :param session: the session to send the request with, defaults to the shared session
+    :type session: requests.Session, optional
+    :param max_workers: the number of days fetched concurrently, defaults to 8
+    :type max_workers: int, optional
+    :return: the responses of the API: one per day, in time order, for the data types fetched one day at a time, otherwise a single one
+    :rtype: List
+    """
+    urls = get_urls(data_type, start_date, end_date)
+
+    if len(urls) == 1:
+        return _combine(data_type, [call_API(access_token, urls[0], session=session)])
+
+    with ThreadPoolExecutor(
+        max_workers=min(max_workers, len(urls)), thread_name_prefix="wearipedia-fitbit"
+    ) as executor:
+        # each request in the context of the caller, e.g. the phase measured by
+        # instrumentation
+        futures = [
+            executor.submit(
+                contextvars.copy_context().run,
+                call_API,
+                access_token,
+                url,
+                session=session,
+            )
+            for url in urls
+        ]
+
+        return _combine(data_type, [future.result() for future in futures])
+
+
+async def afetch_real_data(client, data_type, access_token, start_date, end_date=None):
+    """Coroutine version of `fetch_real_data`, which sends the requests of every day
+    concurrently with the async client (at most its `max_concurrency` at once).
+
+    :param client: the async client to send the requests with
+    :type client: wearipedia.aio.AsyncClient
+    :param data_type: the type of data to fetch
     :type data_type: str
     :param access_token: access token for the API
     :type api: str
-    :return: the data fetched from the API according to the inputs
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date (inclusive) represented as a string in the format "YYYY-MM-DD", defaults to start_date
+    :type end_date: str, optional
+    :return: the responses of the API, see `fetch_real_data`
     :rtype: List
     """
-    single_date = start_date
-    categories = {
-        "sleep": {
-            "url": f"https://api.fitbit.com/1.2/user/-/sleep/date/{start_date}/{end_date}.json"
-        },
-        "steps": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/steps/date/{start_date}/{end_date}.json"
-        },
-        "minutesVeryActive": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/minutesVeryActive/date/{start_date}/{end_date}.json"
-        },
-        "minutesFairlyActive": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/minutesFairlyActive/date/{start_date}/{end_date}.json"
-        },
-        "minutesLightlyActive": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/minutesLightlyActive/date/{start_date}/{end_date}.json"
-        },
-        "distance": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/distance/date/{start_date}/{end_date}.json"
-        },
-        "minutesSedentary": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/minutesSedentary/date/{start_date}/{end_date}.json"
-        },
-        "heart_rate_day": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/heart/date/{single_date}/1d.json"
-        },
-        "hrv": {"url": f"https://api.fitbit.com/1/user/-/hrv/date/{single_date}.json"},
-        "distance_day": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/distance/date/{single_date}/1d.json"
-        },
-        "intraday_breath_rate": {
-            "url": f"https://api.fitbit.com/1/user/-/br/date/{start_date}/all.json"
-        },
-        "intraday_active_zone_minute": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/active-zone-minutes/date/{single_date}/1d/1min.json"
-        },
-        "intraday_activity": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/steps/date/{single_date}/1d/1min.json"
-        },
-        "intraday_heart_rate": {
-            "url": f"https://api.fitbit.com/1/user/-/activities/heart/date/{single_date}/1d/1sec.json"
-        },
-        "intraday_hrv": {
-            "url": f"https://api.fitbit.com/1/user/-/hrv/date/{single_date}/all.json"
-        },
-        "intraday_spo2": {
-            "url": f"https://api.fitbit.com/1/user/-/spo2/date/{single_date}/all.json"
-        },
-    }
-
-    arr = []
-
-    response = call_API(url=categories[data_type]["url"], access_token=access_token)
-    arr.append(response)
-
-    return arr
+    headers = {"Authorization": "Bearer " + access_token}
+
+    responses = await asyncio.gather(
+        *[
+            client.get(url, headers=headers)
+            for url in get_urls(data_type, start_date, end_date)
+        ]
+    )
+
+    return _combine(data_type, [response.json() for response in responses])
@@ -1 +1,12 @@
-from .fenix_7s import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "Fenix7S": ".fenix_7s",
+    },
+    [
+        ".fenix_7s",
+    ],
+)
@@ -2,10 +2,9 @@ import os
 import pickle
 from datetime import datetime
 
-import garth
-from garminconnect import Garmin
-
+from ...aio import get_async_client
 from ...devices.device import BaseDevice
+from ...sessions import mount_adapter, set_cache_user
 from ...utils import seed_everything
 from .fenix_fetch import *
 from .fenix_gen import *
@@ -45,6 +44,23 @@ class Fenix7S(BaseDevice):
     :type use_cache: bool, optional
     """
 
+    # the synthetic data is not filtered by the date range of the params
+    _undated_data_types = {
+        "steps",
+        "body_battery",
+        "hr",
+        "blood_pressure",
+        "floors",
+        "rhr",
+        "hydration",
+        "sleep",
+        "stress",
+        "respiration",
+        "spo2",
+        "dates",
+        "hrv",
+    }
+
     def __init__(
         self,
         seed=0,
@@ -100,6 +116,15 @@ class Fenix7S(BaseDevice):
             params["start_date"], params["end_date"], data_type, self.api
         )
 
+    async def _aget_real(self, data_type, params):
+        return await afetch_real_data(
+            params["start_date"],
+            params["end_date"],
+            data_type,
+            self.api,
+            get_async_client(),
+        )
+
     def _filter_synthetic(self, data, data_type, params):
         # Here we just return the data we've already generated,
         # but index into it based on the params. Specifically, we
@@ -137,6 +162,14 @@ class Fenix7S(BaseDevice):
         if self.init_params["use_cache"] and os.path.exists(CRED_CACHE_PATH):
             self.api = pickle.load(open(CRED_CACHE_PATH, "rb"))
         else:
+            # the Garmin client is only needed (and imported) for real data
+            import garth
+
             self.api = garth.Client(domain="garmin.com")
             self.api.login(auth_creds["email"], auth_creds["password"])
             pickle.dump(self.api, open(CRED_CACHE_PATH, "wb"))
+
+        # the requests of the client are rate limited (and cached) like the requests of
+        # the sessions of the other devices
+        mount_adapter(self.api.sess)
+        set_cache_user(self.api.sess, auth_creds)
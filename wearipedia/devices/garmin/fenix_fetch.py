@@ -1,10 +1,11 @@
+import asyncio
 import os
 from datetime import datetime, timedelta
 from threading import Lock, Thread
 
 from tqdm import tqdm
 
-__all__ = ["fetch_real_data"]
+__all__ = ["fetch_real_data", "afetch_real_data"]
 
 
 def fetch_garmin_url(data_type):
@@ -41,24 +42,73 @@ def fetch_garmin_url(data_type):
 
 
 # Steps, HR
-def fetch_steps_and_hr(api, data_type, start_date, num_days, params=None):
+def steps_and_hr_call(api, data_type, date):
     display_name = api.profile["displayName"]
     url = f"{fetch_garmin_url(data_type)}/{display_name}"
-    response = []
-    for i in tqdm(range(num_days)):
-        new_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
-        params = {"date": str(new_date.date())}
-        response.append(api.connectapi(url, params=params))
-    return response
+    return url, {"params": {"date": str(date.date())}}
 
 
 # Floors, Stress, Respiration, Spo2, Hydration, HRV, Training Status, Training Readiness, Activities for Date Aggregated, Day Stress Aggregated
-def fetch_aggregated_data(api, data_type, start_date, num_days, params=None):
+def aggregated_data_call(api, data_type, date):
+    url = f"{fetch_garmin_url(data_type)}/{date.date()}"
+    return url, {}
+
+
+# Sleep
+def sleep_call(api, data_type, date):
+    display_name = api.profile["displayName"]
+    url = f"{fetch_garmin_url(data_type)}/{display_name}"
+    return url, {"params": {"date": str(date.date()), "nonSleepBufferMinutes": 60}}
+
+
+# Body Composition Aggregated, Body Battery
+def body_comp_agg_and_battery_call(api, data_type, date):
+    url = f"{fetch_garmin_url(data_type)}"
+    return url, {"params": {"startDate": str(date), "endDate": str(date)}}
+
+
+# data types that are fetched one day at a time, mapped to a function returning the
+# url and keyword arguments of the API call for a given day
+DAILY_CALLS = {
+    "steps": steps_and_hr_call,
+    "hr": steps_and_hr_call,
+    "sleep": sleep_call,
+    "body_battery": body_comp_agg_and_battery_call,
+    "floors": aggregated_data_call,
+    "stress": aggregated_data_call,
+    "respiration": aggregated_data_call,
+    "spo2": aggregated_data_call,
+    "hydration": aggregated_data_call,
+    "hrv": aggregated_data_call,
+}
+
+
+def get_daily_calls(api, data_type, start_date, num_days):
+    """Returns the API calls to make to fetch a data type that is fetched one day at a time.
+
+    :param api: the Garmin Connect API object
+    :type api: Garmin
+    :param data_type: the type of data to fetch, one of the keys of DAILY_CALLS
+    :type data_type: str
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param num_days: the number of days to fetch
+    :type num_days: int
+    :return: a list with the url and keyword arguments of the API call for each day
+    :rtype: List
+    """
+    start = datetime.strptime(start_date, "%Y-%m-%d")
+
+    return [
+        DAILY_CALLS[data_type](api, data_type, start + timedelta(days=i))
+        for i in range(num_days)
+    ]
+
+
+def fetch_daily_data(api, data_type, start_date, num_days):
     response = []
-    for i in tqdm(range(num_days)):
-        new_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
-        url = f"{fetch_garmin_url(data_type)}/{new_date.date()}"
-        response.append(api.connectapi(url))
+    for url, kwargs in tqdm(get_daily_calls(api, data_type, start_date, num_days)):
+        response.append(api.connectapi(url, **kwargs))
     return response
 
 
@@ -79,29 +129,6 @@ def fetch_resting_heart_rate(api, data_type, start_date, end_date, params=None):
     return api.connectapi(url, params=params)
 
 
-# Sleep
-def fetch_sleep(api, data_type, start_date, num_days, params=None):
-    display_name = api.profile["displayName"]
-    response = []
-    url = f"{fetch_garmin_url(data_type)}/{display_name}"
-    for i in tqdm(range(num_days)):
-        new_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
-        params = {"date": str(new_date.date()), "nonSleepBufferMinutes": 60}
-        response.append(api.connectapi(url, params=params))
-    return response
-
-
-# Body Composition Aggregated, Body Battery
-def fetch_body_comp_agg_and_battery(api, data_type, start_date, num_days, params=None):
-    response = []
-    for i in tqdm(range(num_days)):
-        new_date = datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
-        url = f"{fetch_garmin_url(data_type)}"
-        params = {"startDate": str(new_date), "endDate": str(new_date)}
-        response.append(api.connectapi(url, params=params))
-    return response
-
-
 def fetch_real_data(start_date, end_date, data_type, api):
     """Main function for fetching real data from the Garmin Connect API.
     We parallelize this since making requests to the API is day-by-day,
@@ -125,8 +152,8 @@ def fetch_real_data(start_date, end_date, data_type, api):
     ).days
     display_name = api.profile["displayName"]
 
-    if data_type in ["steps", "hr"]:
-        return fetch_steps_and_hr(api, data_type, start_date, num_days)
+    if data_type in DAILY_CALLS:
+        return fetch_daily_data(api, data_type, start_date, num_days)
 
     elif data_type in ["blood_pressure", "weigh_ins"]:
         return fetch_blood_pressure_and_weigh_ins(api, data_type, start_date, end_date)
@@ -134,15 +161,6 @@ def fetch_real_data(start_date, end_date, data_type, api):
     elif data_type in ["rhr"]:
         return fetch_resting_heart_rate(api, data_type, start_date, end_date)
 
-    elif data_type in ["sleep"]:
-        return fetch_sleep(api, data_type, start_date, num_days)
-
-    elif data_type in ["body_battery"]:
-        return fetch_body_comp_agg_and_battery(api, data_type, start_date, num_days)
-
-    elif data_type in ["floors", "stress", "respiration", "spo2", "hydration", "hrv"]:
-        return fetch_aggregated_data(api, data_type, start_date, num_days)
-
     elif data_type == "dates":
         return [
             datetime.strptime(start_date, "%Y-%m-%d") + timedelta(days=i)
@@ -150,3 +168,39 @@ def fetch_real_data(start_date, end_date, data_type, api):
         ]
 
     return None
+
+
+async def afetch_real_data(start_date, end_date, data_type, api, client):
+    """Coroutine version of fetch_real_data(). Data types that are fetched one day at a
+    time are fetched for all days concurrently.
+
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :param data_type: the type of data to fetch, see fetch_real_data()
+    :type data_type: str
+    :param api: the Garmin Connect API object
+    :type api: Garmin
+    :param client: the async client to make the API calls with
+    :type client: wearipedia.aio.AsyncClient
+    :return: the data fetched from the API according to the inputs
+    :rtype: List
+    """
+    if data_type not in DAILY_CALLS:
+        return await client.run(fetch_real_data, start_date, end_date, data_type, api)
+
+    num_days = (
+        datetime.strptime(end_date, "%Y-%m-%d")
+        - datetime.strptime(start_date, "%Y-%m-%d")
+    ).days
+
+    # the calls are built before any of them is made, since getting the profile of the
+    # user may itself require an API call
+    calls = get_daily_calls(api, data_type, start_date, num_days)
+
+    return list(
+        await asyncio.gather(
+            *[client.run(api.connectapi, url, **kwargs) for url, kwargs in calls]
+        )
+    )
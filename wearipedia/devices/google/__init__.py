@@ -1 +1,12 @@
-from .googlefit import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "GoogleFitness": ".googlefit",
+    },
+    [
+        ".googlefit",
+    ],
+)
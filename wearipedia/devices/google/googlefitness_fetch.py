@@ -1,7 +1,7 @@
 import json
 from datetime import date, datetime, timedelta
 
-import requests
+from ...sessions import get_session
 
 year, month, day = 0, 1, 2
 
@@ -87,7 +87,9 @@ def fetch_real_data(
     }
 
     # GET request to get all your activities from the API
-    response = requests.post(api_url, data=json.dumps(body), headers=headers)
+    response = get_session(self.http_session).post(
+        api_url, data=json.dumps(body), headers=headers
+    )
 
     # If there is an error in the response, raise an exception
     if "error" in response.json():
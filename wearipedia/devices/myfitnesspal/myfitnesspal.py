@@ -2,8 +2,7 @@ import os
 import pickle
 from datetime import datetime
 
-import myfitnesspal
-
+from ...aio import get_async_client
 from ...devices.device import BaseDevice
 from ...utils import seed_everything
 from .myfitnesspal_fetch import *
@@ -80,6 +79,15 @@ class MyFitnessPal(BaseDevice):
             self, params["start_date"], params["end_date"], data_type
         )
 
+    async def _aget_real(self, data_type, params):
+        return await afetch_real_data(
+            self,
+            params["start_date"],
+            params["end_date"],
+            data_type,
+            get_async_client(),
+        )
+
     def _filter_synthetic(self, data, data_type, params):
         # Here we just return the data we've already generated,
         # but index into it based on the params. Specifically, we
@@ -116,6 +124,8 @@ class MyFitnessPal(BaseDevice):
         )
 
     def _authenticate(self, auth_creds):
+        # the MyFitnessPal client is only needed (and imported) for real data
+        import myfitnesspal
 
         # Using cookies stored on local machine to login to myfitnesspal
         if "cookies" in auth_creds:
@@ -1,3 +1,6 @@
+import asyncio
+from functools import partial
+
 import pandas as pd
 
 # Functions to generate data
@@ -5,109 +8,87 @@ import pandas as pd
 # data that is generated by the MyFitnessPal API
 
 
-def goal_generator(self, days):
-    # creating an empty list to store the goals
-    goals = []
+def get_day(client, day):
+    # using the client, we get all the data for the day
+    return client.get_date(int(day.year), int(day.month), int(day.day))
+
+
+def goals_from_day(day_data, day):
+    # we get the goals of the day, and add the date to them
+    res = day_data.goals
+    res["date"] = day
+    return res
+
+
+def daily_summary_from_day(day_data, day):
+    # we get the daily summary of the day, and add the date to it
+    res = day_data.totals
+    res["date"] = day
+    return res
+
+
+def cardio_from_day(day_data, day):
+    # we get the cardio exercises of the day, and add the date to them
+    return [{"day": day}] + day_data.exercises[0].get_as_list()
+
+
+def strength_from_day(day_data, day):
+    # we get the strength exercises of the day, and add the date to them
+    return [{"day": day}] + day_data.exercises[1].get_as_list()
+
+
+def food_from_day(day_data, day, type):
+    # we get the food items of the given meal of the day
+    res = day_data.meals[type].get_as_list()
+
+    # if the length of the list is 0, skip the totals
+    if len(res) == 0:
+        res.append({"date": day})
+
+    # if the length of the list is not 0, we add the date and the totals to the list
+    else:
+        res[0]["date"] = day
+        res[0]["totals"] = day_data.meals[type].totals
+
+    return res
+
+
+# for each data type, the function extracting its data from the data of a day
+DAY_PARSERS = {
+    "goals": goals_from_day,
+    "daily_summary": daily_summary_from_day,
+    "exercises_cardio": cardio_from_day,
+    "exercises_strength": strength_from_day,
+    "breakfast": partial(food_from_day, type=0),
+    "lunch": partial(food_from_day, type=1),
+    "dinner": partial(food_from_day, type=2),
+    "snacks": partial(food_from_day, type=3),
+}
+
 
+def goal_generator(self, days):
     # for each day in the date range, we get the goals for that day
-    for day in days:
-        # using the client, we get the goals for the day
-        res = self.client.get_date(int(day.year), int(day.month), int(day.day)).goals
-        # we add the date to the goals
-        res["date"] = day
-        # we append the goals to the list
-        goals.append(res)
-    # we return the list of goals
-    return goals
+    return [goals_from_day(get_day(self.client, day), day) for day in days]
 
 
 def daily_summary_generator(self, days):
-    # creating an empty list to store the daily summary
-    summary = []
-
     # for each day in the date range, we get the daily summary for that day
-    for day in days:
-        # using the client, we get the daily summary for the day
-        res = self.client.get_date(int(day.year), int(day.month), int(day.day)).totals
-        # we add the date to the daily summary
-        res["date"] = day
-        # we append the daily summary to the list
-        summary.append(res)
-
-    # we return the list of daily summary
-    return summary
+    return [daily_summary_from_day(get_day(self.client, day), day) for day in days]
 
 
 def cardio_generator(self, days):
-    # creating an empty list to store the cardio exercises
-    cardio = []
-
     # for each day in the date range, we get the cardio exercises for that day
-    for day in days:
-        # using the client, we get the cardio exercises for the day
-        res = (
-            self.client.get_date(int(day.year), int(day.month), int(day.day))
-            .exercises[0]
-            .get_as_list()
-        )
-        # we add the date to the cardio exercises
-        res = [{"day": day}] + res
-        # we append the cardio exercises to the list
-        cardio.append(res)
-    # we return the list of cardio exercises
-    return cardio
+    return [cardio_from_day(get_day(self.client, day), day) for day in days]
 
 
 def strength_generator(self, days):
-    # creating an empty list to store the strength exercises
-    strength = []
-
     # for each day in the date range, we get the strength exercises for that day
-    for day in days:
-        # using the client, we get the strength exercises for the day
-        res = (
-            self.client.get_date(int(day.year), int(day.month), int(day.day))
-            .exercises[1]
-            .get_as_list()
-        )
-        # we add the date to the strength exercises
-        res = [{"day": day}] + res
-        # we append the strength exercises to the list
-        strength.append(res)
-    # we return the list of strength exercises
-    return strength
+    return [strength_from_day(get_day(self.client, day), day) for day in days]
 
 
 def food_fetcher(client, type, days):
-    # creating an empty list to store the food items
-    food = []
-
     # for each day in the date range, we get the food items for that day
-    for day in days:
-        # using the client, we get the food items for the day
-        res = (
-            client.get_date(int(day.year), int(day.month), int(day.day))
-            .meals[type]
-            .get_as_list()
-        )
-
-        # if the length of the list is 0, skip the totals
-        if len(res) == 0:
-            res.append({"date": day})
-
-        # if the length of the list is not 0, we add the date and the totals to the list
-        else:
-            res[0]["date"] = day
-            res[0]["totals"] = (
-                client.get_date(int(day.year), int(day.month), int(day.day))
-                .meals[type]
-                .totals
-            )
-
-        # we append the food items to the list
-        food.append(res)
-    # we return the list of food items
-    return food
+    return [food_from_day(get_day(client, day), day, type) for day in days]
 
 
 def breakfast_generator(self, days):
@@ -171,3 +152,26 @@ def fetch_real_data(self, start_date, end_date, data_type):
     # if the data type is snacks, we need to get the snacks for each day using the client
     if data_type == "snacks":
         return snacks_generator(self, days)
+
+
+# Coroutine version of fetch_real_data, which gets the data of all days concurrently
+async def afetch_real_data(self, start_date, end_date, data_type, client):
+
+    # if the client is not set, we need to login
+    if self.client == None:
+        raise Exception("Not Authenticated, login and try again")
+
+    if data_type not in DAY_PARSERS:
+        return None
+
+    # creating the date range from the start and end dates
+    days = pd.date_range(start_date, end_date, freq="D")
+
+    # we get the data of each day at once, then extract the data type from each of them
+    day_datas = await asyncio.gather(
+        *[client.run(get_day, self.client, day) for day in days]
+    )
+
+    return [
+        DAY_PARSERS[data_type](day_data, day) for day_data, day in zip(day_datas, days)
+    ]
@@ -1 +1,12 @@
-from .cgm import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "cgm": ".cgm",
+    },
+    [
+        ".cgm",
+    ],
+)
@@ -31,6 +31,11 @@ class cgm(BaseDevice):
     :type end_date: str, optional
     """
 
+    _end_date_inclusive = True
+
+    # summaries of the whole synthetic range, which are not filtered by date
+    _undated_data_types = {"summary", "scores", "statistics"}
+
     def __init__(
         self,
         seed=0,
@@ -65,22 +70,23 @@ class cgm(BaseDevice):
 
     def _get_real(self, data_type, params):
         return fetch_real_data(
-            params["start_date"], params["end_date"], data_type, self.headers
+            params["start_date"],
+            params["end_date"],
+            data_type,
+            self.headers,
+            session=self.http_session,
         )
 
     def _filter_synthetic(self, data, data_type, params):
-        # choose only the dates between start and end
-        result = []
-        str_to_date = lambda x: datetime.strptime(x, "%Y-%m-%dT%H:%M:%S-08:00")
-        start = datetime.strptime(params["start_date"], "%Y-%m-%d")
-        end = datetime.strptime(params["end_date"], "%Y-%m-%d")
-        end = end + timedelta(days=1)
+        # choose only the dates between start and end (both inclusive)
         if data_type == "continuous":
-            for e in data:
-                d = str_to_date(e["x"])
-                if d > start and d < end:
-                    result.append(e)
-            return result
+            # index the local time of the readings, i.e. without their UTC offset
+            index = self._time_index(
+                data_type, data, lambda data: [e["x"][:19] for e in data]
+            )
+            end = datetime.strptime(params["end_date"], "%Y-%m-%d") + timedelta(days=1)
+
+            return index.select(data, params["start_date"], end)
         else:
             return data
 
@@ -1,7 +1,7 @@
-import requests
+from ...sessions import get_session
 
 
-def fetch_real_data(start_date, end_date, data_type, headers):
+def fetch_real_data(start_date, end_date, data_type, headers, session=None):
     """Main function for fetching real data from the nutrisense database.
     Uses Nutrisense's internal API.
 
@@ -13,10 +13,14 @@ def fetch_real_data(start_date, end_date, data_type, headers):
     :type data_type: str
     :param headers: current header with credentials to Nutrisense, pre authenticated
     :type headers: requests.sessions.Session
+    :param session: the session to send the requests with, defaults to a shared session
+    :type session: requests.Session, optional
     :return: the data fetched from the API according to the inputs
     :rtype: list[dict] (for continuous data) or dict (otherwise)
     """
 
+    session = get_session(session)
+
     if data_type == "continuous" or data_type == "summary":
         json_data = {
             "operationName": "allCharts",
@@ -35,7 +39,7 @@ def fetch_real_data(start_date, end_date, data_type, headers):
             "query": "query allCharts($filter: DateFilter) {\n  allCharts(filter: $filter) {\n    charts {\n      type\n      title\n      description\n      xAxis\n      yAxis\n      range {\n        min\n        max\n        goal\n        goalMin\n        goalMax\n        __typename\n      }\n      meta {\n        key\n        tag\n        section\n        __typename\n      }\n      values {\n        ... on TimePair {\n          x\n          y\n          interpolated\n          __typename\n        }\n        ... on NumericPair {\n          x\n          y\n          __typename\n        }\n        ... on StringPair {\n          name\n          x\n          y\n          __typename\n        }\n        ... on RangePair {\n          x {\n            min\n            max\n            __typename\n          }\n          y\n          __typename\n        }\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}",
         }
 
-        response = requests.post(
+        response = session.post(
             "https://api-production.nutrisense.io/graphql",
             headers=headers,
             json=json_data,
@@ -60,7 +64,7 @@ def fetch_real_data(start_date, end_date, data_type, headers):
             "query": "query allNutrition($filter: DateFilter) {\n  allNutrition(filter: $filter) {\n    nutrition {\n      today {\n        key\n        value\n        __typename\n      }\n      average {\n        key\n        value\n        __typename\n      }\n      __typename\n    }\n    score {\n      today {\n        scoreTimeOutsideRange\n        scorePeak\n        scoreMean\n        scoreStdDev\n        score\n        __typename\n      }\n      __typename\n    }\n    statistics {\n      today {\n        healthyRange {\n          min\n          max\n          __typename\n        }\n        range {\n          min\n          max\n          __typename\n        }\n        timeWithinRange\n        min\n        max\n        mean\n        median\n        standardDeviation\n        q1\n        q3\n        score\n        __typename\n      }\n      average {\n        healthyRange {\n          min\n          max\n          __typename\n        }\n        range {\n          min\n          max\n          __typename\n        }\n        timeWithinRange\n        min\n        max\n        mean\n        median\n        standardDeviation\n        q1\n        q3\n        score\n        __typename\n      }\n      __typename\n    }\n    __typename\n  }\n}",
         }
 
-        response = requests.post(
+        response = session.post(
             "https://api-production.nutrisense.io/graphql",
             headers=headers,
             json=json_data,
@@ -1 +1,12 @@
-from .oura_ring3 import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "Oura_Ring_3": ".oura_ring3",
+    },
+    [
+        ".oura_ring3",
+    ],
+)
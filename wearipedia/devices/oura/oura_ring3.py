@@ -1,6 +1,7 @@
 from datetime import datetime, time, timedelta
 
-from ...utils import bin_search, seed_everything
+from ...aio import get_async_client
+from ...utils import seed_everything
 from ..device import BaseDevice
 from .oura_ring3_authenticate import *
 from .oura_ring3_fetch import *
@@ -28,6 +29,8 @@ class Oura_Ring_3(BaseDevice):
     :type synthetic_end_date: str, optional
     """
 
+    _end_date_inclusive = True
+
     def __init__(
         self,
         seed=0,
@@ -71,17 +74,22 @@ class Oura_Ring_3(BaseDevice):
         date_format = "%Y-%m-%d"
         date1 = datetime.strptime(self.init_params["synthetic_start_date"], date_format)
         date2 = datetime.strptime(params["start_date"], date_format)
-
-        date3 = datetime.strptime(self.init_params["synthetic_end_date"], date_format)
         date4 = datetime.strptime(params["end_date"], date_format)
 
-        delta1 = date2 - date1
-        delta2 = date3 - date4
+        if data_type == "heart_rate":
+            # one sample every few minutes rather than one entry per day, so select the
+            # samples from the start date to the end date (both inclusive) by timestamp
+            index = self._time_index(
+                data_type, data, lambda data: [sample["timestamp"] for sample in data]
+            )
+
+            return index.select(data, date2, date4 + timedelta(days=1))
 
-        num_days_start = delta1.days
-        num_days_end = delta2.days
+        # one entry per day, and both the start and the end date are inclusive
+        num_days_start = max((date2 - date1).days, 0)
+        num_days_end = max((date4 - date1).days + 1, 0)
 
-        return data[num_days_start : -num_days_end + 1]
+        return data[num_days_start:num_days_end]
 
     def _get_real(self, data_type, params):
 
@@ -90,9 +98,20 @@ class Oura_Ring_3(BaseDevice):
             self.user,
             start_date=params["start_date"],
             end_date=params["end_date"],
+            session=self.http_session,
         )
         return data
 
+    async def _aget_real(self, data_type, params):
+
+        return await afetch_real_data(
+            data_type,
+            self.user,
+            start_date=params["start_date"],
+            end_date=params["end_date"],
+            client=get_async_client(),
+        )
+
     def _gen_synthetic(self):
 
         syn_data = create_syn_data(
@@ -1,115 +1,166 @@
-import requests
-
-__all__ = ["fetch_real_data"]
+from ...sessions import get_session
+
+__all__ = ["fetch_real_data", "afetch_real_data"]
+
+VERSION_1_URL = "https://api.ouraring.com/v1"
+VERSION_2_URL = "https://api.ouraring.com/v2/usercollection"
+
+# data types served by each version of the api, mapped to their endpoint
+VERSION_1_ENDPOINTS = {
+    "sleep": "sleep",
+    "activity": "activity",
+    "readiness": "readiness",
+    "ideal_bedtime": "bedtime",
+}
+VERSION_2_ENDPOINTS = {
+    "heart_rate": "heartrate",
+    "personal_info": "personal_info",
+    "sessions": "sessions",
+    "tag": "tag",
+    "workout": "workout",
+    "daily_activity": "daily_activity",
+}
+
+
+def call_api_version_1(
+    url: str,
+    start_date,
+    end_date,
+    access_token,
+    start_date_col: str = "start",
+    end_date_col: str = "end",
+):
+    """
+    First version of the api, will expire in near future
+    """
+    params = {
+        "access_token": access_token,
+        start_date_col: start_date,
+        end_date_col: end_date,
+    }
+    return {"url": url, "params": params}
+
+
+def call_api_version_2(
+    url: str,
+    start_date,
+    end_date,
+    access_token,
+    start_date_col: str = "start_date",
+    end_date_col: str = "end_date",
+):
+    """
+    Second version of the api, will be the only api version available in the near future
+    """
+    headers = {"Authorization": "Bearer " + access_token}
+    params = {start_date_col: start_date, end_date_col: end_date}
+    return {"url": url, "headers": headers, "params": params}
 
 
-def fetch_real_data(data_type, access_token, start_date, end_date):
-    """Main function for fetching real data from the Fitbit API.
+def get_request(data_type, access_token, start_date, end_date):
+    """Returns the request to make to fetch a data type from the Oura API.
 
+    :param data_type: the type of data to fetch, see fetch_real_data()
+    :type data_type: str
+    :param access_token: access token for the API
+    :type access_token: str
     :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :type start_date: str
     :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
-    :param data_type: the type of data to fetch, one of "Personal Info", "Heart Rate", "Sessions", "Tags", "Workouts", "Daily Sleep", "Daily Activity", "Daily Readiness", "Ideal Bedtime"
-    :param access_token: access token for the API
-    :return: the data fetched from the API according to the inputs
+    :type end_date: str
+    :raises ValueError: if the data type is not available from the API
+    :return: the keyword arguments of the GET request, for `requests.request`
+    :rtype: Dict
+    """
+    if data_type == "heart_rate":
+        return call_api_version_2(
+            f"{VERSION_2_URL}/{VERSION_2_ENDPOINTS[data_type]}",
+            start_date=start_date + "T00:00:00-23:59",
+            end_date=end_date + "T00:00:00-23:59",
+            access_token=access_token,
+            start_date_col="start_datetime",
+            end_date_col="end_datetime",
+        )
+    elif data_type in VERSION_2_ENDPOINTS:
+        return call_api_version_2(
+            f"{VERSION_2_URL}/{VERSION_2_ENDPOINTS[data_type]}",
+            start_date,
+            end_date,
+            access_token,
+        )
+    elif data_type in VERSION_1_ENDPOINTS:
+        return call_api_version_1(
+            f"{VERSION_1_URL}/{VERSION_1_ENDPOINTS[data_type]}",
+            start_date,
+            end_date,
+            access_token,
+        )
+
+    raise ValueError(f"data_type must be in {list(get_data_types())}")
+
+
+def parse_response(data_type, response):
+    """Extracts the data of a data type from the response of the Oura API.
+
+    :param data_type: the type of data fetched
+    :type data_type: str
+    :param response: the JSON response of the request made for the data type
+    :type response: Dict
+    :return: the data
     :rtype: List
     """
 
-    def call_api_version_1(
-        url: str,
-        start_date=start_date,
-        end_date=end_date,
-        access_token=access_token,
-        start_date_col: str = "start",
-        end_date_col: str = "end",
-        call: str = "GET",
-    ):
-        """
-        First version of the api, will expire in near future
-        """
-        params = {
-            "access_token": access_token,
-            start_date_col: start_date,
-            end_date_col: end_date,
-        }
-        return requests.request(call, url=url, params=params).json()
-
-    def call_api_version_2(
-        url: str,
-        start_date=start_date,
-        end_date=end_date,
-        access_token=access_token,
-        start_date_col: str = "start_date",
-        end_date_col: str = "end_date",
-        call: str = "GET",
-    ):
-        """
-        Second version of the api, will be the only api version available in the near future
-        """
-        headers = {"Authorization": "Bearer " + access_token}
-        params = {start_date_col: start_date, end_date_col: end_date}
-        return requests.request(call, url=url, headers=headers, params=params).json()
-
-    # heart_rate
-    heart_rate = call_api_version_2(
-        url="https://api.ouraring.com/v2/usercollection/heartrate",
-        start_date_col="start_datetime",
-        end_date_col="end_datetime",
-        start_date=start_date + "T00:00:00-23:59",
-        end_date=end_date + "T00:00:00-23:59",
-    )
+    # version 2 endpoints
+    if data_type == "heart_rate":
+        return response["data"]
+    elif data_type == "personal_info":
+        return [response]
+    elif data_type == "sessions":
+        return response["detail"] if response["detail"] != "Not Found" else [{}]
+    elif data_type in ["tag", "workout", "daily_activity"]:
+        return response["data"] if response["data"] else [{}]
 
-    # personal_info
-    personal_info = call_api_version_2(
-        url="https://api.ouraring.com/v2/usercollection/personal_info"
-    )
+    # version 1 endpoints
+    elif data_type == "ideal_bedtime":
+        return response["ideal_bedtimes"]
+    else:
+        return response[data_type]
 
-    # sessions
-    sessions = call_api_version_2(
-        url="https://api.ouraring.com/v2/usercollection/sessions"
-    )
 
-    # tag
-    tag = call_api_version_2(url="https://api.ouraring.com/v2/usercollection/tag")
+def get_data_types():
+    return [*VERSION_2_ENDPOINTS, *VERSION_1_ENDPOINTS]
 
-    # workout
-    workout = call_api_version_2(
-        url="https://api.ouraring.com/v2/usercollection/workout"
-    )
-
-    # daily_activity
-    daily_activity = call_api_version_2(
-        url="https://api.ouraring.com/v2/usercollection/daily_activity"
-    )
 
-    # sleep
-    sleep = call_api_version_1(url="https://api.ouraring.com/v1/sleep")
+def fetch_real_data(data_type, access_token, start_date, end_date, session=None):
+    """Main function for fetching real data from the Oura API.
 
-    # activity
-    activity = call_api_version_1(url="https://api.ouraring.com/v1/activity")
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :param data_type: the type of data to fetch, one of "heart_rate", "personal_info", "sessions", "tag", "workout", "daily_activity", "sleep", "activity", "readiness", "ideal_bedtime"
+    :param access_token: access token for the API
+    :param session: the session to send the request with, defaults to a shared session
+    :return: the data fetched from the API according to the inputs
+    :rtype: List
+    """
+    request = get_request(data_type, access_token, start_date, end_date)
 
-    # readiness
-    readiness = call_api_version_1(url="https://api.ouraring.com/v1/readiness")
+    return parse_response(
+        data_type, get_session(session).request("GET", **request).json()
+    )
 
-    # ideal_bedtime
-    ideal_bedtime = call_api_version_1(url="https://api.ouraring.com/v1/bedtime")
 
-    # aggregate data for version 2 endpoints
-    api_data = dict()
-    api_data["heart_rate"] = heart_rate["data"]
-    api_data["personal_info"] = [personal_info]
-    api_data["sessions"] = (
-        sessions["detail"] if sessions["detail"] != "Not Found" else [{}]
-    )
-    api_data["tag"] = tag["data"] if tag["data"] else [{}]
-    api_data["workout"] = workout["data"] if workout["data"] else [{}]
-    api_data["daily_activity"] = (
-        daily_activity["data"] if daily_activity["data"] else [{}]
-    )
+async def afetch_real_data(data_type, access_token, start_date, end_date, client):
+    """Coroutine version of fetch_real_data().
 
-    # aggregate data for version 1 (in addition to VERSION 2)
-    api_data["sleep"] = sleep["sleep"]
-    api_data["activity"] = activity["activity"]
-    api_data["readiness"] = readiness["readiness"]
-    api_data["ideal_bedtime"] = ideal_bedtime["ideal_bedtimes"]
+    :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
+    :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
+    :param data_type: the type of data to fetch, see fetch_real_data()
+    :param access_token: access token for the API
+    :param client: the async client to make the request with
+    :return: the data fetched from the API according to the inputs
+    :rtype: List
+    """
+    request = get_request(data_type, access_token, start_date, end_date)
+    response = await client.request("GET", **request)
 
-    return api_data[data_type]
+    return parse_response(data_type, response.json())
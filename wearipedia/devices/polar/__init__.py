@@ -1,3 +1,16 @@
-from .h10 import *
-from .vantage import *
-from .verity_sense import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "H10": ".h10",
+        "PolarVantage": ".vantage",
+        "VeritySense": ".verity_sense",
+    },
+    [
+        ".h10",
+        ".vantage",
+        ".verity_sense",
+    ],
+)
@@ -1,5 +1,4 @@
 import numpy as np
-import requests
 
 from ...devices.device import BaseDevice
 from .h10_gen import *
@@ -24,6 +23,10 @@ class H10(BaseDevice):
     :type end_date: str, optional
     """
 
+    _end_date_inclusive = True
+
+    _synthetic_range_params = ["start_date", "end_date"]
+
     def __init__(self, seed=0, start_date="2022-03-01", end_date="2022-06-17"):
 
         params = {
@@ -42,6 +45,15 @@ class H10(BaseDevice):
             },
         )
 
+        # each day is generated independently, the first time it is requested
+        self._register_synthetic_generator(
+            ["rr", "sessions"],
+            gen_session,
+            dates=get_synth_dates(
+                self.init_params["start_date"], self.init_params["end_date"]
+            ),
+        )
+
     def _default_params(self):
         return {
             "start_date": self.init_params["start_date"],
@@ -61,26 +73,25 @@ class H10(BaseDevice):
     def _filter_synthetic(self, data, data_type, params):
         # return data within range of start date and end date
         # includes both RR and HR data
+        synthetic_start = np.datetime64(self.init_params["start_date"])
+        start = np.datetime64(params["start_date"]) - synthetic_start
+        end = np.datetime64(params["end_date"]) - synthetic_start
+
+        # only generate the days between the start and end date (both inclusive)
+        start_index = max(int(start / np.timedelta64(1, "D")), 0)
+        end_index = max(int(end / np.timedelta64(1, "D")) + 1, 0)
+
         result = {}
 
-        for key in data.keys():
-            if np.datetime64(key) - np.datetime64(params["end_date"]) > 0:
-                break
-            elif np.datetime64(key) - np.datetime64(params["start_date"]) < 0:
-                continue
-            else:
-                result[key] = data[key]
+        for key, session in zip(
+            data.dates[start_index:end_index], data[start_index:end_index]
+        ):
+            # no session was recorded on skip days
+            if session is not None:
+                result[key] = session
 
         return result
 
-    def _gen_synthetic(self):
-        # generate heart rate data according to start and end dates
-        self.rr, self.sessions = gen_data(
-            self.init_params["seed"],
-            self.init_params["start_date"],
-            self.init_params["end_date"],
-        )
-
     def _authenticate(self, auth_creds):
         self.elite_hrv_session = None
         self.session = None
@@ -94,7 +105,7 @@ class H10(BaseDevice):
 
             # authenticate device in a python session and save it
             auth = {"email": email, "password": password}
-            self.session = requests.Session()
+            self.session = self.http_session
 
             # contains polar global variables we need later
             self.post = self.session.post("https://flow.polar.com/login", data=auth)
@@ -115,7 +126,7 @@ class H10(BaseDevice):
             data = f"email={elite_hrv_email}%40gmail.com&password={elite_hrv_password}&version=*&locale=en-us&language=en"
 
             # authenticate device in a python session and save it
-            response = requests.post(
+            response = self.http_session.post(
                 "https://app.elitehrv.com/application/index/login",
                 headers=headers,
                 data=data,
@@ -1,16 +1,97 @@
-import copy
 import datetime
-from collections import defaultdict
-from threading import Thread
 
 import numpy as np
-import pandas as pd
 from tqdm import tqdm
 
 
+def get_synth_dates(start_date, end_date):
+    """Returns the dates on which a training session may have been recorded.
+
+    :param start_date: the start date (inclusive) as a string in the format "YYYY-MM-DD"
+    :type start_date: str
+    :param end_date: the end date (exclusive) as a string in the format "YYYY-MM-DD"
+    :type end_date: str
+    :return: list of dates as strings in the format "YYYY-MM-DD"
+    :rtype: list
+    """
+    days = np.arange(np.datetime64(start_date), np.datetime64(end_date))
+
+    return [np.datetime_as_string(day, unit="D") for day in days]
+
+
+def gen_session(date, rng=np.random):
+    """Creates synthetic heart rate and RR data for the training session of a single day.
+
+    :param date: the date represented as a string in the format "YYYY-MM-DD"
+    :type date: str
+    :param rng: the random number generator to draw from, defaults to the global numpy
+        random state
+    :type rng: np.random.RandomState, optional
+    :return: a dictionary with keys "rr" and "sessions", whose values are the RR data and
+        the heart rate data of the session, or None if there was no session on that day
+    :rtype: Dict[str: Dict[str: list], str: Dict[str: list, str: int, str: int]]
+    """
+    durations = (45, 60)  # minutes
+
+    # simulate skip day
+    if rng.uniform(low=0, high=1, size=(1,))[0] > 0.8:
+        return {"rr": None, "sessions": None}
+
+    # day that you workout
+    duration = int(rng.uniform(low=durations[0], high=durations[1], size=(1,))[0])
+
+    # RR data
+    rr_list = []
+    c_rr = rng.uniform(low=400, high=2000, size=(1,))[0]
+
+    # heart rate data
+    hrate = []
+    start_rate = rng.uniform(low=70, high=110, size=(1,))[0]
+
+    for _ in range(duration * 60):
+
+        # heart rate data
+        hrate.append(start_rate)
+        added = rng.normal(scale=1) + 0.01 * (160 / start_rate)
+        if start_rate < 50:
+            added = abs(added)
+        elif start_rate > 190:
+            added = -1 * abs(added)
+        start_rate += added
+
+        # RR data
+        rr_list.append(c_rr)
+        added = rng.normal(scale=1) + 0.01 * (1000 / c_rr)
+        if c_rr < 400:
+            added = abs(added)
+        elif c_rr > 2000:
+            added = -1 * abs(added)
+        c_rr += added
+
+    # save heart rate data
+    session = {
+        "heart_rates": hrate,
+        "calories": int(rng.uniform(low=200, high=500, size=(1,))[0]),
+        "minutes": duration,
+    }
+
+    # save RR data
+    # create a list of timestamps
+    cur_time = datetime.datetime.strptime("00:00:00.0", "%H:%M:%S.%f")
+    date_list = []
+
+    for interval in rr_list:
+        date_list.append(cur_time)
+        cur_time = cur_time + datetime.timedelta(milliseconds=interval)
+
+    return {"rr": {"rr": rr_list, "time": date_list}, "sessions": session}
+
+
 def gen_data(seed, start_date, end_date):
     """Main function for creating synthetic heart rate data for the H10.
 
+    :param seed: the random seed, the session of the i-th day is generated with seed + i
+    :type seed: int
     :param start_date: the start date represented as a string in the format "YYYY-MM-DD"
     :type start_date: str
     :param end_date: the end date represented as a string in the format "YYYY-MM-DD"
@@ -18,82 +99,14 @@ def gen_data(seed, start_date, end_date):
     :return: a tuple of dictionary with keys the training session dates and values a dictionary with keys RR< heart_rates, calories, and minutes
     :rtype: tuple(Dict[str: list, str: list], Dict[str: Dict[str: list, str: int, str: int]])
     """
-    sessions = np.datetime64(end_date) - np.datetime64(start_date)
-    durations = (45, 60)  # minutes
-
-    def gen_all(rr_result, hr_result, index):
-        local_rng = np.random.RandomState(seed + index)
-
-        # simulate skip day
-        if local_rng.uniform(low=0, high=1, size=(1,))[0] > 0.8:
-            return
+    hr_result = dict()
+    rr_result = dict()
 
-        # day that you workout
-        day = np.datetime64(start_date) + np.timedelta64(index, "D")
-        duration = int(
-            local_rng.uniform(low=durations[0], high=durations[1], size=(1,))[0]
-        )
+    for index, date in enumerate(tqdm(get_synth_dates(start_date, end_date))):
+        session = gen_session(date, np.random.RandomState(seed + index))
 
-        # RR data
-        rr_list = []
-        c_rr = local_rng.uniform(low=400, high=2000, size=(1,))[0]
-
-        # heart rate data
-        hrate = []
-        start_rate = local_rng.uniform(low=70, high=110, size=(1,))[0]
-
-        for _ in range(duration * 60):
-
-            # heart rate data
-            hrate.append(start_rate)
-            added = local_rng.normal(scale=1) + 0.01 * (160 / start_rate)
-            if start_rate < 50:
-                added = abs(added)
-            elif start_rate > 190:
-                added = -1 * abs(added)
-            start_rate += added
-
-            # RR data
-            rr_list.append(c_rr)
-            added = local_rng.normal(scale=1) + 0.01 * (1000 / c_rr)
-            if c_rr < 400:
-                added = abs(added)
-            elif c_rr > 2000:
-                added = -1 * abs(added)
-            c_rr += added
-
-        # save heart rate data
-        hr_result[pd.to_datetime(day).strftime("%Y-%m-%d")]["heart_rates"] = hrate
-        hr_result[pd.to_datetime(day).strftime("%Y-%m-%d")]["calories"] = int(
-            local_rng.uniform(low=200, high=500, size=(1,))[0]
-        )
-        hr_result[pd.to_datetime(day).strftime("%Y-%m-%d")]["minutes"] = duration
-
-        # save RR data
-        # create a list of timestamps
-        cur_time = datetime.datetime.strptime("00:00:00.0", "%H:%M:%S.%f")
-        date_list = []
-
-        for interval in rr_list:
-            date_list.append(cur_time)
-            cur_time = cur_time + datetime.timedelta(milliseconds=interval)
-
-        rr_result[pd.to_datetime(day).strftime("%Y-%m-%d")]["rr"] = rr_list
-        rr_result[pd.to_datetime(day).strftime("%Y-%m-%d")]["time"] = date_list
-
-    threads = []
-    hr_result = defaultdict(dict)
-    rr_result = defaultdict(dict)
-    for i in tqdm(range(int(sessions / np.timedelta64(1, "D")))):
-        new_thread = Thread(target=gen_all, args=(rr_result, hr_result, i))
-        threads.append(new_thread)
-
-    # start threads
-    for thread in threads:
-        thread.start()
-
-    # wait for all threads to terminate
-    for thread in tqdm(threads):
-        thread.join()
+        if session["sessions"] is not None:
+            rr_result[date] = session["rr"]
+            hr_result[date] = session["sessions"]
 
     return rr_result, hr_result
@@ -5,7 +5,8 @@ import zipfile
 
 import numpy as np
 import pandas as pd
-import requests
+
+from ...sessions import get_session
 
 
 def fetch_real_data(
@@ -115,7 +116,7 @@ def fetch_real_data(
         data = f"userId={user_id}&startDate={start_date}%3A01%3A52.615Z&endDate={end_date}T23%3A01%3A52.615Z&version=*&locale=en-us&language=en&sessionId={session_id}"
 
         # get the output raw text file
-        response = requests.post(
+        response = get_session(session).post(
             "https://app.elitehrv.com/application/reading/exportUser",
             headers=headers,
             data=data,
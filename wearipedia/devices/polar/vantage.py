@@ -1,8 +1,6 @@
 import re
 from datetime import datetime
 
-import requests
-
 from ...utils import seed_everything
 from ..device import BaseDevice
 from .vantage_fetch import *
@@ -127,19 +125,19 @@ class PolarVantage(BaseDevice):
         }
 
         # login to polar flow
-        with requests.Session() as session:
-            post = session.post("https://flow.polar.com/login", data=payload)
+        session = self.http_session
+        post = session.post("https://flow.polar.com/login", data=payload)
 
-            # using regular expressions, we can search for the userId in the session response
-            result = re.search("AppGlobal.init((.*))", post.text)
+        # using regular expressions, we can search for the userId in the session response
+        result = re.search("AppGlobal.init((.*))", post.text)
 
-            # if the userId is not found, the login failed
-            if result == None:
-                print("Login failed, please check your credentials")
-                return
+        # if the userId is not found, the login failed
+        if result == None:
+            print("Login failed, please check your credentials")
+            return
 
-            res = str(result.group(1)).split('"')
-            self.USERID = int(res[1])
+        res = str(result.group(1)).split('"')
+        self.USERID = int(res[1])
 
-            print("Login successful, user id is: " + str(self.USERID))
-            self.session = session
+        print("Login successful, user id is: " + str(self.USERID))
+        self.session = session
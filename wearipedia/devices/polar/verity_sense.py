@@ -1,5 +1,4 @@
 import numpy as np
-import requests
 
 from ...devices.device import BaseDevice
 from .polar_get import *
@@ -22,6 +21,8 @@ class VeritySense(BaseDevice):
     :type end_date: str, optional
     """
 
+    _end_date_inclusive = True
+
     def __init__(self, seed=0, start_date="2022-03-01", end_date="2022-06-17"):
 
         params = {
@@ -56,16 +57,13 @@ class VeritySense(BaseDevice):
         )
 
     def _filter_synthetic(self, data, data_type, params):
-        # return data within range of start date and end date
-        result = {}
-        for key in data.keys():
-            if np.datetime64(key) - np.datetime64(params["end_date"]) > 0:
-                break
-            elif np.datetime64(key) - np.datetime64(params["start_date"]) < 0:
-                continue
-            else:
-                result[key] = data[key]
-        return result
+        # return data within range of start date and end date (both inclusive)
+        keys = list(data.keys())
+        # the sessions are keyed by their date
+        index = self._time_index(data_type, data, list)
+        end = np.datetime64(params["end_date"]) + np.timedelta64(1, "D")
+
+        return {key: data[key] for key in index.select(keys, params["start_date"], end)}
 
     def _gen_synthetic(self):
         # generate heart rate data according to start and end dates
@@ -83,7 +81,7 @@ class VeritySense(BaseDevice):
 
         # authenticate device in a python session and save it
         auth = {"email": self.email, "password": self.password}
-        self.session = requests.Session()
+        self.session = self.http_session
 
         # contains polar global variables we need later
         self.post = self.session.post("https://flow.polar.com/login", data=auth)
@@ -60,6 +60,9 @@ class Strava(BaseDevice):
     :type id: str, optional
     """
 
+    # the streams of an activity are not filtered by date
+    _undated_data_types = {"heartrate"}
+
     def __init__(self, seed=0, start_date="2022-03-01", end_date="2022-06-17"):
 
         params = {
@@ -2,7 +2,8 @@ import time
 
 import numpy as np
 import pandas as pd
-import requests
+
+from ...sessions import get_session
 
 PER_PAGE_LIMIT = 200
 PAGE_COUNT = 1
@@ -39,6 +40,8 @@ def fetch_real_data(self, start_date, end_date, data_type, id=""):
     :return: The data fetched from the API according to the inputs.
     :rtype: list
     """
+    session = get_session(self.http_session)
+
     # URL to access all of participant's activities.
 
     stream_data = set(["heartrate"])
@@ -58,7 +61,7 @@ def fetch_real_data(self, start_date, end_date, data_type, id=""):
         params = {"keys": [data_type], "key_by_type": True}
 
         # GET request to get activity streams from the API
-        response = requests.get(activities_url, headers=headers, params=params).json()
+        response = session.get(activities_url, headers=headers, params=params).json()
 
         if response is None:
             return []
@@ -75,7 +78,7 @@ def fetch_real_data(self, start_date, end_date, data_type, id=""):
     }
 
     # GET request to get all your activities from the API
-    my_dataset = requests.get(activites_url, headers=header, params=param).json()
+    my_dataset = session.get(activites_url, headers=header, params=param).json()
 
     # Normalize the json data
     df_strava = pd.json_normalize(my_dataset)
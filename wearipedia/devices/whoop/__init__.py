@@ -1 +1,12 @@
-from .whoop_4 import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "Whoop4": ".whoop_4",
+    },
+    [
+        ".whoop_4",
+    ],
+)
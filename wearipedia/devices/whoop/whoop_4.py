@@ -1,7 +1,7 @@
 import numpy as np
 import pandas as pd
 
-from ...utils import bin_search, seed_everything
+from ...utils import seed_everything
 from ..device import BaseDevice
 from .whoop_authenticate import *
 from .whoop_extract import *
@@ -28,6 +28,8 @@ class Whoop4(BaseDevice):
     :type end_date: str, optional
     """
 
+    _sync_keys = {"cycles": ["id"], "sleeps": ["id"], "workouts": ["id"]}
+
     def __init__(
         self, seed=0, synthetic_start_date="2022-03-01", synthetic_end_date="2022-06-17"
     ):
@@ -48,6 +50,11 @@ class Whoop4(BaseDevice):
             },
         )
 
+        # each collection is generated independently, the first time it is requested
+        self._register_synthetic_generator(["cycles"], self._gen_cycles)
+        self._register_synthetic_generator(["sleeps"], self._gen_sleeps)
+        self._register_synthetic_generator(["workouts"], self._gen_workouts)
+
     def _default_params(self):
         return {
             "start": self.init_params["synthetic_start_date"],
@@ -61,6 +68,7 @@ class Whoop4(BaseDevice):
                 access_token=self.access_token,
                 start_date=params["start"],
                 end_date=params["end"],
+                session=self.http_session,
             )
         elif data_type == "sleeps":
             return fetch_collection(
@@ -68,6 +76,7 @@ class Whoop4(BaseDevice):
                 access_token=self.access_token,
                 start_date=params["start"],
                 end_date=params["end"],
+                session=self.http_session,
             )
         elif data_type == "workouts":
             return fetch_collection(
@@ -75,37 +84,38 @@ class Whoop4(BaseDevice):
                 access_token=self.access_token,
                 start_date=params["start"],
                 end_date=params["end"],
+                session=self.http_session,
             )
 
     def _filter_synthetic(self, data, data_type, params):
+        # collections are sorted by descending start time, like the API returns them
+        index = self._time_index(data_type, data, lambda data: data["start"])
 
-        key = "start"
-        target_start = params["start"]
-        target_end = params["end"]
-
-        start_idx = bin_search(np.array(data[key]), target_start)
-        end_idx = bin_search(np.array(data[key]), target_end)
-
-        return data.iloc[start_idx:end_idx]
-
-    def _gen_synthetic(self):
-        # generate random data according to seed
-        seed_everything(self.init_params["seed"])
+        return index.select(data, params["start"], params["end"])
 
-        self.cycles = create_synthetic_cycle_collection_df(
-            self.init_params["synthetic_start_date"],
-            self.init_params["synthetic_end_date"],
-        )
+    def _gen_cycles(self):
+        return {
+            "cycles": create_synthetic_cycle_collection_df(
+                self.init_params["synthetic_start_date"],
+                self.init_params["synthetic_end_date"],
+            )
+        }
 
-        self.sleeps = create_synthetic_sleep_collection_df(
-            self.init_params["synthetic_start_date"],
-            self.init_params["synthetic_end_date"],
-        )
+    def _gen_sleeps(self):
+        return {
+            "sleeps": create_synthetic_sleep_collection_df(
+                self.init_params["synthetic_start_date"],
+                self.init_params["synthetic_end_date"],
+            )
+        }
 
-        self.workouts = create_synthetic_workout_collection_df(
-            self.init_params["synthetic_start_date"],
-            self.init_params["synthetic_end_date"],
-        )
+    def _gen_workouts(self):
+        return {
+            "workouts": create_synthetic_workout_collection_df(
+                self.init_params["synthetic_start_date"],
+                self.init_params["synthetic_end_date"],
+            )
+        }
 
     def _authenticate(self, auth_creds):
         # authenticate this device against API
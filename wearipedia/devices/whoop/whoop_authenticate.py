@@ -5,6 +5,8 @@ from urllib.parse import parse_qs, urlparse
 
 import requests
 
+from ...tokens import refresh_tokens
+
 __all__ = ["refresh_access_token", "whoop_authenticate"]
 
 CALLBACK_URI = "https://wearipedia.com/"
@@ -99,24 +101,29 @@ def refresh_access_token(refresh_token, client_id, client_secret):
     :return: A tuple containing the refresh token and new access token obtained from the refresh token. (refresh_token, new_access_token)
     :rtype: tuple
     """
-    params = {
-        "action": "requesttoken",
-        "grant_type": "refresh_token",
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "refresh_token": refresh_token,
-    }
-    response = requests.post(
-        "https://api.prod.whoop.com/oauth/oauth2/token", data=params
-    )
-    try:
-        new_access_token, refresh_token = response.json().get(
-            "access_token"
-        ), response.json().get("refresh_token")
-        # print("Access Token:", access_token)
-        # print("Refresh Token:", refresh_token)
-    except:
-        print("Error:", response.json().get("error"))
-        print("Error Description:", response.json().get("error_description"))
 
-    return refresh_token, new_access_token
+    # the token store may already have a fresh access token, e.g. refreshed by another worker
+    def request_tokens(refresh_token):
+        params = {
+            "action": "requesttoken",
+            "grant_type": "refresh_token",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "refresh_token": refresh_token,
+        }
+        response = requests.post(
+            "https://api.prod.whoop.com/oauth/oauth2/token", data=params
+        )
+        out = response.json()
+
+        if "access_token" not in out:
+            print("Error:", out.get("error"))
+            print("Error Description:", out.get("error_description"))
+
+        return (
+            out.get("refresh_token", refresh_token),
+            out.get("access_token"),
+            out.get("expires_in"),
+        )
+
+    return refresh_tokens("WHOOP", refresh_token, request_tokens, client_id)
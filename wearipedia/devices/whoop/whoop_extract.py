@@ -3,22 +3,24 @@ from typing import Optional
 import re
 
 import pandas as pd
-import requests
+
+from ...sessions import get_session
 
 
 # Fetch profile
-def fetch_profile(access_token: str) -> pd.DataFrame:
+def fetch_profile(access_token: str, session=None) -> pd.DataFrame:
     """
     Fetches the basic user profile data from the WHOOP API.
 
     :param str access_token: The access token for authentication.
+    :param requests.Session session: The session to send the request with. Defaults to the shared session.
 
     :raises Exception: Raised if the API request fails with a status code other than 200.
 
     :return: A pandas DataFrame containing the user profile data.
     :rtype: pd.DataFrame
     """
-    response = requests.get(
+    response = get_session(session).get(
         "https://api.prod.whoop.com/developer/v1/user/profile/basic",
         headers={"Authorization": f"Bearer {access_token}"},
     )
@@ -34,18 +36,19 @@ def fetch_profile(access_token: str) -> pd.DataFrame:
 
 
 # Fetch body measurements
-def fetch_body_measurements(access_token: str) -> pd.DataFrame:
+def fetch_body_measurements(access_token: str, session=None) -> pd.DataFrame:
     """
     Fetches body measurements data from the WHOOP API.
 
     :param str access_token: The access token for authentication.
+    :param requests.Session session: The session to send the request with. Defaults to the shared session.
 
     :raises Exception: Raised if the API request fails with a status code other than 200.
 
     :return: A pandas DataFrame containing body measurements data.
     :rtype: pd.DataFrame
     """
-    response = requests.get(
+    response = get_session(session).get(
         "https://api.prod.whoop.com/developer/v1/user/measurement/body",
         headers={"Authorization": f"Bearer {access_token}"},
     )
@@ -67,6 +70,7 @@ def fetch_collection(
     access_token: str,
     start_date: Optional[str] = None,
     end_date: Optional[str] = None,
+    session=None,
 ) -> pd.DataFrame:
     """
     Fetches collection data from the WHOOP API.
@@ -75,6 +79,7 @@ def fetch_collection(
     :param str access_token: The access token for authentication.
     :param str start_date: The start date of the requested data in the format "YYYY-MM-DD" or "YYYY-MM-DDTHH:MM:SS.mmmZ". Defaults to None (not provided).
     :param str end_date: The end date of the requested data in the format "YYYY-MM-DD" or "YYYY-MM-DDTHH:MM:SS.mmmZ". Defaults to None (not provided).
+    :param requests.Session session: The session to send the requests with, so that all pages reuse its connections. Defaults to the shared session.
 
     :raises ValueError: Raised if the provided start_date or end_date is not in the correct format.
 
@@ -106,6 +111,8 @@ def fetch_collection(
                 "End date is not in the correct format. Please use the format YYYY-MM-DD or YYYY-MM-DDTHH:MM:SS.mmmZ"
             )
 
+    session = get_session(session)
+
     next_page = True
     next_token = None
 
@@ -130,7 +137,7 @@ def fetch_collection(
             query += f"nextToken={next_token}&"
         query = query[:-1]
 
-        response = requests.get(
+        response = session.get(
             query,
             headers={
                 "Authorization": f"Bearer {access_token}",
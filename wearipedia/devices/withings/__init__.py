@@ -1,3 +1,16 @@
-from .bodyplus import *
-from .scanwatch import *
-from .sleepmat import *
+# device modules are only imported once they are used
+from ...lazy import lazy_getattr
+
+__getattr__ = lazy_getattr(
+    __name__,
+    {
+        "BodyPlus": ".bodyplus",
+        "ScanWatch": ".scanwatch",
+        "SleepMat": ".sleepmat",
+    },
+    [
+        ".bodyplus",
+        ".scanwatch",
+        ".sleepmat",
+    ],
+)
@@ -4,7 +4,7 @@ from pathlib import Path
 import wget
 
 from ...devices.device import BaseDevice
-from ...utils import bin_search, seed_everything
+from ...utils import seed_everything
 from .withings_authenticate import *
 from .withings_extract import *
 from .withings_gen import *
@@ -24,6 +24,8 @@ class BodyPlus(BaseDevice):
     :type start_date: str, optional
     """
 
+    _sync_keys = {"measurements": ["date"]}
+
     def __init__(self, seed=0, synthetic_start_date="2021-06-01"):
 
         params = {"seed": seed, "synthetic_start_date": synthetic_start_date}
@@ -51,16 +53,14 @@ class BodyPlus(BaseDevice):
         start = datetime.strptime(params["start"], "%Y-%m-%d")
         end = datetime.strptime(params["end"], "%Y-%m-%d")
 
-        return fetch_measurements(self.access_token, start, end)
+        return fetch_measurements(
+            self.access_token, start, end, session=self.http_session
+        )
 
     def _filter_synthetic(self, data, data_type, params):
-        start_ts = pd.Timestamp(params["start"])
-        end_ts = pd.Timestamp(params["end"])
-
-        start_idx = bin_search(np.array(data.date), start_ts)
-        end_idx = bin_search(np.array(data.date), end_ts)
+        index = self._time_index(data_type, data, lambda data: data.date)
 
-        return data.iloc[start_idx:end_idx]
+        return index.select(data, params["start"], params["end"])
 
     def _gen_synthetic(self):
         # generate random data according to seed
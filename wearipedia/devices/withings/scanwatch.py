@@ -1,7 +1,8 @@
 import time
 
+from ...aio import get_async_client
 from ...devices.device import BaseDevice
-from ...utils import bin_search, seed_everything
+from ...utils import seed_everything
 from .withings_authenticate import *
 from .withings_extract import *
 from .withings_gen import *
@@ -25,6 +26,8 @@ class ScanWatch(BaseDevice):
     :type end_date: str, optional
     """
 
+    _sync_keys = {"heart_rates": ["datetime"], "sleeps": ["id"]}
+
     def __init__(
         self, seed=0, synthetic_start_date="2022-03-01", synthetic_end_date="2022-06-17"
     ):
@@ -45,6 +48,12 @@ class ScanWatch(BaseDevice):
             },
         )
 
+        # heart rates are lower during sleeps, so they need the sleeps first
+        self._register_synthetic_generator(["sleeps"], self._gen_sleeps)
+        self._register_synthetic_generator(
+            ["heart_rates"], self._gen_heart_rates, depends_on=["sleeps"]
+        )
+
     def _default_params(self):
         return {
             "start": self.init_params["synthetic_start_date"],
@@ -54,41 +63,57 @@ class ScanWatch(BaseDevice):
     def _get_real(self, data_type, params):
         if data_type == "heart_rates":
             return fetch_all_heart_rate(
-                self.access_token, params["start"], params["end"]
+                self.access_token,
+                params["start"],
+                params["end"],
+                session=self.http_session,
             )
         elif data_type == "sleeps":
-            return fetch_all_sleeps(self.access_token, params["start"], params["end"])
+            return fetch_all_sleeps(
+                self.access_token,
+                params["start"],
+                params["end"],
+                session=self.http_session,
+            )
 
-    def _filter_synthetic(self, data, data_type, params):
+    async def _aget_real(self, data_type, params):
+        client = get_async_client()
+
+        if data_type == "heart_rates":
+            return await afetch_all_heart_rate(
+                client, self.access_token, params["start"], params["end"]
+            )
+        elif data_type == "sleeps":
+            return await client.run(
+                fetch_all_sleeps, self.access_token, params["start"], params["end"]
+            )
 
+    def _filter_synthetic(self, data, data_type, params):
         if data_type == "sleeps":
             key = "date"
-            target_start = params["start"]
-            target_end = params["end"]
         elif data_type == "heart_rates":
             key = "datetime"
-            target_start = pd.Timestamp(params["start"])
-            target_end = pd.Timestamp(params["end"])
-
-        start_idx = bin_search(np.array(data[key]), target_start)
-        end_idx = bin_search(np.array(data[key]), target_end)
 
-        return data.iloc[start_idx:end_idx]
+        index = self._time_index(data_type, data, lambda data: data[key])
 
-    def _gen_synthetic(self):
-        # generate random data according to seed
-        seed_everything(self.init_params["seed"])
+        return index.select(data, params["start"], params["end"])
 
-        self.sleeps = create_synthetic_sleeps_df(
-            self.init_params["synthetic_start_date"],
-            self.init_params["synthetic_end_date"],
-        )
+    def _gen_sleeps(self):
+        return {
+            "sleeps": create_synthetic_sleeps_df(
+                self.init_params["synthetic_start_date"],
+                self.init_params["synthetic_end_date"],
+            )
+        }
 
-        self.heart_rates = create_syn_hr(
-            self.init_params["synthetic_start_date"],
-            self.init_params["synthetic_end_date"],
-            self.sleeps,
-        )
+    def _gen_heart_rates(self, sleeps):
+        return {
+            "heart_rates": create_syn_hr(
+                self.init_params["synthetic_start_date"],
+                self.init_params["synthetic_end_date"],
+                sleeps,
+            )
+        }
 
     def _authenticate(self, auth_creds):
         if "access_token" in auth_creds:
@@ -4,6 +4,8 @@ import urllib
 
 import requests
 
+from ...tokens import refresh_tokens
+
 __all__ = ["refresh_access_token", "withings_authenticate"]
 
 STATE = "string"
@@ -12,28 +14,35 @@ CALLBACK_URI = "https://wbsapi.withings.net/v2/oauth2"
 
 
 def refresh_access_token(refresh_token, client_id, client_secret):
-    # gives us access token given the refresh token
-
-    params = {
-        "action": "requesttoken",
-        "grant_type": "refresh_token",
-        "client_id": client_id,
-        "client_secret": client_secret,
-        "refresh_token": refresh_token,
-    }
-
-    out = requests.post("https://wbsapi.withings.net/v2/oauth2", data=params)
-
-    try:
-        body = json.loads(out.text)["body"]
-        new_refresh_token, access_token = body["refresh_token"], body["access_token"]
-        print(f"Got new refresh token: {new_refresh_token}")
-    except KeyError as e:
-        exception_str = f"Got exception: {e}\n"
-        exception_str += f"The full returned payload is: {json.loads(out.text)}"
-        raise Exception(exception_str)
-
-    return new_refresh_token, access_token
+    # gives us access token given the refresh token, unless the token store already
+    # has a fresh one (e.g. refreshed by another worker)
+
+    def request_tokens(refresh_token):
+        params = {
+            "action": "requesttoken",
+            "grant_type": "refresh_token",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "refresh_token": refresh_token,
+        }
+
+        out = requests.post("https://wbsapi.withings.net/v2/oauth2", data=params)
+
+        try:
+            body = json.loads(out.text)["body"]
+            new_refresh_token, access_token = (
+                body["refresh_token"],
+                body["access_token"],
+            )
+            print(f"Got new refresh token: {new_refresh_token}")
+        except KeyError as e:
+            exception_str = f"Got exception: {e}\n"
+            exception_str += f"The full returned payload is: {json.loads(out.text)}"
+            raise Exception(exception_str)
+
+        return new_refresh_token, access_token, body.get("expires_in")
+
+    return refresh_tokens("WITHINGS", refresh_token, request_tokens, client_id)
 
 
 def withings_authenticate(client_id, client_secret):
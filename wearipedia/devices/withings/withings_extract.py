@@ -8,15 +8,19 @@
 start_date = "2020-05-20"  # @param {type:"date"}
 end_date = "2022-07-20"  # @param {type:"date"}
 
+import asyncio
 import json
+import time
 import urllib
 from datetime import datetime, timedelta
 
 import numpy as np
 import pandas as pd
-import requests
 from tqdm import tqdm
 
+from ...ratelimit import backoff_delay
+from ...sessions import get_session
+
 # import july
 # from july.utils import date_range
 
@@ -48,74 +52,110 @@ num_to_description = {
 
 NUM_RETRIES = 3
 
+# the status of the responses of throttled requests (sent with HTTP status 200)
+TOO_MANY_REQUESTS_STATUS = 601
+
+
+def parse_page(out, arr_key, parse_data, data_args, endpoint_url, headers):
+    # parses the array of a single response of fetch_all_wrapper, returning
+    # None if the request should be retried
+
+    if out["status"] == 401:
+        raise Exception(
+            f"request response is {out} for request {data_args} to endpoint {endpoint_url}, headers {headers}"
+        )
+
+    try:
+        return parse_data(out["body"][arr_key])
+    except KeyError:
+        if "body" in out.keys():
+            raise Exception(f'got key {arr_key}, expected one of {out["body"].keys()}')
+        elif out["status"] == 2555:
+            # when the payload is too large, this is the status code
+            return None
+        else:
+            raise Exception(
+                f"request response is {out} for request {data_args} to endpoint {endpoint_url}, headers {headers}"
+            )
+
+
+def check_throttled(out, data_args, endpoint_url):
+    # raises if the last response of a page was throttled, once the retries are
+    # exhausted, rather than returning the pages so far (or a response without a body)
+    if out["status"] == TOO_MANY_REQUESTS_STATUS:
+        raise Exception(
+            f"request {data_args} to endpoint {endpoint_url} is still throttled after {NUM_RETRIES} attempts"
+        )
+
+
+def merge_page(arr_complete, arr):
+    # for example, https://developer.withings.com/api-reference/#operation/measurev2-getactivity
+    # vs. https://developer.withings.com/api-reference/#operation/measure-getmeas
+
+    if type(arr) == type({}):
+        if arr_complete is None:
+            arr_complete = dict()
+
+        arr_complete.update(arr)
+
+    elif type(arr) == type([]):
+        if arr_complete is None:
+            arr_complete = []
+
+        arr_complete += arr
+
+    return arr_complete
+
+
+def next_offset(out):
+    # the offset to continue from if there's still more to get, otherwise None
+    if "more" in out["body"].keys() and out["body"]["more"] == 1:
+        return out["body"]["offset"]
+
+    return None
+
 
-def fetch_all_wrapper(endpoint_url, data, headers, arr_key, parse_data=lambda x: x):
+def fetch_all_wrapper(
+    endpoint_url, data, headers, arr_key, parse_data=lambda x: x, session=None
+):
     # wrapper around public API that retrieves arbitrarily large # of
     # records, since there is a restriction of # of records per API response
     # NOTES:
     # out['body'][arr_key] is concatenated across several requests
     # parse_data is a function that parses the returned array
+    # all pages are requested through session, reusing its connections
+    session = get_session(session)
 
     cur_offset = 0
     arr_complete = None
 
-    arr = None
-
-    while True:
+    while cur_offset is not None:
         # endpoint can be flaky if the response payload is extremely large,
         # so retry at most NUM_RETRIES times
         for i in range(NUM_RETRIES):
             data_args = {**data, "offset": cur_offset}
 
-            out = requests.post(endpoint_url, data=data_args, headers=headers)
+            out = session.post(endpoint_url, data=data_args, headers=headers)
 
             out = json.loads(out.text)
 
-            if out["status"] == 401:
-                raise Exception(
-                    f"request response is {out} for request {data_args} to endpoint {endpoint_url}, headers {headers}"
-                )
+            if out["status"] == TOO_MANY_REQUESTS_STATUS:
+                time.sleep(backoff_delay(i))
+                arr = None
+                continue
 
-            try:
-                arr = parse_data(out["body"][arr_key])
-                break
-            except KeyError:
-                if "body" in out.keys():
-                    raise Exception(
-                        f'got key {arr_key}, expected one of {out["body"].keys()}'
-                    )
-                elif out["status"] == 2555:
-                    # when the payload is too large, this is the status code
-                    continue
-                else:
-                    raise Exception(
-                        f"request response is {out} for request {data_args} to endpoint {endpoint_url}, headers {headers}"
-                    )
-
-        # for example, https://developer.withings.com/api-reference/#operation/measurev2-getactivity
-        # vs. https://developer.withings.com/api-reference/#operation/measure-getmeas
-
-        if arr is not None:
-            if type(arr) == type({}):
-                if arr_complete is None:
-                    arr_complete = dict()
-
-                arr_complete.update(arr)
-
-            elif type(arr) == type([]):
-                if arr_complete is None:
-                    arr_complete = []
-
-                arr_complete += arr
-
-            # continue if there's still more to get
-            if "more" in out["body"].keys() and out["body"]["more"] == 1:
-                cur_offset = out["body"]["offset"]
-            else:
+            arr = parse_page(out, arr_key, parse_data, data_args, endpoint_url, headers)
+
+            if arr is not None:
                 break
-        else:
+
+        if arr is None:
+            check_throttled(out, data_args, endpoint_url)
             break
 
+        arr_complete = merge_page(arr_complete, arr)
+        cur_offset = next_offset(out)
+
     # replace with concatenated version
     if arr_complete is not None:
         out["body"][arr_key] = arr_complete
@@ -123,9 +163,48 @@ def fetch_all_wrapper(endpoint_url, data, headers, arr_key, parse_data=lambda x:
     return out
 
 
-def fetch_all_heart_rate(access_token, start="2020-03-10", end="2022-05-28"):
-    # get all dates heart rate was collected for
-    out = fetch_all_wrapper(
+async def afetch_all_wrapper(
+    client, endpoint_url, data, headers, arr_key, parse_data=lambda x: x
+):
+    # coroutine version of fetch_all_wrapper, making the requests with client
+
+    cur_offset = 0
+    arr_complete = None
+
+    while cur_offset is not None:
+        for i in range(NUM_RETRIES):
+            data_args = {**data, "offset": cur_offset}
+
+            out = await client.post(endpoint_url, data=data_args, headers=headers)
+
+            out = json.loads(out.text)
+
+            if out["status"] == TOO_MANY_REQUESTS_STATUS:
+                await asyncio.sleep(backoff_delay(i))
+                arr = None
+                continue
+
+            arr = parse_page(out, arr_key, parse_data, data_args, endpoint_url, headers)
+
+            if arr is not None:
+                break
+
+        if arr is None:
+            check_throttled(out, data_args, endpoint_url)
+            break
+
+        arr_complete = merge_page(arr_complete, arr)
+        cur_offset = next_offset(out)
+
+    if arr_complete is not None:
+        out["body"][arr_key] = arr_complete
+
+    return out
+
+
+def heart_rate_dates_request(access_token, start, end):
+    # arguments of fetch_all_wrapper to get all dates heart rate was collected for
+    return (
         "https://wbsapi.withings.net/v2/measure",
         {
             "action": "getactivity",
@@ -134,7 +213,45 @@ def fetch_all_heart_rate(access_token, start="2020-03-10", end="2022-05-28"):
             "data_fields": "hr_average",
         },
         {"Authorization": f"Bearer {access_token}"},
-        arr_key="activities",
+        "activities",
+    )
+
+
+def intraday_heart_rate_request(access_token, date):
+    # arguments of fetch_all_wrapper to get the heart rate data of a single date
+    return (
+        "https://wbsapi.withings.net/v2/measure",
+        {
+            "action": "getintradayactivity",
+            "startdate": int(datetime.strptime(date, "%Y-%m-%d").timestamp()),
+            "enddate": int(datetime.strptime(date, "%Y-%m-%d").timestamp()) + 24 * 3600,
+            "data_fields": "heart_rate",
+        },
+        {"Authorization": f"Bearer {access_token}"},
+        "series",
+    )
+
+
+def parse_intraday_heart_rate(out, start, end):
+    # the heart rate data of a single date as a list of dicts
+    if "body" not in out.keys():
+        return []
+
+    return [
+        {"datetime": datetime.fromtimestamp(int(k)), **v}
+        for k, v in out["body"]["series"].items()
+        if datetime.strptime(start, "%Y-%m-%d")
+        <= datetime.fromtimestamp(int(k))
+        <= datetime.strptime(end, "%Y-%m-%d")
+    ]
+
+
+def fetch_all_heart_rate(
+    access_token, start="2020-03-10", end="2022-05-28", session=None
+):
+    # get all dates heart rate was collected for
+    out = fetch_all_wrapper(
+        *heart_rate_dates_request(access_token, start, end), session=session
     )
 
     dates = [act["date"] for act in out["body"]["activities"]]
@@ -143,33 +260,44 @@ def fetch_all_heart_rate(access_token, start="2020-03-10", end="2022-05-28"):
     dict_list = []
     for date in tqdm(dates):
         out = fetch_all_wrapper(
-            "https://wbsapi.withings.net/v2/measure",
-            {
-                "action": "getintradayactivity",
-                "startdate": int(datetime.strptime(date, "%Y-%m-%d").timestamp()),
-                "enddate": int(datetime.strptime(date, "%Y-%m-%d").timestamp())
-                + 24 * 3600,
-                "data_fields": "heart_rate",
-            },
-            {"Authorization": f"Bearer {access_token}"},
-            arr_key="series",
+            *intraday_heart_rate_request(access_token, date), session=session
         )
 
-        if "body" in out.keys():
-            dict_list += [
-                {"datetime": datetime.fromtimestamp(int(k)), **v}
-                for k, v in out["body"]["series"].items()
-                if datetime.strptime(start, "%Y-%m-%d")
-                <= datetime.fromtimestamp(int(k))
-                <= datetime.strptime(end, "%Y-%m-%d")
-            ]
+        dict_list += parse_intraday_heart_rate(out, start, end)
+
+    df = pd.DataFrame.from_dict(dict_list)
+
+    return df
+
+
+async def afetch_all_heart_rate(
+    client, access_token, start="2020-03-10", end="2022-05-28"
+):
+    # coroutine version of fetch_all_heart_rate, which gets the heart rate data
+    # of all dates concurrently
+    out = await afetch_all_wrapper(
+        client, *heart_rate_dates_request(access_token, start, end)
+    )
+
+    dates = [act["date"] for act in out["body"]["activities"]]
+
+    outs = await asyncio.gather(
+        *[
+            afetch_all_wrapper(client, *intraday_heart_rate_request(access_token, date))
+            for date in dates
+        ]
+    )
+
+    dict_list = []
+    for out in outs:
+        dict_list += parse_intraday_heart_rate(out, start, end)
 
     df = pd.DataFrame.from_dict(dict_list)
 
     return df
 
 
-def fetch_all_sleeps(access_token, start="2020-03-10", end="2022-05-28"):
+def fetch_all_sleeps(access_token, start="2020-03-10", end="2022-05-28", session=None):
     out = fetch_all_wrapper(
         "https://wbsapi.withings.net/v2/sleep",
         {
@@ -180,6 +308,7 @@ def fetch_all_sleeps(access_token, start="2020-03-10", end="2022-05-28"):
         },
         {"Authorization": f"Bearer {access_token}"},
         arr_key="series",
+        session=session,
     )
 
     df = pd.DataFrame.from_dict(out["body"]["series"])
@@ -220,15 +349,16 @@ num_to_description = {
 }
 
 
-def fetch_measurements(access_token, start, end, measure_types="1,6"):
+def fetch_measurements(access_token, start, end, measure_types="1,6", session=None):
     # make public API requests, while specifying the measure_types we desire
     # we make potentially multiple because the public API can return only up
     # to 200 measurements
+    session = get_session(session)
 
     cur_offset = 0
     data_complete = []
     while True:
-        out = requests.post(
+        out = session.post(
             "https://wbsapi.withings.net/measure",
             data={
                 "action": "getmeas",
@@ -265,6 +395,6 @@ def fetch_measurements(access_token, start, end, measure_types="1,6"):
         else:
             break
 
-    df = pd.DataFrame(data)
+    df = pd.DataFrame(data_complete)
 
     return df
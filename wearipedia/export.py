@@ -0,0 +1,336 @@
+"""
+export.py
+====================================
+Streaming export of extracted data to NDJSON, CSV or Parquet files.
+
+Data is converted to flat records (one per row of a DataFrame, element of a list or
+key of a dictionary) and written a chunk of records at a time, so a batch of jobs can be
+exported as its results come in, without ever holding all of them in memory.
+"""
+
+import csv
+import importlib.util
+import json
+import os
+import sys
+from itertools import islice
+from pathlib import Path
+
+__all__ = ["to_records", "get_writer", "write_json", "export_batch", "EXPORT_FORMATS"]
+
+# format -> file extensions of the format
+EXPORT_FORMATS = {
+    "ndjson": [".ndjson", ".jsonl"],
+    "csv": [".csv"],
+    "parquet": [".parquet"],
+}
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+
+def _json_default(value):
+    # timestamps, numpy scalars and arrays, DataFrames and Series (as their records), and
+    # anything else json does not know
+    if hasattr(value, "to_dict") and hasattr(value, "index"):
+        return list(to_records(value))
+    elif hasattr(value, "isoformat"):
+        return value.isoformat()
+    elif hasattr(value, "tolist"):
+        return value.tolist()
+
+    return str(value)
+
+
+def _flat_value(value):
+    # nested values are stored as JSON strings in tabular formats
+    if isinstance(value, (dict, list, tuple)) or (
+        hasattr(value, "tolist") and getattr(value, "ndim", 0) > 0
+    ):
+        return json.dumps(value, default=_json_default)
+    elif hasattr(value, "item") and getattr(value, "ndim", None) == 0:
+        return value.item()
+
+    return value
+
+
+def to_records(data):
+    """Converts data, as returned by get_data(), to a generator of flat records: one per
+    row of a DataFrame or array, per element of a list, or per key of a dictionary (with
+    the key in a "key" field).
+
+    :param data: the data to convert
+    :type data: DataFrame or Series or List or Dict or np.ndarray
+    :return: a generator of dictionaries
+    :rtype: Generator
+    """
+    if hasattr(data, "to_dict") and hasattr(data, "columns"):  # DataFrame
+        columns = [str(column) for column in data.columns]
+
+        for row in data.itertuples(index=False, name=None):
+            yield dict(zip(columns, row))
+    elif hasattr(data, "to_dict") and hasattr(data, "index"):  # Series
+        for index, value in data.items():
+            yield {"index": index, "value": value}
+    elif isinstance(data, dict):
+        for key, value in data.items():
+            if isinstance(value, dict):
+                yield {"key": key, **value}
+            else:
+                yield {"key": key, "value": value}
+    elif isinstance(data, (list, tuple)) or hasattr(data, "tolist"):
+        for element in data:
+            if isinstance(element, dict):
+                yield element
+            else:
+                yield {"value": element}
+    else:
+        yield {"value": data}
+
+
+def write_json(data, path):
+    """Writes data, as returned by get_data(), to a JSON file, keeping its structure.
+    Values json does not know (e.g. timestamps, NumPy values or DataFrames) are converted
+    like in the other export formats.
+
+    :param data: the data to write
+    :type data: DataFrame or Series or List or Dict or np.ndarray
+    :param path: the path of the file
+    :type path: str or Path
+    """
+    with open(path, "w") as f:
+        json.dump(data, f, default=_json_default)
+
+
+class _TextWriter:
+    # writes records to a text file, which is closed with the writer (unless it is stdout)
+
+    def __init__(self, file):
+        self.file = file
+
+    def close(self):
+        self.file.flush()
+
+        if self.file is not sys.stdout:
+            self.file.close()
+
+
+class NDJSONWriter(_TextWriter):
+    """Writes records as newline-delimited JSON, one record per line.
+
+    :param file: the text file to write to
+    :type file: TextIO
+    """
+
+    def write(self, records):
+        for record in records:
+            self.file.write(json.dumps(record, default=_json_default) + "\n")
+
+
+class CSVWriter(_TextWriter):
+    """Writes records as CSV rows. The columns are those of the first record, so all the
+    records must have the same fields.
+
+    :param file: the text file to write to
+    :type file: TextIO
+    """
+
+    def __init__(self, file):
+        super().__init__(file)
+        self._writer = None
+
+    def write(self, records):
+        for record in records:
+            if self._writer is None:
+                self._writer = csv.DictWriter(self.file, fieldnames=list(record))
+                self._writer.writeheader()
+
+            try:
+                self._writer.writerow(
+                    {key: _flat_value(value) for key, value in record.items()}
+                )
+            except ValueError as e:
+                raise ValueError(
+                    f"{e}: records with different fields must be exported to separate "
+                    "files, e.g. by exporting to a directory"
+                ) from e
+
+
+class ParquetWriter:
+    """Writes records as a Parquet file, one row group per chunk of records. The schema
+    is that of the first chunk. Requires `pyarrow`.
+
+    :param path: the path of the file to write to
+    :type path: str or Path
+    :param chunk_size: the number of records per row group, defaults to 10000
+    :type chunk_size: int, optional
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE):
+        if importlib.util.find_spec("pyarrow") is None:
+            raise ImportError(
+                "exporting to Parquet requires pyarrow, install it with "
+                "`pip install pyarrow`"
+            )
+
+        self.path = path
+        self.chunk_size = chunk_size
+        self._writer = None
+
+    def write(self, records):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        records = iter(records)
+
+        while True:
+            chunk = [
+                {key: _flat_value(value) for key, value in record.items()}
+                for record in islice(records, self.chunk_size)
+            ]
+
+            if not chunk:
+                return
+
+            if self._writer is None:
+                table = pa.Table.from_pylist(chunk)
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                table = pa.Table.from_pylist(chunk, schema=self._writer.schema)
+
+            self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def get_format(path, format=None):
+    """Returns the export format of a file, either `format` or the one of its extension.
+
+    :param path: the path of the file, or None for stdout
+    :type path: str or Path
+    :param format: the format, one of EXPORT_FORMATS, defaults to the format of the
+        extension of path (or "ndjson" for stdout)
+    :type format: str, optional
+    :raises ValueError: if the format is unknown, or cannot be inferred from path
+    :return: the format
+    :rtype: str
+    """
+    if format is None:
+        if path is None:
+            return "ndjson"
+
+        suffix = Path(path).suffix.lower()
+
+        for format, suffixes in EXPORT_FORMATS.items():
+            if suffix in suffixes:
+                return format
+
+        raise ValueError(
+            f"cannot infer the export format of {path}, expected one of "
+            f"{[suffix for suffixes in EXPORT_FORMATS.values() for suffix in suffixes]}"
+        )
+
+    if format not in EXPORT_FORMATS:
+        raise ValueError(f"format must be in {list(EXPORT_FORMATS)}, got {format}")
+
+    return format
+
+
+def get_writer(path, format=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Opens a writer of records, see to_records(), with ``write(records)`` and
+    ``close()`` methods.
+
+    :param path: the path of the file to write to, or None for stdout (NDJSON or CSV
+        only)
+    :type path: str or Path
+    :param format: one of EXPORT_FORMATS, defaults to the format of the extension of path
+    :type format: str, optional
+    :param chunk_size: the number of records per row group of Parquet files, defaults to
+        10000
+    :type chunk_size: int, optional
+    :return: the writer
+    """
+    format = get_format(path, format)
+
+    if format == "parquet":
+        if path is None:
+            raise ValueError("Parquet cannot be written to stdout")
+
+        return ParquetWriter(path, chunk_size=chunk_size)
+
+    file = sys.stdout if path is None else open(path, "w", newline="")
+
+    return NDJSONWriter(file) if format == "ndjson" else CSVWriter(file)
+
+
+def export_batch(results, output=None, format=None, raise_errors=True):
+    """Writes the results of a batch, see wearipedia.iter_batch(), as they come in.
+
+    Each record is tagged with the "device" and "data_type" of its job. If output is a
+    directory, the results of each device and data type go to their own file in it (e.g.
+    "whoop_whoop_4_cycles.csv"), otherwise all results go to output.
+
+    :param results: the results of the batch
+    :type results: Iterable
+    :param output: a file, a directory (which must exist or end with a path separator), or
+        None for stdout, defaults to None
+    :type output: str or Path, optional
+    :param format: one of EXPORT_FORMATS, defaults to the format of the extension of
+        output (and is required if output is a directory)
+    :type format: str, optional
+    :param raise_errors: whether to raise the error of the first failed job (otherwise,
+        failed jobs are skipped), defaults to True
+    :type raise_errors: bool, optional
+    :return: the number of records written for each (device, data type)
+    :rtype: Dict
+    """
+    to_directory = output is not None and (
+        os.path.isdir(output) or str(output).endswith(os.sep)
+    )
+
+    if to_directory:
+        if format is None:
+            raise ValueError("the format is required to export to a directory")
+
+        os.makedirs(output, exist_ok=True)
+        format = get_format(None, format)
+    else:
+        format = get_format(output, format)
+
+    writers = dict()
+    counts = dict()
+
+    def tag(job, records):
+        key = (job.device_name, job.data_type)
+
+        for record in records:
+            counts[key] = counts.get(key, 0) + 1
+            yield {"device": job.device_name, "data_type": job.data_type, **record}
+
+    try:
+        for result in results:
+            if result.error is not None:
+                if raise_errors:
+                    raise result.error
+                continue
+
+            job = result.job
+
+            if to_directory:
+                key = (job.device_name, job.data_type)
+                name = f"{job.device_name.replace('/', '_')}_{job.data_type}"
+                path = Path(output) / (name + EXPORT_FORMATS[format][0])
+            else:
+                key = None
+                path = output
+
+            if key not in writers:
+                writers[key] = get_writer(path, format)
+
+            writers[key].write(tag(job, to_records(result.data)))
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return counts
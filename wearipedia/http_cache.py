@@ -0,0 +1,492 @@
+"""
+http_cache.py
+====================================
+An opt-in, persistent on-disk cache of the responses of the device APIs, shared between
+processes.
+
+The data of a day does not change once the day is over (and the device has synced), so
+the responses to requests for days older than a few days are cached until they are
+evicted, while responses for recent days are refetched (or only cached for a short
+time). Entries are keyed by the vendor, the endpoint, the normalized params of the
+request and the user, and are stored zlib compressed in a SQLite database, evicted
+least recently used first once the cache is larger than its maximum size.
+
+The cache is disabled by default, and can be enabled with `enable_response_cache` or by
+setting the ``WEARIPEDIA_RESPONSE_CACHE`` environment variable to the path of the
+database. Requests sent with a session of `wearipedia.sessions` go through the cache.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from urllib.parse import parse_qsl, urlsplit
+
+__all__ = [
+    "enable_response_cache",
+    "disable_response_cache",
+    "clear_response_cache",
+    "ResponseCache",
+]
+
+RESPONSE_CACHE_ENV_VAR = "WEARIPEDIA_RESPONSE_CACHE"
+
+# a header set on the sessions of a device to identify its user in the cache keys, which
+# is removed from requests before they are sent (see wearipedia.sessions)
+CACHE_USER_HEADER = "X-Wearipedia-Cache-User"
+
+DEFAULT_MAX_SIZE = 2**30  # 1 GiB
+
+# responses for days at least this many days before today are cached until evicted
+DEFAULT_RECENT_DAYS = 2
+
+# seconds to cache responses for recent days (0 to not cache them), and responses to
+# requests that are not for any particular day (e.g. the profile of the user)
+DEFAULT_RECENT_TTL = 0
+DEFAULT_TTL = 3600
+
+# requests whose URL contains any of these are never cached, since they authenticate
+UNCACHED_URL_PATTERN = re.compile(r"oauth|token|login|signin|auth", re.IGNORECASE)
+
+# vendors whose APIs report errors in the body of responses with HTTP status 200, as a
+# "status" that is 0 on success
+BODY_STATUS_VENDORS = {"withings"}
+
+# headers of the requests that identify the user, if the session has no cache user
+USER_HEADERS = ["Authorization", "Cookie"]
+
+# headers of the responses that no longer apply to their decoded content
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+DATE_PATTERN = re.compile(r"(?<!\d)(\d{4})-(\d{2})-(\d{2})(?!\d)")
+
+# params holding UNIX timestamps, e.g. "startdate" of Withings or "endTime" of Google Fit
+TIMESTAMP_PARAM_PATTERN = re.compile(r"date|time|start|end|from|to", re.IGNORECASE)
+
+_response_cache = None
+
+
+class ResponseCache:
+    """A SQLite database of cached responses. Responses to requests for days at least
+    `recent_days` before today are kept until they are evicted, those for more recent
+    days for `recent_ttl` seconds, and any other for `default_ttl` seconds. Entries are
+    evicted least recently used first once the total size of the cache exceeds
+    `max_size`.
+
+    :param path: the path of the database
+    :type path: str or Path
+    :param max_size: the maximum total size of the cached responses in bytes, defaults
+        to 1 GiB
+    :type max_size: int, optional
+    :param recent_days: the number of days before today whose responses are not kept
+        until evicted, defaults to 2
+    :type recent_days: int, optional
+    :param recent_ttl: the number of seconds to cache responses for recent days,
+        defaults to 0 (not cached)
+    :type recent_ttl: float, optional
+    :param default_ttl: the number of seconds to cache responses that are not for any
+        day, defaults to 3600
+    :type default_ttl: float, optional
+    """
+
+    def __init__(
+        self,
+        path,
+        max_size=DEFAULT_MAX_SIZE,
+        recent_days=DEFAULT_RECENT_DAYS,
+        recent_ttl=DEFAULT_RECENT_TTL,
+        default_ttl=DEFAULT_TTL,
+    ):
+        self.path = Path(path)
+        self.max_size = max_size
+        self.recent_days = recent_days
+        self.recent_ttl = recent_ttl
+        self.default_ttl = default_ttl
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+
+        with self._connection() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, vendor TEXT, url TEXT, status INTEGER, "
+                "headers TEXT, body BLOB, size INTEGER, expires REAL, last_used REAL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_last_used "
+                "ON responses (last_used)"
+            )
+
+    def _connection(self):
+        # sqlite connections cannot be shared between threads
+        connection = getattr(self._local, "connection", None)
+
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=30)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+
+        return connection
+
+    def key(self, vendor, method, url, body=None, user=None):
+        """Returns the key of the entry of a request.
+
+        :param vendor: the vendor of the API
+        :type vendor: str
+        :param method: the HTTP method of the request
+        :type method: str
+        :param url: the URL of the request
+        :type url: str
+        :param body: the body of the request, defaults to None
+        :type body: str or bytes, optional
+        :param user: the user of the request, defaults to None
+        :type user: str, optional
+        :return: a hexadecimal key
+        :rtype: str
+        """
+        parts = urlsplit(url)
+
+        description = json.dumps(
+            [
+                vendor,
+                method.upper(),
+                f"{parts.scheme}://{parts.netloc}{parts.path}",
+                _normalize_params(parts.query),
+                _normalize_params(body),
+                user,
+            ],
+            sort_keys=True,
+        )
+
+        return hashlib.sha256(description.encode()).hexdigest()
+
+    def ttl(self, url, body=None):
+        """Returns the number of seconds to cache the response to a request for, from
+        the last day it requests data for.
+
+        :param url: the URL of the request
+        :type url: str
+        :param body: the body of the request, defaults to None
+        :type body: str or bytes, optional
+        :return: the number of seconds, or None to cache it until it is evicted
+        :rtype: float
+        """
+        last_day = _last_day(url, body)
+
+        if last_day is None:
+            return self.default_ttl
+
+        if last_day <= date.today() - timedelta(days=self.recent_days):
+            return None
+
+        return self.recent_ttl
+
+    def load(self, key):
+        """Loads a cached response, marking it as recently used.
+
+        :param key: the key of the entry
+        :type key: str
+        :return: the status code, headers and (decoded) content of the response, or None
+            if it is not cached (or has expired)
+        :rtype: Tuple
+        """
+        now = time.time()
+        connection = self._connection()
+
+        try:
+            with connection:
+                row = connection.execute(
+                    "SELECT status, headers, body FROM responses WHERE key = ? "
+                    "AND (expires IS NULL OR expires > ?)",
+                    (key, now),
+                ).fetchone()
+
+                if row is None:
+                    return None
+
+                connection.execute(
+                    "UPDATE responses SET last_used = ? WHERE key = ?", (now, key)
+                )
+        except sqlite3.Error:
+            return None
+
+        status, headers, body = row
+
+        try:
+            return status, json.loads(headers), zlib.decompress(body)
+        except (ValueError, zlib.error):
+            # a corrupted entry
+            return None
+
+    def store(self, key, vendor, url, status, headers, content, ttl=None):
+        """Stores a response, then evicts the least recently used entries if the cache is
+        larger than its maximum size.
+
+        :param key: the key of the entry
+        :type key: str
+        :param vendor: the vendor of the API
+        :type vendor: str
+        :param url: the URL of the request
+        :type url: str
+        :param status: the status code of the response
+        :type status: int
+        :param headers: the headers of the response
+        :type headers: Dict
+        :param content: the (decoded) content of the response
+        :type content: bytes
+        :param ttl: the number of seconds to cache the response for, defaults to None
+            (until it is evicted)
+        :type ttl: float, optional
+        """
+        now = time.time()
+        body = zlib.compress(content)
+        headers = {
+            name: value
+            for name, value in headers.items()
+            if name.lower() not in DROPPED_HEADERS
+        }
+
+        try:
+            with self._connection() as connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        key,
+                        vendor,
+                        url,
+                        status,
+                        json.dumps(headers),
+                        body,
+                        len(body),
+                        None if ttl is None else now + ttl,
+                        now,
+                    ),
+                )
+        except sqlite3.Error:
+            # e.g. the database is locked by another process for too long, in which case
+            # the response is simply not cached
+            return
+
+        self.evict()
+
+    def size(self):
+        """Returns the total size of the cached responses in bytes.
+
+        :return: the size of all cache entries
+        :rtype: int
+        """
+        row = self._connection().execute("SELECT SUM(size) FROM responses").fetchone()
+
+        return row[0] or 0
+
+    def evict(self):
+        """Removes the expired entries, then the least recently used entries until the
+        cache is no larger than its maximum size.
+        """
+        with self._connection() as connection:
+            connection.execute(
+                "DELETE FROM responses WHERE expires IS NOT NULL AND expires <= ?",
+                (time.time(),),
+            )
+
+            excess = self.size() - self.max_size
+
+            if excess <= 0:
+                return
+
+            keys = []
+
+            for key, size in connection.execute(
+                "SELECT key, size FROM responses ORDER BY last_used"
+            ):
+                if excess <= 0:
+                    break
+
+                keys.append((key,))
+                excess -= size
+
+            connection.executemany("DELETE FROM responses WHERE key = ?", keys)
+
+    def clear(self):
+        """Removes all entries from the cache."""
+        with self._connection() as connection:
+            connection.execute("DELETE FROM responses")
+
+        self._connection().execute("VACUUM")
+
+
+def is_cacheable(method, url):
+    """Returns whether the response to a request can be cached, i.e. whether the request
+    queries data rather than authenticating or changing data.
+
+    :param method: the HTTP method of the request
+    :type method: str
+    :param url: the URL of the request
+    :type url: str
+    :return: whether the response can be cached
+    :rtype: bool
+    """
+    # some APIs (e.g. Withings and Nutrisense) are queried with POST requests
+    return method.upper() in ["GET", "POST"] and not UNCACHED_URL_PATTERN.search(url)
+
+
+def is_cacheable_response(vendor, status_code, content):
+    """Returns whether a response can be cached, i.e. whether it is successful.
+
+    :param vendor: the vendor of the API
+    :type vendor: str
+    :param status_code: the HTTP status code of the response
+    :type status_code: int
+    :param content: the content of the response
+    :type content: bytes
+    :return: whether the response can be cached
+    :rtype: bool
+    """
+    if status_code != 200:
+        return False
+
+    if vendor in BODY_STATUS_VENDORS:
+        try:
+            return json.loads(content).get("status") == 0
+        except (ValueError, AttributeError):
+            return False
+
+    return True
+
+
+def get_cache_user(headers):
+    """Returns the user of a request, for the key of its cache entry: the cache user of
+    its session if it has one, otherwise a hash of its credentials.
+
+    :param headers: the headers of the request
+    :type headers: Dict
+    :return: the user
+    :rtype: str
+    """
+    if CACHE_USER_HEADER in headers:
+        return headers[CACHE_USER_HEADER]
+
+    credentials = [str(headers.get(name, "")) for name in USER_HEADERS]
+
+    return hashlib.sha256("\n".join(credentials).encode()).hexdigest()
+
+
+def _decode_body(body):
+    if body is None:
+        return ""
+
+    if isinstance(body, bytes):
+        return body.decode("utf-8", errors="replace")
+
+    return str(body)
+
+
+def _normalize_params(params):
+    # the params of a query string, form or JSON body, in a canonical order
+    params = _decode_body(params)
+
+    try:
+        return json.dumps(json.loads(params), sort_keys=True)
+    except ValueError:
+        return sorted(parse_qsl(params, keep_blank_values=True))
+
+
+def _last_day(url, body=None):
+    # the last day a request asks for data for, from the dates in its URL and body, and
+    # its params that hold UNIX timestamps
+    text = url + " " + _decode_body(body)
+    days = []
+
+    for year, month, day in DATE_PATTERN.findall(text):
+        try:
+            days.append(date(int(year), int(month), int(day)))
+        except ValueError:
+            pass
+
+    params = parse_qsl(urlsplit(url).query) + parse_qsl(_decode_body(body))
+
+    for name, value in params:
+        if TIMESTAMP_PARAM_PATTERN.search(name) and value.isdigit():
+            timestamp = int(value)
+
+            # seconds or milliseconds since the epoch, from 2001 to 2286
+            if 10**12 <= timestamp < 10**13:
+                timestamp //= 1000
+
+            if 10**9 <= timestamp < 10**10:
+                days.append(datetime.fromtimestamp(timestamp).date())
+
+    return max(days) if days else None
+
+
+def get_response_cache():
+    """Returns the response cache, or None if caching is disabled.
+
+    :return: the cache in use
+    :rtype: ResponseCache
+    """
+    global _response_cache
+
+    if _response_cache is None and os.environ.get(RESPONSE_CACHE_ENV_VAR):
+        _response_cache = ResponseCache(os.environ[RESPONSE_CACHE_ENV_VAR])
+
+    # False when explicitly disabled, even if the environment variable is set
+    return _response_cache or None
+
+
+def enable_response_cache(path=None, max_size=DEFAULT_MAX_SIZE, **kwargs):
+    """Enable the on-disk cache of the responses of the device APIs, see ResponseCache for
+    the keyword arguments.
+
+    :param path: the path of the database, defaults to
+        "~/.cache/wearipedia/responses.sqlite"
+    :type path: str, optional
+    :param max_size: the maximum total size of the cached responses in bytes, defaults
+        to 1 GiB
+    :type max_size: int, optional
+    :return: the cache
+    :rtype: ResponseCache
+
+    **Example**
+
+    .. code-block:: python
+
+        import wearipedia
+
+        wearipedia.enable_response_cache()
+
+        # the first call downloads every day, later calls (in any process) only the
+        # last few days
+        device = wearipedia.get_device("fitbit/fitbit_charge_4")
+        device.authenticate(creds)
+        hrv = device.get_data("hrv", {"start_date": "2023-01-01", "end_date": "2023-06-30"})
+    """
+    global _response_cache
+
+    if path is None:
+        path = Path.home() / ".cache" / "wearipedia" / "responses.sqlite"
+
+    _response_cache = ResponseCache(path, max_size, **kwargs)
+
+    return _response_cache
+
+
+def disable_response_cache():
+    """Disable the on-disk cache of responses. The cached responses are kept on disk."""
+    global _response_cache
+
+    _response_cache = False
+
+
+def clear_response_cache():
+    """Remove all entries from the on-disk cache of responses, if it is enabled."""
+    cache = get_response_cache()
+
+    if cache is not None:
+        cache.clear()
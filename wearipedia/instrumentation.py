@@ -0,0 +1,373 @@
+"""
+instrumentation.py
+====================================
+Instrumentation of the phases of `get_data`: generating synthetic data
+(``gen_synthetic``), filtering it (``filter_synthetic``), getting real data
+(``get_real``, which includes the requests to the API and the conversion of their
+responses) and the whole call (``get_data``).
+
+Each phase emits an event, a dictionary with:
+
+* ``device``, ``data_type`` and ``phase``
+
+* ``duration``: the wall time of the phase in seconds
+
+* ``records``: the number of records of the result (rows, elements or keys)
+
+* ``memory``: the approximate size of the result in bytes
+
+* ``http_requests``, ``http_bytes`` and ``http_time``: the number of requests sent by
+  the sessions of `wearipedia.sessions` during the phase, the size of their response
+  bodies, and the time spent waiting for them (so ``duration - http_time`` is the time
+  spent converting the responses)
+
+* ``error``: the name of the exception raised by the phase, if any
+
+Events are passed to the hooks added with `add_hook`, e.g. to forward them to a metrics
+system, and aggregated in process by the `MetricsAggregator` returned by
+`enable_instrumentation`. Without any hook, phases are not measured at all.
+"""
+
+import contextvars
+import sys
+import threading
+import time
+
+__all__ = [
+    "MetricsAggregator",
+    "add_hook",
+    "remove_hook",
+    "enable_instrumentation",
+    "disable_instrumentation",
+    "get_aggregator",
+]
+
+_hooks = []
+_hooks_lock = threading.Lock()
+_aggregator = None
+
+# the innermost phase being measured in the current thread (or task)
+_current_span = contextvars.ContextVar("wearipedia_span", default=None)
+
+# the number of elements of a list sampled to approximate its size
+SAMPLE_SIZE = 100
+
+
+class _Span:
+    # the HTTP counters of a phase being measured
+    def __init__(self, parent):
+        self.parent = parent
+        self.lock = threading.Lock()
+        self.http_requests = 0
+        self.http_bytes = 0
+        self.http_time = 0.0
+
+
+class MetricsAggregator:
+    """Aggregates the events of each device, data type and phase: their count, their
+    total, minimum and maximum durations, and their total records, memory and HTTP
+    requests, bytes and time.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics = dict()
+
+    def __call__(self, event):
+        key = (event["device"], event["data_type"], event["phase"])
+
+        with self._lock:
+            metrics = self._metrics.setdefault(
+                key,
+                {
+                    "count": 0,
+                    "errors": 0,
+                    "total_duration": 0.0,
+                    "min_duration": float("inf"),
+                    "max_duration": 0.0,
+                    "records": 0,
+                    "memory": 0,
+                    "http_requests": 0,
+                    "http_bytes": 0,
+                    "http_time": 0.0,
+                },
+            )
+
+            metrics["count"] += 1
+            metrics["errors"] += event["error"] is not None
+            metrics["total_duration"] += event["duration"]
+            metrics["min_duration"] = min(metrics["min_duration"], event["duration"])
+            metrics["max_duration"] = max(metrics["max_duration"], event["duration"])
+
+            for name in [
+                "records",
+                "memory",
+                "http_requests",
+                "http_bytes",
+                "http_time",
+            ]:
+                metrics[name] += event[name] or 0
+
+    def summary(self):
+        """Returns the aggregated metrics, one dictionary per device, data type and
+        phase, slowest first.
+
+        :return: the metrics
+        :rtype: List
+        """
+        with self._lock:
+            rows = [
+                {
+                    "device": device,
+                    "data_type": data_type,
+                    "phase": phase,
+                    **metrics,
+                    "mean_duration": metrics["total_duration"] / metrics["count"],
+                }
+                for (device, data_type, phase), metrics in self._metrics.items()
+            ]
+
+        return sorted(rows, key=lambda row: row["total_duration"], reverse=True)
+
+    def to_dataframe(self):
+        """Returns the aggregated metrics as a DataFrame, see `summary`.
+
+        :return: the metrics
+        :rtype: pd.DataFrame
+        """
+        import pandas as pd
+
+        return pd.DataFrame(self.summary())
+
+    def reset(self):
+        """Forgets all the events aggregated so far."""
+        with self._lock:
+            self._metrics.clear()
+
+
+def add_hook(hook):
+    """Adds a function called with every event, see the module documentation. Hooks are
+    called in the thread of the phase, so they should be quick (e.g. put the event on a
+    queue).
+
+    :param hook: the function, taking the event
+    :type hook: Callable
+    """
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook):
+    """Removes a function added with `add_hook`.
+
+    :param hook: the function
+    :type hook: Callable
+    """
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def get_aggregator():
+    """Returns the in-process aggregator of the events, if instrumentation is enabled.
+
+    :return: the aggregator, or None
+    :rtype: MetricsAggregator
+    """
+    return _aggregator
+
+
+def enable_instrumentation():
+    """Starts aggregating the events of every phase of get_data() in process.
+
+    :return: the aggregator
+    :rtype: MetricsAggregator
+
+    **Example**
+
+    .. code-block:: python
+
+        import wearipedia
+
+        metrics = wearipedia.enable_instrumentation()
+
+        device = wearipedia.get_device("whoop/whoop_4")
+        device.get_data("cycles")
+
+        print(metrics.to_dataframe())
+    """
+    global _aggregator
+
+    with _hooks_lock:
+        if _aggregator is None:
+            _aggregator = MetricsAggregator()
+            _hooks.append(_aggregator)
+
+        return _aggregator
+
+
+def disable_instrumentation():
+    """Stops aggregating events, and removes every hook."""
+    global _aggregator
+
+    with _hooks_lock:
+        _hooks.clear()
+        _aggregator = None
+
+
+def record_http(response_bytes, duration):
+    """Counts a request towards the phases being measured in the current context. This
+    is called by the sessions for every request they send.
+
+    :param response_bytes: the size of the body of the response
+    :type response_bytes: int
+    :param duration: the time waited for the response in seconds
+    :type duration: float
+    """
+    span = _current_span.get()
+
+    while span is not None:
+        with span.lock:
+            span.http_requests += 1
+            span.http_bytes += response_bytes
+            span.http_time += duration
+
+        span = span.parent
+
+
+def is_enabled():
+    """Returns whether any hook receives events.
+
+    :rtype: bool
+    """
+    return bool(_hooks)
+
+
+def count_records(data):
+    """Returns the number of records of data: its rows, elements or keys.
+
+    :param data: the data
+    :return: the number of records, or None if data has no length
+    :rtype: int
+    """
+    try:
+        return len(data)
+    except TypeError:
+        return None
+
+
+def approximate_size(data):
+    """Returns the approximate size of data in bytes, without traversing all of it: the
+    memory of the columns of DataFrames (not of the objects they hold), the buffers of
+    arrays, and the size of a sample of the elements of lists and dictionaries.
+
+    :param data: the data
+    :return: the approximate size in bytes
+    :rtype: int
+    """
+    if hasattr(data, "memory_usage") and hasattr(data, "columns"):
+        return int(data.memory_usage(index=True).sum())
+    elif hasattr(data, "memory_usage"):
+        return int(data.memory_usage(index=True))
+    elif hasattr(data, "nbytes"):
+        return int(data.nbytes)
+    elif isinstance(data, (list, tuple, dict)):
+        values = list(data.values()) if isinstance(data, dict) else data
+        sample = values[:SAMPLE_SIZE]
+        sample_size = sum(approximate_size(value) for value in sample)
+
+        return sys.getsizeof(data) + (
+            sample_size * len(values) // len(sample) if sample else 0
+        )
+
+    return sys.getsizeof(data)
+
+
+def measure(device, data_type, phase, func, *args, **kwargs):
+    """Calls func(*args, **kwargs), emitting an event for the phase if any hook is
+    added.
+
+    :param device: the device
+    :type device: BaseDevice
+    :param data_type: the data type
+    :type data_type: str
+    :param phase: the name of the phase, e.g. "get_real"
+    :type phase: str
+    :param func: the function to call
+    :type func: Callable
+    :return: the return value of func
+    """
+    if not _hooks:
+        return func(*args, **kwargs)
+
+    span = _Span(_current_span.get())
+    token = _current_span.set(span)
+    result, error = None, None
+    start = time.perf_counter()
+
+    try:
+        result = func(*args, **kwargs)
+        return result
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        _emit(
+            device, data_type, phase, span, time.perf_counter() - start, result, error
+        )
+
+
+async def ameasure(device, data_type, phase, coroutine_func, *args, **kwargs):
+    """Coroutine version of `measure`.
+
+    :param device: the device
+    :type device: BaseDevice
+    :param data_type: the data type
+    :type data_type: str
+    :param phase: the name of the phase
+    :type phase: str
+    :param coroutine_func: the coroutine function to await
+    :type coroutine_func: Callable
+    :return: the return value of the coroutine
+    """
+    if not _hooks:
+        return await coroutine_func(*args, **kwargs)
+
+    span = _Span(_current_span.get())
+    token = _current_span.set(span)
+    result, error = None, None
+    start = time.perf_counter()
+
+    try:
+        result = await coroutine_func(*args, **kwargs)
+        return result
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        _emit(
+            device, data_type, phase, span, time.perf_counter() - start, result, error
+        )
+
+
+def _emit(device, data_type, phase, span, duration, result, error):
+    # phases without a result, e.g. generating synthetic data
+    has_result = error is None and result is not None
+
+    event = {
+        "device": type(device).__name__,
+        "data_type": data_type,
+        "phase": phase,
+        "duration": duration,
+        "records": count_records(result) if has_result else None,
+        "memory": approximate_size(result) if has_result else None,
+        "http_requests": span.http_requests,
+        "http_bytes": span.http_bytes,
+        "http_time": span.http_time,
+        "error": error,
+    }
+
+    for hook in list(_hooks):
+        hook(event)
@@ -0,0 +1,57 @@
+"""
+lazy.py
+====================================
+Lazy loading of submodules (PEP 562), so that ``import wearipedia`` does not import
+every device, and with it every heavy dependency (pandas, scipy, the Garmin and
+MyFitnessPal clients, ...), when only one device is used.
+"""
+
+import sys
+from importlib import import_module
+from importlib.util import find_spec
+
+__all__ = ["lazy_getattr"]
+
+
+def lazy_getattr(package_name, attributes, submodules=()):
+    """Returns a module-level ``__getattr__`` for the package `package_name`, which
+    imports the submodule defining an attribute the first time the attribute is accessed.
+
+    :param package_name: the name of the package, i.e. ``__name__`` of its ``__init__``
+    :type package_name: str
+    :param attributes: attribute name -> relative name of the submodule defining it,
+        e.g. {"Whoop4": ".whoop_4"}
+    :type attributes: Dict
+    :param submodules: relative names of the submodules to search, in order, for any
+        other attribute, e.g. the names they used to be star-imported from
+    :type submodules: Iterable, optional
+    :return: the ``__getattr__`` function of the package
+    :rtype: Callable
+    """
+
+    def __getattr__(name):
+        # dunder lookups (e.g. by inspect, doctest or pickle) should not import anything
+        if name.startswith("__"):
+            raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+        # a submodule that has not been imported yet
+        if find_spec(f"{package_name}.{name}") is not None:
+            return import_module(f".{name}", package_name)
+
+        if name in attributes:
+            candidates = [attributes[name]]
+        else:
+            candidates = submodules
+
+        for submodule in candidates:
+            module = import_module(submodule, package_name)
+
+            if hasattr(module, name):
+                value = getattr(module, name)
+                # later lookups are plain module attribute lookups
+                setattr(sys.modules[package_name], name, value)
+                return value
+
+        raise AttributeError(f"module {package_name!r} has no attribute {name!r}")
+
+    return __getattr__
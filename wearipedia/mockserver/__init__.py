@@ -0,0 +1,13 @@
+"""
+mockserver
+====================================
+A local stand-in for the vendor APIs serving synthetic data, to test and benchmark the
+real data path of devices (requests, pagination, retries and parsing) without
+credentials or network access.
+
+Run it with ``python -m wearipedia.mockserver``, and send the requests of wearipedia to
+it with ``WEARIPEDIA_API_BASE_URL=http://127.0.0.1:<port>`` or
+`wearipedia.set_api_base_url`.
+"""
+
+from .server import *
@@ -0,0 +1,58 @@
+"""
+__main__.py
+====================================
+Runs the stand-in vendor APIs:
+``python -m wearipedia.mockserver [--port PORT] [--latency SECONDS] [--error_rate RATE]``
+"""
+
+import argparse
+
+from ..sessions import API_BASE_URL_ENV_VAR
+from .server import MockServer
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m wearipedia.mockserver",
+        description="Serves synthetic data at the endpoints of the vendor APIs.",
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="seconds before each response"
+    )
+    parser.add_argument(
+        "--error_rate",
+        type=float,
+        default=0.0,
+        help="fraction of requests answered with 429 Too Many Requests",
+    )
+    parser.add_argument("--page_size", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start_date", default="2022-03-01")
+    parser.add_argument("--end_date", default="2022-06-17")
+
+    args = parser.parse_args(argv)
+
+    server = MockServer(
+        host=args.host,
+        port=args.port,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        page_size=args.page_size,
+        seed=args.seed,
+        start_date=args.start_date,
+        end_date=args.end_date,
+    )
+
+    print(f"Serving the vendor APIs at {server.base_url}, use them with")
+    print(f"    export {API_BASE_URL_ENV_VAR}={server.base_url}")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,323 @@
+"""
+routes.py
+====================================
+The endpoints of the stand-in vendor APIs, serving the synthetic data of the devices in
+the shape of the responses of the real APIs.
+
+Each route is a function of the synthetic data, the params of the request (those of its
+query string and form body) and the page size, returning the HTTP status and the JSON
+payload of the response.
+"""
+
+import inspect
+import threading
+
+import pandas as pd
+
+__all__ = ["SyntheticData", "ROUTES"]
+
+
+class SyntheticData:
+    """The synthetic data served by the stand-in APIs, generated the first time it is
+    requested.
+
+    :param seed: the seed of the synthetic data, defaults to 0
+    :type seed: int, optional
+    :param start_date: the start date of the synthetic data, defaults to "2022-03-01"
+    :type start_date: str, optional
+    :param end_date: the end date of the synthetic data, defaults to "2022-06-17"
+    :type end_date: str, optional
+    """
+
+    def __init__(self, seed=0, start_date="2022-03-01", end_date="2022-06-17"):
+        self.seed = seed
+        self.start_date = start_date
+        self.end_date = end_date
+
+        self._data = dict()
+        # the server answers requests concurrently
+        self._lock = threading.RLock()
+
+    def get(self, device_name, data_type):
+        """Returns synthetic data of a device, as get_data() returns it with the default
+        params.
+
+        :param device_name: the name of the device, e.g. "whoop/whoop_4"
+        :type device_name: str
+        :param data_type: the data type
+        :type data_type: str
+        :return: the data
+        """
+        from .. import get_device_class
+
+        def generate():
+            device_class = get_device_class(device_name)
+            params = {
+                "seed": self.seed,
+                "synthetic_start_date": self.start_date,
+                "synthetic_end_date": self.end_date,
+            }
+            # not every device has an end date
+            accepted = inspect.signature(device_class).parameters
+            device = device_class(
+                **{name: value for name, value in params.items() if name in accepted}
+            )
+
+            return device.get_data(data_type)
+
+        return self.cached((device_name, data_type), generate)
+
+    def records(self, device_name, data_type):
+        """Returns synthetic data of a device as a list of records.
+
+        :param device_name: the name of the device
+        :type device_name: str
+        :param data_type: the data type
+        :type data_type: str
+        :return: the records
+        :rtype: List
+        """
+        return self.cached(
+            (device_name, data_type, "records"),
+            lambda: self.get(device_name, data_type).to_dict("records"),
+        )
+
+    def cached(self, key, compute):
+        """Returns the value computed by `compute` the first time it is called with
+        `key`, e.g. data derived from the synthetic data.
+
+        :param key: the key of the value
+        :type key: Tuple
+        :param compute: the function computing the value
+        :type compute: Callable
+        :return: the value
+        """
+        with self._lock:
+            if key not in self._data:
+                self._data[key] = compute()
+
+            return self._data[key]
+
+
+def _page(records, params, page_size, offset_param="offset"):
+    # the records of the page starting at the offset in params, and the offset of the
+    # next page (or None if it is the last page)
+    offset = int(params.get(offset_param) or 0)
+    page = records[offset : offset + page_size]
+    next_offset = offset + page_size if offset + page_size < len(records) else None
+
+    return page, next_offset
+
+
+def _timestamp(value):
+    # the APIs send Unix timestamps, which the fetch functions convert to local time
+    return int(pd.Timestamp(value).to_pydatetime().timestamp())
+
+
+###########
+#  WHOOP  #
+###########
+
+
+def whoop_collection(data_type):
+    # a paginated collection, whose pages are linked by their nextToken
+    def route(data, params, page_size):
+        records = data.records("whoop/whoop_4", data_type)
+
+        # the API returns the records whose start is within [start, end), in
+        # descending order of start (like the synthetic data)
+        start, end = params.get("start"), params.get("end")
+        records = [
+            record
+            for record in records
+            if (start is None or record["start"] >= start)
+            and (end is None or record["start"] < end)
+        ]
+
+        limit = min(int(params.get("limit", 10)), 25, page_size)
+        page, next_offset = _page(records, params, limit, offset_param="nextToken")
+
+        return 200, {
+            "records": page,
+            "next_token": None if next_offset is None else str(next_offset),
+        }
+
+    return route
+
+
+def whoop_profile(data, params, page_size):
+    return 200, {
+        "user_id": 10129,
+        "email": "jsmith123@whoop.com",
+        "first_name": "John",
+        "last_name": "Smith",
+    }
+
+
+def whoop_body_measurement(data, params, page_size):
+    return 200, {
+        "height_meter": 1.8288,
+        "weight_kilogram": 90.7185,
+        "max_heart_rate": 200,
+    }
+
+
+##############
+#  Withings  #
+##############
+
+
+def _withings(body):
+    return 200, {"status": 0, "body": body}
+
+
+def _withings_page(records, params, page_size, key):
+    page, next_offset = _page(records, params, page_size)
+
+    body = {key: page, "more": int(next_offset is not None), "offset": 0}
+
+    if next_offset is not None:
+        body["offset"] = next_offset
+
+    return _withings(body)
+
+
+def _heart_rates(data):
+    heart_rates = data.get("withings/scanwatch", "heart_rates")
+    return heart_rates.assign(date=heart_rates.datetime.dt.strftime("%Y-%m-%d"))
+
+
+def _heart_rate_timestamps(data):
+    return data.cached(
+        ("withings/scanwatch", "heart_rates", "timestamps"),
+        lambda: [
+            _timestamp(value)
+            for value in data.get("withings/scanwatch", "heart_rates").datetime
+        ],
+    )
+
+
+def withings_measure(data, params, page_size):
+    action = params.get("action")
+
+    if action == "getactivity":
+        # the days with heart rate data, and their average heart rate
+        heart_rates = _heart_rates(data)
+        heart_rates = heart_rates[
+            (heart_rates.date >= params["startdateymd"])
+            & (heart_rates.date <= params["enddateymd"])
+        ]
+        activities = [
+            {"date": date, "hr_average": int(round(heart_rate))}
+            for date, heart_rate in heart_rates.groupby("date")
+            .heart_rate.mean()
+            .items()
+        ]
+
+        return _withings_page(activities, params, page_size, "activities")
+
+    elif action == "getintradayactivity":
+        start, end = int(params["startdate"]), int(params["enddate"])
+
+        series = {
+            str(timestamp): {
+                key: value for key, value in record.items() if key != "datetime"
+            }
+            for timestamp, record in zip(
+                _heart_rate_timestamps(data),
+                data.records("withings/scanwatch", "heart_rates"),
+            )
+            if start <= timestamp < end
+        }
+
+        return _withings({"series": series, "more": 0, "offset": 0})
+
+    return 200, {"status": 2555, "error": f"unknown action {action}"}
+
+
+def withings_sleep(data, params, page_size):
+    sleeps = [
+        sleep
+        for sleep in data.records("withings/scanwatch", "sleeps")
+        if params["startdateymd"] <= sleep["date"] <= params["enddateymd"]
+    ]
+
+    return _withings_page(sleeps, params, page_size, "series")
+
+
+# measure type of each column of the synthetic measurements
+MEASURE_TYPES = {"Weight (kg)": 1, "Fat Ratio (%)": 6}
+
+
+def _measure_groups(data):
+    measurements = data.get("withings/bodyplus", "measurements")
+
+    return [
+        {
+            "grpid": i,
+            "date": _timestamp(row["date"]),
+            "measures": [
+                # values are integers, scaled by 10 ** unit
+                {"value": int(round(row[column] * 1000)), "type": type, "unit": -3}
+                for column, type in MEASURE_TYPES.items()
+            ],
+        }
+        for i, row in enumerate(measurements.to_dict("records"))
+    ]
+
+
+def withings_getmeas(data, params, page_size):
+    groups = data.cached(
+        ("withings/bodyplus", "measurements", "groups"), lambda: _measure_groups(data)
+    )
+    types = {int(type) for type in params.get("meastypes", "1,6").split(",")}
+
+    if types != set(MEASURE_TYPES.values()):
+        groups = [
+            {
+                **group,
+                "measures": [
+                    measure for measure in group["measures"] if measure["type"] in types
+                ],
+            }
+            for group in groups
+        ]
+
+    return _withings_page(groups, params, page_size, "measuregrps")
+
+
+############
+#  Dexcom  #
+############
+
+
+def dexcom_egvs(data, params, page_size):
+    egvs = data.get("dexcom/pro_cgm", "data")
+
+    return 200, {
+        **{key: value for key, value in egvs.items() if key != "egvs"},
+        "egvs": [
+            egv
+            for egv in egvs["egvs"]
+            if params["startDate"] <= egv["systemTime"] <= params["endDate"]
+        ],
+    }
+
+
+# (host, path) -> route
+ROUTES = {
+    ("api.prod.whoop.com", "/developer/v1/cycle"): whoop_collection("cycles"),
+    ("api.prod.whoop.com", "/developer/v1/activity/sleep"): whoop_collection("sleeps"),
+    ("api.prod.whoop.com", "/developer/v1/activity/workout"): whoop_collection(
+        "workouts"
+    ),
+    ("api.prod.whoop.com", "/developer/v1/user/profile/basic"): whoop_profile,
+    (
+        "api.prod.whoop.com",
+        "/developer/v1/user/measurement/body",
+    ): whoop_body_measurement,
+    ("wbsapi.withings.net", "/v2/measure"): withings_measure,
+    ("wbsapi.withings.net", "/v2/sleep"): withings_sleep,
+    ("wbsapi.withings.net", "/measure"): withings_getmeas,
+    ("api.dexcom.com", "/v2/users/self/egvs"): dexcom_egvs,
+}
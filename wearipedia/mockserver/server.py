@@ -0,0 +1,222 @@
+"""
+server.py
+====================================
+A local HTTP server standing in for the vendor APIs, which answers requests to their
+endpoints with synthetic data, see `wearipedia.mockserver.routes`.
+
+Requests reach it through the base URL override of the sessions (see
+`wearipedia.sessions.set_api_base_url`): a request to ``https://<host>/<path>`` is sent
+to ``<base URL>/<host>/<path>``, so the server routes requests on the host of the
+vendor API and the path of the endpoint.
+"""
+
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+import pandas as pd
+
+from .routes import ROUTES, SyntheticData
+
+__all__ = ["MockServer"]
+
+# hosts whose APIs report errors in the body of responses with HTTP status 200
+BODY_STATUS_HOSTS = {"wbsapi.withings.net"}
+
+
+def _to_json(value):
+    # numpy and pandas values of the synthetic data
+    if isinstance(value, np.generic):
+        return value.item()
+    elif isinstance(value, pd.Timestamp):
+        return value.isoformat()
+
+    raise TypeError(f"{type(value)} is not JSON serializable")
+
+
+class MockServer:
+    """A local stand-in for the vendor APIs (currently those of WHOOP, Withings and
+    Dexcom), serving synthetic data. Pages of collections are linked like those of the
+    real APIs (by a next token for WHOOP, and by more and offset for Withings), and the
+    server can add latency to every response and throttle requests at random, to
+    exercise the retries of the sessions.
+
+    :param host: the host to listen on, defaults to "127.0.0.1"
+    :type host: str, optional
+    :param port: the port to listen on, defaults to 0 (any free port)
+    :type port: int, optional
+    :param latency: the time in seconds to wait before each response, defaults to 0.0
+    :type latency: float, optional
+    :param error_rate: the fraction of requests answered with 429 Too Many Requests,
+        defaults to 0.0
+    :type error_rate: float, optional
+    :param retry_after: the Retry-After of the 429 responses in seconds, defaults to 1
+    :type retry_after: int, optional
+    :param page_size: the maximum number of records in a page, defaults to 200
+    :type page_size: int, optional
+    :param seed: the seed of the synthetic data and of the throttled requests, defaults
+        to 0
+    :type seed: int, optional
+    :param start_date: the start date of the synthetic data, defaults to "2022-03-01"
+    :type start_date: str, optional
+    :param end_date: the end date of the synthetic data, defaults to "2022-06-17"
+    :type end_date: str, optional
+
+    **Example**
+
+    .. code-block:: python
+
+        import wearipedia
+        from wearipedia.mockserver import MockServer
+
+        with MockServer(latency=0.05) as server:
+            wearipedia.set_api_base_url(server.base_url)
+
+            device = wearipedia.get_device("whoop/whoop_4")
+            device.authenticate({"access_token": "any"})
+            cycles = device.get_data("cycles")
+    """
+
+    def __init__(
+        self,
+        host="127.0.0.1",
+        port=0,
+        latency=0.0,
+        error_rate=0.0,
+        retry_after=1,
+        page_size=200,
+        seed=0,
+        start_date="2022-03-01",
+        end_date="2022-06-17",
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.page_size = page_size
+        self.data = SyntheticData(seed, start_date, end_date)
+        # the number of requests answered, per (host, path), and of those throttled
+        self.requests = dict()
+        self.throttled = 0
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+
+    @property
+    def base_url(self):
+        """The URL to send the requests to the vendor APIs to.
+
+        :rtype: str
+        """
+        host, port = self._httpd.server_address[:2]
+
+        return f"http://{host}:{port}"
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server._handle(self, self.path, b"")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                server._handle(self, self.path, self.rfile.read(length))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _throttled(self):
+        with self._lock:
+            throttled = self._random.random() < self.error_rate
+            self.throttled += throttled
+
+            return throttled
+
+    def _handle(self, handler, path, body):
+        parts = urlsplit(path)
+        host, _, endpoint = parts.path.lstrip("/").partition("/")
+        endpoint = "/" + endpoint
+
+        params = dict(parse_qsl(parts.query))
+        params.update(parse_qsl(body.decode("utf-8")))
+
+        with self._lock:
+            self.requests[(host, endpoint)] = self.requests.get((host, endpoint), 0) + 1
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        route = ROUTES.get((host, endpoint))
+
+        if route is None:
+            status, payload, headers = 404, {"error": f"no route {host}{endpoint}"}, {}
+        elif "Authorization" not in handler.headers:
+            status, payload, headers = 401, {"error": "missing access token"}, {}
+        elif self._throttled():
+            status, payload = 429, {"error": "too many requests"}
+            headers = {"Retry-After": str(self.retry_after)}
+        else:
+            status, payload = route(self.data, params, self.page_size)
+            headers = {}
+
+        if host in BODY_STATUS_HOSTS and status in [401, 429]:
+            # e.g. the status 601 of throttled Withings requests
+            payload = {"status": 601 if status == 429 else status, **payload}
+            status = 200
+
+        content = json.dumps(payload, default=_to_json).encode("utf-8")
+
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(content)))
+
+        for name, value in headers.items():
+            handler.send_header(name, value)
+
+        handler.end_headers()
+        handler.wfile.write(content)
+
+    def start(self):
+        """Starts answering requests in a background thread.
+
+        :return: the base URL of the server
+        :rtype: str
+        """
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self.base_url
+
+    def serve_forever(self):
+        """Answers requests until interrupted."""
+        try:
+            self._httpd.serve_forever()
+        finally:
+            self._httpd.server_close()
+
+    def stop(self):
+        """Stops answering requests and closes the socket of the server."""
+        if self._thread is not None:
+            self._httpd.shutdown()
+            self._thread.join()
+            self._thread = None
+
+        self._httpd.server_close()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *args):
+        self.stop()
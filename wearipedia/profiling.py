@@ -0,0 +1,280 @@
+"""
+profiling.py
+====================================
+Memory profiling of the data of devices: how much memory each data type takes, per
+record and per value, and how much of it is the overhead of Python objects (object
+headers, pointers and hash tables) rather than the values themselves.
+
+Data types whose memory is dominated by overhead, e.g. lists of dictionaries holding one
+float and one ``datetime`` per sample, are the ones that would gain the most from a
+columnar representation (a DataFrame or NumPy arrays).
+"""
+
+import datetime
+import numbers
+import sys
+import time
+import tracemalloc
+
+__all__ = ["profile_memory", "deep_size"]
+
+# data types with a larger share of overhead are flagged in the report
+OVERHEAD_THRESHOLD = 0.5
+
+# the size of a pointer, e.g. to each element of a list or of an object column
+POINTER_SIZE = 8
+
+# the size of the value of scalars, without the header of their object
+_PAYLOAD_SIZES = {
+    bool: 1,
+    int: 8,
+    float: 8,
+    complex: 16,
+    datetime.datetime: 8,
+    datetime.date: 4,
+    datetime.time: 8,
+    datetime.timedelta: 8,
+}
+
+
+def _payload_size(value):
+    # the size of a scalar if it were stored in a typed array
+    if isinstance(value, (str, bytes, bytearray)):
+        return len(value)
+
+    for cls in type(value).__mro__:
+        if cls in _PAYLOAD_SIZES:
+            return _PAYLOAD_SIZES[cls]
+
+    # NumPy scalars
+    return getattr(value, "nbytes", sys.getsizeof(value))
+
+
+def _is_scalar(value):
+    return (
+        value is None
+        or isinstance(
+            value,
+            (
+                str,
+                bytes,
+                bytearray,
+                numbers.Number,
+                datetime.date,
+                datetime.time,
+                datetime.timedelta,
+            ),
+        )
+        or (hasattr(value, "dtype") and getattr(value, "ndim", None) == 0)
+    )
+
+
+def deep_size(data):
+    """Returns the memory held by data, following containers (lists, tuples, sets,
+    dictionaries, the ``__dict__`` of objects, NumPy arrays, and pandas DataFrames and
+    Series, including the objects in their object columns). Objects referenced several
+    times are counted once.
+
+    :param data: the data
+    :return: a dictionary with the total ``size``, the ``payload`` (the size the
+        values would take in typed arrays, e.g. 8 bytes per float or datetime instead of
+        24 or 48), and the number of scalar ``values``
+    :rtype: Dict
+    """
+    pd = sys.modules.get("pandas")
+    np = sys.modules.get("numpy")
+
+    seen = set()
+    stack = [data]
+    size, payload, values = 0, 0, 0
+
+    while stack:
+        obj = stack.pop()
+
+        if id(obj) in seen:
+            continue
+
+        seen.add(id(obj))
+
+        if _is_scalar(obj):
+            size += sys.getsizeof(obj)
+
+            if obj is not None:
+                payload += _payload_size(obj)
+                values += 1
+        elif pd is not None and isinstance(obj, pd.DataFrame):
+            # the memory of a DataFrame is that of its index and columns
+            stack.append(obj.index)
+            stack.extend(column for _, column in obj.items())
+        elif pd is not None and isinstance(obj, pd.RangeIndex):
+            size += obj.memory_usage()
+        elif pd is not None and isinstance(obj, (pd.Series, pd.Index)):
+            if isinstance(obj, pd.Series):
+                stack.append(obj.index)
+
+            if obj.dtype == object or pd.api.types.is_string_dtype(obj.dtype):
+                size += POINTER_SIZE * len(obj)
+                stack.extend(obj.tolist())
+            else:
+                nbytes = (
+                    obj.memory_usage(deep=False)
+                    if isinstance(obj, pd.Index)
+                    else obj.memory_usage(index=False, deep=False)
+                )
+                size += nbytes
+                payload += nbytes
+                values += len(obj)
+        elif np is not None and isinstance(obj, np.ndarray):
+            if obj.dtype == object:
+                size += sys.getsizeof(obj)
+                stack.extend(obj.ravel().tolist())
+            else:
+                size += obj.nbytes
+                payload += obj.nbytes
+                values += obj.size
+        elif isinstance(obj, dict):
+            size += sys.getsizeof(obj)
+            stack.extend(obj.values())
+
+            # keys are overhead (the names of the fields, repeated in every record
+            # unless interned), not values
+            for key in obj:
+                if id(key) not in seen:
+                    seen.add(id(key))
+                    size += sys.getsizeof(key)
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            size += sys.getsizeof(obj)
+            stack.extend(obj)
+        else:
+            size += sys.getsizeof(obj)
+
+            if hasattr(obj, "__dict__"):
+                stack.append(obj.__dict__)
+
+    return {"size": size, "payload": payload, "values": values}
+
+
+def _describe(data):
+    # e.g. "list[dict]", "dict[str, list]" or "DataFrame"
+    name = type(data).__name__
+
+    if isinstance(data, (list, tuple)) and len(data) > 0:
+        return f"{name}[{_describe(data[0])}]"
+    elif isinstance(data, dict) and len(data) > 0:
+        key, value = next(iter(data.items()))
+
+        return f"{name}[{type(key).__name__}, {_describe(value)}]"
+
+    return name
+
+
+def profile_memory(
+    device_name,
+    data_types=None,
+    trace_allocations=True,
+    overhead_threshold=OVERHEAD_THRESHOLD,
+    **kwargs,
+):
+    """Reports the memory taken by the synthetic data of each data type of a device.
+
+    The report has one row per data type, with:
+
+    * ``container``: the structure of the data, e.g. "list[dict]"
+    * ``records``: its length, e.g. the number of rows or days
+    * ``values``: the number of scalar values it holds
+    * ``size``: the memory it holds in bytes, see `deep_size`
+    * ``bytes_per_record`` and ``bytes_per_value``
+    * ``overhead``: the share of ``size`` that is the overhead of Python objects rather
+      than the values themselves
+    * ``overhead_dominated``: whether ``overhead`` is above the threshold, in which case
+      a columnar representation would take much less memory
+    * ``allocated`` and ``peak_allocated``: the memory allocated by getting the data
+      type (and still held after, or at its peak), as traced by `tracemalloc`. For
+      devices generating all their data types at once, the first data type is charged
+      for all of them
+    * ``duration``: the time to get the data type in seconds, which tracing slows down
+
+    :param device_name: the name of the device, e.g. "fitbit/fitbit_charge_4"
+    :type device_name: str
+    :param data_types: the data types to profile, defaults to all of them
+    :type data_types: List, optional
+    :param trace_allocations: whether to trace the allocations with tracemalloc,
+        defaults to True
+    :type trace_allocations: bool, optional
+    :param overhead_threshold: the share of overhead above which data types are flagged,
+        defaults to 0.5
+    :type overhead_threshold: float, optional
+    :param kwargs: the init params of the device, e.g. its synthetic date range
+    :return: the report, one row per data type
+    :rtype: pd.DataFrame
+
+    **Example**
+
+    .. code-block:: python
+
+        import wearipedia
+
+        report = wearipedia.profile_memory(
+            "polar/h10", start_date="2022-03-01", end_date="2022-03-07"
+        )
+        print(report[["size", "bytes_per_value", "overhead_dominated"]])
+    """
+    import pandas as pd
+
+    from . import get_device
+
+    started_tracing = trace_allocations and not tracemalloc.is_tracing()
+
+    if started_tracing:
+        tracemalloc.start()
+
+    try:
+        device = get_device(device_name, **kwargs)
+        rows = []
+
+        for data_type in data_types or device.valid_data_types:
+            if trace_allocations:
+                before = tracemalloc.get_traced_memory()[0]
+
+                # Python < 3.9 cannot reset the peak, in which case it is the peak so far
+                if hasattr(tracemalloc, "reset_peak"):
+                    tracemalloc.reset_peak()
+
+            start = time.perf_counter()
+            data = device.get_data(data_type)
+            duration = time.perf_counter() - start
+
+            if trace_allocations:
+                current, peak = tracemalloc.get_traced_memory()
+
+            sizes = deep_size(data)
+            records = len(data) if hasattr(data, "__len__") else None
+            overhead = 1 - sizes["payload"] / sizes["size"] if sizes["size"] else 0.0
+
+            rows.append(
+                {
+                    "data_type": data_type,
+                    "container": _describe(data),
+                    "records": records,
+                    "values": sizes["values"],
+                    "size": sizes["size"],
+                    "bytes_per_record": (
+                        sizes["size"] / records if records else float("nan")
+                    ),
+                    "bytes_per_value": (
+                        sizes["size"] / sizes["values"]
+                        if sizes["values"]
+                        else float("nan")
+                    ),
+                    "overhead": overhead,
+                    "overhead_dominated": overhead > overhead_threshold,
+                    "allocated": current - before if trace_allocations else None,
+                    "peak_allocated": peak - before if trace_allocations else None,
+                    "duration": duration,
+                }
+            )
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+
+    return pd.DataFrame(rows).set_index("data_type")
@@ -0,0 +1,391 @@
+"""
+ratelimit.py
+====================================
+Per-vendor rate limiting of the requests to the device APIs, with retries of throttled
+requests (HTTP 429) after the delay of their ``Retry-After`` header, or a jittered
+exponential backoff.
+
+Each vendor has a token bucket shared by every device (and session) of the process, and
+optionally by every process, if it is backed by a lock file (see `set_rate_limit`).
+Requests sent with a session of `wearipedia.sessions` are rate limited by the host they
+are sent to, while calls of third party API clients that do not send their requests with
+such a session can be rate limited with `call_with_retries`.
+"""
+
+import json
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+from requests.adapters import HTTPAdapter
+
+from .cassette import get_cassette
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+__all__ = [
+    "RateLimiter",
+    "RateLimitedAdapter",
+    "set_rate_limit",
+    "get_rate_limiter",
+    "call_with_retries",
+    "backoff_delay",
+]
+
+# vendor -> (number of requests, per number of seconds), from the published quotas
+# (Garmin Connect does not publish one, so its limit is a conservative guess)
+DEFAULT_RATE_LIMITS = {
+    "fitbit": (150, 3600),
+    "withings": (120, 60),
+    "whoop": (100, 60),
+    "oura": (5000, 300),
+    "strava": (100, 900),
+    "garmin": (60, 60),
+}
+
+# host (or parent domain of the host) -> vendor
+VENDOR_HOSTS = {
+    "fitbit.com": "fitbit",
+    "withings.net": "withings",
+    "whoop.com": "whoop",
+    "ouraring.com": "oura",
+    "strava.com": "strava",
+    "garmin.com": "garmin",
+    "dexcom.com": "dexcom",
+    "googleapis.com": "google",
+    "polar.com": "polar",
+    "elitehrv.com": "polar",
+    "coros.com": "coros",
+    "nutrisense.io": "nutrisense",
+    "rythm.co": "dreem",
+    "cronometer.com": "cronometer",
+}
+
+# responses to retry, after the delay of their Retry-After header if they have one
+RETRY_STATUS_CODES = {429, 503}
+
+MAX_RETRIES = 5
+
+# seconds, the backoff before the first retry doubles with each retry up to MAX_BACKOFF
+BASE_BACKOFF = 1.0
+MAX_BACKOFF = 60.0
+
+# not the global random, which is seeded to generate synthetic data
+_random = random.Random()
+
+_limiters = dict()
+_limiters_lock = threading.Lock()
+
+
+class RateLimiter:
+    """A token bucket allowing `rate` requests every `per` seconds, in bursts of at most
+    `capacity` requests. It is thread-safe, and if it has a `lock_path`, its state is kept
+    in that file so that all the processes using the same file share the bucket (on
+    POSIX systems, elsewhere the bucket is only shared by the threads of the process).
+
+    :param rate: the number of requests allowed every `per` seconds
+    :type rate: float
+    :param per: the period of `rate`, in seconds, defaults to 1
+    :type per: float, optional
+    :param capacity: the maximum number of requests in a burst, defaults to `rate`
+    :type capacity: float, optional
+    :param lock_path: the file to keep the state of the bucket in, defaults to None
+    :type lock_path: str or Path, optional
+    """
+
+    def __init__(self, rate, per=1.0, capacity=None, lock_path=None):
+        if rate <= 0 or per <= 0:
+            raise ValueError("rate and per must be positive")
+
+        self.rate = rate
+        self.per = per
+        self.capacity = rate if capacity is None else capacity
+        self.lock_path = None if fcntl is None else lock_path
+
+        self._lock = threading.Lock()
+        self._tokens = self.capacity
+        self._updated = time.time()
+
+    def _take(self, tokens, now):
+        # takes tokens from the bucket if it has enough, otherwise returns the number of
+        # seconds until it does
+        elapsed = max(now - self._updated, 0)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate / self.per)
+        self._updated = now
+
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0
+
+        return (tokens - self._tokens) * self.per / self.rate
+
+    def _take_shared(self, tokens, now):
+        with open(self.lock_path, "a+") as file:
+            fcntl.flock(file, fcntl.LOCK_EX)
+
+            try:
+                file.seek(0)
+                state = file.read()
+
+                if state:
+                    state = json.loads(state)
+                    self._tokens, self._updated = state["tokens"], state["updated"]
+                else:
+                    self._tokens, self._updated = self.capacity, now
+
+                wait = self._take(tokens, now)
+
+                file.seek(0)
+                file.truncate()
+                file.write(
+                    json.dumps({"tokens": self._tokens, "updated": self._updated})
+                )
+                file.flush()
+            finally:
+                fcntl.flock(file, fcntl.LOCK_UN)
+
+        return wait
+
+    def try_acquire(self, tokens=1):
+        """Takes tokens from the bucket if it has enough.
+
+        :param tokens: the number of tokens to take, defaults to 1
+        :type tokens: float, optional
+        :return: 0 if the tokens were taken, otherwise the number of seconds until the
+            bucket has enough tokens
+        :rtype: float
+        """
+        if tokens > self.capacity:
+            raise ValueError(
+                f"cannot take {tokens} tokens from a bucket of {self.capacity}"
+            )
+
+        with self._lock:
+            if self.lock_path is not None:
+                return self._take_shared(tokens, time.time())
+
+            return self._take(tokens, time.time())
+
+    def acquire(self, tokens=1):
+        """Waits until the bucket has enough tokens, and takes them.
+
+        :param tokens: the number of tokens to take, defaults to 1
+        :type tokens: float, optional
+        :return: the number of seconds waited
+        :rtype: float
+        """
+        waited = 0
+
+        while True:
+            wait = self.try_acquire(tokens)
+
+            if wait == 0:
+                return waited
+
+            time.sleep(wait)
+            waited += wait
+
+
+def set_rate_limit(vendor, rate, per=1.0, capacity=None, lock_path=None):
+    """Sets the rate limit of the requests to the API of a vendor, for every device of
+    the process. Pass a `lock_path` to share the limit with the other processes using
+    the same file, e.g. the workers of a batch.
+
+    :param vendor: the vendor, e.g. "fitbit"
+    :type vendor: str
+    :param rate: the number of requests allowed every `per` seconds, or None to remove
+        the limit
+    :type rate: float
+    :param per: the period of `rate`, in seconds, defaults to 1
+    :type per: float, optional
+    :param capacity: the maximum number of requests in a burst, defaults to `rate`
+    :type capacity: float, optional
+    :param lock_path: the file to keep the state of the limit in, defaults to None
+    :type lock_path: str or Path, optional
+    :return: the rate limiter of the vendor, or None if the limit was removed
+    :rtype: RateLimiter
+
+    **Example**
+
+    .. code-block:: python
+
+        import wearipedia
+
+        # half of the Fitbit quota, shared by all the processes of this user
+        wearipedia.set_rate_limit(
+            "fitbit", 75, per=3600, lock_path="/tmp/wearipedia-fitbit.lock"
+        )
+    """
+    with _limiters_lock:
+        if rate is None:
+            _limiters[vendor] = None
+        else:
+            _limiters[vendor] = RateLimiter(rate, per, capacity, lock_path)
+
+        return _limiters[vendor]
+
+
+def get_rate_limiter(vendor):
+    """Returns the rate limiter of a vendor, creating it from DEFAULT_RATE_LIMITS on first
+    use.
+
+    :param vendor: the vendor, e.g. "fitbit"
+    :type vendor: str
+    :return: the rate limiter, or None if the vendor has no rate limit
+    :rtype: RateLimiter
+    """
+    with _limiters_lock:
+        if vendor not in _limiters:
+            limit = DEFAULT_RATE_LIMITS.get(vendor)
+            _limiters[vendor] = None if limit is None else RateLimiter(*limit)
+
+        return _limiters[vendor]
+
+
+def get_vendor(url):
+    """Returns the vendor whose API a URL belongs to.
+
+    :param url: the URL
+    :type url: str
+    :return: the vendor, or None if the host is not the one of a known vendor
+    :rtype: str
+    """
+    host = (urlsplit(url).hostname or "").lower()
+
+    while host:
+        if host in VENDOR_HOSTS:
+            return VENDOR_HOSTS[host]
+
+        host = host.partition(".")[2]
+
+    return None
+
+
+def _parse_retry_after(retry_after):
+    # Retry-After is either a number of seconds or an HTTP date
+    try:
+        return max(float(retry_after), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(parsedate_to_datetime(retry_after).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt, retry_after=None):
+    """Returns the delay before retrying a throttled request: the delay of its
+    ``Retry-After`` header if it has one, otherwise a random delay of up to
+    BASE_BACKOFF * 2 ** attempt seconds (capped at MAX_BACKOFF), so that throttled
+    clients do not all retry at once.
+
+    :param attempt: the number of retries so far
+    :type attempt: int
+    :param retry_after: the value of the Retry-After header, defaults to None
+    :type retry_after: str, optional
+    :return: the delay, in seconds
+    :rtype: float
+    """
+    if retry_after is not None:
+        delay = _parse_retry_after(retry_after)
+
+        if delay is not None:
+            return min(delay, MAX_BACKOFF)
+
+    return _random.uniform(0, min(MAX_BACKOFF, BASE_BACKOFF * 2**attempt))
+
+
+class RateLimitedAdapter(HTTPAdapter):
+    """A transport adapter that waits for the rate limiter of the vendor of each request
+    before sending it, and retries throttled requests (see RETRY_STATUS_CODES) up to
+    `max_throttle_retries` times.
+
+    :param max_throttle_retries: the maximum number of retries of a throttled request,
+        defaults to MAX_RETRIES
+    :type max_throttle_retries: int, optional
+    """
+
+    def __init__(self, *args, max_throttle_retries=MAX_RETRIES, **kwargs):
+        self.max_throttle_retries = max_throttle_retries
+        super().__init__(*args, **kwargs)
+
+    def send(self, request, **kwargs):
+        vendor = get_vendor(request.url)
+        attempt = 0
+
+        while True:
+            limiter = get_rate_limiter(vendor) if vendor is not None else None
+            cassette = get_cassette()
+
+            # replayed responses do not count towards the quota of the vendor
+            if limiter is not None and (cassette is None or cassette.mode == "record"):
+                limiter.acquire()
+
+            response = super().send(request, **kwargs)
+
+            if (
+                response.status_code not in RETRY_STATUS_CODES
+                or attempt >= self.max_throttle_retries
+            ):
+                return response
+
+            delay = backoff_delay(attempt, response.headers.get("Retry-After"))
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+
+
+def _error_response(exception):
+    # the response of an HTTP error of requests, or of a client wrapping one
+    for error in [exception, getattr(exception, "error", None)]:
+        response = getattr(error, "response", None)
+
+        # (responses with an error status are falsy, so compare with None)
+        if response is not None and hasattr(response, "status_code"):
+            return response
+
+    return None
+
+
+def call_with_retries(vendor, func, *args, max_retries=MAX_RETRIES, **kwargs):
+    """Calls a function making a request to the API of a vendor (e.g. a method of a third
+    party API client) after waiting for the rate limiter of the vendor, and calls it
+    again with a backoff if it raises an error of a throttled request.
+
+    :param vendor: the vendor, e.g. "garmin"
+    :type vendor: str
+    :param func: the function to call
+    :type func: Callable
+    :param max_retries: the maximum number of retries, defaults to MAX_RETRIES
+    :type max_retries: int, optional
+    :return: the return value of func(*args, **kwargs)
+    """
+    attempt = 0
+
+    while True:
+        limiter = get_rate_limiter(vendor)
+
+        if limiter is not None:
+            limiter.acquire()
+
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            response = _error_response(e)
+
+            if (
+                response is None
+                or response.status_code not in RETRY_STATUS_CODES
+                or attempt >= max_retries
+            ):
+                raise
+
+            retry_after = getattr(response, "headers", {}).get("Retry-After")
+            time.sleep(backoff_delay(attempt, retry_after))
+            attempt += 1
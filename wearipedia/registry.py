@@ -0,0 +1,84 @@
+"""
+registry.py
+====================================
+The registry of all devices, mapping each device name to the module implementing it.
+"""
+
+from importlib import import_module
+
+__all__ = ["get_device_class", "register_device"]
+
+# device name -> module implementing the device, whose `class_name` attribute is the
+# name of the device class
+_DEVICE_MODULES = {
+    "apple/healthkit": "wearipedia.devices.apple.healthkit",
+    "cronometer/cronometer": "wearipedia.devices.cronometer.cronometer",
+    "whoop/whoop_4": "wearipedia.devices.whoop.whoop_4",
+    "withings/scanwatch": "wearipedia.devices.withings.scanwatch",
+    "withings/bodyplus": "wearipedia.devices.withings.bodyplus",
+    "withings/sleepmat": "wearipedia.devices.withings.sleepmat",
+    "dreem/headband_2": "wearipedia.devices.dreem.headband_2",
+    "dexcom/pro_cgm": "wearipedia.devices.dexcom.pro_cgm",
+    "garmin/fenix_7s": "wearipedia.devices.garmin.fenix_7s",
+    "google/googlefit": "wearipedia.devices.google.googlefit",
+    "polar/h10": "wearipedia.devices.polar.h10",
+    "polar/verity_sense": "wearipedia.devices.polar.verity_sense",
+    "nutrisense/cgm": "wearipedia.devices.nutrisense.cgm",
+    "fitbit/fitbit_charge_4": "wearipedia.devices.fitbit.fitbit_charge_4",
+    "fitbit/fitbit_charge_6": "wearipedia.devices.fitbit.fitbit_charge_6",
+    "fitbit/fitbit_sense": "wearipedia.devices.fitbit.fitbit_sense",
+    "fitbit/google_pixel_watch": "wearipedia.devices.fitbit.google_pixel_watch",
+    "oura/oura_ring3": "wearipedia.devices.oura.oura_ring3",
+    "coros/coros_pace_2": "wearipedia.devices.coros.coros_pace_2",
+    "polar/vantage": "wearipedia.devices.polar.vantage",
+    "strava/strava": "wearipedia.devices.strava.strava",
+    "myfitnesspal/myfitnesspal": "wearipedia.devices.myfitnesspal.myfitnesspal",
+}
+
+# device name -> device class, filled in as devices are first requested
+_device_classes = dict()
+
+
+def register_device(device_name, module_name):
+    """Register a device, so that it can be created with get_device().
+
+    :param device_name: the name of the device, e.g. "whoop/whoop_4"
+    :type device_name: str
+    :param module_name: the module implementing the device, which must define the name of
+        the device class as `class_name`, e.g. "wearipedia.devices.whoop.whoop_4"
+    :type module_name: str
+    """
+    _DEVICE_MODULES[device_name] = module_name
+    _device_classes.pop(device_name, None)
+
+
+def get_device_class(device_name):
+    """Get the class of a device by name. The module of the device is imported (with the
+    normal import machinery) the first time the device is requested.
+
+    :param device_name: the name of the device, e.g. "garmin/fenix_7s"
+    :type device_name: str
+    :raises ValueError: if there is no device with that name
+    :return: the device class
+    :rtype: type
+    """
+    if device_name not in _device_classes:
+        if device_name not in _DEVICE_MODULES:
+            raise ValueError(
+                f"device_name must be in {get_device_names()}, got {device_name}"
+            )
+
+        module = import_module(_DEVICE_MODULES[device_name])
+
+        _device_classes[device_name] = getattr(module, module.class_name)
+
+    return _device_classes[device_name]
+
+
+def get_device_names():
+    """Get the names of all registered devices.
+
+    :return: a list of device names
+    :rtype: List
+    """
+    return list(_DEVICE_MODULES)
@@ -0,0 +1,247 @@
+"""
+sessions.py
+====================================
+Pooled HTTP sessions for the fetch modules, so that consecutive requests to a vendor API
+(pages of a collection, one request per day, ...) reuse kept-alive connections instead of
+opening a new TCP and TLS connection for each request. Requests are rate limited per
+vendor, and throttled requests are retried, see `wearipedia.ratelimit`. If the response
+cache is enabled, responses are served from it, see `wearipedia.http_cache`. If an API
+base URL is set, requests are sent to it instead of the vendor APIs, e.g. to the
+stand-in APIs of `wearipedia.mockserver`.
+
+Each device gets its own session when it is authenticated (see
+`BaseDevice.authenticate`), and passes it to its fetch functions. Fetch functions
+called without a session use a session shared by the whole process.
+"""
+
+import hashlib
+import json
+import os
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from .cassette import get_cassette
+from .http_cache import (
+    CACHE_USER_HEADER,
+    get_cache_user,
+    get_response_cache,
+    is_cacheable,
+    is_cacheable_response,
+)
+from .instrumentation import is_enabled, record_http
+from .ratelimit import RateLimitedAdapter, get_vendor
+
+__all__ = [
+    "create_session",
+    "get_session",
+    "mount_adapter",
+    "set_cache_user",
+    "set_api_base_url",
+    "get_api_base_url",
+]
+
+# connections kept alive per host, which bounds the concurrent requests to a host
+DEFAULT_POOL_SIZE = 16
+
+API_BASE_URL_ENV_VAR = "WEARIPEDIA_API_BASE_URL"
+
+_shared_session = None
+_api_base_url = None
+
+
+def set_api_base_url(base_url):
+    """Sends the requests of the sessions to `base_url` instead of the vendor APIs: a
+    request to ``https://<host>/<path>`` is sent to ``<base_url>/<host>/<path>``. The
+    base URL can also be set with the ``WEARIPEDIA_API_BASE_URL`` environment variable.
+
+    :param base_url: the base URL, or None to send requests to the vendor APIs again
+    :type base_url: str
+    """
+    global _api_base_url
+
+    _api_base_url = base_url.rstrip("/") if base_url else None
+
+
+def get_api_base_url():
+    """Returns the base URL the requests of the sessions are sent to, if any.
+
+    :return: the base URL, or None
+    :rtype: str
+    """
+    base_url = _api_base_url or os.environ.get(API_BASE_URL_ENV_VAR)
+
+    return base_url.rstrip("/") if base_url else None
+
+
+def _redirect(url, base_url):
+    # the URL of a request sent to the base URL, which keeps its host as the first
+    # segment of the path
+    if url.startswith(base_url + "/"):
+        return url
+
+    parts = urlsplit(url)
+    redirected = f"{base_url}/{parts.netloc}{parts.path}"
+
+    return redirected + f"?{parts.query}" if parts.query else redirected
+
+
+class SessionAdapter(RateLimitedAdapter):
+    """The transport adapter of the sessions: serves responses from the response cache
+    if it is enabled (caching the responses it does not have), and otherwise sends
+    requests like RateLimitedAdapter. Requests are counted towards the phases measured
+    by `wearipedia.instrumentation`, if it is enabled.
+    """
+
+    def send(self, request, **kwargs):
+        if not is_enabled():
+            return self._send(request, **kwargs)
+
+        start = time.perf_counter()
+        response = self._send(request, **kwargs)
+
+        # the size of streamed bodies is only known from their headers
+        if kwargs.get("stream"):
+            size = int(response.headers.get("Content-Length") or 0)
+        else:
+            size = len(response.content)
+
+        record_http(size, time.perf_counter() - start)
+
+        return response
+
+    def _send(self, request, **kwargs):
+        base_url = get_api_base_url()
+
+        if base_url is not None:
+            request.url = _redirect(request.url, base_url)
+
+        user = get_cache_user(request.headers)
+        # the cache user is not meant for the API
+        request.headers.pop(CACHE_USER_HEADER, None)
+
+        cache = get_response_cache()
+        vendor = get_vendor(request.url)
+
+        # a cassette records (or replays) the requests actually sent
+        if (
+            cache is None
+            or get_cassette() is not None
+            or vendor is None
+            or kwargs.get("stream")
+            or not is_cacheable(request.method, request.url)
+        ):
+            return super().send(request, **kwargs)
+
+        key = cache.key(vendor, request.method, request.url, request.body, user)
+        cached = cache.load(key)
+
+        if cached is not None:
+            return self._cached_response(request, *cached)
+
+        response = super().send(request, **kwargs)
+        ttl = cache.ttl(request.url, request.body)
+
+        if (ttl is None or ttl > 0) and is_cacheable_response(
+            vendor, response.status_code, response.content
+        ):
+            cache.store(
+                key,
+                vendor,
+                request.url,
+                response.status_code,
+                response.headers,
+                response.content,
+                ttl,
+            )
+
+        return response
+
+    def _cached_response(self, request, status, headers, content):
+        response = requests.Response()
+        response.status_code = status
+        response.headers = CaseInsensitiveDict(headers)
+        response._content = content
+        response.encoding = get_encoding_from_headers(response.headers)
+        response.url = request.url
+        response.request = request
+        response.connection = self
+        response.from_cache = True
+
+        return response
+
+
+def mount_adapter(session, pool_size=DEFAULT_POOL_SIZE):
+    """Mounts the adapter of the sessions of this module on a session, e.g. the session
+    of a third party API client, so that its requests are rate limited and cached too.
+
+    :param session: the session
+    :type session: requests.Session
+    :param pool_size: the number of connections kept alive per host, defaults to 16
+    :type pool_size: int, optional
+    """
+    adapter = SessionAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def create_session(pool_size=DEFAULT_POOL_SIZE):
+    """Creates a session with a pool of kept-alive connections for each host, which
+    accepts gzip (or deflate) compressed responses, and waits for the rate limit of the
+    vendor of each request (retrying throttled requests).
+
+    :param pool_size: the number of connections kept alive per host, defaults to 16
+    :type pool_size: int, optional
+    :return: the session
+    :rtype: requests.Session
+    """
+    session = requests.Session()
+
+    mount_adapter(session, pool_size)
+
+    session.headers.update(
+        {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+    )
+
+    return session
+
+
+def set_cache_user(session, auth_creds):
+    """Sets the user of the requests of a session in the keys of the response cache to a
+    hash of their credentials, so that cached responses outlive the access tokens of the
+    user (which would otherwise identify the user).
+
+    :param session: the session
+    :type session: requests.Session
+    :param auth_creds: the credentials of the user
+    :type auth_creds: Dict
+    """
+    credentials = json.dumps(auth_creds, sort_keys=True, default=str)
+
+    session.headers[CACHE_USER_HEADER] = hashlib.sha256(
+        credentials.encode()
+    ).hexdigest()
+
+
+def get_session(session=None):
+    """Returns `session`, or if it is None, the session shared by the whole process
+    (created on first use). Fetch functions call this on their optional `session`
+    argument, so that they always send requests through a pooled session.
+
+    :param session: the session of the caller, defaults to None
+    :type session: requests.Session, optional
+    :return: the session to send requests with
+    :rtype: requests.Session
+    """
+    global _shared_session
+
+    if session is not None:
+        return session
+
+    if _shared_session is None:
+        _shared_session = create_session()
+
+    return _shared_session
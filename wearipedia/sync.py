@@ -0,0 +1,339 @@
+"""
+sync.py
+====================================
+Incremental sync of real data: the data of each device, user and data type is kept in a
+local store along with its high-water mark, the date up to which it has been fully
+fetched. Later syncs only fetch the data from the high-water mark on (less an overlap
+window, for data the API adds late), de-duplicate it against the stored data, and
+append it, instead of fetching the whole date range again.
+
+.. code-block:: python
+
+    import wearipedia
+
+    device = wearipedia.get_device("whoop/whoop_4")
+    device.authenticate(creds)
+
+    # the first sync fetches everything from the start date, later syncs only new data
+    cycles = device.sync("cycles", store="sync/", start="2021-01-01", user="p01")
+"""
+
+import json
+import os
+import pickle
+import re
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+__all__ = ["SyncStore", "sync_data"]
+
+SYNC_DIR_ENV_VAR = "WEARIPEDIA_SYNC_DIR"
+
+DATE_FORMAT = "%Y-%m-%d"
+
+# days fetched again before the high-water mark, for data that is added late
+DEFAULT_OVERLAP = 1
+
+
+class SyncStore:
+    """A directory holding the synced data of devices, with one entry per device, user
+    and data type: the data (pickled) and its high-water mark (as JSON).
+
+    :param sync_dir: the directory to store the synced data in
+    :type sync_dir: str or Path
+    """
+
+    def __init__(self, sync_dir):
+        self.sync_dir = Path(sync_dir)
+
+        self.sync_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry(self, device_key, user, data_type):
+        # the directory of the entry, and the name of its files
+        directory = self.sync_dir / _safe_name(device_key) / _safe_name(user)
+
+        return directory, _safe_name(data_type)
+
+    def load(self, device_key, user, data_type):
+        """Loads the synced data of a device, user and data type.
+
+        :param device_key: the key of the device, see `device_key`
+        :type device_key: str
+        :param user: the user of the data
+        :type user: str
+        :param data_type: the data type
+        :type data_type: str
+        :return: the data and the state of the sync (whose "high_water_mark" is the date
+            up to which the data was fully fetched), or (None, None) if it was never
+            synced
+        :rtype: Tuple
+        """
+        directory, name = self._entry(device_key, user, data_type)
+
+        try:
+            with open(directory / f"{name}.json") as f:
+                state = json.load(f)
+
+            with open(directory / f"{name}.pkl", "rb") as f:
+                data = pickle.load(f)
+        except (OSError, ValueError, EOFError, pickle.UnpicklingError):
+            return None, None
+
+        return data, state
+
+    def store(self, device_key, user, data_type, data, state):
+        """Stores the synced data of a device, user and data type. The data is written
+        before the state, so that the high-water mark never gets ahead of the data.
+
+        :param device_key: the key of the device, see `device_key`
+        :type device_key: str
+        :param user: the user of the data
+        :type user: str
+        :param data_type: the data type
+        :type data_type: str
+        :param data: the data
+        :type data: DataFrame or List
+        :param state: the state of the sync
+        :type state: Dict
+        """
+        directory, name = self._entry(device_key, user, data_type)
+        directory.mkdir(parents=True, exist_ok=True)
+
+        _write_atomic(
+            directory / f"{name}.pkl",
+            lambda f: pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL),
+        )
+        _write_atomic(
+            directory / f"{name}.json",
+            lambda f: f.write(json.dumps(state, indent=4).encode()),
+        )
+
+    def clear(self, device_key=None, user=None):
+        """Removes synced data, so that it is fetched again from the start.
+
+        :param device_key: only remove the data of this device, defaults to None
+        :type device_key: str, optional
+        :param user: only remove the data of this user, defaults to None
+        :type user: str, optional
+        """
+        for path in sorted(self.sync_dir.glob("*/*/*"), reverse=True):
+            entry_device, entry_user = path.parent.parent.name, path.parent.name
+
+            if (device_key is None or entry_device == _safe_name(device_key)) and (
+                user is None or entry_user == _safe_name(user)
+            ):
+                path.unlink()
+
+
+def _safe_name(name):
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", str(name))
+
+
+def _write_atomic(path, write):
+    # other processes never see a partially written file
+    fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=path.parent)
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def device_key(device):
+    """Returns the key of a device in sync stores: the module and name of its class.
+
+    :param device: the device
+    :type device: BaseDevice
+    :return: the key
+    :rtype: str
+    """
+    return f"{type(device).__module__}.{type(device).__name__}"
+
+
+def _get_store(store):
+    if isinstance(store, SyncStore):
+        return store
+    elif store is not None:
+        return SyncStore(store)
+    elif os.environ.get(SYNC_DIR_ENV_VAR):
+        return SyncStore(os.environ[SYNC_DIR_ENV_VAR])
+
+    raise ValueError(
+        f"store must be given, or the {SYNC_DIR_ENV_VAR} environment variable set"
+    )
+
+
+def _default_user(device):
+    # a hash of the credentials the device was authenticated with
+    from .http_cache import CACHE_USER_HEADER
+
+    user = device.http_session.headers.get(CACHE_USER_HEADER)
+
+    if user is None:
+        raise ValueError("user must be given for devices without a session")
+
+    return user[:16]
+
+
+def _date_keys(params):
+    if "start_date" in params and "end_date" in params:
+        return "start_date", "end_date"
+    elif "start" in params and "end" in params:
+        return "start", "end"
+
+    return None
+
+
+def _record_key(record, keys):
+    if keys:
+        return tuple(str(record[key]) for key in keys)
+
+    return json.dumps(record, sort_keys=True, default=str)
+
+
+def merge(old, new, keys=None):
+    """Appends new data to old data, dropping the old records that are also in the new
+    data (which are more recent).
+
+    :param old: the stored data, or None
+    :type old: DataFrame or List
+    :param new: the data just fetched
+    :type new: DataFrame or List
+    :param keys: the fields identifying a record, defaults to all of them
+    :type keys: List, optional
+    :raises ValueError: if the data is neither a DataFrame nor a list
+    :return: the merged data
+    :rtype: DataFrame or List
+    """
+    import pandas as pd
+
+    if isinstance(new, pd.DataFrame):
+        if old is None or len(old) == 0:
+            return new.reset_index(drop=True)
+        elif len(new) == 0:
+            return old
+
+        merged = pd.concat([old, new], ignore_index=True)
+        # nested values (e.g. dictionaries of scores) are not hashable
+        records = merged[keys] if keys else merged
+        duplicated = pd.Series(
+            [_record_key(record, keys) for record in records.to_dict("records")]
+        ).duplicated(keep="last")
+
+        return merged[~duplicated.to_numpy()].reset_index(drop=True)
+
+    elif isinstance(new, list):
+        new_keys = {_record_key(record, keys) for record in new}
+
+        return [
+            record for record in old or [] if _record_key(record, keys) not in new_keys
+        ] + new
+
+    raise ValueError(
+        f"only data returned as a DataFrame or a list can be synced, got {type(new)}"
+    )
+
+
+def sync_data(
+    device,
+    data_type,
+    store=None,
+    start=None,
+    end=None,
+    user=None,
+    overlap=DEFAULT_OVERLAP,
+):
+    """Fetches the data of an authenticated device that is not in the store yet, and
+    returns all the stored data. See `BaseDevice.sync`.
+
+    :param device: the device, which must be authenticated
+    :type device: BaseDevice
+    :param data_type: the data type
+    :type data_type: str
+    :param store: the store (or the directory of the store), defaults to the directory
+        in the ``WEARIPEDIA_SYNC_DIR`` environment variable
+    :type store: SyncStore or str, optional
+    :param start: the date to fetch data from on the first sync, defaults to the start
+        date of the default params of the device
+    :type start: str, optional
+    :param end: the date to fetch data up to (excluded), defaults to tomorrow, so that
+        the data of today is fetched (and fetched again on the next sync)
+    :type end: str, optional
+    :param user: the user of the data, defaults to a hash of the credentials of the
+        device (pass e.g. the ID of the participant for credentials that change, such
+        as rotating refresh tokens)
+    :type user: str, optional
+    :param overlap: the number of days before the high-water mark to fetch again,
+        defaults to 1
+    :type overlap: int, optional
+    :raises ValueError: if the device is not authenticated, or its params have no date
+        range
+    :return: all the synced data
+    :rtype: DataFrame or List
+    """
+    if not device.authenticated:
+        raise ValueError("only the real data of an authenticated device can be synced")
+
+    if not data_type in device.valid_data_types:
+        raise ValueError(f"data_type must be in {list(device.valid_data_types)}")
+
+    params = device._default_params()
+    date_keys = _date_keys(params)
+
+    if date_keys is None:
+        raise ValueError(f"{type(device).__name__} has no date range to sync")
+
+    store = _get_store(store)
+    key = device_key(device)
+    user = user or _default_user(device)
+
+    old, state = store.load(key, user, data_type)
+
+    if end is None:
+        end = (datetime.now() + timedelta(days=1)).strftime(DATE_FORMAT)
+
+    if state is not None:
+        start = (
+            datetime.strptime(state["high_water_mark"], DATE_FORMAT)
+            - timedelta(days=overlap)
+        ).strftime(DATE_FORMAT)
+    elif start is None:
+        start = str(params[date_keys[0]])[:10]
+
+    # devices whose end date is part of the window get the day before the end
+    window_end = _parse_date(end) - timedelta(days=int(device._end_date_inclusive))
+    new = device.get_data(
+        data_type,
+        {
+            **params,
+            date_keys[0]: start,
+            date_keys[1]: window_end.strftime(DATE_FORMAT),
+        },
+    )
+
+    data = merge(old, new, device._sync_keys.get(data_type))
+
+    # the last day is only fully fetched once it is over
+    high_water_mark = min(_parse_date(end), datetime.now()).strftime(DATE_FORMAT)
+
+    store.store(
+        key,
+        user,
+        data_type,
+        data,
+        {
+            "high_water_mark": high_water_mark,
+            "synced_at": datetime.now().isoformat(timespec="seconds"),
+        },
+    )
+
+    return data
+
+
+def _parse_date(date):
+    return datetime.strptime(str(date)[:10], DATE_FORMAT)
@@ -0,0 +1,311 @@
+"""
+tokens.py
+====================================
+A token store shared by the threads and processes refreshing OAuth tokens, so that
+parallel workers do not race to refresh (and, for APIs that rotate refresh tokens,
+invalidate) each other's tokens.
+
+Tokens are kept in a JSON file, only readable by its owner, mapping names such as
+``WITHINGS_REFRESH_TOKEN`` to tokens (which set_secrets_script.py pushes back to the
+secrets of the CI). The tokens refreshed for each vendor, client and user are kept apart,
+along with the expiry of their access token, under the ``_users`` key, which is not
+exported as secrets. Reads are served from memory until the file changes, writes replace
+the file atomically, and refreshes hold an exclusive lock on the file (on POSIX systems),
+so that only one worker refreshes the tokens of a user while the others wait and then use
+the new tokens. A stored access token is reused until shortly before it expires, after
+which the next refresh (when a device authenticates) requests new tokens: tokens are not
+refreshed while a device is fetching data.
+
+The store is disabled by default, and enabled with `set_token_store` or the
+``WEARIPEDIA_TOKEN_STORE`` environment variable (the path of the file).
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+__all__ = ["TokenStore", "get_token_store", "set_token_store", "refresh_tokens"]
+
+TOKEN_STORE_ENV_VAR = "WEARIPEDIA_TOKEN_STORE"
+
+# the file of the token store of the CI, from which set_secrets_script.py updates the
+# secrets
+DEFAULT_TOKEN_STORE = "/tmp/refresh_tokens.json"
+
+# access tokens expiring within this many seconds are refreshed
+DEFAULT_REFRESH_MARGIN = 300
+
+# the key of the tokens of each vendor, client and user in the file, along with their
+# expiry and origin
+USERS_KEY = "_users"
+
+_token_store = None
+_token_store_lock = threading.Lock()
+
+
+def _fingerprint(token):
+    # identifies a refresh token (or a client) without storing it
+    return hashlib.sha256(str(token).encode()).hexdigest()[:16]
+
+
+class TokenStore:
+    """The tokens of a JSON file, see the module documentation.
+
+    :param path: the path of the file, defaults to "/tmp/refresh_tokens.json"
+    :type path: str or Path, optional
+    :param refresh_margin: the number of seconds before their expiry at which access
+        tokens are refreshed, defaults to 300
+    :type refresh_margin: int, optional
+    """
+
+    def __init__(self, path=DEFAULT_TOKEN_STORE, refresh_margin=DEFAULT_REFRESH_MARGIN):
+        self.path = Path(path)
+        self.refresh_margin = refresh_margin
+
+        self._lock = threading.RLock()
+        # the parsed file, and the (modification time, size, inode) it was parsed at
+        self._tokens = dict()
+        self._version = None
+
+    def _stat(self):
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def read(self):
+        """Returns all the tokens of the file, parsing it again only if it changed.
+
+        :return: a dictionary of token name to token
+        :rtype: Dict
+        """
+        with self._lock:
+            version = self._stat()
+
+            if version != self._version:
+                try:
+                    with open(self.path) as f:
+                        text = f.read()
+
+                    self._tokens = json.loads(text) if text.strip() else dict()
+                except (OSError, ValueError):
+                    self._tokens = dict()
+
+                self._version = version
+
+            return dict(self._tokens)
+
+    def get(self, name):
+        """Returns a token.
+
+        :param name: the name of the token, e.g. "WITHINGS_REFRESH_TOKEN"
+        :type name: str
+        :return: the token, or None if it is not in the store
+        :rtype: str
+        """
+        return self.read().get(name)
+
+    def _write(self, tokens):
+        # the new file replaces the old one at once, so readers never see it partially
+        # written (and it is only readable by its owner, like any file of mkstemp)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", dir=self.path.parent)
+
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(tokens, f)
+
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+        self._tokens = tokens
+        self._version = self._stat()
+
+    @contextmanager
+    def locked(self):
+        """Holds an exclusive lock on the store, across the threads of the process and
+        (on POSIX systems) the processes sharing the file.
+        """
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+
+            fd = os.open(f"{self.path}.lock", os.O_RDWR | os.O_CREAT, 0o600)
+
+            with os.fdopen(fd, "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def update(self, tokens):
+        """Sets tokens, keeping the other tokens of the file.
+
+        :param tokens: a dictionary of token name to token
+        :type tokens: Dict
+        """
+        with self.locked():
+            self._write({**self.read(), **tokens})
+
+    def _find_user(self, users, prefix, client, refresh_token):
+        # the name of the stored tokens of a user of a client of a vendor: those whose
+        # refresh token is refresh_token or was refreshed from it, or new ones
+        if refresh_token is not None:
+            for name, user in users.items():
+                if user.get("vendor") != prefix or user.get("client") != client:
+                    continue
+
+                if user.get("refresh_token") == refresh_token or user.get(
+                    "refreshed_from"
+                ) == _fingerprint(refresh_token):
+                    return name, user
+
+        return f"{prefix}_{_fingerprint((client, refresh_token))[:12]}", None
+
+    def refresh(self, prefix, refresh_token, request_tokens, client_id=None):
+        """Returns fresh tokens of a user, only requesting new ones with
+        `request_tokens` if the stored access token is missing or about to expire. The
+        stored tokens are used if `refresh_token` is the stored refresh token, or the one
+        it was refreshed from (e.g. by another worker started with the same token). The
+        tokens of different clients and users of a vendor are stored apart.
+
+        :param prefix: the prefix of the names of the tokens, e.g. "WITHINGS"
+        :type prefix: str
+        :param refresh_token: the refresh token of the caller
+        :type refresh_token: str
+        :param request_tokens: a function of a refresh token requesting new tokens, which
+            returns the new refresh token, the access token, and the number of seconds
+            until the access token expires (or None if unknown)
+        :type request_tokens: Callable
+        :param client_id: the ID of the OAuth client of the caller, defaults to None
+        :type client_id: str, optional
+        :return: the refresh token and the access token
+        :rtype: Tuple
+        """
+        client = None if client_id is None else _fingerprint(client_id)
+
+        with self.locked():
+            tokens = self.read()
+            users = tokens.get(USERS_KEY, dict())
+            name, user = self._find_user(users, prefix, client, refresh_token)
+
+            if user is not None:
+                expires_at = user.get("expires_at")
+
+                if (
+                    user.get("access_token") is not None
+                    and expires_at is not None
+                    and expires_at - self.refresh_margin > time.time()
+                ):
+                    return user["refresh_token"], user["access_token"]
+
+                # the stored refresh token is the latest one, even if it was rotated
+                refresh_token = user["refresh_token"]
+
+            new_refresh_token, access_token, expires_in = request_tokens(refresh_token)
+
+            # a failed refresh is not stored
+            if access_token is None:
+                return new_refresh_token, access_token
+
+            self._write(
+                {
+                    **tokens,
+                    USERS_KEY: {
+                        **users,
+                        name: {
+                            "vendor": prefix,
+                            "client": client,
+                            "refresh_token": new_refresh_token,
+                            "access_token": access_token,
+                            "expires_at": (
+                                None if expires_in is None else time.time() + expires_in
+                            ),
+                            "refreshed_from": _fingerprint(refresh_token),
+                        },
+                    },
+                }
+            )
+
+        return new_refresh_token, access_token
+
+
+def get_token_store():
+    """Returns the token store shared by the process, or None if it is disabled, which
+    it is unless it was set with `set_token_store` or the ``WEARIPEDIA_TOKEN_STORE``
+    environment variable.
+
+    :return: the token store
+    :rtype: TokenStore
+    """
+    global _token_store
+
+    with _token_store_lock:
+        if _token_store is None:
+            path = os.environ.get(TOKEN_STORE_ENV_VAR)
+            _token_store = TokenStore(path) if path else False
+
+        # False when disabled
+        return _token_store or None
+
+
+def set_token_store(path, refresh_margin=DEFAULT_REFRESH_MARGIN):
+    """Sets the file of the token store shared by the process.
+
+    :param path: the path of the file, or None to disable the store (so that every
+        refresh requests new tokens)
+    :type path: str or Path
+    :param refresh_margin: the number of seconds before their expiry at which access
+        tokens are refreshed, defaults to 300
+    :type refresh_margin: int, optional
+    :return: the token store, or None
+    :rtype: TokenStore
+    """
+    global _token_store
+
+    with _token_store_lock:
+        _token_store = False if path is None else TokenStore(path, refresh_margin)
+
+        return _token_store or None
+
+
+def refresh_tokens(prefix, refresh_token, request_tokens, client_id=None):
+    """Refreshes the tokens of a user through the shared token store (see
+    `TokenStore.refresh`), or with `request_tokens` directly if the store is disabled.
+
+    :param prefix: the prefix of the names of the tokens, e.g. "WITHINGS"
+    :type prefix: str
+    :param refresh_token: the refresh token of the caller
+    :type refresh_token: str
+    :param request_tokens: the function requesting new tokens
+    :type request_tokens: Callable
+    :param client_id: the ID of the OAuth client of the caller, defaults to None
+    :type client_id: str, optional
+    :return: the refresh token and the access token
+    :rtype: Tuple
+    """
+    store = get_token_store()
+
+    if store is None:
+        return request_tokens(refresh_token)[:2]
+
+    return store.refresh(prefix, refresh_token, request_tokens, client_id)
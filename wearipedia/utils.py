@@ -1,8 +1,10 @@
+import hashlib
 import random
+import sys
 
 import numpy as np
 
-__all__ = ["is_notebook", "seed_everything"]
+__all__ = ["is_notebook", "seed_everything", "derive_seed", "TimeIndex"]
 
 
 def is_notebook() -> bool:
@@ -33,42 +35,139 @@ def seed_everything(seed):
     random.seed(seed)
 
 
-def bin_search_aux(data, start, end, target):
-    """Binary search for a target in a sorted array.
-    This is a helper function for `bin_search`.
+def derive_seed(*keys):
+    """Derive a reproducible 32-bit seed from a sequence of keys, e.g.
+    ``derive_seed(0, "Fitbit_sense", "sleep")``. Unlike the builtin ``hash``,
+    the result is stable across processes.
 
-    :param data: the sorted array
-    :type data: list
-    :param start: the start index
-    :type start: int
-    :param end: the end index
-    :type end: int
-    :param target: the target to search for
-    :type target: int
-    :return: the index of the target
+    :param keys: the keys to derive the seed from, converted with ``str``
+    :return: a seed suitable for `seed_everything`
     :rtype: int
     """
-    if start >= end:
-        return start
-
-    mid = (start + end) // 2
-    if data[mid] == target:
-        return mid
-    elif data[mid] < target:
-        return bin_search_aux(data, mid + 1, end, target)
-    else:
-        return bin_search_aux(data, start, mid - 1, target)
-
-
-def bin_search(data, target):
-    """Binary search for a target in a sorted array.
-
-    :param data: the sorted array
-    :type data: list
-    :param target: the target to search for
-    :type target: int
-    :return: the index of the target
-    :rtype: int
+    digest = hashlib.sha256("/".join(str(key) for key in keys).encode()).digest()
+    return int.from_bytes(digest[:4], "little")
+
+
+def to_datetime64(timestamps):
+    """Convert timestamps (strings, datetimes, pd.Timestamps or np.datetime64) to a
+    ``datetime64[ns]`` array. Timezone-aware timestamps are converted to UTC, and naive
+    ones are kept as they are.
+
+    :param timestamps: the timestamps to convert
+    :type timestamps: Iterable
+    :return: the converted timestamps
+    :rtype: np.ndarray
     """
+    import pandas as pd
+
+    timestamps = list(timestamps)
+
+    try:
+        index = pd.DatetimeIndex(pd.to_datetime(timestamps))
+    except ValueError:
+        # timestamps in several formats (or timezones), parsed one by one
+        return np.array(
+            [_to_datetime64(timestamp) for timestamp in timestamps],
+            dtype="datetime64[ns]",
+        )
+
+    if index.tz is not None:
+        index = index.tz_convert("UTC").tz_localize(None)
+
+    return index.values.astype("datetime64[ns]")
+
+
+def _to_datetime64(timestamp):
+    import pandas as pd
+
+    if isinstance(timestamp, str):
+        # e.g. np.str_, which pd.Timestamp does not accept
+        timestamp = str(timestamp)
+
+    timestamp = pd.Timestamp(timestamp)
+
+    if timestamp.tz is not None:
+        timestamp = timestamp.tz_convert("UTC").tz_localize(None)
 
-    return bin_search_aux(data, 0, len(data) - 1, target)
+    return timestamp.to_datetime64().astype("datetime64[ns]")
+
+
+class TimeIndex:
+    """A sorted index of the timestamps of some data, to select the elements of the data
+    in a time range with a binary search (``np.searchsorted``) instead of comparing or
+    parsing every timestamp on every query. Build it once, when the data is generated, and
+    query it many times.
+
+    The timestamps do not need to be sorted: selections are always returned in the
+    original order of the data.
+
+    :param timestamps: the timestamp of each element of the data, in any format understood
+        by ``pd.to_datetime``
+    :type timestamps: Iterable
+
+    **Example**
+
+    .. code-block:: python
+
+        index = TimeIndex(df["datetime"])
+
+        # rows from 2022-03-01 (inclusive) to 2022-03-08 (exclusive)
+        week = index.select(df, "2022-03-01", "2022-03-08")
+    """
+
+    def __init__(self, timestamps):
+        times = to_datetime64(timestamps)
+
+        if len(times) == 0 or np.all(times[1:] >= times[:-1]):
+            self._order = None
+            self.times = times
+        else:
+            self._order = np.argsort(times, kind="stable")
+            self.times = times[self._order]
+
+    def __len__(self):
+        return len(self.times)
+
+    def positions(self, start, end):
+        """Get the positions of the elements with a timestamp in [start, end).
+
+        :param start: the start of the range (inclusive)
+        :type start: str or datetime or pd.Timestamp or np.datetime64
+        :param end: the end of the range (exclusive)
+        :type end: str or datetime or pd.Timestamp or np.datetime64
+        :return: a slice if the timestamps are sorted, otherwise an array of positions in
+            increasing order
+        :rtype: slice or np.ndarray
+        """
+        start_idx = np.searchsorted(self.times, _to_datetime64(start), side="left")
+        end_idx = np.searchsorted(self.times, _to_datetime64(end), side="left")
+        end_idx = max(end_idx, start_idx)
+
+        if self._order is None:
+            return slice(int(start_idx), int(end_idx))
+
+        return np.sort(self._order[start_idx:end_idx])
+
+    def select(self, data, start, end):
+        """Select the elements of data with a timestamp in [start, end).
+
+        :param data: the data the index was built for, with one element per timestamp
+        :type data: DataFrame or Series or List
+        :param start: the start of the range (inclusive)
+        :type start: str or datetime or pd.Timestamp or np.datetime64
+        :param end: the end of the range (exclusive)
+        :type end: str or datetime or pd.Timestamp or np.datetime64
+        :return: the selected elements, of the same type as data
+        :rtype: DataFrame or Series or List
+        """
+        positions = self.positions(start, end)
+
+        # pandas is only imported by the devices whose data are DataFrames
+        pd = sys.modules.get("pandas")
+
+        if pd is not None and isinstance(data, (pd.DataFrame, pd.Series)):
+            return data.iloc[positions]
+        elif isinstance(positions, slice):
+            return data[positions]
+        else:
+            return [data[i] for i in positions]